@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Batch Persistence Benchmark
+
+Measures how long storing the results of a large batch takes in a fresh
+SQLite database, comparing the former per-file path (commit and refresh per
+file, debug SQL file rewritten per file) with the bulk ``BatchWriter``
+(multi-row INSERTs, one commit per chunk or per batch).
+
+The stored results are copies of one real conversion, so only persistence
+is timed.
+
+Usage:
+    python benchmarks/batch_persistence.py
+    python benchmarks/batch_persistence.py --files 2000 --chunk-size 500
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from xml_to_sql.web.database.models import Base, BatchConversion, BatchFile  # noqa: E402
+from xml_to_sql.web.services.batch_store import BATCH_COMMIT_CHUNK_SIZE, BatchWriter, record_batch_file  # noqa: E402
+from xml_to_sql.web.services.converter import ConversionResult, convert_xml_to_sql  # noqa: E402
+
+DEFAULT_SAMPLE = PROJECT_ROOT / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+
+Upload = Tuple[str, bytes, ConversionResult]
+
+
+def write_debug_file(path: Path, result: ConversionResult) -> None:
+    """Same content as the web app's LATEST_SQL_FROM_DB.txt, written to ``path``."""
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"-- Last generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"-- Scenario ID: {result.scenario_id}\n\n")
+        f.write(result.sql_content)
+
+
+def persist_per_file(db: Session, batch_id: str, uploads: List[Upload], debug_file: Path) -> None:
+    """The former /convert/batch path: one transaction per file."""
+
+    for filename, content, result in uploads:
+        conversion = record_batch_file(db, batch_id, filename, content, len(content), "{}", result)
+        db.commit()
+        db.refresh(conversion)
+        write_debug_file(debug_file, result)
+    db.commit()
+
+
+def persist_bulk(chunk_size: int) -> Callable[[Session, str, List[Upload], Path], None]:
+    def persist(db: Session, batch_id: str, uploads: List[Upload], debug_file: Path) -> None:
+        writer = BatchWriter(db, batch_id, "{}", chunk_size=chunk_size)
+        for index, (filename, content, result) in enumerate(uploads):
+            writer.add(index, filename, content, len(content), result)
+        writer.flush()
+        write_debug_file(debug_file, uploads[-1][2])
+
+    return persist
+
+
+def run(label: str, uploads: List[Upload], persist: Callable[[Session, str, List[Upload], Path], None]) -> float:
+    """Persist ``uploads`` into a fresh database file and print files/second."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'conversions.db'}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            batch_id = f"bench-{label}"
+            db.add(BatchConversion(batch_id=batch_id, total_files=len(uploads)))
+            db.commit()
+
+            start = time.perf_counter()
+            persist(db, batch_id, uploads, Path(tmp) / "LATEST_SQL_FROM_DB.txt")
+            elapsed = time.perf_counter() - start
+
+            stored = db.query(BatchFile).filter(BatchFile.batch_id == batch_id).count()
+        engine.dispose()
+
+    assert stored == len(uploads), f"{label}: stored {stored} of {len(uploads)} files"
+    rate = len(uploads) / elapsed if elapsed else float("inf")
+    print(f"  {label:<32} {len(uploads):>6} files  {elapsed * 1000:>10.1f} ms  {rate:>10,.0f} files/s")
+    return elapsed
+
+
+def main():
+    """Run the persistence benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark batch conversion persistence")
+    parser.add_argument("--sample", type=Path, default=DEFAULT_SAMPLE, help="XML view whose result is stored")
+    parser.add_argument("--files", type=int, default=500, help="Files per batch")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_COMMIT_CHUNK_SIZE, help="Files per bulk commit")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BATCH PERSISTENCE")
+    print("=" * 80)
+
+    content = args.sample.read_bytes()
+    result = convert_xml_to_sql(content, database_mode="snowflake")
+    if result.error:
+        print(f"Sample did not convert: {result.error}")
+        return 1
+    uploads = [(f"{args.sample.stem}_{index}.XML", content, result) for index in range(args.files)]
+    print(f"Sample: {args.sample.name} ({len(content):,} bytes XML, {len(result.sql_content):,} bytes SQL)")
+    print()
+
+    per_file = run("per-file commit", uploads, persist_per_file)
+    chunked = run(f"bulk, {args.chunk_size} files per commit", uploads, persist_bulk(args.chunk_size))
+    single = run("bulk, one transaction", uploads, persist_bulk(0))
+
+    print()
+    print(f"  speed-up vs per-file: {per_file / chunked:.2f}x (chunked), {per_file / single:.2f}x (one transaction)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
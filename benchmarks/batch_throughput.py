@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Batch Conversion Throughput Benchmark
+
+Converts the sample XML corpus through the shared conversion process pool
+(the path ``/api/convert/batch`` takes) with 1, 2, 4, ... worker processes
+up to the CPU count, and reports files per second and the speed-up over a
+single worker. While a batch runs, a ticker coroutine measures how late the
+event loop wakes up, which shows whether other requests would be served.
+
+Usage:
+    python benchmarks/batch_throughput.py
+    python benchmarks/batch_throughput.py --files 200 --max-workers 8
+    python benchmarks/batch_throughput.py --source "Source (XML Files)/HANA 2.XX XML Views"
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from xml_to_sql.web.services.conversion_pool import (  # noqa: E402
+    CONVERSION_WORKERS_ENV,
+    convert_as_completed,
+    shutdown_conversion_pool,
+)
+
+DEFAULT_SOURCE = PROJECT_ROOT / "Source (XML Files)"
+
+
+def collect_corpus_files(source: Path) -> List[Tuple[str, bytes]]:
+    """Return ``(name, content)`` for every XML file under ``source``."""
+
+    xml_files = sorted(p for p in source.rglob("*") if p.suffix.lower() == ".xml")
+    return [(path.name, path.read_bytes()) for path in xml_files]
+
+
+async def _ticker(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _run_batch(files: List[Tuple[str, bytes]], database_mode: str) -> Tuple[float, int, List[float]]:
+    jobs = [(index, content, {"database_mode": database_mode}) for index, (_, content) in enumerate(files)]
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop, lags))
+
+    failed = 0
+    start = time.perf_counter()
+    async for _, result in convert_as_completed(jobs):
+        failed += result.error is not None
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    return elapsed, failed, lags
+
+
+def run(workers: int, files: List[Tuple[str, bytes]], database_mode: str) -> float:
+    """Convert ``files`` with a pool of ``workers`` processes and print files/second."""
+
+    shutdown_conversion_pool()
+    os.environ[CONVERSION_WORKERS_ENV] = str(workers)
+    # Warm-up: start every worker process and load its caches
+    asyncio.run(_run_batch(files[:workers], database_mode))
+
+    elapsed, failed, lags = asyncio.run(_run_batch(files, database_mode))
+    rate = len(files) / elapsed if elapsed else float("inf")
+    worst_lag = max(lags) if lags else 0.0
+    print(
+        f"  {workers:>3} workers  {len(files):>6} files  {elapsed * 1000:>10.1f} ms  "
+        f"{rate:>8.1f} files/s  {failed:>4} failed  max loop lag {worst_lag:>7.1f} ms"
+    )
+    return rate
+
+
+def main():
+    """Run the batch throughput benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark batch conversion throughput per worker count")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Directory with XML views")
+    parser.add_argument("--files", type=int, default=0, help="Files per batch (corpus is repeated; default: corpus size)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool size to measure")
+    parser.add_argument("--database-mode", default="hana", choices=["hana", "snowflake"], help="Target database")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BATCH CONVERSION THROUGHPUT")
+    print("=" * 80)
+
+    corpus = collect_corpus_files(args.source)
+    if not corpus:
+        print("No XML files found.")
+        return 1
+    files = list(islice(cycle(corpus), args.files or len(corpus)))
+    print(f"Corpus: {len(corpus)} XML files from {args.source}; {len(files)} files per batch")
+    print(f"CPU count: {os.cpu_count()}")
+    print()
+
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(max(1, args.max_workers))
+
+    try:
+        rates = {workers: run(workers, files, args.database_mode) for workers in worker_counts}
+    finally:
+        shutdown_conversion_pool()
+
+    print()
+    baseline = rates[worker_counts[0]]
+    for workers, rate in rates.items():
+        print(f"  {workers:>3} workers: {rate / baseline:.2f}x vs 1 worker")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+Formula Translation Throughput Benchmark
+
+Collects every formula from the sample XML corpus (calculated attributes,
+RAW filter predicates, RAW mappings, logical-model calculated attributes and
+measure formulas) and measures how many formulas per second the translator
+handles, comparing the expression-tree pipeline with the legacy regex one.
+
+Both pipelines share the text pre-passes (placeholder substitution and the
+regex pattern rules), which are timed on their own. On the sample corpus the
+tree pipeline runs at parity with the regex one (0.9x-1.07x): it was
+adopted for correctness, and repeated formulas are made cheap by the
+translation cache rather than by the tree.
+
+Usage:
+    python benchmarks/formula_throughput.py
+    python benchmarks/formula_throughput.py --iterations 200
+    python benchmarks/formula_throughput.py --source "Source (XML Files)/HANA 2.XX XML Views"
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion  # noqa: E402
+from xml_to_sql.parser.scenario_parser import parse_scenario  # noqa: E402
+from xml_to_sql.sql.formula_ast import FormulaSyntaxError, parse_formula  # noqa: E402
+from xml_to_sql.sql.formula_batch import collect_formulas  # noqa: E402
+from xml_to_sql.sql.function_translator import (  # noqa: E402
+    _apply_pattern_rewrites,
+    _substitute_placeholders,
+    _translate_raw_formula_uncached,
+    _translate_with_regex,
+    translate_raw_formula,
+)
+from xml_to_sql.sql.rewrite_engine import get_rewrite_engine  # noqa: E402
+from xml_to_sql.sql.translation_cache import get_formula_cache  # noqa: E402
+
+DEFAULT_SOURCE = PROJECT_ROOT / "Source (XML Files)"
+
+
+class BenchmarkContext:
+    """Minimal translation context, mirroring what the renderer passes."""
+
+    def __init__(self, database_mode: DatabaseMode, hana_version=None):
+        self.database_mode = database_mode
+        self.hana_version = hana_version
+        self.client = "PROD"
+        self.language = "EN"
+        self.warnings: List[str] = []
+
+
+def collect_corpus_formulas(source: Path) -> List[str]:
+    """Return every formula string found in the XML files under ``source``."""
+
+    formulas: List[str] = []
+    xml_files = sorted(p for p in source.rglob("*") if p.suffix.lower() == ".xml")
+
+    for xml_path in xml_files:
+        try:
+            scenario = parse_scenario(xml_path)
+        except Exception as exc:  # Corpus contains non-view XML files
+            print(f"  skipped {xml_path.name}: {exc}")
+            continue
+        formulas.extend(collect_formulas(scenario))
+
+    return [formula for formula in formulas if formula]
+
+
+def pre_passes(formula: str, ctx) -> str:
+    """Text passes both pipelines run before translating."""
+
+    text = _substitute_placeholders(formula, ctx)
+    return _apply_pattern_rewrites(text, ctx, ctx.database_mode)
+
+
+def translate_with_regex(formula: str, ctx) -> str:
+    """Legacy pipeline: the same pre-passes followed by regex translation."""
+
+    mode = ctx.database_mode
+    text = _substitute_placeholders(formula, ctx)
+    text = _apply_pattern_rewrites(text, ctx, mode)
+    return _translate_with_regex(text, ctx, mode)
+
+
+def run(label: str, formulas: List[str], func: Callable[[str], object], iterations: int) -> float:
+    """Time ``func`` over all formulas and print formulas/second."""
+
+    for formula in formulas:  # warm-up (catalog loading, template compilation)
+        func(formula)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for formula in formulas:
+            func(formula)
+    elapsed = time.perf_counter() - start
+
+    total = len(formulas) * iterations
+    rate = total / elapsed if elapsed else float("inf")
+    print(f"  {label:<32} {total:>8} formulas  {elapsed * 1000:>9.1f} ms  {rate:>12,.0f} formulas/s")
+    return rate
+
+
+def main():
+    """Run the throughput benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark formula translation throughput")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Directory with XML views")
+    parser.add_argument("--iterations", type=int, default=50, help="Passes over the corpus per measurement")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("FORMULA TRANSLATION THROUGHPUT")
+    print("=" * 80)
+
+    formulas = collect_corpus_formulas(args.source)
+    unique = len(set(formulas))
+    print(f"Corpus: {len(formulas)} formulas ({unique} unique) from {args.source}")
+
+    unparsable = 0
+    for formula in formulas:
+        try:
+            parse_formula(formula)
+        except FormulaSyntaxError:
+            unparsable += 1
+    print(f"Parser coverage: {len(formulas) - unparsable}/{len(formulas)} parse without fallback")
+    print()
+
+    if not formulas:
+        print("No formulas found.")
+        return 1
+
+    run("parse only", formulas, parse_formula_safe, args.iterations)
+
+    targets = [
+        ("HANA 2.0", BenchmarkContext(DatabaseMode.HANA, HanaVersion.HANA_2_0)),
+        ("HANA 1.0", BenchmarkContext(DatabaseMode.HANA, HanaVersion.HANA_1_0)),
+        ("Snowflake", BenchmarkContext(DatabaseMode.SNOWFLAKE)),
+    ]
+
+    for name, ctx in targets:
+        print(f"{name}:")
+        shared_rate = run("shared pre-passes", formulas, lambda f, c=ctx: pre_passes(f, c), args.iterations)
+        tree_rate = run(
+            "expression tree",
+            formulas,
+            lambda f, c=ctx: _translate_raw_formula_uncached(f, c, c.database_mode),
+            args.iterations,
+        )
+        regex_rate = run("legacy regex", formulas, lambda f, c=ctx: translate_with_regex(f, c), args.iterations)
+        get_formula_cache().clear()
+        cached_rate = run("cached (translate_raw_formula)", formulas, lambda f, c=ctx: translate_raw_formula(f, c), args.iterations)
+        print(f"  throughput vs regex: {tree_rate / regex_rate:.2f}x (tree), {cached_rate / regex_rate:.2f}x (cached)")
+        print(
+            f"  per formula: {1e6 / shared_rate:.0f} us shared pre-passes, "
+            f"{1e6 / tree_rate - 1e6 / shared_rate:.0f} us tree, {1e6 / regex_rate - 1e6 / shared_rate:.0f} us regex"
+        )
+        print(f"  cache: {get_formula_cache().stats().to_dict()}")
+        print()
+
+    print("Catalog rules (candidates = prefilter passed):")
+    for stats in sorted(get_rewrite_engine().stats(), key=lambda s: s.total_ns, reverse=True):
+        if stats.candidates:
+            print(f"  {stats.kind:<9} {stats.name:<28} {stats.candidates:>8} runs {stats.hits:>8} hits {stats.total_ms:>9.1f} ms")
+
+    return 0
+
+
+def parse_formula_safe(formula: str):
+    try:
+        return parse_formula(formula)
+    except FormulaSyntaxError:
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
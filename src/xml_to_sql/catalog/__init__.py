@@ -1,7 +1,17 @@
 """Utilities for loading the structured conversion catalog."""
 
 from .loader import FunctionRule, get_function_catalog
+from .pattern_linter import PatternLintIssue, PatternLintReport, RegexTimeout, lint_pattern_catalog
 from .pattern_loader import PatternRule, get_pattern_catalog
 
-__all__ = ["FunctionRule", "get_function_catalog", "PatternRule", "get_pattern_catalog"]
+__all__ = [
+    "FunctionRule",
+    "get_function_catalog",
+    "PatternRule",
+    "get_pattern_catalog",
+    "PatternLintIssue",
+    "PatternLintReport",
+    "RegexTimeout",
+    "lint_pattern_catalog",
+]
 
@@ -0,0 +1,423 @@
+"""Safety and performance linter for pattern rewrite rules.
+
+Pattern rules are arbitrary regular expressions applied to every formula, so
+a single pathological rule (``(a+)+``, ``(x|x)*``) could backtrack
+catastrophically and stall a web worker. The linter combines:
+
+* Static checks on the parsed regex: nested quantifiers, ambiguous
+  alternations inside repeats and adjacent overlapping quantifiers.
+* A timing check that runs each rule against real formulas and fuzzed,
+  adversarial inputs derived from the rule, failing rules whose slowest
+  input exceeds a time budget.
+
+``get_pattern_catalog`` refuses to load a catalog with lint errors. At
+runtime, ``run_with_timeout`` guards individual rule executions.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+try:  # Python 3.11+
+    from re import _parser as _regex_parser
+    from re import _constants as _regex_constants
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _regex_constants  # type: ignore[no-redef]
+    import sre_parse as _regex_parser  # type: ignore[no-redef]
+
+# Slowest allowed single input when linting a rule.
+DEFAULT_RULE_BUDGET_MS = 50.0
+
+# Representative formulas from calculation views; callers can add more.
+SAMPLE_FORMULAS = (
+    "if(\"KUNNR\" = '', 'N', 'Y')",
+    "date(NOW() - 270)",
+    "NOW() - 365",
+    "CURRENT_TIMESTAMP - 30",
+    "leftstr(\"CALMONTH\", 4) + rightstr(\"CALMONTH\", 2)",
+    "in(rightstr(\"CALMONTH\", 2), '01', '02', '03')",
+    "(\"MANDT\" = '$$client$$') and (\"SPRAS\" = '$$language$$')",
+    "('$$IP_DATE$$' = '' OR (DATE(\"ERDAT\") >= DATE('$$IP_DATE$$')))",
+    "if(isnull(\"NETWR\"), 0, \"NETWR\" * \"KURSF\")",
+    "match(\"MATNR\", 'A*') and not isnull(\"WERKS\")",
+    "daysbetween(\"ERDAT\", now()) > 30",
+    "string(int(\"MENGE\")) + ' ' + \"MEINS\"",
+)
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+T = TypeVar("T")
+
+
+class RegexTimeout(RuntimeError):
+    """Raised when a guarded regex exceeds its time limit."""
+
+
+@dataclass(slots=True)
+class PatternLintIssue:
+    """A single linter finding for a rule."""
+
+    rule: str
+    code: str
+    message: str
+    severity: str = SEVERITY_ERROR
+
+    def __str__(self) -> str:
+        return f"{self.rule}: [{self.code}] {self.message}"
+
+
+@dataclass(slots=True)
+class PatternLintReport:
+    """Findings and timings for a catalog."""
+
+    issues: List[PatternLintIssue] = field(default_factory=list)
+    worst_ms: dict = field(default_factory=dict)  # rule name -> slowest input (ms)
+
+    @property
+    def errors(self) -> List[PatternLintIssue]:
+        return [issue for issue in self.issues if issue.severity == SEVERITY_ERROR]
+
+    @property
+    def warnings(self) -> List[PatternLintIssue]:
+        return [issue for issue in self.issues if issue.severity == SEVERITY_WARNING]
+
+
+# ---------------------------------------------------------------------------
+# Runtime guard
+# ---------------------------------------------------------------------------
+
+
+def _can_use_alarm() -> bool:
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        return False
+    # Do not clobber a timer someone else installed.
+    return signal.getitimer(signal.ITIMER_REAL)[0] == 0
+
+
+@contextmanager
+def _alarm(seconds: float) -> Iterator[None]:
+    def _raise_timeout(signum, frame):
+        raise RegexTimeout(f"regex exceeded {seconds * 1000:.0f} ms")
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_with_timeout(func: Callable[[], T], timeout_ms: float) -> T:
+    """Run ``func`` and raise ``RegexTimeout`` if it takes over ``timeout_ms``.
+
+    The regex engine checks for signals while matching, so on the main thread
+    a ``SIGALRM`` timer interrupts a runaway match. Other threads (web worker
+    pool) cannot receive signals; there the elapsed time is checked after the
+    call returns, so the caller can disable the rule for subsequent formulas.
+    """
+
+    if _can_use_alarm():
+        with _alarm(timeout_ms / 1000):
+            return func()
+
+    start = time.perf_counter()
+    result = func()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if elapsed_ms > timeout_ms:
+        raise RegexTimeout(f"regex took {elapsed_ms:.0f} ms (limit {timeout_ms:.0f} ms)")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Static analysis
+# ---------------------------------------------------------------------------
+
+_MAXREPEAT = _regex_constants.MAXREPEAT
+_REPEATS = (_regex_constants.MAX_REPEAT, _regex_constants.MIN_REPEAT)
+_ZERO_WIDTH = (
+    _regex_constants.AT,
+    _regex_constants.ASSERT,
+    _regex_constants.ASSERT_NOT,
+)
+# Characters used to approximate which characters an item can start with.
+_PROBE_CHARS = "".join(chr(code) for code in range(32, 127)) + "\t\näß"
+
+
+def _is_unbounded(max_count: int) -> bool:
+    return max_count == _MAXREPEAT or max_count > 1
+
+
+def _contains_variable_repeat(items) -> bool:
+    for op, value in items:
+        if op in _REPEATS:
+            min_count, max_count, sub = value
+            if _is_unbounded(max_count) and max_count != min_count:
+                return True
+            if _contains_variable_repeat(sub):
+                return True
+        elif op is _regex_constants.SUBPATTERN:
+            if _contains_variable_repeat(value[-1]):
+                return True
+        elif op is _regex_constants.BRANCH:
+            if any(_contains_variable_repeat(branch) for branch in value[1]):
+                return True
+    return False
+
+
+def _first_chars(items, flags: int) -> Optional[frozenset]:
+    """Probe characters a sequence can start with (``None`` = unknown/any)."""
+
+    for op, value in items:
+        if op in _ZERO_WIDTH:
+            continue
+        if op is _regex_constants.SUBPATTERN:
+            return _first_chars(value[-1], flags)
+        if op is _regex_constants.BRANCH:
+            combined: set = set()
+            for branch in value[1]:
+                chars = _first_chars(branch, flags)
+                if chars is None:
+                    return None
+                combined |= chars
+            return frozenset(combined)
+        if op in _REPEATS:
+            if value[0] == 0:
+                return None
+            return _first_chars(value[2], flags)
+        if op in (_regex_constants.LITERAL, _regex_constants.NOT_LITERAL, _regex_constants.IN, _regex_constants.ANY):
+            try:
+                compiled = re.compile(_unparse_single(op, value), flags)
+            except (re.error, ValueError):
+                return None
+            return frozenset(ch for ch in _PROBE_CHARS if compiled.fullmatch(ch))
+        return None
+    return frozenset()
+
+
+def _unparse_single(op, value) -> str:
+    """Rebuild a regex for a single-character item."""
+
+    if op is _regex_constants.LITERAL:
+        return re.escape(chr(value))
+    if op is _regex_constants.NOT_LITERAL:
+        return f"[^{re.escape(chr(value))}]"
+    if op is _regex_constants.ANY:
+        return "."
+    parts: List[str] = []
+    negate = False
+    for item_op, item_value in value:
+        if item_op is _regex_constants.NEGATE:
+            negate = True
+        elif item_op is _regex_constants.LITERAL:
+            parts.append(re.escape(chr(item_value)))
+        elif item_op is _regex_constants.RANGE:
+            parts.append(f"{re.escape(chr(item_value[0]))}-{re.escape(chr(item_value[1]))}")
+        elif item_op is _regex_constants.CATEGORY:
+            parts.append(_CATEGORY_ESCAPES.get(item_value, ""))
+    return f"[{'^' if negate else ''}{''.join(parts)}]"
+
+
+_CATEGORY_ESCAPES = {
+    _regex_constants.CATEGORY_DIGIT: r"\d",
+    _regex_constants.CATEGORY_NOT_DIGIT: r"\D",
+    _regex_constants.CATEGORY_SPACE: r"\s",
+    _regex_constants.CATEGORY_NOT_SPACE: r"\S",
+    _regex_constants.CATEGORY_WORD: r"\w",
+    _regex_constants.CATEGORY_NOT_WORD: r"\W",
+}
+
+
+def _overlap(left: Optional[frozenset], right: Optional[frozenset]) -> bool:
+    if left is None or right is None:
+        return True
+    return bool(left & right)
+
+
+def _check_items(rule: str, items, flags: int, inside_repeat: bool, issues: List[PatternLintIssue]) -> None:
+    previous_repeat: Optional[frozenset] = None
+    previous_was_repeat = False
+
+    for op, value in items:
+        if op in _REPEATS:
+            min_count, max_count, sub = value
+            unbounded = _is_unbounded(max_count)
+            if unbounded and _contains_variable_repeat(sub):
+                issues.append(
+                    PatternLintIssue(
+                        rule,
+                        "NESTED_QUANTIFIER",
+                        "quantified group contains another variable-length quantifier "
+                        "(catastrophic backtracking risk)",
+                    )
+                )
+            chars = _first_chars(sub, flags)
+            if previous_was_repeat and unbounded and _overlap(previous_repeat, chars):
+                issues.append(
+                    PatternLintIssue(
+                        rule,
+                        "ADJACENT_QUANTIFIERS",
+                        "adjacent quantifiers can match the same characters (polynomial backtracking)",
+                        SEVERITY_WARNING,
+                    )
+                )
+            previous_was_repeat = unbounded
+            previous_repeat = chars
+            _check_items(rule, sub, flags, inside_repeat or unbounded, issues)
+            continue
+
+        previous_was_repeat = False
+        if op is _regex_constants.SUBPATTERN:
+            _check_items(rule, value[-1], flags, inside_repeat, issues)
+        elif op is _regex_constants.BRANCH:
+            branches = value[1]
+            if inside_repeat:
+                firsts = [_first_chars(branch, flags) for branch in branches]
+                for i in range(len(firsts)):
+                    if any(_overlap(firsts[i], firsts[j]) for j in range(i + 1, len(firsts))):
+                        issues.append(
+                            PatternLintIssue(
+                                rule,
+                                "AMBIGUOUS_ALTERNATION",
+                                "alternatives inside a repeat can start with the same character",
+                            )
+                        )
+                        break
+            for branch in branches:
+                _check_items(rule, branch, flags, inside_repeat, issues)
+        elif op in (_regex_constants.ASSERT, _regex_constants.ASSERT_NOT):
+            _check_items(rule, value[1], flags, inside_repeat, issues)
+
+
+def lint_regex(name: str, pattern: str, flags: int = re.IGNORECASE) -> List[PatternLintIssue]:
+    """Statically check one regex for backtracking hazards."""
+
+    try:
+        parsed = _regex_parser.parse(pattern, flags)
+    except re.error as exc:
+        return [PatternLintIssue(name, "INVALID_REGEX", str(exc))]
+
+    issues: List[PatternLintIssue] = []
+    _check_items(name, parsed, flags, False, issues)
+    return issues
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+
+def fuzz_inputs(pattern: str, corpus: Sequence[str] = (), seed: int = 0, count: int = 24) -> List[str]:
+    """Build adversarial inputs for ``pattern``.
+
+    Includes long runs of each literal the pattern mentions followed by a
+    character that breaks the match (the classic backtracking trigger),
+    repeated near-matches of the pattern's literal skeleton, random strings
+    over the pattern's alphabet, and repeated real formulas.
+    """
+
+    try:
+        parsed = _regex_parser.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return list(corpus)
+
+    literals: List[str] = []
+
+    def collect(items) -> None:
+        for op, value in items:
+            if op is _regex_constants.LITERAL:
+                literals.append(chr(value))
+            elif op in _REPEATS:
+                collect(value[2])
+            elif op is _regex_constants.SUBPATTERN:
+                collect(value[-1])
+            elif op is _regex_constants.BRANCH:
+                for branch in value[1]:
+                    collect(branch)
+
+    collect(parsed)
+    skeleton = "".join(literals)
+    alphabet = sorted(set(literals) | set(" 0123456789aZ_(),'\"-+"))
+
+    rng = random.Random(seed)
+    inputs: List[str] = []
+    for ch in sorted(set(literals)) or ["a"]:
+        inputs.append(ch * 512 + "\x00")
+    inputs.append(" " * 512 + "\x00")
+    inputs.append("9" * 512 + "\x00")
+    if skeleton:
+        inputs.append((skeleton[:-1] + " ") * 64)
+        inputs.append(skeleton * 32 + "\x00")
+    for _ in range(count):
+        inputs.append("".join(rng.choice(alphabet) for _ in range(rng.randint(64, 512))))
+    for formula in corpus:
+        inputs.append(formula)
+        inputs.append(" and ".join([formula] * 16))
+    return inputs
+
+
+def time_regex(regex: re.Pattern, inputs: Iterable[str], budget_ms: float) -> float:
+    """Return the slowest input time (ms); raise ``RegexTimeout`` past the budget."""
+
+    worst = 0.0
+    for text in inputs:
+        start = time.perf_counter()
+        run_with_timeout(lambda: sum(1 for _ in regex.finditer(text)), budget_ms)
+        worst = max(worst, (time.perf_counter() - start) * 1000)
+    return worst
+
+
+def lint_pattern_catalog(
+    rules,
+    corpus: Sequence[str] = SAMPLE_FORMULAS,
+    budget_ms: float = DEFAULT_RULE_BUDGET_MS,
+) -> PatternLintReport:
+    """Lint every rule of a pattern catalog.
+
+    Args:
+        rules: Mapping or iterable of ``PatternRule``.
+        corpus: Real formulas to time the rules against (fuzzed inputs are
+            added automatically).
+        budget_ms: Maximum time for a rule on any single input.
+
+    Returns:
+        Report with all issues and each rule's slowest input time.
+    """
+
+    report = PatternLintReport()
+    for rule in getattr(rules, "values", lambda: rules)():
+        issues = lint_regex(rule.name, rule.match)
+        report.issues.extend(issues)
+        if any(issue.severity == SEVERITY_ERROR for issue in issues):
+            continue  # Never time a regex already known to be dangerous
+
+        regex = re.compile(rule.match, re.IGNORECASE)
+        try:
+            report.worst_ms[rule.name] = time_regex(regex, fuzz_inputs(rule.match, corpus), budget_ms)
+        except RegexTimeout as exc:
+            report.issues.append(
+                PatternLintIssue(rule.name, "TIME_BUDGET", f"exceeded {budget_ms:.0f} ms budget: {exc}")
+            )
+    return report
+
+
+__all__ = [
+    "DEFAULT_RULE_BUDGET_MS",
+    "PatternLintIssue",
+    "PatternLintReport",
+    "RegexTimeout",
+    "SAMPLE_FORMULAS",
+    "fuzz_inputs",
+    "lint_pattern_catalog",
+    "lint_regex",
+    "run_with_timeout",
+    "time_regex",
+]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from functools import lru_cache
 from importlib import resources
@@ -9,6 +10,10 @@ from typing import Dict, Optional
 
 import yaml
 
+from .pattern_linter import lint_pattern_catalog
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class PatternRule:
@@ -31,6 +36,30 @@ class PatternRule:
     description: Optional[str] = None
 
 
+def parse_pattern_rules(raw_text: str) -> Dict[str, PatternRule]:
+    """Parse patterns.yaml content into rules keyed by name (no linting)."""
+
+    payload = yaml.safe_load(raw_text) or {}
+    rules: Dict[str, PatternRule] = {}
+
+    for item in payload.get("patterns", []):
+        name = (item or {}).get("name")
+        match = (item or {}).get("match")
+        if not name or not match:
+            continue  # Skip invalid entries
+
+        rule = PatternRule(
+            name=name,
+            match=match,
+            hana=item.get("hana", ""),
+            snowflake=item.get("snowflake", ""),
+            description=item.get("description"),
+        )
+        rules[rule.name] = rule
+
+    return rules
+
+
 @lru_cache(maxsize=1)
 def get_pattern_catalog() -> Dict[str, PatternRule]:
     """Load and return the pattern rewrite catalog.
@@ -38,11 +67,16 @@ def get_pattern_catalog() -> Dict[str, PatternRule]:
     Patterns are loaded from patterns.yaml and cached for performance.
     The catalog is returned as a dictionary keyed by pattern name.
 
+    Every rule is linted (see ``pattern_linter``) before the catalog is
+    returned; regexes at risk of catastrophic backtracking or slower than the
+    time budget are rejected.
+
     Returns:
         Dictionary mapping pattern names to PatternRule objects.
 
     Raises:
-        RuntimeError: If patterns.yaml is missing or cannot be loaded.
+        RuntimeError: If patterns.yaml is missing, cannot be loaded, or
+            contains rules that fail linting.
 
     Example:
         >>> catalog = get_pattern_catalog()
@@ -63,22 +97,13 @@ def get_pattern_catalog() -> Dict[str, PatternRule]:
     except FileNotFoundError as exc:
         raise RuntimeError("patterns.yaml catalog is missing") from exc
 
-    payload = yaml.safe_load(raw_text) or {}
-    rules: Dict[str, PatternRule] = {}
-
-    for item in payload.get("patterns", []):
-        name = (item or {}).get("name")
-        match = (item or {}).get("match")
-        if not name or not match:
-            continue  # Skip invalid entries
+    rules = parse_pattern_rules(raw_text)
 
-        rule = PatternRule(
-            name=name,
-            match=match,
-            hana=item.get("hana", ""),
-            snowflake=item.get("snowflake", ""),
-            description=item.get("description"),
-        )
-        rules[rule.name] = rule
+    report = lint_pattern_catalog(rules)
+    for issue in report.warnings:
+        logger.warning("patterns.yaml: %s", issue)
+    if report.errors:
+        details = "; ".join(str(issue) for issue in report.errors)
+        raise RuntimeError(f"patterns.yaml contains unsafe rules: {details}")
 
     return rules
@@ -2,16 +2,35 @@
 
 from __future__ import annotations
 
+from importlib import resources
 from pathlib import Path
 from typing import List, Optional
 
+import json
+
 import typer
 
+from ..catalog.pattern_linter import DEFAULT_RULE_BUDGET_MS, SAMPLE_FORMULAS, lint_pattern_catalog
+from ..catalog.pattern_loader import parse_pattern_rules
 from ..config import Config, ScenarioConfig, load_config
 from ..domain.types import DatabaseMode, HanaVersion
 from ..parser import parse_scenario
 from ..parser.xml_format_detector import detect_xml_format, get_recommended_hana_version
 from ..sql import render_scenario
+from ..sql.cost_model import estimate_cost, load_statistics
+from ..sql.dry_run import dry_run_sql
+from ..sql.ir_validator import validate_scenario_ir
+from ..sql.schema_catalog import SchemaCatalog
+from ..sql.validation_cache import configure_validation_cache
+from ..sql.validator import validate_column_references
+from ..sql.formula_batch import collect_formulas
+from ..utils.instrumentation import (
+    ConversionProfile,
+    enable_memory_tracing,
+    get_metrics_registry,
+    measure,
+    start_phase,
+)
 from ..bw import generate_bw_wrapper
 from ..bw.wrapper_generator import detect_is_bw_object
 from lxml import etree
@@ -45,10 +64,54 @@ def convert(
         "-l",
         help="Do not parse files; only show which scenarios would be processed.",
     ),
+    formula_workers: Optional[int] = typer.Option(
+        None,
+        "--formula-workers",
+        help="Translate formulas of large scenarios across this many processes.",
+    ),
+    validation_cache: Optional[Path] = typer.Option(
+        None,
+        "--validation-cache",
+        help="Directory of the validation result cache shared with web workers "
+        "(default: $VALIDATION_CACHE_DIR).",
+    ),
+    statistics: Optional[Path] = typer.Option(
+        None,
+        "--statistics",
+        help="YAML/JSON file with source table row counts, distinct counts and column widths; "
+        "enables the cost estimate.",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Execute the generated SQL against synthetic stand-in tables in an embedded SQLite database.",
+    ),
+    schema_catalog: Optional[Path] = typer.Option(
+        None,
+        "--schema-catalog",
+        help="SQLite column catalog (see 'import-columns') to check data source column references against.",
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        help="Write wall time and CPU time per scenario and phase, with histograms, to this JSON file.",
+    ),
+    profile_memory: bool = typer.Option(
+        False,
+        "--profile-memory",
+        help="Also record peak allocation per phase (tracemalloc; slows conversion down).",
+    ),
 ) -> None:
     """Parse configured scenarios and (eventually) emit SQL artefacts."""
 
     config_obj = load_config(config)
+    if validation_cache is not None:
+        configure_validation_cache(validation_cache)
+    table_statistics = load_statistics(statistics) if statistics is not None else None
+    column_catalog = SchemaCatalog(schema_catalog) if schema_catalog is not None else None
+    if profile_memory:
+        enable_memory_tracing()
+    scenario_profiles: List[dict] = []
     selected = config_obj.select_scenarios(scenario)
 
     if not selected:
@@ -67,10 +130,22 @@ def convert(
             typer.secho(f"  ERROR: Source file not found: {source_path}", fg=typer.colors.RED)
             continue
 
+        scenario_profile = ConversionProfile()
+        scenario_timer = start_phase("scenario", scenario_profile)
         try:
-            scenario_ir = parse_scenario(source_path)
+            with measure("stage:Parse XML", scenario_profile):
+                scenario_ir = parse_scenario(source_path)
             _describe_scenario(scenario_ir, scenario_cfg, target_path)
 
+            with measure("ir_validation", scenario_profile):
+                ir_validation = validate_scenario_ir(scenario_ir)
+            if ir_validation.has_errors:
+                for issue in ir_validation.errors:
+                    typer.secho(f"  ✗ IR: {issue.message}", fg=typer.colors.RED)
+                raise ValueError(
+                    f"Scenario structure is invalid ({len(ir_validation.errors)} error(s)); SQL not generated"
+                )
+
             client = scenario_cfg.overrides.effective_client(config_obj.default_client)
             language = scenario_cfg.overrides.effective_language(config_obj.default_language)
             output_name = scenario_cfg.output_name or scenario_cfg.id
@@ -145,22 +220,24 @@ def convert(
             except Exception:
                 xml_format = None
 
+            with measure("stage:Generate SQL", scenario_profile):
                 sql_content, warnings = render_scenario(
-                scenario_ir,
-                schema_overrides=config_obj.schema_overrides,
-                client=client,
-                language=language,
-                database_mode=mode_enum,
-                hana_version=hana_ver_enum,
-                xml_format=xml_format,
-                create_view=True,
+                    scenario_ir,
+                    schema_overrides=config_obj.schema_overrides,
+                    client=client,
+                    language=language,
+                    database_mode=mode_enum,
+                    hana_version=hana_ver_enum,
+                    xml_format=xml_format,
+                    create_view=True,
                     view_name=qualified_view_name,
-                currency_udf=config_obj.currency.udf_name,
-                currency_schema=config_obj.currency.schema,
-                currency_table=config_obj.currency.rates_table,
-                return_warnings=True,  # Capture warnings
-                validate=True,  # Re-enable validation
-            )
+                    currency_udf=config_obj.currency.udf_name,
+                    currency_schema=config_obj.currency.schema,
+                    currency_table=config_obj.currency.rates_table,
+                    return_warnings=True,  # Capture warnings
+                    validate=True,  # Re-enable validation
+                    formula_workers=formula_workers,
+                )
 
             target_path.parent.mkdir(parents=True, exist_ok=True)
             target_path.write_text(sql_content, encoding="utf-8")
@@ -171,9 +248,48 @@ def convert(
                 for warning in warnings:
                     typer.secho(f"  ⚠ WARNING: {warning}", fg=typer.colors.YELLOW)
 
+            if table_statistics is not None:
+                with measure("cost_estimation", scenario_profile):
+                    cost_report = estimate_cost(scenario_ir, table_statistics)
+                final = cost_report.to_dict()["final"]
+                if final:
+                    typer.echo(f"  Estimated result: ~{final['rows']:,} rows, ~{final['bytes']:,} bytes")
+                for issue in cost_report.result.warnings + cost_report.result.info:
+                    typer.secho(f"  ⚠ COST: {issue.message}", fg=typer.colors.YELLOW)
+
+            if dry_run:
+                with measure("validator:Dry Run", scenario_profile):
+                    dry_run_report = dry_run_sql(sql_content, scenario_ir)
+                for issue in dry_run_report.result.errors:
+                    typer.secho(f"  ✗ DRY RUN: {issue.message}", fg=typer.colors.RED)
+                for issue in dry_run_report.result.warnings:
+                    typer.secho(f"  ⚠ DRY RUN: {issue.message}", fg=typer.colors.YELLOW)
+                for issue in dry_run_report.result.info:
+                    typer.echo(f"  DRY RUN: {issue.message}")
+                if dry_run_report.executed:
+                    typer.echo(
+                        f"  DRY RUN: prepared in {dry_run_report.prepare_ms:.1f} ms, "
+                        f"executed in {dry_run_report.execute_ms:.1f} ms"
+                    )
+                for line in dry_run_report.plan_lines():
+                    typer.echo(f"    {line}")
+
+            if column_catalog is not None:
+                with measure("validator:Column References", scenario_profile):
+                    column_result = validate_column_references(sql_content, scenario_ir, column_catalog)
+                for issue in column_result.errors:
+                    typer.secho(f"  ✗ COLUMNS: {issue.message}", fg=typer.colors.RED)
+                for issue in column_result.info:
+                    typer.echo(f"  COLUMNS: {issue.message}")
+
         except Exception as e:
             typer.secho(f"  ERROR: {e}", fg=typer.colors.RED)
             raise typer.Exit(code=1)
+        finally:
+            scenario_timer.stop()
+            if profile is not None:
+                scenario_profiles.append({"scenario": scenario_cfg.id, **scenario_profile.to_dict()})
+                _write_profile_report(profile, scenario_profiles)
 
 
 @app.command("list")
@@ -193,6 +309,193 @@ def list_scenarios(
         typer.echo(f"{scenario_cfg.id} [{status}] -> {source_path}")
 
 
+@app.command("lint-patterns")
+def lint_patterns(
+    patterns: Optional[Path] = typer.Option(
+        None,
+        "--patterns",
+        "-p",
+        help="patterns.yaml to lint (defaults to the packaged catalog).",
+    ),
+    corpus: Optional[Path] = typer.Option(
+        None,
+        "--corpus",
+        help="Directory of calculation view XML files whose formulas are used for timing.",
+    ),
+    budget_ms: float = typer.Option(
+        DEFAULT_RULE_BUDGET_MS, "--budget-ms", help="Slowest allowed input per rule, in milliseconds."
+    ),
+) -> None:
+    """Check pattern rewrite rules for backtracking hazards and slow regexes."""
+
+    if patterns is None:
+        patterns = Path(str(resources.files("xml_to_sql.catalog.data").joinpath("patterns.yaml")))
+    rules = parse_pattern_rules(patterns.read_text(encoding="utf-8"))
+
+    formulas = list(SAMPLE_FORMULAS)
+    if corpus is not None:
+        for xml_path in sorted(p for p in corpus.rglob("*") if p.suffix.lower() == ".xml"):
+            try:
+                formulas.extend(collect_formulas(parse_scenario(xml_path)))
+            except Exception:
+                continue  # Not a calculation view
+    formulas = list(dict.fromkeys(formulas))
+
+    report = lint_pattern_catalog(rules, corpus=formulas, budget_ms=budget_ms)
+    typer.echo(f"Linted {len(rules)} rules against {len(formulas)} formulas (budget {budget_ms:.0f} ms)")
+    for name, worst in report.worst_ms.items():
+        typer.echo(f"  {name}: slowest input {worst:.2f} ms")
+    for issue in report.warnings:
+        typer.secho(f"  ⚠ {issue}", fg=typer.colors.YELLOW)
+    for issue in report.errors:
+        typer.secho(f"  ✗ {issue}", fg=typer.colors.RED)
+
+    if report.errors:
+        raise typer.Exit(code=1)
+    typer.secho("  ✓ All rules passed", fg=typer.colors.GREEN)
+
+
+@app.command("import-columns")
+def import_columns(
+    exports: List[Path] = typer.Argument(..., help="CSV or JSON exports of table definitions (DD03L-like)."),
+    catalog: Path = typer.Option(..., "--catalog", help="SQLite column catalog to create or update."),
+    schema: Optional[str] = typer.Option(
+        None, "--schema", help="Schema for records that do not name one (DD03L dumps have none)."
+    ),
+) -> None:
+    """Load exported table definitions into a local column catalog."""
+
+    column_catalog = SchemaCatalog(catalog)
+    try:
+        for export in exports:
+            summary = column_catalog.import_file(export, schema_name=schema)
+            typer.echo(
+                f"{export}: {summary.columns} columns of {summary.tables} tables"
+                + (f" ({summary.skipped} records skipped)" if summary.skipped else "")
+            )
+    except (OSError, ValueError) as exc:
+        typer.secho(f"  ERROR: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    finally:
+        column_catalog.close()
+
+
+@app.command("migrate-history")
+def migrate_history(
+    database: Optional[Path] = typer.Option(
+        None, "--database", help="Conversion history database (default: the web app's, see DATABASE_PATH)."
+    ),
+    vacuum: bool = typer.Option(
+        True, "--vacuum/--no-vacuum", help="Rewrite the database file afterwards so it shrinks (needs free space of its size)."
+    ),
+) -> None:
+    """Move conversion texts stored inline into the compressed blob store."""
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from ..web.database.blobs import migrate_inline_texts
+    from ..web.database.db import DB_PATH, init_db
+
+    path = database or DB_PATH
+    if not path.exists():
+        typer.secho(f"  ERROR: Database not found: {path}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        size_before = path.stat().st_size
+        init_db(engine)
+        migrated = migrate_inline_texts(
+            sessionmaker(bind=engine), progress=lambda count: typer.echo(f"  {count} conversions migrated")
+        )
+        typer.echo(f"{path}: moved the texts of {migrated} conversions into the blob store")
+        if vacuum:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.exec_driver_sql("VACUUM")
+            typer.echo(f"  Database size: {size_before:,} -> {path.stat().st_size:,} bytes")
+    finally:
+        engine.dispose()
+
+
+@app.command("maintenance")
+def maintenance(
+    database: Optional[Path] = typer.Option(
+        None, "--database", help="Conversion history database (default: the web app's, see DATABASE_PATH)."
+    ),
+    mappings_database: Optional[Path] = typer.Option(
+        None, "--mappings-database", help="Package mapping database (default: package_mappings.db in the project root)."
+    ),
+    retention_days: Optional[int] = typer.Option(
+        None, "--retention-days", min=1, help="Remove conversions older than this (default: HISTORY_RETENTION_DAYS)."
+    ),
+    max_rows: Optional[int] = typer.Option(
+        None, "--max-rows", min=1, help="Keep only the newest conversions (default: HISTORY_RETENTION_MAX_ROWS)."
+    ),
+    archive_dir: Optional[Path] = typer.Option(
+        None, "--archive-dir", help="Directory of the monthly archives (default: HISTORY_ARCHIVE_DIR)."
+    ),
+    archive: bool = typer.Option(True, "--archive/--no-archive", help="Archive removed conversions before deleting them."),
+    full_vacuum: bool = typer.Option(
+        False, "--full-vacuum", help="Rewrite the files and enable incremental vacuum (locks them; needs free space of their size)."
+    ),
+    analyze: bool = typer.Option(True, "--analyze/--no-analyze", help="Refresh the query planner statistics."),
+    reindex: bool = typer.Option(False, "--reindex", help="Rebuild all indexes."),
+) -> None:
+    """Archive old conversion history and compact the SQLite databases."""
+
+    from sqlalchemy import create_engine
+
+    from ..package_mapping_db import DEFAULT_DB_PATH
+    from ..web.database.db import DB_PATH, init_db
+    from ..web.services.maintenance import RetentionPolicy, run_maintenance
+
+    path = database or DB_PATH
+    if not path.exists():
+        typer.secho(f"  ERROR: Database not found: {path}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    policy = RetentionPolicy.from_env()
+    policy.max_age_days = retention_days or policy.max_age_days
+    policy.max_rows = max_rows or policy.max_rows
+    policy.archive_dir = (archive_dir or policy.archive_dir) if archive else None
+
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        init_db(engine)
+        report = run_maintenance(
+            policy,
+            bind=engine,
+            mappings_path=mappings_database or DEFAULT_DB_PATH,
+            full_vacuum=full_vacuum,
+            analyze=analyze,
+            reindex=reindex,
+        )
+    finally:
+        engine.dispose()
+
+    retention = report.retention
+    typer.echo(
+        f"Removed {retention.conversions_deleted} conversions ({retention.conversions_archived} archived), "
+        f"{retention.blobs_deleted} texts, {retention.batches_deleted} batches "
+        f"and {retention.import_history_deleted} import records"
+    )
+    for archive_file in retention.archive_files:
+        typer.echo(f"  Archive: {archive_file}")
+    for compaction in report.databases:
+        typer.echo(
+            f"{compaction.path}: {compaction.size_before:,} -> {compaction.size_after:,} bytes"
+            f" ({', '.join(compaction.steps) or 'no steps'})"
+        )
+    typer.echo(f"Reclaimed {report.reclaimed_bytes:,} bytes")
+
+
+def _write_profile_report(path: Path, scenario_profiles: List[dict]) -> None:
+    report = {"scenarios": scenario_profiles, "metrics": get_metrics_registry().snapshot()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
 def _describe_scenario(scenario_ir, scenario_cfg: ScenarioConfig, target_path: Path) -> None:
     nodes_count = len(scenario_ir.nodes)
     filters_count = sum(len(node.filters) for node in scenario_ir.nodes.values())
@@ -207,5 +510,5 @@ def _describe_scenario(scenario_ir, scenario_cfg: ScenarioConfig, target_path: P
     typer.echo(f"  Planned SQL target: {target_path}")
 
 
-__all__ = ["app", "convert", "list_scenarios"]
+__all__ = ["app", "convert", "lint_patterns", "list_scenarios", "maintenance", "migrate_history"]
 
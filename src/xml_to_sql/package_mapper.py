@@ -229,8 +229,28 @@ def get_package(cv_name: str) -> Optional[str]:
         return get_mapper().get_package(cv_name)
 
 
+def mapping_version() -> str:
+    """Token that changes whenever the package mappings may have changed.
+
+    Built from the change counter of the mapping database, which maintenance
+    of the file (vacuum, analyze) leaves alone, and the size and
+    modification time of the legacy JSON file.
+    """
+    from .package_mapping_db import DEFAULT_DB_PATH, mapping_data_version
+
+    version = mapping_data_version(DEFAULT_DB_PATH)
+    parts = [str(version) if version is not None else "-"]
+    try:
+        stat = DEFAULT_DB_PATH.with_name("package_mapping.json").stat()
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    except OSError:
+        parts.append("-")
+    return "/".join(parts)
+
+
 __all__ = [
     "PackageMapper",
     "get_mapper",
     "get_package",
+    "mapping_version",
 ]
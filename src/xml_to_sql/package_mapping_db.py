@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import sqlite3
 import json
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict
@@ -14,6 +15,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Default database file, in the project root
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "package_mappings.db"
+
 
 class PackageMappingDB:
     """Database manager for package mappings from multiple HANA instances."""
@@ -26,9 +30,7 @@ class PackageMappingDB:
                     If None, uses default location in project root.
         """
         if db_path is None:
-            # Default to project root
-            project_root = Path(__file__).parent.parent.parent
-            db_path = project_root / "package_mappings.db"
+            db_path = DEFAULT_DB_PATH
 
         self.db_path = db_path
         self._init_database()
@@ -38,6 +40,10 @@ class PackageMappingDB:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
 
+            # Lets maintenance return freed pages to the file system; only
+            # takes effect on a new database (see web/services/maintenance.py)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
             # Table: hana_instances
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS hana_instances (
@@ -86,6 +92,25 @@ class PackageMappingDB:
                 ON package_mappings(cv_name, is_active)
             """)
 
+            # Table: mapping_version - bumped by every change of the tables
+            # package lookups read (see mapping_data_version)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mapping_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("INSERT OR IGNORE INTO mapping_version (id, version) VALUES (1, 0)")
+            for table in ("package_mappings", "hana_instances"):
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE mapping_version SET version = version + 1;
+                        END
+                    """)
+
             conn.commit()
             logger.info(f"Database initialized at {self.db_path}")
 
@@ -376,6 +401,23 @@ class PackageMappingDB:
             }
 
 
+def mapping_data_version(db_path: Path = DEFAULT_DB_PATH) -> Optional[int]:
+    """Counter that changes whenever a package mapping or instance changes.
+
+    Kept by triggers, so it covers every writer of the database, and
+    unaffected by maintenance such as ``VACUUM`` or ``ANALYZE``. Returns
+    None when the database does not exist or predates the counter.
+    """
+    if not Path(db_path).exists():
+        return None
+    try:
+        with closing(sqlite3.connect(db_path)) as conn:
+            row = conn.execute("SELECT version FROM mapping_version WHERE id = 1").fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
 # Global singleton
 _db: Optional[PackageMappingDB] = None
 
@@ -388,4 +430,4 @@ def get_db() -> PackageMappingDB:
     return _db
 
 
-__all__ = ["PackageMappingDB", "get_db"]
+__all__ = ["DEFAULT_DB_PATH", "PackageMappingDB", "get_db", "mapping_data_version"]
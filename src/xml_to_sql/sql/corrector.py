@@ -1,13 +1,28 @@
-"""SQL auto-correction module for automatically fixing validation issues."""
+"""SQL auto-correction module for automatically fixing validation issues.
+
+Fixes are :class:`CorrectionRule` visitors over the shared token stream of
+:mod:`.sql_lexer`. Each pass tokenizes the SQL once, lets every active rule
+propose position-indexed edits, and applies them in a single rebuild; passes
+repeat until no rule proposes an edit (at most ``MAX_CORRECTION_PASSES``).
+Correction line numbers come straight from the tokens.
+
+When the renderer's statement AST is available, names, table references
+and CTEs are fixed structurally, the same rules rewrite each expression, and
+the corrected statement is printed once at the end.
+"""
 
 from __future__ import annotations
 
+import copy
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ..domain import Scenario
+from ..utils.instrumentation import ConversionProfile, measure
+from .sql_ast import Select, SqlStatement, TableRef, iter_selects, map_expressions, walk_query
+from .sql_lexer import SqlToken, SqlTokenKind, SqlVisitor, key_at, tokenize_sql, walk_tokens
 from .validator import ValidationIssue, ValidationResult, ValidationSeverity
 
 
@@ -48,6 +63,7 @@ class CorrectionResult:
     issues_remaining: List[ValidationIssue] = field(default_factory=list)  # Issues that couldn't be auto-fixed
     auto_fix_enabled: bool = False
     original_sql: str = ""
+    corrected_ast: Optional[SqlStatement] = None  # Set when corrections ran on the statement AST
 
     def __init__(self, corrected_sql: str, original_sql: str = "", auto_fix_enabled: bool = False):
         """Initialize correction result."""
@@ -57,6 +73,7 @@ class CorrectionResult:
         self.corrections_applied = []
         self.issues_fixed = []
         self.issues_remaining = []
+        self.corrected_ast = None
 
 
 @dataclass
@@ -98,198 +115,418 @@ SNOWFLAKE_RESERVED_KEYWORDS = {
 }
 
 
-def fix_reserved_keywords(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
-    """
-    Fix unquoted reserved keywords by adding quotes.
+# Issue codes each rule responds to
+_RESERVED_KEYWORD_CODES = ("RESERVED_KEYWORD", "UNQUOTED_RESERVED_KEYWORD", "RESERVED_KEYWORD_IDENTIFIER")
+_STRING_CONCAT_CODES = ("HANA_STRING_CONCAT", "STRING_CONCAT_PLUS", "HANA_COMPATIBILITY")
+_FUNCTION_CALL_CODES = ("HANA_IF_FUNCTION", "IF_FUNCTION", "HANA_COMPATIBILITY", "FUNCTION_SYNTAX")
+_SCHEMA_CODES = ("UNQUALIFIED_TABLE", "MISSING_SCHEMA", "SCHEMA_QUALIFICATION")
+_CTE_NAMING_CODES = ("DUPLICATE_CTE", "CTE_NAME_CONFLICT")
 
-    Args:
-        sql: SQL string to fix
-        issues: List of validation issues related to reserved keywords
-        config: Auto-fix configuration
+# Keywords that legitimately end an expression (``END AS x``, ``NULL,``) and
+# keywords that start a clause after ``AS`` (``CREATE VIEW v AS SELECT``)
+_VALUE_KEYWORDS = frozenset({
+    "CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP", "CURRENT_USER", "END", "FALSE",
+    "LOCALTIME", "LOCALTIMESTAMP", "NULL", "TRUE",
+})
+_CLAUSE_KEYWORDS = frozenset({"SELECT", "WITH"})
 
-    Returns:
-        Tuple of (corrected_sql, list of corrections)
-    """
-    if not config.fix_reserved_keywords:
-        return sql, []
+# Upper bound on rewrite passes; rules are idempotent, so two passes are the norm
+MAX_CORRECTION_PASSES = 4
 
-    corrections: List[Correction] = []
-    corrected_sql = sql
-    sql_lines = corrected_sql.split("\n")
 
-    # Find issues related to reserved keywords
-    reserved_keyword_issues = [
-        issue for issue in issues
-        if issue.code in ("RESERVED_KEYWORD", "UNQUOTED_RESERVED_KEYWORD", "RESERVED_KEYWORD_IDENTIFIER")
-    ]
+# ---------------------------------------------------------------------------
+# Rule engine
 
-    if not reserved_keyword_issues:
-        return sql, []
 
-    # Pattern to find unquoted identifiers that are reserved keywords
-    # We need to be careful to only quote identifiers, not SQL keywords in their proper context
-    for issue in reserved_keyword_issues:
-        # Extract the keyword from the issue message
-        # Message format: "Reserved keyword 'KEYWORD' used as identifier without quotes"
-        match = re.search(r"['\"]([A-Z_][A-Z0-9_]*)['\"]", issue.message, re.IGNORECASE)
-        if not match:
-            continue
+def _splice(text: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Apply ``(start, end, replacement)`` edits to ``text`` in one rebuild."""
+
+    parts: List[str] = []
+    position = 0
+    for start, end, replacement in sorted(edits):
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
 
-        keyword = match.group(1).upper()
-        if keyword not in SNOWFLAKE_RESERVED_KEYWORDS:
+
+def _reserved_keywords_from(issues: List[ValidationIssue]) -> Dict[str, str]:
+    """Map each reserved keyword named by a reserved-keyword issue to the issue code."""
+
+    keywords: Dict[str, str] = {}
+    for issue in issues:
+        if issue.code not in _RESERVED_KEYWORD_CODES:
             continue
+        match = re.search(r"['\"]([A-Z_][A-Z0-9_]*)['\"]", issue.message, re.IGNORECASE)
+        if match and match.group(1).upper() in SNOWFLAKE_RESERVED_KEYWORDS:
+            keywords.setdefault(match.group(1).upper(), issue.code)
+    return keywords
 
-        # Find the keyword in SQL (as identifier, not as SQL keyword)
-        # Look for patterns like: AS keyword, keyword AS, keyword, keyword FROM, etc.
-        # But avoid: SELECT keyword FROM (where keyword is a column name)
-        patterns = [
-            # AS keyword (alias)
-            (rf'\bAS\s+{re.escape(keyword)}\b', rf'AS `{keyword}`'),
-            # keyword AS (table/CTE alias)
-            (rf'\b{re.escape(keyword)}\s+AS\b', rf'`{keyword}` AS'),
-            # keyword, (in SELECT list)
-            (rf'\b{re.escape(keyword)}\s*,', rf'`{keyword}`,'),
-            # keyword FROM (table name)
-            (rf'\bFROM\s+{re.escape(keyword)}\b', rf'FROM `{keyword}`'),
-            # JOIN keyword (table name)
-            (rf'\bJOIN\s+{re.escape(keyword)}\b', rf'JOIN `{keyword}`'),
-            # .keyword (qualified column)
-            (rf'\.{re.escape(keyword)}\b', rf'.`{keyword}`'),
-            # keyword. (schema/table prefix)
-            (rf'\b{re.escape(keyword)}\.', rf'`{keyword}`.'),
-        ]
-
-        for pattern, replacement in patterns:
-            if re.search(pattern, corrected_sql, re.IGNORECASE):
-                line_num = issue.line_number or 1
-                original = keyword
-                corrected = f"`{keyword}`"
-                corrections.append(
-                    Correction(
-                        issue_code=issue.code,
-                        original_text=original,
-                        corrected_text=corrected,
-                        line_number=line_num,
-                        description=f"Quoted reserved keyword '{keyword}'",
-                        confidence=CorrectionConfidence.HIGH,
-                    )
-                )
-                corrected_sql = re.sub(pattern, replacement, corrected_sql, flags=re.IGNORECASE)
 
-    return corrected_sql, corrections
+@dataclass(slots=True)
+class _Edit:
+    """Replace ``text[start:end]`` with ``replacement``."""
 
+    start: int
+    end: int
+    replacement: str
+    correction: Optional[Correction] = None
 
-def fix_string_concatenation(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
+
+class CorrectionRule(SqlVisitor):
+    """A fix that proposes position-indexed edits while visiting the token stream.
+
+    All active rules visit the same token stream of a pass; their edits are
+    applied together in one rebuild. Rules must be idempotent: once their
+    edits are applied, the next pass must not propose them again.
     """
-    Fix string concatenation by replacing + with ||.
 
-    Args:
-        sql: SQL string to fix
-        issues: List of validation issues related to string concatenation
-        config: Auto-fix configuration
+    issue_codes: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.edits: List[_Edit] = []
+        self.applied: List[Correction] = []
+
+    def applies(self, issues: List[ValidationIssue]) -> bool:
+        return any(issue.code in self.issue_codes for issue in issues)
+
+    def begin(self, text: str, tokens: Sequence[SqlToken]) -> None:
+        """Reset per-pass state before ``tokens`` of ``text`` are visited."""
+        self.text = text
+        self.edits = []
+
+    def propose(self, token: SqlToken, replacement: str, correction: Optional[Correction] = None) -> None:
+        self.edits.append(_Edit(token.start, token.end, replacement, correction))
+
+
+def apply_correction_rules(
+    sql: str, rules: Sequence[CorrectionRule], max_passes: int = MAX_CORRECTION_PASSES
+) -> Tuple[str, List[Correction]]:
+    """Run ``rules`` over ``sql`` until no rule proposes an edit.
+
+    Each pass tokenizes once, walks all rules over that token stream and
+    applies the non-overlapping edits in a single rebuild. An edit that
+    overlaps an earlier one is dropped for this pass and proposed again on
+    the next. Replacements never span lines, so the line numbers recorded
+    on corrections stay valid for the original SQL.
 
     Returns:
-        Tuple of (corrected_sql, list of corrections)
+        Tuple of (corrected_sql, corrections in rule order).
     """
-    if not config.fix_string_concatenation:
-        return sql, []
 
-    corrections: List[Correction] = []
-    corrected_sql = sql
+    applied_before = [len(rule.applied) for rule in rules]
+    for _ in range(max_passes):
+        tokens = tokenize_sql(sql)
+        for rule in rules:
+            rule.begin(sql, tokens)
+        walk_tokens(tokens, rules)
+
+        accepted: List[Tuple[int, int, str]] = []
+        proposals = sorted(
+            ((edit.start, order, edit, rule) for order, rule in enumerate(rules) for edit in rule.edits),
+            key=lambda proposal: proposal[:2],
+        )
+        position = 0
+        for start, _, edit, rule in proposals:
+            if start < position:
+                continue
+            accepted.append((edit.start, edit.end, edit.replacement))
+            position = edit.end
+            if edit.correction is not None:
+                rule.applied.append(edit.correction)
+        if not accepted:
+            break
+        sql = _splice(sql, accepted)
 
-    # Find issues related to string concatenation
-    concat_issues = [
-        issue for issue in issues
-        if issue.code in ("HANA_STRING_CONCAT", "STRING_CONCAT_PLUS", "HANA_COMPATIBILITY")
-    ]
+    corrections = [c for rule, before in zip(rules, applied_before) for c in rule.applied[before:]]
+    return sql, corrections
 
-    if not concat_issues:
-        return sql, []
 
-    # Pattern to find + used for string concatenation
-    # We need to be careful to only replace + when it's string concatenation, not numeric addition
-    # Look for patterns like: 'string' + 'string', column + 'string', etc.
-    # But avoid: number + number, column + column (unless we can determine they're strings)
-
-    # Simple heuristic: Replace + when it's between quoted strings or after/before string-like expressions
-    # Pattern: '...' + or + '...' or column + '...' or '...' + column
-    string_concat_pattern = r"((?:'[^']*'|\"[^\"]*\"|`[^`]*`|[A-Z_][A-Z0-9_]*)\s*)\+(\s*(?:'[^']*'|\"[^\"]*\"|`[^`]*`|[A-Z_][A-Z0-9_]*))"
-
-    matches = list(re.finditer(string_concat_pattern, corrected_sql, re.IGNORECASE))
-    if matches:
-        # Replace from end to start to preserve positions
-        for match in reversed(matches):
-            original = match.group(0)
-            corrected = match.group(1) + "||" + match.group(2)
-            line_num = _get_line_number(corrected_sql, match.start())
-            corrections.append(
+class _ReservedKeywordRule(CorrectionRule):
+    """Double-quote reserved keywords used as identifiers.
+
+    ``qualified_only`` restricts the rule to ``.keyword`` column references,
+    for expressions whose names and aliases are fixed structurally.
+    """
+
+    issue_codes = _RESERVED_KEYWORD_CODES
+
+    def __init__(self, keywords: Dict[str, str], qualified_only: bool = False) -> None:
+        super().__init__()
+        self.keywords = keywords
+        self.qualified_only = qualified_only
+        self.counts: Dict[str, int] = {}
+
+    def handlers(self):
+        return {SqlTokenKind.WORD: self._visit}
+
+    def _visit(self, tokens: Sequence[SqlToken], index: int) -> None:
+        token = tokens[index]
+        issue_code = self.keywords.get(token.key)
+        if issue_code is None:
+            return
+        before, after = key_at(tokens, index - 1), key_at(tokens, index + 1)
+        if self.qualified_only:
+            is_identifier = before == "."
+        elif token.key in _VALUE_KEYWORDS:
+            is_identifier = before in (".", "FROM", "JOIN")
+        else:
+            is_identifier = (
+                before in (".", "FROM", "JOIN")
+                or (before == "AS" and token.key not in _CLAUSE_KEYWORDS)
+                or after in (".", ",", "AS")
+            )
+        if not is_identifier:
+            return
+        quoted = f'"{token.key}"'
+        correction = None
+        if token.key not in self.counts:
+            # One correction per keyword, located at its first occurrence
+            correction = Correction(
+                issue_code=issue_code,
+                original_text=token.key,
+                corrected_text=quoted,
+                line_number=token.line,
+                description=f"Quoted reserved keyword '{token.key}'",
+                confidence=CorrectionConfidence.HIGH,
+            )
+        self.counts[token.key] = self.counts.get(token.key, 0) + 1
+        self.propose(token, quoted, correction)
+
+
+class _StringConcatenationRule(CorrectionRule):
+    """Replace ``+`` next to a string literal with ``||``."""
+
+    issue_codes = _STRING_CONCAT_CODES
+
+    def handlers(self):
+        return {"+": self._visit}
+
+    def _visit(self, tokens: Sequence[SqlToken], index: int) -> None:
+        if index == 0 or index + 1 >= len(tokens):
+            return
+        token, before, after = tokens[index], tokens[index - 1], tokens[index + 1]
+        if SqlTokenKind.STRING not in (before.kind, after.kind):
+            return
+        original = self.text[before.start:after.end]
+        self.propose(
+            token,
+            "||",
+            Correction(
+                issue_code="STRING_CONCAT_PLUS",
+                original_text=original,
+                corrected_text=original[: token.start - before.start] + "||" + original[token.end - before.start:],
+                line_number=token.line,
+                description="Replaced string concatenation operator + with ||",
+                confidence=CorrectionConfidence.HIGH,
+            ),
+        )
+
+
+class _FunctionCallRule(CorrectionRule):
+    """Rename HANA ``IF(`` calls to Snowflake ``IFF(``."""
+
+    issue_codes = _FUNCTION_CALL_CODES
+
+    def handlers(self):
+        return {"IF": self._visit}
+
+    def _visit(self, tokens: Sequence[SqlToken], index: int) -> None:
+        token = tokens[index]
+        if token.kind is not SqlTokenKind.WORD or key_at(tokens, index + 1) != "(":
+            return
+        self.propose(
+            token,
+            "IFF",
+            Correction(
+                issue_code="HANA_IF_FUNCTION",
+                original_text="IF(",
+                corrected_text="IFF(",
+                line_number=token.line,
+                description="Replaced HANA IF() function with Snowflake IFF()",
+                confidence=CorrectionConfidence.HIGH,
+            ),
+        )
+
+
+def _is_cte_definition(tokens: Sequence[SqlToken], index: int) -> bool:
+    """True if ``tokens[index]`` is the name in ``name AS (``."""
+
+    return key_at(tokens, index + 1) == "AS" and key_at(tokens, index + 2) == "("
+
+
+class _SchemaQualificationRule(CorrectionRule):
+    """Prefix FROM/JOIN references to known data source objects with their schema."""
+
+    issue_codes = _SCHEMA_CODES
+
+    def __init__(self, schema_map: Dict[str, str]) -> None:
+        super().__init__()
+        self.schema_map = schema_map
+        self.cte_names: set = set()
+
+    def begin(self, text: str, tokens: Sequence[SqlToken]) -> None:
+        super().begin(text, tokens)
+        self.cte_names = {
+            token.key for index, token in enumerate(tokens)
+            if token.kind is SqlTokenKind.WORD and _is_cte_definition(tokens, index)
+        }
+
+    def handlers(self):
+        return {SqlTokenKind.WORD: self._visit}
+
+    def _visit(self, tokens: Sequence[SqlToken], index: int) -> None:
+        token = tokens[index]
+        if key_at(tokens, index - 1) not in ("FROM", "JOIN") or key_at(tokens, index + 1) == ".":
+            return
+        schema = self.schema_map.get(token.key)
+        if schema is None or token.key in self.cte_names:
+            return
+        qualified = f"{schema}.{token.text}"
+        self.propose(
+            token,
+            qualified,
+            Correction(
+                issue_code="UNQUALIFIED_TABLE",
+                original_text=token.text,
+                corrected_text=qualified,
+                line_number=token.line,
+                description=f"Qualified table '{token.text}' with schema '{schema}'",
+                confidence=CorrectionConfidence.MEDIUM,
+            ),
+        )
+
+
+class _CteNamingRule(CorrectionRule):
+    """Rename duplicate CTEs and retarget the FROM/JOIN references after them.
+
+    References inside the duplicate's own body still read the previous
+    definition; the rename takes effect once that body is closed.
+    """
+
+    issue_codes = _CTE_NAMING_CODES
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.taken: set = set()
+        self.seen: set = set()
+        self.renamed: Dict[str, str] = {}
+        self.pending: List[Tuple[SqlToken, str, str]] = []
+
+    def begin(self, text: str, tokens: Sequence[SqlToken]) -> None:
+        super().begin(text, tokens)
+        self.taken = {
+            token.key for index, token in enumerate(tokens)
+            if token.kind is SqlTokenKind.WORD and _is_cte_definition(tokens, index)
+        }
+        self.seen = set()
+        self.renamed = {}
+        self.pending = []
+
+    def handlers(self):
+        return {SqlTokenKind.WORD: self._visit_word, ")": self._visit_close}
+
+    def _visit_word(self, tokens: Sequence[SqlToken], index: int) -> None:
+        token = tokens[index]
+        if _is_cte_definition(tokens, index):
+            if token.key not in self.seen:
+                self.seen.add(token.key)
+                return
+            suffix = 2
+            while f"{token.key}_{suffix}" in self.taken:
+                suffix += 1
+            new_name = f"{token.text}_{suffix}"
+            self.taken.add(new_name.upper())
+            self.seen.add(new_name.upper())
+            self.pending.append((token, token.key, new_name))
+            self.propose(
+                token,
+                new_name,
                 Correction(
-                    issue_code="STRING_CONCAT_PLUS",
-                    original_text=original,
-                    corrected_text=corrected,
-                    line_number=line_num,
-                    description="Replaced string concatenation operator + with ||",
-                    confidence=CorrectionConfidence.HIGH,
-                )
+                    issue_code="DUPLICATE_CTE",
+                    original_text=token.text,
+                    corrected_text=new_name,
+                    line_number=token.line,
+                    description=f"Renamed duplicate CTE '{token.text}' to '{new_name}'",
+                    confidence=CorrectionConfidence.MEDIUM,
+                ),
             )
-            corrected_sql = corrected_sql[: match.start()] + corrected + corrected_sql[match.end() :]
+        elif token.key in self.renamed and key_at(tokens, index - 1) in ("FROM", "JOIN"):
+            self.propose(token, self.renamed[token.key])
 
-    return corrected_sql, corrections
+    def _visit_close(self, tokens: Sequence[SqlToken], index: int) -> None:
+        close = tokens[index]
+        for definition in list(self.pending):
+            name_token, old_key, new_name = definition
+            if close.depth == name_token.depth:
+                self.renamed[old_key] = new_name
+                self.pending.remove(definition)
 
 
-def fix_function_calls(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
+def _schema_map(scenario: Scenario) -> Dict[str, str]:
+    """Map upper-cased data source object names to their schema."""
+
+    schema_map: Dict[str, str] = {}
+    for ds in scenario.data_sources.values():
+        if ds.schema_name and ds.object_name:
+            schema_map[ds.object_name.upper()] = ds.schema_name
+    return schema_map
+
+
+def fix_reserved_keywords(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
     """
-    Fix function calls (e.g., IF() to IFF()).
+    Fix unquoted reserved keywords by adding quotes.
 
     Args:
         sql: SQL string to fix
-        issues: List of validation issues related to function calls
+        issues: List of validation issues related to reserved keywords
         config: Auto-fix configuration
 
     Returns:
         Tuple of (corrected_sql, list of corrections)
     """
-    if not config.fix_function_calls:
+    keywords = _reserved_keywords_from(issues)
+    if not config.fix_reserved_keywords or not keywords:
         return sql, []
+    return apply_correction_rules(sql, [_ReservedKeywordRule(keywords)])
 
-    corrections: List[Correction] = []
-    corrected_sql = sql
 
-    # Find issues related to function calls
-    function_issues = [
-        issue for issue in issues
-        if issue.code in ("HANA_IF_FUNCTION", "IF_FUNCTION", "HANA_COMPATIBILITY", "FUNCTION_SYNTAX")
-    ]
+def fix_string_concatenation(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
+    """
+    Fix string concatenation by replacing + with ||.
+
+    Args:
+        sql: SQL string to fix
+        issues: List of validation issues related to string concatenation
+        config: Auto-fix configuration
 
-    if not function_issues:
+    Returns:
+        Tuple of (corrected_sql, list of corrections)
+    """
+    rule = _StringConcatenationRule()
+    if not config.fix_string_concatenation or not rule.applies(issues):
         return sql, []
+    return apply_correction_rules(sql, [rule])
 
-    # Replace IF( with IFF( (but not IFF itself)
-    # Pattern: IF( but not IFF(
-    if_pattern = r"\bIF\s*\("
-    matches = list(re.finditer(if_pattern, corrected_sql, re.IGNORECASE))
-    if matches:
-        for match in reversed(matches):
-            # Check that it's not already IFF
-            if match.start() > 0 and corrected_sql[match.start() - 1 : match.start()].upper() == "F":
-                continue
 
-            original = match.group(0)
-            corrected = "IFF("
-            line_num = _get_line_number(corrected_sql, match.start())
-            corrections.append(
-                Correction(
-                    issue_code="HANA_IF_FUNCTION",
-                    original_text=original,
-                    corrected_text=corrected,
-                    line_number=line_num,
-                    description="Replaced HANA IF() function with Snowflake IFF()",
-                    confidence=CorrectionConfidence.HIGH,
-                )
-            )
-            corrected_sql = corrected_sql[: match.start()] + corrected + corrected_sql[match.end() :]
+def fix_function_calls(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
+    """
+    Fix function calls (e.g., IF() to IFF()).
 
-    return corrected_sql, corrections
+    Args:
+        sql: SQL string to fix
+        issues: List of validation issues related to function calls
+        config: Auto-fix configuration
+
+    Returns:
+        Tuple of (corrected_sql, list of corrections)
+    """
+    rule = _FunctionCallRule()
+    if not config.fix_function_calls or not rule.applies(issues):
+        return sql, []
+    return apply_correction_rules(sql, [rule])
 
 
 def fix_identifier_quoting(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
@@ -337,35 +574,12 @@ def fix_schema_qualification(
     Returns:
         Tuple of (corrected_sql, list of corrections)
     """
-    if not config.fix_schema_qualification:
+    if not config.fix_schema_qualification or not scenario:
         return sql, []
-
-    corrections: List[Correction] = []
-    corrected_sql = sql
-
-    # Find issues related to schema qualification
-    schema_issues = [
-        issue for issue in issues
-        if issue.code in ("UNQUALIFIED_TABLE", "MISSING_SCHEMA", "SCHEMA_QUALIFICATION")
-    ]
-
-    if not schema_issues or not scenario:
+    rule = _SchemaQualificationRule(_schema_map(scenario))
+    if not rule.applies(issues):
         return sql, []
-
-    # Extract table names from data sources
-    schema_map: Dict[str, str] = {}
-    for ds_id, ds in scenario.data_sources.items():
-        if ds.schema_name and ds.object_name:
-            schema_map[ds.object_name.lower()] = ds.schema_name
-
-    # Find unqualified table references in FROM/JOIN clauses
-    # Pattern: FROM table_name or JOIN table_name
-    for issue in schema_issues:
-        # Extract table name from issue message if possible
-        # This is a simplified approach - in practice, we'd need more sophisticated parsing
-        pass  # Placeholder for schema qualification fixes
-
-    return corrected_sql, corrections
+    return apply_correction_rules(sql, [rule])
 
 
 def fix_type_casting(sql: str, issues: List[ValidationIssue], config: AutoFixConfig) -> Tuple[str, List[Correction]]:
@@ -408,26 +622,159 @@ def fix_cte_naming(sql: str, issues: List[ValidationIssue], config: AutoFixConfi
     Returns:
         Tuple of (corrected_sql, list of corrections)
     """
-    if not config.fix_cte_naming:
+    rule = _CteNamingRule()
+    if not config.fix_cte_naming or not rule.applies(issues):
         return sql, []
+    return apply_correction_rules(sql, [rule])
+
+
+# ---------------------------------------------------------------------------
+# Structural fixes on the statement AST
+
+
+def _table_refs(select: Select) -> List[TableRef]:
+    refs = [join.source for join in select.joins]
+    if isinstance(select.source, TableRef):
+        refs.insert(0, select.source)
+    return refs
+
+
+def _locate_ast_corrections(
+    sql: str,
+    expression_lines: List[int],
+    rules: Sequence[CorrectionRule],
+    keyword_rule: Optional[CorrectionRule],
+    keyword_corrections: Dict[str, Correction],
+    expression_of: Dict[int, int],
+) -> None:
+    """Turn line numbers within expressions into lines of the printed statement.
+
+    Rules record the line within the expression they rewrote; the expression
+    starts on ``expression_lines[expression_of[id(correction)]]``. A quoted
+    keyword is located at its first occurrence, in an expression or a name.
+    """
+
+    for rule in rules:
+        for correction in rule.applied:
+            index = expression_of.get(id(correction))
+            if index is None:
+                continue
+            correction.line_number = expression_lines[index] + (correction.line_number or 1) - 1
+            if rule is keyword_rule:
+                located = keyword_corrections.get(correction.original_text)
+                if located is not None:
+                    located.line_number = correction.line_number
+
+    for keyword, correction in keyword_corrections.items():
+        # Names are not expressions: look for the first quoted occurrence
+        position = sql.find(f'"{keyword}"')
+        if position >= 0:
+            line = sql.count("\n", 0, position) + 1
+            if correction.line_number is None or line < correction.line_number:
+                correction.line_number = line
+
+
+def _quote_reserved_names_ast(statement: SqlStatement, keywords: Dict[str, str]) -> Dict[str, int]:
+    """Quote reserved keywords used as CTE names, table names or aliases.
+
+    Returns the number of names changed per keyword.
+    """
+
+    counts: Dict[str, int] = {}
+
+    def requote(name: Optional[str]) -> Optional[str]:
+        if name is not None and name.upper() in keywords:
+            keyword = name.upper()
+            counts[keyword] = counts.get(keyword, 0) + 1
+            return f'"{keyword}"'
+        return name
+
+    for cte in statement.ctes:
+        cte.name = requote(cte.name)
+    for select in iter_selects(statement):
+        for item in select.items:
+            item.alias = requote(item.alias)
+        for ref in _table_refs(select):
+            ref.name = requote(ref.name)
+            ref.alias = requote(ref.alias)
+    return counts
+
+
+def _fix_schema_qualification_ast(
+    statement: SqlStatement, issues: List[ValidationIssue], scenario: Optional[Scenario], config: AutoFixConfig
+) -> List[Correction]:
+    """Prefix FROM/JOIN references to known data source objects with their schema."""
+
+    if not scenario or not any(issue.code in _SCHEMA_CODES for issue in issues):
+        return []
+
+    schema_map = _schema_map(scenario)
+    cte_names = {cte.name.upper() for cte in statement.ctes}
 
     corrections: List[Correction] = []
-    corrected_sql = sql
+    for select in iter_selects(statement):
+        for ref in _table_refs(select):
+            key = ref.name.upper()
+            if "." in ref.name or key in cte_names or key not in schema_map:
+                continue
+            qualified = f"{schema_map[key]}.{ref.name}"
+            corrections.append(
+                Correction(
+                    issue_code="UNQUALIFIED_TABLE",
+                    original_text=ref.name,
+                    corrected_text=qualified,
+                    description=f"Qualified table '{ref.name}' with schema '{schema_map[key]}'",
+                    confidence=CorrectionConfidence.MEDIUM,
+                )
+            )
+            ref.name = qualified
+    return corrections
 
-    # Find issues related to CTE naming
-    cte_issues = [
-        issue for issue in issues
-        if issue.code in ("DUPLICATE_CTE", "CTE_NAME_CONFLICT")
-    ]
 
-    if not cte_issues:
-        return sql, []
+def _fix_cte_naming_ast(
+    statement: SqlStatement, issues: List[ValidationIssue], config: AutoFixConfig
+) -> List[Correction]:
+    """Rename duplicate CTEs and retarget the references that follow them."""
 
-    # Extract duplicate CTE names from issues
-    # This would require parsing the SQL to find CTE definitions
-    # For now, this is a placeholder
+    if not any(issue.code in _CTE_NAMING_CODES for issue in issues):
+        return []
 
-    return corrected_sql, corrections
+    corrections: List[Correction] = []
+    taken = {cte.name.upper() for cte in statement.ctes}
+    seen: set = set()
+    for position, cte in enumerate(statement.ctes):
+        old_name = cte.name
+        if old_name.upper() not in seen:
+            seen.add(old_name.upper())
+            continue
+        suffix = 2
+        while f"{old_name}_{suffix}".upper() in taken:
+            suffix += 1
+        new_name = f"{old_name}_{suffix}"
+        taken.add(new_name.upper())
+        seen.add(new_name.upper())
+        cte.name = new_name
+
+        # References after the duplicate meant the latest definition
+        later = [other.query for other in statement.ctes[position + 1:]] + [statement.query]
+        for query in later:
+            for node in walk_query(query):
+                if not isinstance(node, Select):
+                    continue
+                for ref in _table_refs(node):
+                    if ref.name.upper() == old_name.upper():
+                        ref.name = new_name
+
+        corrections.append(
+            Correction(
+                issue_code="DUPLICATE_CTE",
+                original_text=old_name,
+                corrected_text=new_name,
+                description=f"Renamed duplicate CTE '{old_name}' to '{new_name}'",
+                confidence=CorrectionConfidence.MEDIUM,
+            )
+        )
+    return corrections
 
 
 def auto_correct_sql(
@@ -435,6 +782,8 @@ def auto_correct_sql(
     validation_result: ValidationResult,
     scenario: Optional[Scenario] = None,
     config: Optional[AutoFixConfig] = None,
+    ast: Optional[SqlStatement] = None,
+    profile: Optional[ConversionProfile] = None,
 ) -> CorrectionResult:
     """
     Automatically correct SQL issues based on validation results.
@@ -444,6 +793,12 @@ def auto_correct_sql(
         validation_result: Validation results containing issues to fix
         scenario: Optional scenario IR for context-aware fixes
         config: Auto-fix configuration (defaults to AutoFixConfig.default())
+        ast: Optional statement AST ``sql`` was printed from. When given, fixes
+            are applied structurally to a copy of the AST, which is printed
+            once into ``corrected_sql`` and returned as ``corrected_ast``.
+        profile: Optional profile that receives a ``fix:<name>`` phase per
+            fix. Token rules share one walk and are measured together as
+            ``fix:token_rules``.
 
     Returns:
         CorrectionResult with corrected SQL and applied corrections
@@ -459,62 +814,99 @@ def auto_correct_sql(
     all_issues.extend(validation_result.warnings)
     all_issues.extend(validation_result.info)
 
-    corrected_sql = sql
-    all_corrections: List[Correction] = []
-    
+    statement = copy.deepcopy(ast) if ast is not None else None
+    keywords = _reserved_keywords_from(all_issues)
+
     # Note: Auto-correction can work even without validation issues
     # Pattern matching for string concat and IF() works independently
 
-    # Apply high-confidence fixes
-    # Note: These fixes can work even without validation issues, as they do pattern matching
+    # Every active fix is a rule over the same token stream, applied in one
+    # rebuild per pass. On the AST, rules rewrite expressions and names are
+    # fixed structurally.
+    rules: List[CorrectionRule] = []
+    keyword_rule: Optional[_ReservedKeywordRule] = None
+
+    # High-confidence fixes: reserved keywords, string concatenation, IF()
     if config.enable_high_confidence_fixes:
-        # Fix reserved keywords (works with or without validation issues)
-        if config.fix_reserved_keywords:
-            corrected_sql, corrections = fix_reserved_keywords(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-        # Fix string concatenation (works with or without validation issues)
-        # This will find + operators between strings even if validation didn't flag them
+        if config.fix_reserved_keywords and keywords:
+            keyword_rule = _ReservedKeywordRule(keywords, qualified_only=statement is not None)
+            rules.append(keyword_rule)
         if config.fix_string_concatenation:
-            corrected_sql, corrections = fix_string_concatenation(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-        # Fix function calls (works with or without validation issues)
-        # This will find IF( patterns even if validation didn't flag them
+            rules.append(_StringConcatenationRule())
         if config.fix_function_calls:
-            corrected_sql, corrections = fix_function_calls(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-    # Apply medium-confidence fixes
-    if config.enable_medium_confidence_fixes:
-        # Fix identifier quoting
-        if config.fix_identifier_quoting:
-            corrected_sql, corrections = fix_identifier_quoting(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-        # Fix schema qualification
-        if config.fix_schema_qualification:
-            corrected_sql, corrections = fix_schema_qualification(corrected_sql, all_issues, scenario, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-        # Fix CTE naming
+            rules.append(_FunctionCallRule())
+
+    # Medium-confidence fixes: schema qualification, CTE naming (identifier
+    # quoting has no rule yet)
+    medium = config.enable_medium_confidence_fixes
+    if medium and statement is None:
+        if config.fix_schema_qualification and scenario:
+            rules.append(_SchemaQualificationRule(_schema_map(scenario)))
         if config.fix_cte_naming:
-            corrected_sql, corrections = fix_cte_naming(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
-
-    # Apply low-confidence fixes (if enabled)
-    if config.enable_low_confidence_fixes:
-        # Fix type casting
-        if config.fix_type_casting:
-            corrected_sql, corrections = fix_type_casting(corrected_sql, all_issues, config)
-            all_corrections.extend(corrections)
-            result.issues_fixed.extend([c.issue_code for c in corrections])
+            rules.append(_CteNamingRule())
+
+    # Low-confidence fixes: type casting has no rule yet
+    rules = [rule for rule in rules if rule is keyword_rule or rule.applies(all_issues)]
+
+    if statement is None:
+        with measure("fix:token_rules", profile):
+            corrected_sql, all_corrections = apply_correction_rules(sql, rules)
+    else:
+        name_counts: Dict[str, int] = {}
+        if keyword_rule:
+            with measure("fix:reserved_keywords", profile):
+                name_counts = _quote_reserved_names_ast(statement, keywords)
+
+        # Index (in map_expressions order) of the expression each correction was made in
+        expression_of: Dict[int, int] = {}
+        if rules:
+            expression_count = 0
+
+            def correct(text: str) -> str:
+                nonlocal expression_count
+                corrected, corrections = apply_correction_rules(text, rules)
+                for correction in corrections:
+                    expression_of[id(correction)] = expression_count
+                expression_count += 1
+                return corrected
+
+            with measure("fix:token_rules", profile):
+                map_expressions(statement, correct)
+
+        all_corrections = []
+        keyword_corrections: Dict[str, Correction] = {}
+        for rule in rules:
+            if rule is keyword_rule:
+                for keyword, issue_code in keywords.items():
+                    if name_counts.get(keyword) or keyword_rule.counts.get(keyword):
+                        keyword_corrections[keyword] = Correction(
+                            issue_code=issue_code,
+                            original_text=keyword,
+                            corrected_text=f'"{keyword}"',
+                            description=f"Quoted reserved keyword '{keyword}'",
+                            confidence=CorrectionConfidence.HIGH,
+                        )
+                all_corrections.extend(keyword_corrections.values())
+                continue
+            all_corrections.extend(rule.applied)
+
+        if medium and config.fix_schema_qualification:
+            with measure("fix:schema_qualification", profile):
+                all_corrections.extend(_fix_schema_qualification_ast(statement, all_issues, scenario, config))
+        if medium and config.fix_cte_naming:
+            with measure("fix:cte_naming", profile):
+                all_corrections.extend(_fix_cte_naming_ast(statement, all_issues, config))
+
+        # Print the corrected statement once
+        result.corrected_ast = statement
+        corrected_sql = sql
+        if all_corrections:
+            corrected_sql, expression_lines = statement.to_sql_with_lines()
+            _locate_ast_corrections(
+                corrected_sql, expression_lines, rules, keyword_rule, keyword_corrections, expression_of
+            )
+
+    result.issues_fixed = [c.issue_code for c in all_corrections]
 
     # Update result
     result.corrected_sql = corrected_sql
@@ -527,9 +919,3 @@ def auto_correct_sql(
     ]
 
     return result
-
-
-def _get_line_number(sql: str, position: int) -> int:
-    """Get line number for a given position in SQL string."""
-    return sql[:position].count("\n") + 1
-
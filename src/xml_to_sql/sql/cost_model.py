@@ -0,0 +1,589 @@
+"""Static cost estimation for scenarios using declared table statistics.
+
+The estimator walks the ``Scenario`` node graph and propagates cardinality
+(rows), per-column distinct counts and row widths from the data sources
+through filters, joins, aggregations, unions and ranks, using the classic
+System R style assumptions (independent predicates, uniform values,
+containment of join keys).
+
+Statistics are optional and come from a YAML or JSON file::
+
+    tables:
+      SAPABAP1.KNA1:            # SCHEMA.OBJECT or just OBJECT
+        rows: 1200000
+        columns:
+          KUNNR: {distinct: 1200000, width: 10}
+          LAND1: {distinct: 200, width: 3}
+
+Tables without statistics fall back to conservative defaults. Findings
+(explosive joins, oversized intermediate results, large tables read without
+a selective filter) are reported as warnings when statistics were declared,
+and as info when every estimate rests on defaults.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+import yaml
+
+from ..domain import (
+    AggregationNode,
+    DataSource,
+    ExpressionType,
+    JoinNode,
+    JoinType,
+    Node,
+    Predicate,
+    PredicateKind,
+    RankNode,
+    Scenario,
+    UnionNode,
+)
+from ..domain.types import DataTypeSpec, SnowflakeType
+from .validator import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the statistics file used by the web service
+STATISTICS_PATH_ENV = "TABLE_STATISTICS_PATH"
+
+# Defaults for tables and columns without declared statistics
+DEFAULT_TABLE_ROWS = 100_000
+DEFAULT_COLUMN_WIDTH = 16
+DEFAULT_DISTINCT = 200  # equality filters keep 1/200 of the rows
+DEFAULT_RANGE_SELECTIVITY = 1 / 3
+DEFAULT_LIKE_SELECTIVITY = 0.05
+DEFAULT_OTHER_SELECTIVITY = 0.5
+
+# Finding thresholds
+EXPLOSIVE_JOIN_FACTOR = 10.0  # join output vs. its largest input
+OVERSIZED_INTERMEDIATE_BYTES = 1024 ** 3
+LARGE_TABLE_ROWS = 10_000_000
+SELECTIVE_FILTER_THRESHOLD = 0.5  # filters keeping more than this are not selective
+
+_TYPE_WIDTHS = {
+    SnowflakeType.NUMBER: 8,
+    SnowflakeType.BOOLEAN: 1,
+    SnowflakeType.DATE: 4,
+    SnowflakeType.TIMESTAMP_NTZ: 8,
+}
+
+
+@dataclass(slots=True)
+class ColumnStats:
+    """Declared statistics for one column."""
+
+    distinct: Optional[int] = None
+    width: Optional[int] = None
+
+
+@dataclass(slots=True)
+class TableStats:
+    """Declared statistics for one source table."""
+
+    rows: int
+    columns: Dict[str, ColumnStats] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TableStatistics:
+    """Statistics for source tables, keyed by upper-cased ``SCHEMA.OBJECT`` or ``OBJECT``."""
+
+    tables: Dict[str, TableStats] = field(default_factory=dict)
+    source: Optional[str] = None
+
+    def lookup(self, data_source: DataSource) -> Optional[TableStats]:
+        for key in (
+            f"{data_source.schema_name}.{data_source.object_name}",
+            data_source.object_name,
+            data_source.source_id,
+        ):
+            stats = self.tables.get((key or "").upper())
+            if stats is not None:
+                return stats
+        return None
+
+    @property
+    def fingerprint(self) -> str:
+        """Short digest of the statistics, for cache keys."""
+
+        canonical = {
+            name: [stats.rows, sorted((col, c.distinct, c.width) for col, c in stats.columns.items())]
+            for name, stats in sorted(self.tables.items())
+        }
+        return hashlib.sha256(json.dumps(canonical).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_dict(cls, data: Dict, source: Optional[str] = None) -> TableStatistics:
+        """Build statistics from the parsed file contents.
+
+        Raises:
+            ValueError: If the structure or a value is invalid.
+        """
+
+        tables_raw = (data or {}).get("tables", {})
+        if not isinstance(tables_raw, dict):
+            raise ValueError("Statistics 'tables' must be a mapping.")
+        tables: Dict[str, TableStats] = {}
+        for name, raw in tables_raw.items():
+            if not isinstance(raw, dict) or "rows" not in raw:
+                raise ValueError(f"Statistics for table '{name}' must declare 'rows'.")
+            columns = {
+                str(column).upper(): ColumnStats(
+                    distinct=_positive_int(values.get("distinct"), f"{name}.{column}.distinct"),
+                    width=_positive_int(values.get("width"), f"{name}.{column}.width"),
+                )
+                for column, values in (raw.get("columns") or {}).items()
+            }
+            tables[str(name).upper()] = TableStats(_positive_int(raw["rows"], f"{name}.rows", allow_zero=True), columns)
+        return cls(tables, source)
+
+
+def _positive_int(value, label: str, allow_zero: bool = False) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Statistics value {label} must be an integer, got {value!r}.") from None
+    if number < 0 or (number == 0 and not allow_zero):
+        raise ValueError(f"Statistics value {label} must be positive, got {number}.")
+    return number
+
+
+def load_statistics(path: Union[str, Path]) -> TableStatistics:
+    """Load table statistics from a YAML or JSON file."""
+
+    stats_path = Path(path).expanduser()
+    with stats_path.open("r", encoding="utf-8") as handle:
+        data = yaml.safe_load(handle) or {}
+    if not isinstance(data, dict):
+        raise ValueError("Statistics root must be a mapping.")
+    return TableStatistics.from_dict(data, source=str(stats_path))
+
+
+@lru_cache(maxsize=1)
+def get_default_statistics() -> Optional[TableStatistics]:
+    """Return the statistics named by ``TABLE_STATISTICS_PATH``, loaded once."""
+
+    path = os.getenv(STATISTICS_PATH_ENV)
+    if not path:
+        return None
+    try:
+        return load_statistics(path)
+    except (OSError, ValueError, yaml.YAMLError) as exc:
+        logger.warning("Ignoring table statistics file %s: %s", path, exc)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Estimation
+
+
+@dataclass(slots=True)
+class ColumnEstimate:
+    """Estimated distinct count and width of an output column."""
+
+    distinct: Optional[float]  # None when unknown
+    width: float
+
+
+@dataclass(slots=True)
+class NodeEstimate:
+    """Estimated output of a data source or node."""
+
+    node_id: str
+    kind: str
+    rows: float
+    columns: Dict[str, ColumnEstimate] = field(default_factory=dict)
+    declared: bool = False  # rests on declared statistics somewhere upstream
+
+    @property
+    def row_bytes(self) -> float:
+        if not self.columns:
+            return float(DEFAULT_COLUMN_WIDTH)
+        return sum(column.width for column in self.columns.values())
+
+    @property
+    def bytes(self) -> float:
+        return self.rows * self.row_bytes
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "node": self.node_id,
+            "kind": self.kind,
+            "rows": int(round(self.rows)),
+            "bytes": int(round(self.bytes)),
+        }
+
+
+@dataclass(slots=True)
+class CostReport:
+    """Estimates per data source and node, plus findings."""
+
+    estimates: Dict[str, NodeEstimate]
+    result: ValidationResult
+    final_node: Optional[str] = None
+    statistics: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        nodes = [estimate for estimate in self.estimates.values() if estimate.kind != "DATA_SOURCE"]
+        peak = max(nodes, key=lambda estimate: estimate.bytes, default=None)
+        final = self.estimates.get(self.final_node) if self.final_node else None
+        return {
+            "statistics": self.statistics,
+            "final": final.to_dict() if final else None,
+            "peak": peak.to_dict() if peak else None,
+            "nodes": [estimate.to_dict() for estimate in nodes],
+        }
+
+
+def _format_rows(rows: float) -> str:
+    return f"~{rows:,.0f} rows"
+
+
+def _format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"~{size:,.0f} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024:
+            return f"~{size:,.1f} {unit}"
+    return f"~{size / 1024:,.1f} TB"
+
+
+def _type_width(data_type: Optional[DataTypeSpec]) -> float:
+    if data_type is None:
+        return DEFAULT_COLUMN_WIDTH
+    if data_type.type == SnowflakeType.VARCHAR:
+        return data_type.length or DEFAULT_COLUMN_WIDTH * 2
+    return _TYPE_WIDTHS.get(data_type.type, DEFAULT_COLUMN_WIDTH)
+
+
+def _clean_input(value: str) -> str:
+    # Same normalisation as the renderer's topological sort
+    from ..parser.scenario_parser import _clean_ref
+
+    return re.sub(r"^\d+/", "", _clean_ref(value))
+
+
+class _Estimator:
+    def __init__(self, scenario: Scenario, statistics: Optional[TableStatistics]) -> None:
+        self.scenario = scenario
+        self.statistics = statistics
+        self.estimates: Dict[str, NodeEstimate] = {}
+        self.result = ValidationResult()
+        self._visiting: Set[str] = set()
+
+    # -- graph ---------------------------------------------------------
+
+    def estimate(self, ref: str) -> Optional[NodeEstimate]:
+        node_id = ref if ref in self.estimates else _clean_input(ref)
+        if node_id in self.estimates:
+            return self.estimates[node_id]
+        if node_id in self._visiting:
+            return None  # cycle; the renderer reports it
+        if node_id in self.scenario.nodes:
+            self._visiting.add(node_id)
+            try:
+                estimate = self._node(self.scenario.nodes[node_id])
+            finally:
+                self._visiting.discard(node_id)
+        elif node_id in self.scenario.data_sources:
+            estimate = self._data_source(self.scenario.data_sources[node_id])
+        else:
+            return None
+        self.estimates[node_id] = estimate
+        return estimate
+
+    def _inputs(self, node: Node) -> List[NodeEstimate]:
+        return [estimate for estimate in (self.estimate(ref) for ref in node.inputs) if estimate is not None]
+
+    def _data_source(self, data_source: DataSource) -> NodeEstimate:
+        stats = self.statistics.lookup(data_source) if self.statistics else None
+        rows = float(stats.rows) if stats else float(DEFAULT_TABLE_ROWS)
+        columns = {
+            name.upper(): ColumnEstimate(None, _type_width(attribute.data_type))
+            for name, attribute in data_source.columns.items()
+        }
+        if stats:
+            for name, column in stats.columns.items():
+                current = columns.get(name)
+                columns[name] = ColumnEstimate(
+                    float(min(column.distinct, stats.rows)) if column.distinct else None,
+                    float(column.width) if column.width else (current.width if current else DEFAULT_COLUMN_WIDTH),
+                )
+        return NodeEstimate(data_source.source_id, "DATA_SOURCE", rows, columns, declared=stats is not None)
+
+    def _node(self, node: Node) -> NodeEstimate:
+        inputs = self._inputs(node)
+        declared = any(estimate.declared for estimate in inputs)
+
+        if isinstance(node, JoinNode):
+            rows = self._join_rows(node, inputs)
+        elif isinstance(node, UnionNode):
+            rows = sum(estimate.rows for estimate in inputs)
+        else:
+            rows = inputs[0].rows if inputs else float(DEFAULT_TABLE_ROWS)
+        columns = _merged_columns(inputs, union=isinstance(node, UnionNode))
+        output = self._project(node, inputs, columns)
+
+        rows *= self._filter_selectivity(node, output, columns)
+        for predicate in node.filters:
+            # An equality or IN filter leaves only the listed values
+            values = _filter_values(predicate)
+            column = output.get(predicate.left.value.upper())
+            if values and column is not None:
+                column.distinct = min(column.distinct or values, values)
+
+        if isinstance(node, AggregationNode):
+            rows = min(rows, _groups(node.group_by, output, columns))
+        elif isinstance(node, RankNode) and node.threshold:
+            rows = min(rows, _groups(node.partition_by, output, columns) * node.threshold)
+
+        rows = max(rows, 1.0)
+        for column in output.values():
+            if column.distinct is not None:
+                column.distinct = min(column.distinct, rows)
+        return NodeEstimate(node.node_id, node.kind.value, rows, output, declared=declared)
+
+    # -- operators -----------------------------------------------------
+
+    def _join_rows(self, node: JoinNode, inputs: List[NodeEstimate]) -> float:
+        """|L x R| / max(V(L, keys), V(R, keys)), with the keys treated as one composite key."""
+
+        if not inputs:
+            return float(DEFAULT_TABLE_ROWS)
+        left, rights = inputs[0], inputs[1:]
+        right_rows = math.prod(estimate.rows for estimate in rights) if rights else 1.0
+        rows = left.rows * right_rows
+        if node.conditions:
+            # Keys without statistics are assumed unique on their side
+            left_keys = right_keys = 1.0
+            for condition in node.conditions:
+                left_keys *= _column_distinct(condition.left.value, [left]) or left.rows
+                right_keys *= _column_distinct(condition.right.value, rights) or right_rows
+            rows /= max(min(left_keys, left.rows), min(right_keys, right_rows), 1.0)
+        if node.join_type == JoinType.LEFT_OUTER:
+            rows = max(rows, left.rows)
+        elif node.join_type == JoinType.RIGHT_OUTER:
+            rows = max(rows, right_rows)
+        elif node.join_type == JoinType.FULL_OUTER:
+            rows = max(rows, left.rows + right_rows)
+        return rows
+
+    def _project(
+        self, node: Node, inputs: List[NodeEstimate], columns: Dict[str, ColumnEstimate]
+    ) -> Dict[str, ColumnEstimate]:
+        """Output columns of ``node``: its mappings and calculated attributes, or the input columns."""
+
+        if not node.mappings and not node.calculated_attributes:
+            return {name: ColumnEstimate(column.distinct, column.width) for name, column in columns.items()}
+        output: Dict[str, ColumnEstimate] = {}
+        by_id = {estimate.node_id: estimate for estimate in inputs}
+        for mapping in node.mappings:
+            source = None
+            if mapping.expression.expression_type == ExpressionType.COLUMN:
+                source_input = by_id.get(_clean_input(mapping.source_node)) if mapping.source_node else None
+                source = (source_input.columns if source_input else columns).get(mapping.expression.value.upper())
+            if source is not None:
+                output[mapping.target_name.upper()] = ColumnEstimate(source.distinct, source.width)
+            else:
+                output[mapping.target_name.upper()] = ColumnEstimate(None, _type_width(mapping.data_type))
+        for name, attribute in node.calculated_attributes.items():
+            output[name.upper()] = ColumnEstimate(None, _type_width(attribute.data_type))
+        return output
+
+    def _filter_selectivity(
+        self, node: Node, output: Dict[str, ColumnEstimate], columns: Dict[str, ColumnEstimate]
+    ) -> float:
+        selectivity = 1.0
+        for predicate in node.filters:
+            selectivity *= _selectivity(predicate, _distinct(predicate.left.value, output, columns))
+        return selectivity
+
+    # -- findings ------------------------------------------------------
+
+    def report(self, final_node: Optional[str]) -> None:
+        readers: Dict[str, List[Node]] = {}
+        for node in self.scenario.nodes.values():
+            for ref in node.inputs:
+                readers.setdefault(_clean_input(ref), []).append(node)
+
+        for node_id, estimate in self.estimates.items():
+            node = self.scenario.nodes.get(node_id)
+            add = self.result.add_warning if estimate.declared else self.result.add_info
+
+            if isinstance(node, JoinNode):
+                inputs = self._inputs(node)
+                largest = max((i.rows for i in inputs), default=0.0)
+                if largest and estimate.rows > largest * EXPLOSIVE_JOIN_FACTOR:
+                    sizes = " x ".join(_format_rows(i.rows) for i in inputs)
+                    add(
+                        f"Join '{node_id}' may explode: estimated {_format_rows(estimate.rows)} "
+                        f"({_format_bytes(estimate.bytes)}) from inputs of {sizes}",
+                        "EXPLOSIVE_JOIN",
+                    )
+
+            if node is not None and node_id != final_node and estimate.bytes >= OVERSIZED_INTERMEDIATE_BYTES:
+                add(
+                    f"Intermediate result '{node_id}' is large: estimated {_format_rows(estimate.rows)} "
+                    f"({_format_bytes(estimate.bytes)})",
+                    "OVERSIZED_INTERMEDIATE",
+                )
+
+            if node is None and estimate.rows >= LARGE_TABLE_ROWS:
+                unfiltered = []
+                for reader in readers.get(node_id, []):
+                    columns = _merged_columns(self._inputs(reader))
+                    if self._filter_selectivity(reader, {}, columns) > SELECTIVE_FILTER_THRESHOLD:
+                        unfiltered.append(reader.node_id)
+                if unfiltered:
+                    add(
+                        f"Large table '{node_id}' ({_format_rows(estimate.rows)}, {_format_bytes(estimate.bytes)}) "
+                        f"is read without a selective filter in: {', '.join(unfiltered)}",
+                        "MISSING_SELECTIVE_FILTER",
+                    )
+
+
+def _merged_columns(inputs: List[NodeEstimate], union: bool = False) -> Dict[str, ColumnEstimate]:
+    """Columns visible to a node; a union adds up distinct counts of its branches."""
+
+    columns: Dict[str, ColumnEstimate] = {}
+    for estimate in inputs:
+        for name, column in estimate.columns.items():
+            current = columns.get(name)
+            if current is None:
+                columns[name] = ColumnEstimate(column.distinct, column.width)
+                continue
+            if union:
+                known = current.distinct is not None and column.distinct is not None
+                current.distinct = current.distinct + column.distinct if known else None
+            current.width = max(current.width, column.width)
+    return columns
+
+
+def _distinct(name: str, output: Dict[str, ColumnEstimate], columns: Dict[str, ColumnEstimate]) -> Optional[float]:
+    column = output.get(name.upper()) or columns.get(name.upper())
+    return column.distinct if column is not None else None
+
+
+def _column_distinct(name: str, inputs: List[NodeEstimate]) -> Optional[float]:
+    for estimate in inputs:
+        column = estimate.columns.get(name.upper())
+        if column is not None and column.distinct is not None:
+            return column.distinct
+    return None
+
+
+def _groups(names: List[str], output: Dict[str, ColumnEstimate], columns: Dict[str, ColumnEstimate]) -> float:
+    """Number of distinct combinations of ``names`` (1 for an empty list)."""
+
+    return math.prod(_distinct(name, output, columns) or DEFAULT_DISTINCT for name in names)
+
+
+def _filter_values(predicate: Predicate) -> Optional[int]:
+    """Number of values an including ``=`` or ``IN`` filter keeps, else None."""
+
+    operator = (predicate.operator or "=").upper()
+    if not predicate.including or predicate.kind == PredicateKind.IS_NULL:
+        return None
+    if predicate.kind == PredicateKind.IN_LIST or operator == "IN":
+        return predicate.right.value.count(",") + 1 if predicate.right is not None else 1
+    if predicate.kind == PredicateKind.COMPARISON and operator == "=":
+        return 1
+    return None
+
+
+def _selectivity(predicate: Predicate, distinct: Optional[float]) -> float:
+    """Fraction of rows kept by ``predicate`` on a column with ``distinct`` values."""
+
+    operator = (predicate.operator or "=").upper()
+    equality = 1.0 / (distinct or DEFAULT_DISTINCT)
+
+    if predicate.kind == PredicateKind.IS_NULL:
+        selectivity = equality
+    elif predicate.kind == PredicateKind.BETWEEN or operator in ("<", ">", "<=", ">=", "BETWEEN"):
+        selectivity = DEFAULT_RANGE_SELECTIVITY
+    elif predicate.kind == PredicateKind.IN_LIST or operator == "IN":
+        selectivity = min(1.0, (_filter_values(predicate) or 1) * equality)
+    elif operator == "=":
+        selectivity = equality
+    elif operator in ("<>", "!="):
+        selectivity = 1.0 - equality
+    elif operator == "LIKE":
+        selectivity = DEFAULT_LIKE_SELECTIVITY
+    else:
+        selectivity = DEFAULT_OTHER_SELECTIVITY
+    return selectivity if predicate.including else 1.0 - selectivity
+
+
+def _final_node(scenario: Scenario) -> Optional[str]:
+    if scenario.logical_model and scenario.logical_model.base_node_id in scenario.nodes:
+        return scenario.logical_model.base_node_id
+    consumed = {_clean_input(ref) for node in scenario.nodes.values() for ref in node.inputs}
+    roots = [node_id for node_id in scenario.nodes if node_id not in consumed]
+    return roots[-1] if roots else None
+
+
+def estimate_cost(scenario: Scenario, statistics: Optional[TableStatistics] = None) -> CostReport:
+    """
+    Estimate rows and bytes for every data source and node of ``scenario``.
+
+    Args:
+        scenario: Scenario IR object
+        statistics: Optional declared table statistics
+
+    Returns:
+        CostReport with per-node estimates and findings
+    """
+    estimator = _Estimator(scenario, statistics)
+    for node_id in scenario.nodes:
+        estimator.estimate(node_id)
+    final_node = _final_node(scenario)
+    estimator.report(final_node)
+    return CostReport(
+        estimator.estimates,
+        estimator.result,
+        final_node,
+        statistics.source if statistics else None,
+    )
+
+
+def validate_cost(scenario: Scenario, statistics: Optional[TableStatistics] = None) -> ValidationResult:
+    """
+    Flag explosive joins, oversized intermediate results and unfiltered large tables.
+
+    Args:
+        scenario: Scenario IR object
+        statistics: Optional declared table statistics
+
+    Returns:
+        ValidationResult with cost findings
+    """
+    return estimate_cost(scenario, statistics).result
+
+
+__all__ = [
+    "ColumnEstimate",
+    "ColumnStats",
+    "CostReport",
+    "NodeEstimate",
+    "STATISTICS_PATH_ENV",
+    "TableStatistics",
+    "TableStats",
+    "estimate_cost",
+    "get_default_statistics",
+    "load_statistics",
+    "validate_cost",
+]
@@ -0,0 +1,713 @@
+"""Offline dry run of generated SQL against an embedded SQLite database.
+
+Broken SQL used to surface only once it reached HANA or Snowflake. The dry
+run catches semantic errors (unknown columns, ambiguous references, UNION
+arity mismatches, misused aggregates) and pathological plans without a
+network connection, so it also runs in CI:
+
+1. every ``DataSource`` of the scenario becomes a stand-in table in an
+   in-memory database, with its schema attached as an in-memory database of
+   the same name. Declared column types are used; columns the scenario does
+   not declare are discovered from the statement itself;
+2. the statement is transpiled minimally (view header and trailing
+   statements dropped, ``::`` casts removed, database-qualified names folded
+   into their schema, unquoted ``$$PARAM$$`` placeholders bound to NULL,
+   date-part arguments and function names SQLite reads as keywords quoted)
+   and the HANA and Snowflake functions the renderer emits are emulated as
+   SQLite functions;
+3. ``EXPLAIN QUERY PLAN`` checks the statement and records the plan shape,
+   then the query runs on a few synthetic rows per table under a time limit.
+
+Failures that may stem from the emulation itself (functions SQLite does not
+know, dialect syntax) are reported as info or warnings; only errors that
+cannot be explained by the stand-in tables are reported as errors.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..domain import DataSource, Scenario
+from ..domain.types import DataTypeSpec, SnowflakeType
+from .sql_lexer import SqlToken, SqlTokenKind, key_at, token_at, tokenize_sql
+from .validator import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+DRY_RUN_SAMPLE_ROWS = 50
+DRY_RUN_TIMEOUT_MS = 2000.0
+
+# Upper bound on prepare/fix-up rounds while discovering undeclared columns
+MAX_DISCOVERY_ROUNDS = 200
+
+# Progress handler granularity, in SQLite virtual machine instructions
+_PROGRESS_STEPS = 10_000
+
+_IDENTIFIER_KINDS = (SqlTokenKind.WORD, SqlTokenKind.QUOTED_IDENT)
+
+_DATE_PART_FUNCTIONS = {"DATEADD", "DATEDIFF", "DATE_TRUNC", "TIMESTAMPADD", "TIMESTAMPDIFF"}
+
+# Function names SQLite parses as keywords unless quoted
+_KEYWORD_FUNCTIONS = {"ISNULL", "NOTNULL", "LEFT", "RIGHT"}
+
+_NO_SUCH_COLUMN = re.compile(r"no such column: (?P<name>.+)$")
+_NO_SUCH_TABLE = re.compile(r"no such table: (?P<name>.+)$")
+_NO_SUCH_FUNCTION = re.compile(r"no such function: (?P<name>.+)$")
+_AMBIGUOUS_COLUMN = re.compile(r"ambiguous column name: (?P<name>.+)$")
+
+
+# ---------------------------------------------------------------------------
+# Transpilation
+
+
+def _unquote(text: str) -> str:
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1].replace('""', '"')
+    return text
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _norm(name: str) -> str:
+    # SQLite compares identifiers case-insensitively, quoted or not
+    return _unquote(name).upper()
+
+
+def _matching_paren(tokens: Sequence[SqlToken], index: int) -> int:
+    depth = tokens[index].depth
+    for position in range(index + 1, len(tokens)):
+        if tokens[position].text == ")" and tokens[position].depth == depth:
+            return position
+    return len(tokens) - 1
+
+
+def _query_bounds(sql: str, tokens: Sequence[SqlToken]) -> Tuple[int, int]:
+    """Return the index range of the query after any DROP/CREATE VIEW header."""
+
+    start = 0
+    for index, token in enumerate(tokens):
+        if token.depth == 0 and token.key in ("WITH", "SELECT"):
+            start = index
+            break
+    end = len(tokens)
+    for index in range(start, len(tokens)):
+        if tokens[index].text == ";" and tokens[index].depth == 0:
+            end = index
+            break
+    return start, end
+
+
+def transpile_for_sqlite(sql: str) -> str:
+    """Rewrite a generated HANA/Snowflake statement into a query SQLite can prepare.
+
+    Only what SQLite cannot parse is touched; function names are left alone
+    and emulated at run time.
+    """
+
+    tokens = tokenize_sql(sql)
+    if not tokens:
+        return ""
+    first, stop = _query_bounds(sql, tokens)
+    tokens = tokens[first:stop]
+    if not tokens:
+        return ""
+
+    edits: List[Tuple[int, int, str]] = []
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token.text == "::":
+            # x::TYPE or x::TYPE(p, s) -> x
+            end = index + 1
+            if token_at(tokens, end + 1) is not None and tokens[end + 1].text == "(":
+                end = _matching_paren(tokens, end + 1)
+            last = tokens[min(end, len(tokens) - 1)]
+            edits.append((token.start, last.end, ""))
+            index = end + 1
+            continue
+        if (
+            token.text == "$"
+            and key_at(tokens, index + 1) == "$"
+            and token_at(tokens, index + 2) is not None
+            and tokens[index + 2].kind is SqlTokenKind.WORD
+            and tokens[index + 2].text.endswith("$$")
+        ):
+            # Unquoted $$PARAM$$ placeholder
+            edits.append((token.start, tokens[index + 2].end, "NULL"))
+            index += 3
+            continue
+        if token.key in _KEYWORD_FUNCTIONS and key_at(tokens, index + 1) == "(":
+            edits.append((token.start, token.end, _quote(token.key)))
+        if (
+            token.key in _DATE_PART_FUNCTIONS
+            and key_at(tokens, index + 1) == "("
+            and token_at(tokens, index + 2) is not None
+            and tokens[index + 2].kind is SqlTokenKind.WORD
+            and key_at(tokens, index + 3) == ","
+        ):
+            part = tokens[index + 2]
+            edits.append((part.start, part.end, f"'{part.text.lower()}'"))
+            index += 3
+            continue
+        index += 1
+
+    # SQLite names are at most SCHEMA.TABLE.COLUMN: fold database-qualified
+    # Snowflake names (DB.SCHEMA.TABLE) into one dotted schema name
+    for parts, last in _identifier_chains(tokens):
+        is_table = key_at(tokens, last - 2 * len(parts) + 1) in ("FROM", "JOIN")
+        keep = 1 if is_table else 2
+        if len(parts) - keep > 1:
+            first = tokens[last - 2 * len(parts) + 2]
+            prefix = tokens[last - 2 * keep]
+            schema = ".".join(_unquote(part) for part in parts[:-keep])
+            edits.append((first.start, prefix.end, _quote(schema)))
+    edits.sort()
+
+    base = tokens[0].start
+    text = sql[base:tokens[-1].end]
+    for start, end, replacement in reversed(edits):
+        text = text[: start - base] + replacement + text[end - base:]
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Function emulation
+
+
+def _lenient(func: Callable) -> Callable:
+    # Synthetic data is not meant to exercise conversion errors: a function
+    # that cannot handle its input yields NULL instead of aborting the run
+    def wrapper(*args):
+        try:
+            return func(*args)
+        except Exception:  # noqa: BLE001 - emulation must never raise into SQLite
+            return None
+
+    return wrapper
+
+
+def _as_date(value: object) -> Optional[date]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    for pattern in ("%Y-%m-%d", "%Y%m%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(text[: len(datetime(2000, 1, 1).strftime(pattern))], pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _add_months(value: object, months: object) -> Optional[str]:
+    day = _as_date(value)
+    total = day.year * 12 + day.month - 1 + int(months)
+    year, month = divmod(total, 12)
+    for candidate in (day.day, 30, 29, 28):
+        try:
+            return date(year, month + 1, candidate).isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _date_add(part: object, amount: object, value: object) -> Optional[str]:
+    unit = str(part).lower().rstrip("s")
+    if unit in ("day", "dd", "d"):
+        return (_as_date(value) + timedelta(days=int(amount))).isoformat()
+    if unit in ("month", "mm", "mon"):
+        return _add_months(value, amount)
+    if unit in ("year", "yy", "yyyy"):
+        return _add_months(value, int(amount) * 12)
+    return None
+
+
+def _number(value: object) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _integer(value: object) -> Optional[int]:
+    return None if value is None else int(float(value))
+
+
+def _regexp_like(value: object, pattern: object, *flags: object) -> Optional[int]:
+    if value is None or pattern is None:
+        return None
+    options = re.IGNORECASE if flags and "i" in str(flags[0]) else 0
+    return 1 if re.search(str(pattern), str(value), options) else 0
+
+
+def _pad(left: bool) -> Callable:
+    def pad(value: object, length: object, fill: object = " ") -> Optional[str]:
+        text, width, fill_text = str(value), int(length), str(fill) or " "
+        if len(text) >= width:
+            return text[:width]
+        padding = (fill_text * width)[: width - len(text)]
+        return padding + text if left else text + padding
+
+    return pad
+
+
+# name -> (arity, implementation); arity -1 accepts any number of arguments
+_EMULATED_FUNCTIONS: Dict[str, Tuple[int, Callable]] = {
+    "IF": (3, lambda condition, then, otherwise: then if condition else otherwise),
+    "IFF": (3, lambda condition, then, otherwise: then if condition else otherwise),
+    "NVL": (2, lambda value, default: default if value is None else value),
+    "ISNULL": (1, lambda value: 1 if value is None else 0),
+    "LEFT": (2, lambda value, count: str(value)[: int(count)]),
+    "RIGHT": (2, lambda value, count: str(value)[-int(count):] if int(count) > 0 else ""),
+    "LPAD": (-1, _pad(left=True)),
+    "RPAD": (-1, _pad(left=False)),
+    "CONCAT": (-1, lambda *values: "".join("" if value is None else str(value) for value in values)),
+    "TO_VARCHAR": (-1, lambda value, *_: None if value is None else str(value)),
+    "TO_NVARCHAR": (-1, lambda value, *_: None if value is None else str(value)),
+    "TO_CHAR": (-1, lambda value, *_: None if value is None else str(value)),
+    "TO_INTEGER": (1, _integer),
+    "TO_INT": (1, _integer),
+    "TO_BIGINT": (1, _integer),
+    "TO_DECIMAL": (-1, lambda value, *_: _number(value)),
+    "TO_NUMBER": (-1, lambda value, *_: _number(value)),
+    "TO_DOUBLE": (1, _number),
+    "TO_DATE": (-1, lambda value, *_: _as_date(value).isoformat()),
+    "TO_TIMESTAMP": (-1, lambda value, *_: _as_date(value).isoformat() + " 00:00:00"),
+    "ADD_DAYS": (2, lambda value, days: (_as_date(value) + timedelta(days=int(days))).isoformat()),
+    "ADD_MONTHS": (2, _add_months),
+    "ADD_YEARS": (2, lambda value, years: _add_months(value, int(years) * 12)),
+    "DATEADD": (3, _date_add),
+    "DAYS_BETWEEN": (2, lambda first, second: (_as_date(second) - _as_date(first)).days),
+    "REGEXP_LIKE": (-1, _regexp_like),
+}
+
+
+def _register_functions(connection: sqlite3.Connection) -> None:
+    for name, (arity, func) in _EMULATED_FUNCTIONS.items():
+        connection.create_function(name, arity, _lenient(func), deterministic=True)
+
+
+# ---------------------------------------------------------------------------
+# Stand-in tables
+
+
+@dataclass(slots=True)
+class _StandIn:
+    schema: str  # "" for the main database
+    name: str
+    columns: Dict[str, Optional[DataTypeSpec]] = field(default_factory=dict)
+    declared: bool = False
+
+    @property
+    def qualified(self) -> str:
+        return f"{_quote(self.schema)}.{_quote(self.name)}" if self.schema else _quote(self.name)
+
+    def has_column(self, name: str) -> bool:
+        return _norm(name) in {_norm(column) for column in self.columns}
+
+
+def _sqlite_type(data_type: Optional[DataTypeSpec]) -> str:
+    if data_type is None:
+        return ""
+    if data_type.type == SnowflakeType.NUMBER:
+        return "INTEGER" if not data_type.scale else "REAL"
+    if data_type.type == SnowflakeType.BOOLEAN:
+        return "INTEGER"
+    return "TEXT"
+
+
+def _sample_value(data_type: Optional[DataTypeSpec], row: int) -> object:
+    # Every table numbers its rows the same way, so equality joins match one
+    # to one and only joins without a usable key multiply rows
+    if data_type is None or data_type.type == SnowflakeType.NUMBER:
+        return row + 1
+    if data_type.type == SnowflakeType.BOOLEAN:
+        return row % 2
+    if data_type.type == SnowflakeType.DATE:
+        return (date(2024, 1, 1) + timedelta(days=row)).isoformat()
+    if data_type.type == SnowflakeType.TIMESTAMP_NTZ:
+        return (datetime(2024, 1, 1) + timedelta(days=row)).isoformat(sep=" ")
+    return str(row + 1)
+
+
+class _Database:
+    """In-memory SQLite database holding the stand-in tables."""
+
+    def __init__(self) -> None:
+        self.connection = sqlite3.connect(":memory:")
+        _register_functions(self.connection)
+        self.schemas: Set[str] = set()
+        self.tables: Dict[Tuple[str, str], _StandIn] = {}
+        self.discovered_columns = 0
+        self.discovered_tables = 0
+        self.guessed: Set[str] = set()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_table(self, schema: str, name: str, columns: Dict[str, Optional[DataTypeSpec]], declared: bool) -> None:
+        key = (_norm(schema), _norm(name))
+        if key in self.tables:
+            table = self.tables[key]
+            for column, data_type in columns.items():
+                if not table.has_column(column):
+                    self.add_column(table, column, data_type)
+            return
+        if schema and _norm(schema) not in self.schemas:
+            self.connection.execute(f"ATTACH DATABASE ':memory:' AS {_quote(schema)}")
+            self.schemas.add(_norm(schema))
+        table = _StandIn(schema, name, dict(columns), declared)
+        # A table needs at least one column; the placeholder never clashes
+        definitions = [f"{_quote(column)} {_sqlite_type(data_type)}".rstrip() for column, data_type in columns.items()]
+        self.connection.execute(f"CREATE TABLE {table.qualified} ({', '.join(definitions) or '__dry_run_row__'})")
+        self.tables[key] = table
+
+    def add_column(self, table: _StandIn, column: str, data_type: Optional[DataTypeSpec] = None) -> None:
+        self.connection.execute(f"ALTER TABLE {table.qualified} ADD COLUMN {_quote(column)} {_sqlite_type(data_type)}".rstrip())
+        table.columns[column] = data_type
+        self.discovered_columns += 1
+
+    def find(self, qualifier: str) -> List[_StandIn]:
+        """Return the stand-in tables ``qualifier`` (``SCHEMA.TABLE`` or ``TABLE``) can refer to.
+
+        Object names may themselves contain dots (``pkg.sub/CV``), so the
+        qualifier is compared as a whole rather than split.
+        """
+
+        wanted = _norm(qualifier)
+        exact = [table for (schema, name), table in self.tables.items() if schema and f"{schema}.{name}" == wanted]
+        return exact or [table for (_, name), table in self.tables.items() if name == wanted]
+
+    def populate(self, rows: int) -> None:
+        for table in self.tables.values():
+            if not rows:
+                continue
+            columns = list(table.columns.items())
+            if not columns:
+                self.connection.executemany(
+                    f"INSERT INTO {table.qualified} VALUES (?)", ((row,) for row in range(rows))
+                )
+                continue
+            names = ", ".join(_quote(column) for column, _ in columns)
+            marks = ", ".join("?" for _ in columns)
+            self.connection.executemany(
+                f"INSERT INTO {table.qualified} ({names}) VALUES ({marks})",
+                ([_sample_value(data_type, row) for _, data_type in columns] for row in range(rows)),
+            )
+
+
+def _identifier_chains(tokens: Sequence[SqlToken]) -> List[Tuple[List[str], int]]:
+    """Return dotted identifier chains (``a.b.c``) with the index of their last token."""
+
+    chains: List[Tuple[List[str], int]] = []
+    index = 0
+    while index < len(tokens):
+        if tokens[index].kind not in _IDENTIFIER_KINDS:
+            index += 1
+            continue
+        parts = [tokens[index].text]
+        end = index
+        while (
+            key_at(tokens, end + 1) == "."
+            and token_at(tokens, end + 2) is not None
+            and tokens[end + 2].kind in _IDENTIFIER_KINDS
+        ):
+            parts.append(tokens[end + 2].text)
+            end += 2
+        if len(parts) > 1 and key_at(tokens, end + 1) != "(":
+            chains.append((parts, end))
+        index = end + 1
+    return chains
+
+
+def _cte_names(tokens: Sequence[SqlToken]) -> Set[str]:
+    names: Set[str] = set()
+    for index, token in enumerate(tokens):
+        if (
+            token.depth == 0
+            and token.kind in _IDENTIFIER_KINDS
+            and key_at(tokens, index + 1) == "AS"
+            and key_at(tokens, index + 2) == "("
+            and (key_at(tokens, index - 1) in ("WITH", ","))
+        ):
+            names.add(_norm(token.text))
+    return names
+
+
+def _seed_columns(database: _Database, tokens: Sequence[SqlToken]) -> None:
+    # Fully qualified column references (SCHEMA.TABLE.COLUMN, TABLE.COLUMN)
+    # name the columns of undeclared tables without a prepare round each
+    for parts, _ in _identifier_chains(tokens):
+        if len(parts) < 2:
+            continue
+        for table in database.find(".".join(_unquote(part) for part in parts[:-1])):
+            if not table.declared and not table.has_column(_unquote(parts[-1])):
+                database.add_column(table, _unquote(parts[-1]))
+
+
+# ---------------------------------------------------------------------------
+# Plan and report
+
+
+@dataclass(slots=True)
+class PlanStep:
+    """One line of SQLite's ``EXPLAIN QUERY PLAN`` output."""
+
+    step_id: int
+    parent: int
+    detail: str
+    depth: int = 0
+
+    @property
+    def is_scan(self) -> bool:
+        return self.detail.startswith("SCAN ") and "CONSTANT ROW" not in self.detail
+
+
+@dataclass(slots=True)
+class DryRunReport:
+    """Outcome of a dry run: findings, plan shape and runtime on synthetic data."""
+
+    result: ValidationResult = field(default_factory=ValidationResult)
+    sql: str = ""
+    executed: bool = False
+    timed_out: bool = False
+    tables: int = 0
+    discovered_columns: int = 0
+    sample_rows: int = 0
+    plan: List[PlanStep] = field(default_factory=list)
+    prepare_ms: Optional[float] = None
+    execute_ms: Optional[float] = None
+    rows_returned: Optional[int] = None
+
+    def plan_shape(self) -> Dict[str, int]:
+        details = [step.detail for step in self.plan]
+        return {
+            "steps": len(details),
+            "scans": sum(1 for step in self.plan if step.is_scan),
+            "searches": sum(1 for detail in details if detail.startswith("SEARCH ")),
+            "automatic_indexes": sum(1 for detail in details if "AUTOMATIC" in detail),
+            "temp_btrees": sum(1 for detail in details if "USE TEMP B-TREE" in detail),
+            "materialized": sum(1 for detail in details if detail.startswith(("MATERIALIZE", "CO-ROUTINE"))),
+        }
+
+    def plan_lines(self) -> List[str]:
+        return [f"{'  ' * step.depth}{step.detail}" for step in self.plan]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "executed": self.executed,
+            "timed_out": self.timed_out,
+            "tables": self.tables,
+            "discovered_columns": self.discovered_columns,
+            "sample_rows": self.sample_rows,
+            "prepare_ms": None if self.prepare_ms is None else round(self.prepare_ms, 3),
+            "execute_ms": None if self.execute_ms is None else round(self.execute_ms, 3),
+            "rows_returned": self.rows_returned,
+            "plan_shape": self.plan_shape(),
+            "plan": self.plan_lines(),
+        }
+
+
+def _read_plan(connection: sqlite3.Connection, query: str) -> List[PlanStep]:
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+    depths: Dict[int, int] = {0: -1}
+    steps: List[PlanStep] = []
+    for step_id, parent, _, detail in rows:
+        depth = depths.get(parent, -1) + 1
+        depths[step_id] = depth
+        steps.append(PlanStep(step_id, parent, detail, depth))
+    return steps
+
+
+def _fix_up(database: _Database, message: str, ctes: Set[str]) -> bool:
+    """Create what an error says is missing from the stand-ins; False if it is a real error."""
+
+    match = _NO_SUCH_COLUMN.match(message)
+    if match:
+        qualifier, _, column = match.group("name").rpartition(".")
+        if qualifier:
+            tables = database.find(qualifier)
+            if not tables and ("." in qualifier or _norm(qualifier) in ctes):
+                return False
+            if not tables:
+                # Qualified by a table alias: any undeclared table may own it
+                tables = [table for table in database.tables.values() if not table.declared]
+        else:
+            tables = [table for table in database.tables.values() if not table.declared]
+        tables = [table for table in tables if not table.declared and not table.has_column(column)]
+        if not tables:
+            return False
+        if not qualifier or len(tables) > 1:
+            database.guessed.add(_norm(column))
+        for table in tables:
+            database.add_column(table, column)
+        return True
+
+    match = _NO_SUCH_TABLE.match(message)
+    if match:
+        # Schema names carry no dots; object names may (pkg.sub/CV)
+        schema, _, name = match.group("name").partition(".")
+        if not name:
+            return False  # unqualified names are CTEs; a missing one is a real error
+        if database.find(f"{schema}.{name}"):
+            return False
+        database.add_table(schema, name, {}, declared=False)
+        database.discovered_tables += 1
+        return True
+    return False
+
+
+def _report_failure(result: ValidationResult, message: str, guessed: Set[str]) -> None:
+    match = _NO_SUCH_FUNCTION.match(message)
+    if match:
+        result.add_info(
+            f"Dry run skipped: function {match.group('name')} is not emulated by the local engine",
+            "DRY_RUN_UNSUPPORTED_FUNCTION",
+        )
+        return
+    if "syntax error" in message or "unrecognized token" in message:
+        result.add_warning(
+            f"Dry run could not parse the statement locally ({message}); "
+            "this may be a dialect construct the local engine does not support",
+            "DRY_RUN_SYNTAX_ERROR",
+        )
+        return
+    match = _AMBIGUOUS_COLUMN.match(message)
+    if match and _norm(match.group("name").rpartition(".")[2]) in guessed:
+        result.add_warning(
+            f"Dry run could not resolve {match.group('name')}: the column is not declared for any data source",
+            "DRY_RUN_UNRESOLVED_COLUMN",
+        )
+        return
+    result.add_error(f"Dry run failed: {message}", "DRY_RUN_FAILED")
+
+
+def _declared_columns(data_source: DataSource) -> Dict[str, Optional[DataTypeSpec]]:
+    return {name: attribute.data_type for name, attribute in data_source.columns.items()}
+
+
+def dry_run_sql(
+    sql: str,
+    scenario: Scenario,
+    *,
+    sample_rows: int = DRY_RUN_SAMPLE_ROWS,
+    timeout_ms: float = DRY_RUN_TIMEOUT_MS,
+) -> DryRunReport:
+    """Prepare and execute ``sql`` against stand-in tables for ``scenario``'s data sources.
+
+    Args:
+        sql: Generated SQL statement (view header and all)
+        scenario: Scenario the SQL was generated from
+        sample_rows: Synthetic rows per stand-in table; 0 runs on empty tables
+        timeout_ms: Execution time limit; slower runs are reported as pathological
+
+    Returns:
+        DryRunReport with findings, plan shape and runtime
+    """
+
+    report = DryRunReport(sample_rows=sample_rows)
+    result = report.result
+    query = transpile_for_sqlite(sql)
+    report.sql = query
+    if not query:
+        result.add_info("Dry run skipped: no query found in the generated SQL", "DRY_RUN_SKIPPED")
+        return report
+
+    database = _Database()
+    try:
+        try:
+            for data_source in scenario.data_sources.values():
+                columns = _declared_columns(data_source)
+                database.add_table(data_source.schema_name or "", data_source.object_name, columns, bool(columns))
+        except sqlite3.Error as exc:
+            # e.g. more schemas than SQLite can attach
+            result.add_info(f"Dry run skipped: could not create stand-in tables ({exc})", "DRY_RUN_SKIPPED")
+            return report
+
+        tokens = tokenize_sql(query)
+        _seed_columns(database, tokens)
+        ctes = _cte_names(tokens)
+
+        started = time.perf_counter()
+        for _ in range(MAX_DISCOVERY_ROUNDS):
+            try:
+                report.plan = _read_plan(database.connection, query)
+                break
+            except sqlite3.Error as exc:
+                message = str(exc)
+                try:
+                    fixed = _fix_up(database, message, ctes)
+                except sqlite3.Error:
+                    fixed = False
+                if not fixed:
+                    _report_failure(result, message, database.guessed)
+                    return report
+                if _NO_SUCH_TABLE.match(message):
+                    _seed_columns(database, tokens)
+        else:
+            result.add_info("Dry run skipped: too many undeclared columns to discover", "DRY_RUN_SKIPPED")
+            return report
+        report.prepare_ms = (time.perf_counter() - started) * 1000
+        report.tables = len(database.tables)
+        report.discovered_columns = database.discovered_columns
+
+        database.populate(sample_rows)
+        deadline = time.perf_counter() + timeout_ms / 1000
+        database.connection.set_progress_handler(lambda: int(time.perf_counter() > deadline), _PROGRESS_STEPS)
+        started = time.perf_counter()
+        try:
+            rows = 0
+            for _ in database.connection.execute(query):
+                rows += 1
+        except sqlite3.OperationalError as exc:
+            report.execute_ms = (time.perf_counter() - started) * 1000
+            if "interrupted" in str(exc):
+                report.timed_out = True
+                result.add_warning(
+                    f"Dry run did not finish within {timeout_ms:.0f} ms on {sample_rows} synthetic rows "
+                    "per table; check for exploding joins",
+                    "DRY_RUN_TIMEOUT",
+                )
+            else:
+                result.add_warning(f"Dry run failed during execution: {exc}", "DRY_RUN_RUNTIME_ERROR")
+            return report
+        except sqlite3.Error as exc:
+            report.execute_ms = (time.perf_counter() - started) * 1000
+            result.add_warning(f"Dry run failed during execution: {exc}", "DRY_RUN_RUNTIME_ERROR")
+            return report
+
+        report.execute_ms = (time.perf_counter() - started) * 1000
+        report.executed = True
+        report.rows_returned = rows
+        # Keys match one to one, so even a UNION of every table stays below this
+        ceiling = sample_rows * max(1, report.tables)
+        if sample_rows and rows > ceiling:
+            result.add_warning(
+                f"Dry run returned {rows} rows from {sample_rows} synthetic rows per table "
+                f"(expected at most {ceiling}); a join without a usable key multiplies rows",
+                "DRY_RUN_ROW_EXPLOSION",
+            )
+        shape = report.plan_shape()
+        result.add_info(
+            f"Dry run returned {rows} rows on {sample_rows} synthetic rows per table "
+            f"({shape['scans']} scans, {shape['automatic_indexes']} automatic indexes, "
+            f"{shape['temp_btrees']} temp b-trees)",
+            "DRY_RUN_OK",
+        )
+        return report
+    finally:
+        database.close()
+
+
+__all__ = [
+    "DRY_RUN_SAMPLE_ROWS",
+    "DRY_RUN_TIMEOUT_MS",
+    "DryRunReport",
+    "PlanStep",
+    "dry_run_sql",
+    "transpile_for_sqlite",
+]
@@ -0,0 +1,829 @@
+"""Lexer, parser and printers for HANA calculated-column formulas.
+
+Formulas found in calculation views (calculated attributes, RAW filter
+predicates, logical-model measures) use the legacy HANA expression language:
+``if(cond, a, b)``, ``leftstr("COL", 4)``, ``in("COL", 'A', 'B')``, string
+concatenation with ``+``, ``$$IP_X$$`` input parameters and so on.
+
+This module turns such a formula into a small expression tree so that
+translations can be expressed as tree rewrites (see ``formula_rewriter``)
+instead of chains of regular expressions over raw text. The tree is printed
+back to SQL by a dialect specific printer.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..domain.types import DatabaseMode
+
+
+class FormulaSyntaxError(ValueError):
+    """Raised when a formula cannot be tokenized or parsed."""
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+# ---------------------------------------------------------------------------
+# Lexer
+# ---------------------------------------------------------------------------
+
+TOKEN_STRING = "STRING"
+TOKEN_QUOTED = "QUOTED"
+TOKEN_NUMBER = "NUMBER"
+TOKEN_NAME = "NAME"
+TOKEN_PLACEHOLDER = "PLACEHOLDER"
+TOKEN_SLOT = "SLOT"
+TOKEN_OP = "OP"
+TOKEN_EOF = "EOF"
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<SKIP>\s+|--[^\n]*|/\*.*?\*/)
+    |(?P<STRING>'(?:[^']|'')*')
+    |(?P<QUOTED>"(?:[^"]|"")*")
+    |(?P<PLACEHOLDER>\$\$.*?\$\$)
+    |(?P<NUMBER>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<NAME>[^\W\d][\w#$]*)
+    |(?P<SLOT>\{\d+\})
+    |(?P<OP>\|\||<=|>=|<>|!=|[=<>+\-*/(),.])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@dataclass(slots=True)
+class Token:
+    """A single lexical token with its source offset."""
+
+    kind: str
+    value: str
+    position: int
+
+
+def tokenize(text: str, allow_slots: bool = False) -> List[Token]:
+    """Split a formula into tokens.
+
+    String literals use single quotes with ``''`` escapes, identifiers use
+    double quotes with ``""`` escapes. ``$$NAME$$`` input parameters are kept
+    as a single token. Comments (``--`` and ``/* */``) and whitespace are
+    skipped.
+
+    Args:
+        text: Formula source.
+        allow_slots: Recognize ``{0}``-style template slots (used when
+            compiling catalog templates).
+
+    Returns:
+        Token list terminated by an ``EOF`` token.
+
+    Raises:
+        FormulaSyntaxError: On unterminated literals or unknown characters.
+    """
+
+    tokens: List[Token] = []
+    pos = 0
+    length = len(text)
+    match = _TOKEN_PATTERN.match
+
+    while pos < length:
+        found = match(text, pos)
+        if found is None:
+            ch = text[pos]
+            if ch in "'\"":
+                raise FormulaSyntaxError("Unterminated quoted literal", pos)
+            if text.startswith("$$", pos):
+                raise FormulaSyntaxError("Unterminated parameter placeholder", pos)
+            if text.startswith("/*", pos):
+                raise FormulaSyntaxError("Unterminated comment", pos)
+            raise FormulaSyntaxError(f"Unexpected character {ch!r}", pos)
+
+        kind = found.lastgroup
+        value = found.group()
+        if kind == TOKEN_STRING:
+            tokens.append(Token(kind, value[1:-1].replace("''", "'"), pos))
+        elif kind == TOKEN_QUOTED:
+            tokens.append(Token(kind, value[1:-1].replace('""', '"'), pos))
+        elif kind == TOKEN_SLOT:
+            if not allow_slots:
+                raise FormulaSyntaxError(f"Unexpected character {value[0]!r}", pos)
+            tokens.append(Token(kind, value[1:-1], pos))
+        elif kind != "SKIP":
+            tokens.append(Token(kind, value, pos))
+        pos = found.end()
+
+    tokens.append(Token(TOKEN_EOF, "", length))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Tree
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class StringLiteral:
+    value: str
+
+
+@dataclass(slots=True)
+class NumberLiteral:
+    text: str
+
+
+@dataclass(slots=True)
+class Identifier:
+    """Column reference or bare word (NULL, CURRENT_DATE, schema.table...)."""
+
+    parts: List[str]
+    quoted: List[bool]
+
+
+@dataclass(slots=True)
+class Placeholder:
+    text: str
+
+
+@dataclass(slots=True)
+class TemplateSlot:
+    index: int
+
+
+@dataclass(slots=True)
+class FunctionCall:
+    name: str
+    args: List["Node"] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class UnaryOp:
+    op: str
+    operand: "Node"
+
+
+@dataclass(slots=True)
+class BinaryOp:
+    op: str
+    left: "Node"
+    right: "Node"
+
+
+@dataclass(slots=True)
+class InList:
+    expr: "Node"
+    values: List["Node"]
+    negated: bool = False
+
+
+@dataclass(slots=True)
+class IsNull:
+    expr: "Node"
+    negated: bool = False
+
+
+@dataclass(slots=True)
+class Between:
+    expr: "Node"
+    low: "Node"
+    high: "Node"
+    negated: bool = False
+
+
+@dataclass(slots=True)
+class Case:
+    whens: List[Tuple["Node", "Node"]]
+    else_: Optional["Node"] = None
+    operand: Optional["Node"] = None
+
+
+@dataclass(slots=True)
+class Cast:
+    expr: "Node"
+    type_name: str
+
+
+@dataclass(slots=True)
+class Paren:
+    expr: "Node"
+
+
+@dataclass(slots=True)
+class ValueList:
+    """Parenthesized value list, e.g. the right side of an IN predicate."""
+
+    items: List["Node"]
+
+
+Node = Union[
+    StringLiteral,
+    NumberLiteral,
+    Identifier,
+    Placeholder,
+    TemplateSlot,
+    FunctionCall,
+    UnaryOp,
+    BinaryOp,
+    InList,
+    IsNull,
+    Between,
+    Case,
+    Cast,
+    Paren,
+    ValueList,
+]
+
+
+def children(node: Node) -> List[Node]:
+    """Return the direct child nodes of ``node`` in source order."""
+
+    if isinstance(node, FunctionCall):
+        return list(node.args)
+    if isinstance(node, UnaryOp):
+        return [node.operand]
+    if isinstance(node, BinaryOp):
+        return [node.left, node.right]
+    if isinstance(node, InList):
+        return [node.expr, *node.values]
+    if isinstance(node, IsNull):
+        return [node.expr]
+    if isinstance(node, Between):
+        return [node.expr, node.low, node.high]
+    if isinstance(node, Case):
+        result: List[Node] = [] if node.operand is None else [node.operand]
+        for condition, value in node.whens:
+            result.extend((condition, value))
+        if node.else_ is not None:
+            result.append(node.else_)
+        return result
+    if isinstance(node, (Cast, Paren)):
+        return [node.expr]
+    if isinstance(node, ValueList):
+        return list(node.items)
+    return []
+
+
+def transform(node: Node, visit: Callable[[Node], Node]) -> Node:
+    """Rebuild the tree bottom-up, replacing each node with ``visit(node)``.
+
+    Children are transformed before their parent, so ``visit`` always sees
+    already rewritten arguments.
+    """
+
+    if isinstance(node, FunctionCall):
+        node = FunctionCall(node.name, [transform(arg, visit) for arg in node.args])
+    elif isinstance(node, UnaryOp):
+        node = UnaryOp(node.op, transform(node.operand, visit))
+    elif isinstance(node, BinaryOp):
+        node = BinaryOp(node.op, transform(node.left, visit), transform(node.right, visit))
+    elif isinstance(node, InList):
+        node = InList(
+            transform(node.expr, visit),
+            [transform(value, visit) for value in node.values],
+            node.negated,
+        )
+    elif isinstance(node, IsNull):
+        node = IsNull(transform(node.expr, visit), node.negated)
+    elif isinstance(node, Between):
+        node = Between(
+            transform(node.expr, visit),
+            transform(node.low, visit),
+            transform(node.high, visit),
+            node.negated,
+        )
+    elif isinstance(node, Case):
+        node = Case(
+            [(transform(c, visit), transform(v, visit)) for c, v in node.whens],
+            None if node.else_ is None else transform(node.else_, visit),
+            None if node.operand is None else transform(node.operand, visit),
+        )
+    elif isinstance(node, Cast):
+        node = Cast(transform(node.expr, visit), node.type_name)
+    elif isinstance(node, Paren):
+        node = Paren(transform(node.expr, visit))
+    elif isinstance(node, ValueList):
+        node = ValueList([transform(item, visit) for item in node.items])
+    return visit(node)
+
+
+def substitute_slots(node: Node, args: Sequence[Node]) -> Node:
+    """Replace ``TemplateSlot`` nodes with the corresponding argument trees.
+
+    Raises:
+        IndexError: If the template references a missing argument.
+    """
+
+    def visit(current: Node) -> Node:
+        if isinstance(current, TemplateSlot):
+            return args[current.index]
+        return current
+
+    return transform(node, visit)
+
+
+def strip_parens(node: Node) -> Node:
+    """Return ``node`` without any redundant outer parentheses."""
+
+    while isinstance(node, Paren):
+        node = node.expr
+    return node
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+_COMPARISON_OPERATORS = {"=", "!=", "<>", "<", "<=", ">", ">="}
+
+# Binding power of binary operators; higher binds tighter.
+PRECEDENCE_OR = 1
+PRECEDENCE_AND = 2
+PRECEDENCE_NOT = 3
+PRECEDENCE_COMPARISON = 4
+PRECEDENCE_ADDITIVE = 5
+PRECEDENCE_MULTIPLICATIVE = 6
+PRECEDENCE_UNARY = 7
+PRECEDENCE_PRIMARY = 8
+
+_BINARY_PRECEDENCE: Dict[str, int] = {
+    "OR": PRECEDENCE_OR,
+    "AND": PRECEDENCE_AND,
+    "=": PRECEDENCE_COMPARISON,
+    "!=": PRECEDENCE_COMPARISON,
+    "<>": PRECEDENCE_COMPARISON,
+    "<": PRECEDENCE_COMPARISON,
+    "<=": PRECEDENCE_COMPARISON,
+    ">": PRECEDENCE_COMPARISON,
+    ">=": PRECEDENCE_COMPARISON,
+    "LIKE": PRECEDENCE_COMPARISON,
+    "+": PRECEDENCE_ADDITIVE,
+    "-": PRECEDENCE_ADDITIVE,
+    "||": PRECEDENCE_ADDITIVE,
+    "*": PRECEDENCE_MULTIPLICATIVE,
+    "/": PRECEDENCE_MULTIPLICATIVE,
+}
+
+
+class FormulaParser:
+    """Recursive-descent parser producing the formula tree."""
+
+    def __init__(self, tokens: List[Token]):
+        self._tokens = tokens
+        self._last = len(tokens) - 1
+        self._pos = 0
+
+    # -- token helpers -----------------------------------------------------
+
+    def _peek(self, offset: int = 0) -> Token:
+        index = self._pos + offset
+        if index >= self._last:
+            return self._tokens[self._last]
+        return self._tokens[index]
+
+    def _advance(self) -> Token:
+        token = self._tokens[self._pos]
+        if token.kind != TOKEN_EOF:
+            self._pos += 1
+        return token
+
+    def _is_op(self, value: str, offset: int = 0) -> bool:
+        token = self._peek(offset)
+        return token.kind == TOKEN_OP and token.value == value
+
+    def _is_keyword(self, keyword: str, offset: int = 0) -> bool:
+        token = self._peek(offset)
+        return token.kind == TOKEN_NAME and token.value.upper() == keyword
+
+    def _expect_op(self, value: str) -> Token:
+        if not self._is_op(value):
+            token = self._peek()
+            raise FormulaSyntaxError(f"Expected {value!r}", token.position)
+        return self._advance()
+
+    def _expect_keyword(self, keyword: str) -> Token:
+        if not self._is_keyword(keyword):
+            raise FormulaSyntaxError(f"Expected {keyword}", self._peek().position)
+        return self._advance()
+
+    # -- grammar -----------------------------------------------------------
+
+    def parse(self) -> Node:
+        node = self.parse_expression()
+        token = self._peek()
+        if token.kind != TOKEN_EOF:
+            raise FormulaSyntaxError(f"Unexpected token {token.value!r}", token.position)
+        return node
+
+    def parse_expression(self, min_precedence: int = PRECEDENCE_OR) -> Node:
+        left = self._parse_prefix(min_precedence)
+
+        while True:
+            token = self._peek()
+            if token.kind == TOKEN_OP:
+                op = token.value
+            elif token.kind == TOKEN_NAME:
+                op = token.value.upper()
+            else:
+                break
+
+            if op in ("IN", "IS", "BETWEEN", "NOT") and min_precedence <= PRECEDENCE_COMPARISON:
+                postfix = self._parse_postfix_predicate(left)
+                if postfix is None:
+                    break
+                left = postfix
+                continue
+
+            precedence = _BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < min_precedence:
+                break
+
+            self._advance()
+            right = self.parse_expression(precedence + 1)
+            left = BinaryOp(op if token.kind == TOKEN_NAME else token.value, left, right)
+
+        return left
+
+    def _parse_postfix_predicate(self, left: Node) -> Optional[Node]:
+        negated = False
+        if self._is_keyword("NOT"):
+            if not (self._is_keyword("IN", 1) or self._is_keyword("BETWEEN", 1) or self._is_keyword("LIKE", 1)):
+                return None
+            self._advance()
+            negated = True
+
+        if self._is_keyword("IN"):
+            self._advance()
+            self._expect_op("(")
+            values = self._parse_argument_list()
+            return InList(left, values, negated)
+
+        if self._is_keyword("BETWEEN"):
+            self._advance()
+            low = self.parse_expression(PRECEDENCE_ADDITIVE)
+            self._expect_keyword("AND")
+            high = self.parse_expression(PRECEDENCE_ADDITIVE)
+            return Between(left, low, high, negated)
+
+        if self._is_keyword("LIKE"):
+            self._advance()
+            right = self.parse_expression(PRECEDENCE_ADDITIVE)
+            node: Node = BinaryOp("LIKE", left, right)
+            return UnaryOp("NOT", node) if negated else node
+
+        if self._is_keyword("IS"):
+            self._advance()
+            is_negated = False
+            if self._is_keyword("NOT"):
+                self._advance()
+                is_negated = True
+            self._expect_keyword("NULL")
+            return IsNull(left, is_negated)
+
+        return None
+
+    def _parse_prefix(self, min_precedence: int) -> Node:
+        if self._is_keyword("NOT"):
+            self._advance()
+            operand = self.parse_expression(PRECEDENCE_NOT)
+            return UnaryOp("NOT", operand)
+
+        if self._is_op("-") or self._is_op("+"):
+            op = self._advance().value
+            operand = self.parse_expression(PRECEDENCE_UNARY)
+            return UnaryOp(op, operand)
+
+        return self._parse_primary()
+
+    def _parse_primary(self) -> Node:
+        token = self._peek()
+
+        if token.kind == TOKEN_STRING:
+            self._advance()
+            return StringLiteral(token.value)
+
+        if token.kind == TOKEN_NUMBER:
+            self._advance()
+            return NumberLiteral(token.value)
+
+        if token.kind == TOKEN_PLACEHOLDER:
+            self._advance()
+            return Placeholder(token.value)
+
+        if token.kind == TOKEN_SLOT:
+            self._advance()
+            return TemplateSlot(int(token.value))
+
+        if token.kind == TOKEN_QUOTED:
+            return self._parse_identifier()
+
+        if token.kind == TOKEN_NAME:
+            keyword = token.value.upper()
+            if keyword == "CASE":
+                return self._parse_case()
+            if keyword == "CAST" and self._is_op("(", 1):
+                return self._parse_cast()
+            if self._is_op("(", 1):
+                self._advance()
+                self._advance()
+                args = self._parse_argument_list()
+                return FunctionCall(token.value, args)
+            if keyword in ("AND", "OR", "THEN", "ELSE", "END", "WHEN"):
+                raise FormulaSyntaxError(f"Unexpected keyword {token.value}", token.position)
+            return self._parse_identifier()
+
+        if self._is_op("("):
+            self._advance()
+            inner = self.parse_expression()
+            if self._is_op(","):
+                self._advance()
+                return ValueList([inner, *self._parse_argument_list()])
+            self._expect_op(")")
+            return Paren(inner)
+
+        raise FormulaSyntaxError(
+            f"Unexpected token {token.value or token.kind!r}", token.position
+        )
+
+    def _parse_identifier(self) -> Identifier:
+        parts: List[str] = []
+        quoted: List[bool] = []
+        while True:
+            token = self._advance()
+            if token.kind not in (TOKEN_NAME, TOKEN_QUOTED):
+                raise FormulaSyntaxError("Expected identifier", token.position)
+            parts.append(token.value)
+            quoted.append(token.kind == TOKEN_QUOTED)
+            if self._is_op(".") and self._peek(1).kind in (TOKEN_NAME, TOKEN_QUOTED):
+                self._advance()
+                continue
+            return Identifier(parts, quoted)
+
+    def _parse_argument_list(self) -> List[Node]:
+        """Parse ``a, b, c)`` after an already consumed opening parenthesis."""
+
+        args: List[Node] = []
+        if self._is_op(")"):
+            self._advance()
+            return args
+        while True:
+            args.append(self.parse_expression())
+            if self._is_op(","):
+                self._advance()
+                continue
+            self._expect_op(")")
+            return args
+
+    def _parse_case(self) -> Case:
+        self._expect_keyword("CASE")
+        operand: Optional[Node] = None
+        if not self._is_keyword("WHEN"):
+            operand = self.parse_expression()
+        whens: List[Tuple[Node, Node]] = []
+        while self._is_keyword("WHEN"):
+            self._advance()
+            condition = self.parse_expression()
+            self._expect_keyword("THEN")
+            whens.append((condition, self.parse_expression()))
+        if not whens:
+            raise FormulaSyntaxError("CASE without WHEN", self._peek().position)
+        else_: Optional[Node] = None
+        if self._is_keyword("ELSE"):
+            self._advance()
+            else_ = self.parse_expression()
+        self._expect_keyword("END")
+        return Case(whens, else_, operand)
+
+    def _parse_cast(self) -> Cast:
+        self._advance()
+        self._expect_op("(")
+        expr = self.parse_expression()
+        self._expect_keyword("AS")
+        type_tokens: List[Token] = []
+        depth = 0
+        while True:
+            token = self._peek()
+            if token.kind == TOKEN_EOF:
+                raise FormulaSyntaxError("Unterminated CAST", token.position)
+            if token.kind == TOKEN_OP and token.value == ")" and depth == 0:
+                break
+            if token.kind == TOKEN_OP and token.value == "(":
+                depth += 1
+            elif token.kind == TOKEN_OP and token.value == ")":
+                depth -= 1
+            type_tokens.append(self._advance())
+        self._expect_op(")")
+        if not type_tokens:
+            raise FormulaSyntaxError("CAST without target type", self._peek().position)
+        type_name = ""
+        for index, token in enumerate(type_tokens):
+            previous = type_tokens[index - 1] if index else None
+            if previous is not None and token.kind != TOKEN_OP and previous.kind != TOKEN_OP:
+                type_name += " "
+            type_name += token.value
+        return Cast(expr, type_name.replace(",", ", "))
+
+
+def parse_formula(text: str) -> Node:
+    """Parse a formula string into a tree.
+
+    Raises:
+        FormulaSyntaxError: If the text is not a well-formed expression.
+    """
+
+    return FormulaParser(tokenize(text)).parse()
+
+
+def parse_template(text: str) -> Node:
+    """Parse a catalog template such as ``SUBSTRING({0}, 1, {1})``."""
+
+    return FormulaParser(tokenize(text, allow_slots=True)).parse()
+
+
+# ---------------------------------------------------------------------------
+# Printers
+# ---------------------------------------------------------------------------
+
+
+def _precedence(node: Node) -> int:
+    if isinstance(node, BinaryOp):
+        return _BINARY_PRECEDENCE.get(node.op.upper(), PRECEDENCE_COMPARISON)
+    if isinstance(node, UnaryOp):
+        return PRECEDENCE_NOT if node.op.upper() == "NOT" else PRECEDENCE_UNARY
+    if isinstance(node, (InList, IsNull, Between)):
+        return PRECEDENCE_COMPARISON
+    return PRECEDENCE_PRIMARY
+
+
+class FormulaPrinter:
+    """Print a formula tree as SQL text.
+
+    Subclasses override the hooks that differ between target dialects.
+    """
+
+    concat_operator = "||"
+
+    def print(self, node: Node) -> str:
+        return self._print(node)
+
+    def _print(self, node: Node, min_precedence: int = PRECEDENCE_OR) -> str:
+        text = self._print_node(node)
+        if _precedence(node) < min_precedence:
+            return f"({text})"
+        return text
+
+    def _print_node(self, node: Node) -> str:
+        if isinstance(node, StringLiteral):
+            return self.print_string(node.value)
+        if isinstance(node, NumberLiteral):
+            return node.text
+        if isinstance(node, Identifier):
+            return ".".join(
+                self.print_quoted_identifier(part) if quoted else part
+                for part, quoted in zip(node.parts, node.quoted)
+            )
+        if isinstance(node, Placeholder):
+            return node.text
+        if isinstance(node, TemplateSlot):
+            return f"{{{node.index}}}"
+        if isinstance(node, FunctionCall):
+            return self.print_function(node)
+        if isinstance(node, UnaryOp):
+            if node.op.upper() == "NOT":
+                return f"NOT {self._print(node.operand, PRECEDENCE_NOT)}"
+            return f"{node.op}{self._print(node.operand, PRECEDENCE_UNARY)}"
+        if isinstance(node, BinaryOp):
+            return self.print_binary(node)
+        if isinstance(node, InList):
+            keyword = "NOT IN" if node.negated else "IN"
+            values = ", ".join(self._print(value) for value in node.values)
+            return f"{self._print(node.expr, PRECEDENCE_ADDITIVE)} {keyword} ({values})"
+        if isinstance(node, IsNull):
+            keyword = "IS NOT NULL" if node.negated else "IS NULL"
+            return f"{self._print(node.expr, PRECEDENCE_ADDITIVE)} {keyword}"
+        if isinstance(node, Between):
+            keyword = "NOT BETWEEN" if node.negated else "BETWEEN"
+            return (
+                f"{self._print(node.expr, PRECEDENCE_ADDITIVE)} {keyword} "
+                f"{self._print(node.low, PRECEDENCE_ADDITIVE)} AND "
+                f"{self._print(node.high, PRECEDENCE_ADDITIVE)}"
+            )
+        if isinstance(node, Case):
+            parts = ["CASE"]
+            if node.operand is not None:
+                parts.append(self._print(node.operand))
+            for condition, value in node.whens:
+                parts.append(f"WHEN {self._print(condition)} THEN {self._print(value)}")
+            if node.else_ is not None:
+                parts.append(f"ELSE {self._print(node.else_)}")
+            parts.append("END")
+            return " ".join(parts)
+        if isinstance(node, Cast):
+            return f"CAST({self._print(node.expr)} AS {node.type_name})"
+        if isinstance(node, Paren):
+            return f"({self._print(strip_parens(node.expr))})"
+        if isinstance(node, ValueList):
+            return f"({', '.join(self._print(item) for item in node.items)})"
+        raise TypeError(f"Unsupported formula node: {type(node).__name__}")
+
+    def print_string(self, value: str) -> str:
+        escaped = value.replace("'", "''")
+        return f"'{escaped}'"
+
+    def print_quoted_identifier(self, name: str) -> str:
+        escaped = name.replace('"', '""')
+        return f'"{escaped}"'
+
+    def print_function(self, node: FunctionCall) -> str:
+        args = ", ".join(self._print(arg) for arg in node.args)
+        return f"{node.name}({args})"
+
+    def print_binary(self, node: BinaryOp) -> str:
+        precedence = _precedence(node)
+        op = node.op.upper()
+        if op == "||":
+            op = self.concat_operator
+        left = self._print(node.left, precedence)
+        # Left-associative: a right operand of equal precedence needs parens.
+        right = self._print(node.right, precedence + 1)
+        return f"{left} {op} {right}"
+
+
+class SnowflakeFormulaPrinter(FormulaPrinter):
+    """Printer for Snowflake targets (``||`` concatenation)."""
+
+    concat_operator = "||"
+
+
+class HanaFormulaPrinter(FormulaPrinter):
+    """Printer for HANA targets.
+
+    HANA calculated columns concatenate with ``+``. Concatenation inside
+    ``REGEXP_LIKE`` arguments keeps ``||`` because it builds the regex
+    pattern string.
+    """
+
+    concat_operator = "+"
+
+    def __init__(self) -> None:
+        self._regexp_depth = 0
+
+    def print_function(self, node: FunctionCall) -> str:
+        if node.name.upper() != "REGEXP_LIKE":
+            return super().print_function(node)
+        self._regexp_depth += 1
+        try:
+            return super().print_function(node)
+        finally:
+            self._regexp_depth -= 1
+
+    def print_binary(self, node: BinaryOp) -> str:
+        if node.op == "||" and self._regexp_depth:
+            precedence = _precedence(node)
+            left = self._print(node.left, precedence)
+            right = self._print(node.right, precedence + 1)
+            return f"{left} || {right}"
+        return super().print_binary(node)
+
+
+def print_formula(node: Node, mode: DatabaseMode) -> str:
+    """Print ``node`` using the printer for the given target database."""
+
+    printer = HanaFormulaPrinter() if mode == DatabaseMode.HANA else SnowflakeFormulaPrinter()
+    return printer.print(node)
+
+
+__all__ = [
+    "Between",
+    "BinaryOp",
+    "Case",
+    "Cast",
+    "FormulaParser",
+    "FormulaPrinter",
+    "FormulaSyntaxError",
+    "FunctionCall",
+    "HanaFormulaPrinter",
+    "Identifier",
+    "InList",
+    "IsNull",
+    "Node",
+    "NumberLiteral",
+    "Paren",
+    "Placeholder",
+    "SnowflakeFormulaPrinter",
+    "StringLiteral",
+    "TemplateSlot",
+    "Token",
+    "UnaryOp",
+    "ValueList",
+    "children",
+    "parse_formula",
+    "parse_template",
+    "print_formula",
+    "strip_parens",
+    "substitute_slots",
+    "tokenize",
+    "transform",
+]
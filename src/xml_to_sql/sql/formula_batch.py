@@ -0,0 +1,187 @@
+"""Batch translation of every formula in a scenario.
+
+Instead of translating formulas one at a time while nodes are rendered, the
+renderer collects all formulas of a ``Scenario`` up front, deduplicates them
+and translates them in one go. Very large scenarios can spread the work over
+a process pool. The resulting ``formula -> SQL`` mapping is handed to the
+renderer, and the batch statistics give the formula-translation cost per
+calculation view.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..domain import Expression, ExpressionType, Scenario
+from ..domain.types import DatabaseMode, HanaVersion
+from .function_translator import _translate_raw_formula_uncached, formula_cache_key
+from .translation_cache import get_formula_cache
+
+logger = logging.getLogger(__name__)
+
+# Below this many uncached formulas a process pool costs more than it saves.
+DEFAULT_PARALLEL_THRESHOLD = 256
+
+
+@dataclass(slots=True)
+class FormulaBatchStats:
+    """Cost of translating the formulas of one scenario."""
+
+    formulas: int = 0
+    unique: int = 0
+    cache_hits: int = 0
+    translated: int = 0
+    workers: int = 1
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "formulas": self.formulas,
+            "unique": self.unique,
+            "cache_hits": self.cache_hits,
+            "translated": self.translated,
+            "workers": self.workers,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+@dataclass(slots=True)
+class FormulaTarget:
+    """What a formula translation depends on; a picklable render context."""
+
+    database_mode: DatabaseMode
+    hana_version: Optional[HanaVersion]
+    client: str
+    language: str
+
+
+def collect_formulas(scenario: Scenario) -> List[str]:
+    """Return every RAW formula in ``scenario``, in rendering order.
+
+    Covers calculated attributes, RAW mappings and filter predicates of all
+    nodes, scenario measures, and the logical model's calculated attributes
+    and measure formulas.
+    """
+
+    formulas: List[str] = []
+
+    def add(expression: Optional[Expression]) -> None:
+        if expression is not None and expression.expression_type == ExpressionType.RAW and expression.value:
+            formulas.append(expression.value)
+
+    for node in scenario.nodes.values():
+        for mapping in node.mappings:
+            add(mapping.expression)
+        for predicate in node.filters:
+            add(predicate.left)
+            add(predicate.right)
+        for calc in node.calculated_attributes.values():
+            add(calc.expression)
+
+    for measure in scenario.measures:
+        add(measure.expression)
+
+    if scenario.logical_model:
+        for calc in scenario.logical_model.calculated_attributes:
+            if calc.expression.value:
+                formulas.append(calc.expression.value)
+        for measure in scenario.logical_model.measures:
+            if measure.formula:
+                formulas.append(measure.formula)
+
+    return formulas
+
+
+def translate_formulas(
+    formulas: Iterable[str],
+    ctx,
+    max_workers: Optional[int] = None,
+    parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+) -> Tuple[Dict[str, str], FormulaBatchStats]:
+    """Translate a batch of formulas for the target described by ``ctx``.
+
+    Formulas are deduplicated and looked up in the shared translation cache;
+    the remaining ones are translated serially, or across ``max_workers``
+    processes when there are at least ``parallel_threshold`` of them. New
+    translations are stored in the cache.
+
+    Args:
+        formulas: Formula texts (duplicates allowed).
+        ctx: Render context (database mode, HANA version, client, language).
+        max_workers: Process pool size; ``None`` or ``1`` translates serially.
+        parallel_threshold: Minimum number of uncached formulas for the pool.
+
+    Returns:
+        Tuple of (formula -> translated SQL, batch statistics).
+    """
+
+    start = time.perf_counter()
+    target = FormulaTarget(
+        database_mode=getattr(ctx, "database_mode", DatabaseMode.SNOWFLAKE),
+        hana_version=getattr(ctx, "hana_version", None),
+        client=getattr(ctx, "client", "PROD"),
+        language=getattr(ctx, "language", "EN"),
+    )
+
+    all_formulas = [formula for formula in formulas if formula]
+    unique = list(dict.fromkeys(all_formulas))
+    stats = FormulaBatchStats(formulas=len(all_formulas), unique=len(unique))
+
+    cache = get_formula_cache()
+    translations: Dict[str, str] = {}
+    pending: List[str] = []
+    for formula in unique:
+        cached = cache.get(formula_cache_key(formula, target))
+        if cached is None:
+            pending.append(formula)
+        else:
+            translations[formula] = cached
+    stats.cache_hits = len(unique) - len(pending)
+
+    results: Optional[List[str]] = None
+    if pending and max_workers and max_workers > 1 and len(pending) >= parallel_threshold:
+        results = _translate_in_pool(pending, target, max_workers)
+        if results is not None:
+            stats.workers = max_workers
+    if results is None:
+        results = [_translate_raw_formula_uncached(formula, target, target.database_mode) for formula in pending]
+
+    for formula, translated in zip(pending, results):
+        translations[formula] = translated
+        cache.put(formula_cache_key(formula, target), translated)
+
+    stats.translated = len(pending)
+    stats.elapsed_ms = (time.perf_counter() - start) * 1000
+    return translations, stats
+
+
+def _translate_in_pool(formulas: List[str], ctx: FormulaTarget, max_workers: int) -> Optional[List[str]]:
+    """Translate ``formulas`` in a process pool; ``None`` if the pool fails."""
+
+    chunk_size = max(1, len(formulas) // (max_workers * 4))
+    chunks = [formulas[i : i + chunk_size] for i in range(0, len(formulas), chunk_size)]
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            translated_chunks = pool.map(_translate_chunk, chunks, [ctx] * len(chunks))
+            return [translated for chunk in translated_chunks for translated in chunk]
+    except (BrokenProcessPool, OSError) as exc:
+        logger.warning("Formula process pool failed (%s); translating serially", exc)
+        return None
+
+
+def _translate_chunk(formulas: List[str], ctx: FormulaTarget) -> List[str]:
+    return [_translate_raw_formula_uncached(formula, ctx, ctx.database_mode) for formula in formulas]
+
+
+__all__ = [
+    "DEFAULT_PARALLEL_THRESHOLD",
+    "FormulaBatchStats",
+    "FormulaTarget",
+    "collect_formulas",
+    "translate_formulas",
+]
@@ -0,0 +1,342 @@
+"""Tree rewrites that translate parsed HANA formulas to the target dialect.
+
+Each translation step of the legacy regex pipeline in ``function_translator``
+has a tree counterpart here. Because the rewrites operate on parsed nodes they
+are immune to nesting, quoting and whitespace quirks of the source text.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..catalog import FunctionRule, get_function_catalog
+from ..domain.types import DatabaseMode
+from .formula_ast import (
+    BinaryOp,
+    Case,
+    FunctionCall,
+    Identifier,
+    InList,
+    IsNull,
+    Node,
+    NumberLiteral,
+    Paren,
+    StringLiteral,
+    parse_template,
+    strip_parens,
+    substitute_slots,
+    transform,
+)
+from .rewrite_engine import get_rewrite_engine
+
+# Functions whose result is a string; ``+`` next to them is concatenation.
+STRING_FUNCTIONS = frozenset(
+    {
+        "CONCAT",
+        "LEFT",
+        "LOWER",
+        "LPAD",
+        "LTRIM",
+        "REPLACE",
+        "RIGHT",
+        "RPAD",
+        "RTRIM",
+        "SUBSTR",
+        "SUBSTRING",
+        "TO_CHAR",
+        "TO_NVARCHAR",
+        "TO_VARCHAR",
+        "TRIM",
+        "UPPER",
+    }
+)
+
+_COMPARISONS = {"=", "!=", "<>"}
+
+CallRewrite = Callable[[List[Node]], Optional[Node]]
+
+
+def rewrite_formula(tree: Node, ctx, mode: DatabaseMode) -> Node:
+    """Translate a parsed formula tree for the given target database.
+
+    All rewrites run in a single bottom-up walk: every node sees children that
+    are already fully translated, then the rewrites below are applied to the
+    node in order.
+
+    Args:
+        tree: Tree produced by ``parse_formula``.
+        ctx: Translation context (provides ``hana_version``).
+        mode: Target database mode.
+
+    Returns:
+        The rewritten tree, ready for ``print_formula``.
+    """
+
+    rewrites: List[Callable[[Node], Node]] = [_rewrite_in_function]
+
+    if mode == DatabaseMode.HANA:
+        rewrites.append(_rewrite_isnull_for_hana)
+        hana_version = getattr(ctx, "hana_version", None)
+        version_str = hana_version.value if hasattr(hana_version, "value") else hana_version
+        if version_str and str(version_str).startswith("1."):
+            rewrites.append(_rewrite_in_list_to_or)
+        rewrites.append(_rewrite_if_to_case)
+    else:
+        rewrites.append(_rewrite_if_to_iff)
+        rewrites.append(_rewrite_plus_to_concat)
+
+    rewrites.append(_uppercase_quoted_identifiers)
+    # Only try the rewrites that can match a given node type.
+    applicable = [(rewrite, _REWRITE_NODE_TYPES[rewrite]) for rewrite in rewrites]
+    catalog = _compile_catalog()
+    engine = get_rewrite_engine()
+
+    def apply_structural(node: Node) -> Node:
+        for rewrite, node_types in applicable:
+            if type(node) in node_types:
+                node = rewrite(node)
+        return node
+
+    def visit(node: Node) -> Node:
+        if isinstance(node, FunctionCall):
+            name = node.name.upper()
+            rewrite_call = catalog.get(name)
+            if rewrite_call is not None:
+                start = time.perf_counter_ns()
+                replacement = rewrite_call(node.args)
+                if replacement is not None:
+                    engine.record_function_hit(name, time.perf_counter_ns() - start)
+                    # Nodes introduced by the catalog have not been visited yet.
+                    return transform(replacement, apply_structural)
+        return apply_structural(node)
+
+    return transform(tree, visit)
+
+
+# ---------------------------------------------------------------------------
+# Catalog rewrites
+# ---------------------------------------------------------------------------
+
+
+def apply_catalog_rewrites(tree: Node) -> Node:
+    """Rewrite calls to legacy helpers using the function catalog."""
+
+    catalog = _compile_catalog()
+
+    def visit(node: Node) -> Node:
+        if isinstance(node, FunctionCall):
+            rewrite_call = catalog.get(node.name.upper())
+            if rewrite_call is not None:
+                replacement = rewrite_call(node.args)
+                if replacement is not None:
+                    return replacement
+        return node
+
+    return transform(tree, visit)
+
+
+@lru_cache(maxsize=1)
+def _compile_catalog() -> Dict[str, CallRewrite]:
+    """Build one call rewrite per catalog rule; templates are parsed once."""
+
+    compiled: Dict[str, CallRewrite] = {}
+    for rule in get_function_catalog().values():
+        rewrite_call = _compile_rule(rule)
+        if rewrite_call is not None:
+            compiled[rule.name.upper()] = rewrite_call
+    return compiled
+
+
+def _compile_rule(rule: FunctionRule) -> Optional[CallRewrite]:
+    handler = rule.handler.lower()
+
+    if handler == "template" and rule.template:
+        template = parse_template(rule.template)
+
+        def rewrite_template(args: List[Node]) -> Optional[Node]:
+            try:
+                return substitute_slots(template, args)
+            except IndexError:
+                return None
+
+        return rewrite_template
+
+    if handler == "rename" and rule.target:
+        target = rule.target
+        return lambda args: FunctionCall(target, list(args))
+
+    if handler == "regexp_like":
+        return _rewrite_match
+
+    if handler == "in_list":
+        return _rewrite_in_list
+
+    return None
+
+
+def _rewrite_match(args: List[Node]) -> Optional[Node]:
+    """MATCH(value, pattern) with ``*``/``?`` wildcards → REGEXP_LIKE."""
+
+    if not args:
+        return None
+    pattern = args[1] if len(args) > 1 else StringLiteral("*")
+    regex = FunctionCall(
+        "REPLACE",
+        [
+            FunctionCall("REPLACE", [pattern, StringLiteral("*"), StringLiteral(".*")]),
+            StringLiteral("?"),
+            StringLiteral("."),
+        ],
+    )
+    anchored = BinaryOp("||", BinaryOp("||", StringLiteral("^"), regex), StringLiteral("$"))
+    return FunctionCall("REGEXP_LIKE", [args[0], anchored])
+
+
+def _rewrite_in_list(args: List[Node]) -> Optional[Node]:
+    """IN(value, option, ...) → (value IN (option, ...))."""
+
+    if len(args) < 2:
+        return None
+    target, *options = args
+    return Paren(InList(target, [_normalize_scalar(option) for option in options]))
+
+
+def _normalize_scalar(node: Node) -> Node:
+    """Treat a double-quoted IN() option as a string literal, not a column."""
+
+    if isinstance(node, Identifier) and len(node.parts) == 1 and node.quoted[0]:
+        return StringLiteral(node.parts[0])
+    return node
+
+
+# ---------------------------------------------------------------------------
+# Structural rewrites
+# ---------------------------------------------------------------------------
+
+
+def _rewrite_in_function(node: Node) -> Node:
+    """BUG-020: function-style IN(col, a, b) → operator-style col IN (a, b)."""
+
+    if isinstance(node, FunctionCall) and node.name.upper() == "IN" and len(node.args) >= 2:
+        return InList(node.args[0], list(node.args[1:]))
+    return node
+
+
+def _rewrite_in_list_to_or(node: Node) -> Node:
+    """HANA 1.x: expand ``x IN (a, b)`` to ``(x = a OR x = b)``."""
+
+    if isinstance(node, Paren) and isinstance(node.expr, InList):
+        return _rewrite_in_list_to_or(node.expr)
+    if not isinstance(node, InList) or not node.values:
+        return node
+
+    op, joiner = ("<>", "AND") if node.negated else ("=", "OR")
+    expanded: Node = BinaryOp(op, node.expr, node.values[0])
+    for value in node.values[1:]:
+        expanded = BinaryOp(joiner, expanded, BinaryOp(op, node.expr, value))
+    return Paren(expanded)
+
+
+def _rewrite_isnull_for_hana(node: Node) -> Node:
+    """ISNULL(x) → x IS NULL, folding the legacy ``ISNULL(x) = 1`` idiom."""
+
+    if isinstance(node, FunctionCall) and node.name.upper() == "ISNULL" and len(node.args) == 1:
+        return Paren(IsNull(node.args[0]))
+
+    if isinstance(node, BinaryOp) and node.op in _COMPARISONS:
+        left = strip_parens(node.left)
+        right = node.right
+        if isinstance(left, IsNull) and isinstance(right, NumberLiteral) and right.text in ("0", "1"):
+            is_true = right.text == "1"
+            if node.op != "=":
+                is_true = not is_true
+            return IsNull(left.expr, negated=left.negated != (not is_true))
+
+    return node
+
+
+def _rewrite_if_to_case(node: Node) -> Node:
+    """HANA: IF(cond, a, b) → CASE WHEN cond THEN a ELSE b END.
+
+    An empty-string ELSE becomes NULL to avoid "invalid number" errors when
+    the THEN branch is numeric.
+    """
+
+    if isinstance(node, FunctionCall) and node.name.upper() == "IF" and len(node.args) == 3:
+        condition, then_value, else_value = node.args
+        if isinstance(else_value, StringLiteral) and else_value.value == "":
+            else_value = Identifier(["NULL"], [False])
+        return Case([(condition, then_value)], else_value)
+    if isinstance(node, FunctionCall) and node.name.upper() == "IF":
+        return FunctionCall("IF", list(node.args))
+    return node
+
+
+def _rewrite_if_to_iff(node: Node) -> Node:
+    """Snowflake: IF(cond, a, b) → IFF(cond, a, b)."""
+
+    if isinstance(node, FunctionCall) and node.name.upper() == "IF" and len(node.args) == 3:
+        return FunctionCall("IFF", list(node.args))
+    return node
+
+
+def _rewrite_plus_to_concat(node: Node) -> Node:
+    """Snowflake: ``+`` between strings becomes ``||``.
+
+    Operands count as strings when they are string literals or string
+    functions. Two bare column references are treated as concatenation too,
+    matching how HANA formulas combine text columns.
+    """
+
+    if isinstance(node, BinaryOp) and node.op == "+":
+        left = strip_parens(node.left)
+        right = strip_parens(node.right)
+        both_columns = isinstance(left, Identifier) and isinstance(right, Identifier) and (
+            any(left.quoted) and any(right.quoted)
+        )
+        if both_columns or _is_string_valued(left) or _is_string_valued(right):
+            return BinaryOp("||", node.left, node.right)
+    return node
+
+
+def _is_string_valued(node: Node) -> bool:
+    node = strip_parens(node)
+    if isinstance(node, StringLiteral):
+        return True
+    if isinstance(node, BinaryOp):
+        return node.op == "||"
+    if isinstance(node, FunctionCall):
+        return node.name.upper() in STRING_FUNCTIONS
+    if isinstance(node, Case):
+        branches = [value for _, value in node.whens]
+        if node.else_ is not None:
+            branches.append(node.else_)
+        return any(_is_string_valued(branch) for branch in branches)
+    return False
+
+
+def _uppercase_quoted_identifiers(node: Node) -> Node:
+    """Column names in calculation views are stored upper-case."""
+
+    if isinstance(node, Identifier) and any(node.quoted):
+        return Identifier(
+            [part.upper() if quoted else part for part, quoted in zip(node.parts, node.quoted)],
+            list(node.quoted),
+        )
+    return node
+
+
+_REWRITE_NODE_TYPES: Dict[Callable[[Node], Node], Tuple[type, ...]] = {
+    _rewrite_in_function: (FunctionCall,),
+    _rewrite_in_list_to_or: (InList, Paren),
+    _rewrite_isnull_for_hana: (FunctionCall, BinaryOp),
+    _rewrite_if_to_case: (FunctionCall,),
+    _rewrite_if_to_iff: (FunctionCall,),
+    _rewrite_plus_to_concat: (BinaryOp,),
+    _uppercase_quoted_identifiers: (Identifier,),
+}
+
+
+__all__ = ["STRING_FUNCTIONS", "apply_catalog_rewrites", "rewrite_formula"]
@@ -7,7 +7,11 @@ from typing import List, Optional, Sequence, Tuple
 
 from ..domain import Expression, ExpressionType
 from ..domain.types import DatabaseMode, HanaVersion
-from ..catalog import FunctionRule, get_function_catalog, PatternRule, get_pattern_catalog
+from ..catalog import FunctionRule, PatternRule
+from .formula_ast import FormulaSyntaxError, parse_formula, print_formula
+from .formula_rewriter import rewrite_formula
+from .rewrite_engine import get_rewrite_engine
+from .translation_cache import get_formula_cache
 
 
 def translate_hana_function(func_name: str, args: List[Expression], ctx) -> str:
@@ -199,26 +203,68 @@ def _translate_for_hana(func_name: str, args: List[Expression], ctx, version: Op
 
 
 def translate_raw_formula(formula: str, ctx) -> str:
-    """Translate a raw HANA formula expression to target database SQL."""
+    """Translate a raw HANA formula expression to target database SQL.
 
-    result = formula
+    The formula is parsed into an expression tree (see ``formula_ast``) and
+    translated by tree rewrites. Formulas the parser does not understand fall
+    back to the regex pipeline in ``_translate_with_regex``.
+
+    Results are memoized in the shared translation cache, keyed by everything
+    the translation depends on: formula text, database mode, HANA version and
+    the client/language placeholder values.
+    """
 
-    if not result:
+    if not formula:
         return "NULL"
 
-    result = _substitute_placeholders(result, ctx)
+    mode = getattr(ctx, "database_mode", DatabaseMode.SNOWFLAKE)
+    return get_formula_cache().get_or_compute(
+        formula_cache_key(formula, ctx), lambda: _translate_raw_formula_uncached(formula, ctx, mode)
+    )
+
+
+def formula_cache_key(formula: str, ctx) -> tuple:
+    """Return the translation cache key for ``formula`` under ``ctx``."""
 
-    # Apply mode-specific transformations
     mode = getattr(ctx, "database_mode", DatabaseMode.SNOWFLAKE)
+    hana_version = getattr(ctx, "hana_version", None)
+    return (
+        formula,
+        mode.value if hasattr(mode, "value") else mode,
+        hana_version.value if hasattr(hana_version, "value") else hana_version,
+        getattr(ctx, "client", "PROD"),
+        getattr(ctx, "language", "EN"),
+    )
+
+
+def _translate_raw_formula_uncached(formula: str, ctx, mode: DatabaseMode) -> str:
+    result = _substitute_placeholders(formula, ctx)
+
+    # Pattern rewrites (NOW() - N → ADD_DAYS()) are regex rules by definition
+    # and run on the source text before parsing.
+    result = _apply_pattern_rewrites(result, ctx, mode)
+
+    # The tree fixes nesting and quoting, not speed: it runs at parity with the
+    # regex passes (benchmarks/formula_throughput.py); repeats hit the cache
+    try:
+        tree = parse_formula(result)
+        tree = rewrite_formula(tree, ctx, mode)
+    except FormulaSyntaxError:
+        return _translate_with_regex(result, ctx, mode)
+
+    return print_formula(tree, mode)
+
+
+def _translate_with_regex(result: str, ctx, mode: DatabaseMode) -> str:
+    """Legacy text-based translation, used when a formula cannot be parsed."""
 
     if mode == DatabaseMode.HANA:
         # HANA mode: Convert to CASE WHEN, convert IN to OR conditions
         # IMPORTANT ORDER:
-        # 1. Apply PATTERN rewrites FIRST (NOW() - N → ADD_DAYS())
+        # 1. Pattern rewrites already applied (NOW() - N → ADD_DAYS())
         # 2. Then catalog rewrites (function name mappings: string → TO_VARCHAR)
         # 3. Then convert IN to OR for HANA compatibility
         # 4. Then convert IF to CASE WHEN (HANA requires CASE in SELECT clauses)
-        result = _apply_pattern_rewrites(result, ctx, mode)
         result = _apply_catalog_rewrites(result, ctx)
         result = _normalize_isnull_calls(result)
         result = _uppercase_if_statements(result)
@@ -242,8 +288,6 @@ def translate_raw_formula(formula: str, ctx) -> str:
         result = _translate_column_references(result, ctx)
     else:  # Snowflake mode
         # Snowflake mode: IF -> IFF, + -> ||
-        # Apply pattern rewrites before catalog rewrites
-        result = _apply_pattern_rewrites(result, ctx, mode)
         result = _translate_if_statements(result, ctx)
         result = _apply_catalog_rewrites(result, ctx)
         result = _translate_string_concatenation(result)
@@ -1031,7 +1075,9 @@ def _apply_pattern_rewrites(formula: str, ctx, mode: DatabaseMode) -> str:
     function name substitution (e.g., NOW() - 365 → ADD_DAYS()).
 
     Pattern rewrites are applied in the order they appear in patterns.yaml.
-    Each pattern is applied once in a single pass (no recursion).
+    Each pattern is applied once in a single pass (no recursion). Patterns
+    whose anchor literal does not occur in the formula are skipped (see
+    ``rewrite_engine``).
 
     Args:
         formula: The formula string to transform
@@ -1046,44 +1092,22 @@ def _apply_pattern_rewrites(formula: str, ctx, mode: DatabaseMode) -> str:
         'ADD_DAYS(CURRENT_DATE, -365)'
     """
 
-    catalog = get_pattern_catalog()
-    result = formula
-
-    for rule in catalog.values():
-        # Get the mode-specific replacement template
-        replacement_template = rule.hana if mode == DatabaseMode.HANA else rule.snowflake
-
-        if not replacement_template:
-            continue  # Skip if no replacement for this mode
-
-        # Convert $1, $2, etc. to \1, \2, etc. for Python regex groups
-        replacement = replacement_template.replace('$', '\\')
-
-        # Apply regex substitution (case-insensitive)
-        result = re.sub(
-            rule.match,
-            replacement,
-            result,
-            flags=re.IGNORECASE
-        )
-
-    return result
+    return get_rewrite_engine().apply_patterns(formula, mode)
 
 
 def _apply_catalog_rewrites(formula: str, ctx) -> str:
     """Apply structured catalog rewrites for legacy helper functions."""
 
-    catalog = get_function_catalog()
-    rewritten = formula
-    for rule in catalog.values():
-        rewritten = _rewrite_function_calls(rewritten, rule, ctx)
-    return rewritten
+    return get_rewrite_engine().apply_functions(
+        formula, lambda text, rule, pattern: _rewrite_function_calls(text, rule, ctx, pattern)
+    )
 
 
-def _rewrite_function_calls(formula: str, rule: FunctionRule, ctx) -> str:
+def _rewrite_function_calls(formula: str, rule: FunctionRule, ctx, pattern: Optional[re.Pattern] = None) -> str:
     """Rewrite all occurrences of a function according to the provided rule."""
 
-    pattern = re.compile(rf"\b{re.escape(rule.name)}\s*\(", re.IGNORECASE)
+    if pattern is None:
+        pattern = re.compile(rf"\b{re.escape(rule.name)}\s*\(", re.IGNORECASE)
     pos = 0
     parts: List[str] = []
 
@@ -0,0 +1,220 @@
+"""Structural validation of the scenario IR before SQL generation.
+
+A scenario whose node graph is broken (no final node, inputs that point
+nowhere, dependency cycles, node kinds the renderer cannot handle, mappings
+that read columns no input produces) cannot yield usable SQL. The renderer
+papers over these with placeholder CTEs and the SQL validators only find
+them afterwards by scanning the generated text. This validator inspects the
+``Scenario`` directly, in a single pass over nodes, inputs and mappings,
+so doomed conversions can stop before rendering, with diagnostics that name
+the node at fault.
+
+Column references are checked only where the producing side is fully known:
+a node without explicit mappings passes its input through unchanged, and
+data sources usually carry no column metadata, so references into either
+are not judged.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Set
+
+from ..domain import (
+    AggregationNode,
+    ExpressionType,
+    JoinNode,
+    Node,
+    NodeKind,
+    RankNode,
+    Scenario,
+    UnionNode,
+)
+from .validator import ValidationResult
+
+# Node kinds the renderer supports, with the node class each one requires
+_RENDERABLE_KINDS = {
+    NodeKind.PROJECTION: Node,
+    NodeKind.JOIN: JoinNode,
+    NodeKind.AGGREGATION: AggregationNode,
+    NodeKind.UNION: UnionNode,
+    NodeKind.RANK: RankNode,
+    NodeKind.CALCULATION: Node,
+}
+
+# Minimum number of inputs per node kind
+_MIN_INPUTS = {
+    NodeKind.JOIN: 2,
+    NodeKind.UNION: 2,
+}
+
+
+def _clean_input(value: str) -> str:
+    # Same normalisation as the renderer's topological sort
+    from ..parser.scenario_parser import _clean_ref
+
+    return re.sub(r"^\d+/", "", _clean_ref(value))
+
+
+def _produced_columns(node: Node) -> Optional[Set[str]]:
+    """Upper-cased output columns of ``node``, or None when they are not explicit."""
+
+    if not node.mappings:
+        return None
+    columns = {mapping.target_name.upper() for mapping in node.mappings}
+    columns.update(name.upper() for name in node.calculated_attributes)
+    if isinstance(node, AggregationNode):
+        columns.update(spec.target_name.upper() for spec in node.aggregations)
+    if isinstance(node, RankNode):
+        columns.add(node.rank_column.upper())
+    return columns
+
+
+class _IrValidator:
+    def __init__(self, scenario: Scenario) -> None:
+        self.scenario = scenario
+        self.result = ValidationResult()
+        self.inputs: Dict[str, List[str]] = {}
+
+    def run(self) -> ValidationResult:
+        scenario = self.scenario
+        if not scenario.nodes and not scenario.data_sources:
+            self.result.add_error("Scenario has no nodes or data sources", "EMPTY_SCENARIO")
+            return self.result
+
+        for node_id, node in scenario.nodes.items():
+            self._check_node(node_id, node)
+        self._check_cycles()
+        self._check_final_node()
+        for node_id, node in scenario.nodes.items():
+            self._check_columns(node_id, node)
+        return self.result
+
+    # -- per node --------------------------------------------------------
+
+    def _check_node(self, node_id: str, node: Node) -> None:
+        scenario = self.scenario
+        required = _RENDERABLE_KINDS.get(node.kind)
+        if required is None or not isinstance(node, required):
+            self.result.add_error(
+                f"Node {node_id}: unsupported node kind {node.kind.value}"
+                + (f" for {type(node).__name__}" if required is not None else ""),
+                "UNSUPPORTED_NODE_KIND",
+            )
+
+        resolved: List[str] = []
+        for ref in node.inputs:
+            input_id = _clean_input(ref)
+            if input_id in scenario.nodes or input_id in scenario.data_sources:
+                resolved.append(input_id)
+            else:
+                self.result.add_error(
+                    f"Node {node_id}: input {ref} does not match any node or data source",
+                    "DANGLING_INPUT",
+                )
+        self.inputs[node_id] = resolved
+
+        minimum = _MIN_INPUTS.get(node.kind, 1)
+        if len(node.inputs) < minimum:
+            self.result.add_error(
+                f"Node {node_id}: {node.kind.value.lower()} needs at least {minimum} "
+                f"input{'s' if minimum > 1 else ''}, found {len(node.inputs)}",
+                "INSUFFICIENT_INPUTS",
+            )
+
+    # -- graph -----------------------------------------------------------
+
+    def _check_cycles(self) -> None:
+        # Iterative three-colour DFS over node-to-node edges
+        white, grey, black = 0, 1, 2
+        colour = dict.fromkeys(self.scenario.nodes, white)
+        for start in self.scenario.nodes:
+            if colour[start] != white:
+                continue
+            colour[start] = grey
+            path = [start]
+            stack = [iter(self.inputs.get(start, []))]
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    colour[path.pop()] = black
+                    stack.pop()
+                    continue
+                if child not in colour:
+                    continue  # data source
+                if colour[child] == grey:
+                    cycle = path[path.index(child):] + [child]
+                    self.result.add_error(
+                        f"Node {child}: dependency cycle {' -> '.join(cycle)}",
+                        "DEPENDENCY_CYCLE",
+                    )
+                elif colour[child] == white:
+                    colour[child] = grey
+                    path.append(child)
+                    stack.append(iter(self.inputs.get(child, [])))
+
+    def _check_final_node(self) -> None:
+        scenario = self.scenario
+        logical_model = scenario.logical_model
+        if logical_model and logical_model.base_node_id:
+            base = logical_model.base_node_id
+            if base not in scenario.nodes and base not in scenario.data_sources:
+                self.result.add_error(
+                    f"Logical model base node {base} does not match any node or data source",
+                    "MISSING_FINAL_NODE",
+                )
+            return
+        if not scenario.nodes:
+            return  # the view selects from its only data source
+        referenced = {input_id for inputs in self.inputs.values() for input_id in inputs}
+        if all(node_id in referenced for node_id in scenario.nodes):
+            self.result.add_error(
+                "No terminal node found: every node is the input of another node",
+                "MISSING_FINAL_NODE",
+            )
+
+    # -- columns ---------------------------------------------------------
+
+    def _check_columns(self, node_id: str, node: Node) -> None:
+        inputs = self.inputs.get(node_id, [])
+        if not inputs:
+            return
+        produced: Dict[str, Optional[Set[str]]] = {}
+        for input_id in inputs:
+            upstream = self.scenario.nodes.get(input_id)
+            produced[input_id] = _produced_columns(upstream) if upstream is not None else None
+
+        for mapping in node.mappings:
+            expression = mapping.expression
+            if expression.expression_type != ExpressionType.COLUMN or not expression.value:
+                continue
+            candidates = inputs
+            if mapping.source_node:
+                source = _clean_input(mapping.source_node)
+                if source in produced:
+                    candidates = [source]
+            known = [produced[candidate] for candidate in candidates]
+            if any(columns is None for columns in known):
+                continue
+            if not any(expression.value.upper() in columns for columns in known):
+                self.result.add_error(
+                    f"Node {node_id}: column {expression.value} (mapped to {mapping.target_name}) "
+                    f"is not produced by {', '.join(candidates)}",
+                    "UNRESOLVED_COLUMN",
+                )
+
+
+def validate_scenario_ir(scenario: Scenario) -> ValidationResult:
+    """Check the scenario's node graph before any SQL is generated.
+
+    Args:
+        scenario: Scenario IR built from the calculation view
+
+    Returns:
+        ValidationResult whose errors mean no usable SQL can be generated
+    """
+
+    return _IrValidator(scenario).run()
+
+
+__all__ = ["validate_scenario_ir"]
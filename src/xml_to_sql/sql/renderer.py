@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set
 
 from ..domain import (
@@ -23,7 +23,21 @@ from ..domain import (
     UnionNode,
 )
 from ..domain.types import DatabaseMode, HanaVersion, XMLFormat
+from .formula_batch import FormulaBatchStats, collect_formulas, translate_formulas
 from .function_translator import translate_hana_function, translate_raw_formula, _substitute_placeholders
+from .sql_ast import (
+    Cte,
+    Join,
+    Query,
+    RawQuery,
+    Select,
+    SelectItem,
+    SetOperation,
+    SqlStatement,
+    Subquery,
+    TableRef,
+    ViewHeader,
+)
 
 
 @dataclass(slots=True)
@@ -42,6 +56,8 @@ class RenderContext:
     currency_udf: Optional[str] = None
     currency_schema: Optional[str] = None
     currency_table: Optional[str] = None
+    formula_translations: Dict[str, str] = field(default_factory=dict)
+    formula_stats: Optional[FormulaBatchStats] = None
 
     def __init__(
         self,
@@ -68,6 +84,15 @@ class RenderContext:
         self.currency_udf = currency_udf
         self.currency_schema = currency_schema
         self.currency_table = currency_table
+        self.formula_translations = {}
+        self.formula_stats = None
+
+    def translate_formula(self, formula: str) -> str:
+        """Translate a RAW formula, using the scenario's batch translations."""
+        translated = self.formula_translations.get(formula)
+        if translated is None:
+            translated = translate_raw_formula(formula, self)
+        return translated
 
     def get_cte_alias(self, node_id: str) -> str:
         """Get or create a CTE alias for a node."""
@@ -104,7 +129,10 @@ def render_scenario(
     currency_table: Optional[str] = None,
     return_warnings: bool = False,
     validate: bool = True,
-) -> str | tuple[str, list[str]]:
+    formula_translations: Optional[Dict[str, str]] = None,
+    formula_workers: Optional[int] = None,
+    return_ast: bool = False,
+) -> str | tuple:
     """Render a Scenario IR to target database SQL.
     
     Args:
@@ -113,9 +141,17 @@ def render_scenario(
         xml_format: XML format type for context (ColumnView/Calculation:scenario)
         return_warnings: If True, returns (sql, warnings) tuple; otherwise returns sql string only.
         validate: If True, validate the generated SQL (default: True).
+        formula_translations: Precomputed formula translations (see
+            ``formula_batch.translate_formulas``). When omitted, all formulas
+            of the scenario are translated in one batch before rendering.
+        formula_workers: Process pool size for the formula batch (default: serial).
+        return_ast: If True, the statement AST (``sql_ast.SqlStatement``) the
+            SQL was printed from is appended to the return value, so callers
+            can validate and correct it structurally.
     
     Returns:
-        SQL string, or (sql, warnings) tuple if return_warnings=True.
+        SQL string, or (sql, warnings) tuple if return_warnings=True; with
+        return_ast=True the AST is appended: (sql, ast) or (sql, warnings, ast).
     """
 
     ctx = RenderContext(
@@ -130,8 +166,23 @@ def render_scenario(
         currency_schema,
         currency_table,
     )
+    if formula_translations is None:
+        formula_translations, ctx.formula_stats = translate_formulas(
+            collect_formulas(scenario), ctx, max_workers=formula_workers
+        )
+    ctx.formula_translations = formula_translations
+
     ordered_nodes = _topological_sort(scenario)
-    ctes: List[str] = []
+    ctes: List[Cte] = []
+
+    def _result(statement: SqlStatement, sql: str):
+        if return_warnings and return_ast:
+            return sql, ctx.warnings, statement
+        if return_warnings:
+            return sql, ctx.warnings
+        if return_ast:
+            return sql, statement
+        return sql
 
     for node_id in ordered_nodes:
         if node_id in scenario.data_sources:
@@ -140,10 +191,8 @@ def render_scenario(
             ctx.warnings.append(f"Node {node_id} referenced but not found")
             continue
         node = scenario.nodes[node_id]
-        cte_sql = _render_node(ctx, node)
-        if cte_sql:
-            cte_alias = ctx.get_cte_alias(node_id)
-            ctes.append(f"  {cte_alias} AS (\n    {cte_sql.replace(chr(10), chr(10) + '    ')}\n  )")
+        cte_query = _render_node(ctx, node)
+        ctes.append(Cte(ctx.get_cte_alias(node_id), cte_query))
 
     final_node_id = _find_final_node(scenario, ordered_nodes)
     if not final_node_id:
@@ -152,11 +201,11 @@ def render_scenario(
         ctx.warnings.append(error_msg)
         # If no CTEs exist, create a placeholder to avoid invalid SQL
         if not ctes:
-            placeholder_cte = "  final AS (\n    SELECT NULL AS placeholder\n  )"
-            ctes.append(placeholder_cte)
+            ctes.append(Cte("final", RawQuery("SELECT NULL AS placeholder")))
             ctx.cte_aliases["final"] = "final"
-        final_select = "SELECT * FROM final" if ctes else ""
-        sql = _assemble_sql(ctes, final_select, ctx.warnings, scenario=scenario)
+        final_select = Select([SelectItem("*")], TableRef("final"), inline=True)
+        statement = _build_statement(ctes, final_select, ctx.warnings, scenario=scenario)
+        sql = statement.to_sql()
         # Note: We still return SQL with placeholder, but validation will catch this as error
         if validate:
             from .validator import ValidationResult
@@ -165,7 +214,7 @@ def render_scenario(
             if validation_result.has_errors:
                 error_msg_full = "; ".join([str(e) for e in validation_result.errors])
                 raise ValueError(f"SQL validation failed: {error_msg_full}")
-        return (sql, ctx.warnings) if return_warnings else sql
+        return _result(statement, sql)
 
     # Check if final_node_id is a data source (not a rendered CTE)
     if final_node_id in scenario.data_sources:
@@ -174,14 +223,14 @@ def render_scenario(
         
         # If we have a logical model, select its attributes instead of *
         if scenario.logical_model and scenario.logical_model.attributes:
-            select_items: List[str] = []
+            select_items: List[SelectItem] = []
             table_alias = final_node_id
             
             # Add regular attributes from logical model
             for attr in scenario.logical_model.attributes:
                 if attr.column_name:
                     col_expr = f"{from_clause}.{attr.column_name}"
-                    select_items.append(f"{col_expr} AS {_quote_identifier(attr.name)}")
+                    select_items.append(SelectItem(col_expr, _quote_identifier(attr.name)))
             
             # Add calculated attributes from logical model
             for calc_attr in scenario.logical_model.calculated_attributes:
@@ -207,30 +256,27 @@ def render_scenario(
                     col_expr = translate_raw_formula(formula, formula_ctx)
                 else:
                     col_expr = _render_expression(ctx, calc_attr.expression, from_clause)
-                select_items.append(f"{col_expr} AS {_quote_identifier(calc_attr.name)}")
+                select_items.append(SelectItem(col_expr, _quote_identifier(calc_attr.name)))
             
             if select_items:
-                select_clause = ",\n    ".join(select_items)
-                final_select = f"SELECT\n    {select_clause}\nFROM {from_clause}"
+                final_select = Select(select_items, TableRef(from_clause))
             else:
-                final_select = f"SELECT * FROM {from_clause}"
+                final_select = Select([SelectItem("*")], TableRef(from_clause), inline=True)
         else:
-            final_select = f"SELECT * FROM {from_clause}"
+            final_select = Select([SelectItem("*")], TableRef(from_clause), inline=True)
         
-        if create_view:
-            view = view_name or scenario.metadata.scenario_id
-            sql = _assemble_sql(ctes, final_select, ctx.warnings, view_name=view, database_mode=ctx.database_mode, scenario=scenario)
-        else:
-            sql = _assemble_sql(ctes, final_select, ctx.warnings, database_mode=ctx.database_mode, scenario=scenario)
-        return (sql, ctx.warnings) if return_warnings else sql
+        view = (view_name or scenario.metadata.scenario_id) if create_view else None
+        statement = _build_statement(
+            ctes, final_select, ctx.warnings, view_name=view, database_mode=ctx.database_mode, scenario=scenario
+        )
+        return _result(statement, statement.to_sql())
 
     final_alias = ctx.cte_aliases.get(final_node_id, "final")
     # If final_node_id is not in cte_aliases, the node wasn't rendered as a CTE
     # Create a placeholder CTE to avoid invalid SQL
     if final_node_id not in ctx.cte_aliases:
         if not ctes:
-            placeholder_cte = "  final AS (\n    SELECT NULL AS placeholder\n  )"
-            ctes.append(placeholder_cte)
+            ctes.append(Cte("final", RawQuery("SELECT NULL AS placeholder")))
             ctx.cte_aliases["final"] = "final"
             ctx.warnings.append(f"Final node {final_node_id} referenced but not found in CTEs; using placeholder CTE")
         else:
@@ -241,20 +287,22 @@ def render_scenario(
     final_node = scenario.nodes.get(final_node_id)
     if final_node and final_node.view_attributes:
         # Use explicit column list
-        column_list = ", ".join([_quote_identifier(col) for col in final_node.view_attributes])
-        final_select = f"SELECT {column_list} FROM {final_alias}"
+        column_list = [SelectItem(_quote_identifier(col)) for col in final_node.view_attributes]
+        final_select = Select(column_list, TableRef(final_alias), inline=True)
     else:
-        final_select = f"SELECT * FROM {final_alias}"
+        final_select = Select([SelectItem("*")], TableRef(final_alias), inline=True)
 
-    if create_view:
-        view = view_name or scenario.metadata.scenario_id
-        sql = _assemble_sql(ctes, final_select, ctx.warnings, view_name=view, database_mode=ctx.database_mode, scenario=scenario)
-    else:
-        sql = _assemble_sql(ctes, final_select, ctx.warnings, database_mode=ctx.database_mode, scenario=scenario)
+    view = (view_name or scenario.metadata.scenario_id) if create_view else None
+    statement = _build_statement(
+        ctes, final_select, ctx.warnings, view_name=view, database_mode=ctx.database_mode, scenario=scenario
+    )
+    sql = statement.to_sql()
     
     # Validate SQL if enabled
     if validate:
+        from .validation_cache import get_validation_cache, validation_cache_key
         from .validator import (
+            ValidationResult,
             analyze_query_complexity,
             validate_performance,
             validate_query_completeness,
@@ -262,30 +310,37 @@ def render_scenario(
             validate_sql_structure,
         )
         
-        structure_result = validate_sql_structure(sql)
-        completeness_result = validate_query_completeness(scenario, sql, ctx)
-        performance_result = validate_performance(sql, scenario)
-        snowflake_result = validate_snowflake_specific(sql)
-        complexity_result = analyze_query_complexity(sql, scenario)
+        validators = {
+            "SQL Structure": lambda: validate_sql_structure(sql, ast=statement),
+            "Query Completeness": lambda: validate_query_completeness(scenario, sql, ctx, ast=statement),
+            "Performance Checks": lambda: validate_performance(sql, scenario, ast=statement),
+            "Snowflake Specific Checks": lambda: validate_snowflake_specific(sql, ast=statement),
+            "Query Complexity Analysis": lambda: analyze_query_complexity(sql, scenario, ast=statement),
+        }
+        # Shared with the web converter, so CLI reruns of unchanged views skip validation
+        cache = get_validation_cache()
+        cache_key = validation_cache_key(sql, ctx.database_mode, ctx.hana_version, ["render", *validators])
+        cached = cache.get(cache_key)
+        if cached is not None:
+            merged, messages = cached.result, cached.logs
+        else:
+            merged = ValidationResult()
+            messages = []
+            for validate_fn in validators.values():
+                result = validate_fn()
+                merged.merge(result)
+                messages.extend(warning.message for warning in result.warnings)
+                messages.extend(f"Info: {info.message}" for info in result.info)
+            cache.put(cache_key, merged, messages)
         
-        # Merge validation results
-        all_results = [structure_result, completeness_result, performance_result, snowflake_result, complexity_result]
-        if any(r.has_errors for r in all_results):
-            # Collect all errors
-            all_errors = []
-            for r in all_results:
-                all_errors.extend(r.errors)
-            error_msg = "; ".join([str(e) for e in all_errors])
+        if merged.has_errors:
+            error_msg = "; ".join([str(e) for e in merged.errors])
             raise ValueError(f"SQL validation failed: {error_msg}")
         
         # Merge warnings into context warnings
-        for result in all_results:
-            for warning in result.warnings:
-                ctx.warnings.append(warning.message)
-            for info in result.info:
-                ctx.warnings.append(f"Info: {info.message}")
+        ctx.warnings.extend(messages)
     
-    return (sql, ctx.warnings) if return_warnings else sql
+    return _result(statement, sql)
 
 
 def _topological_sort(scenario: Scenario) -> List[str]:
@@ -354,8 +409,8 @@ def _find_final_node(scenario: Scenario, ordered: List[str]) -> Optional[str]:
     return ordered[-1] if ordered else None
 
 
-def _render_node(ctx: RenderContext, node: Node) -> str:
-    """Render a single node to SQL SELECT statement."""
+def _render_node(ctx: RenderContext, node: Node) -> Query:
+    """Render a single node to a SELECT statement AST."""
 
     if node.kind == NodeKind.PROJECTION:
         return _render_projection(ctx, node)
@@ -374,24 +429,24 @@ def _render_node(ctx: RenderContext, node: Node) -> str:
     error_msg = f"Unsupported node type {node.kind} - conversion not possible"
     ctx.warnings.append(error_msg)
     # Still try to render something, but validation will catch this as error
-    return "SELECT 1 AS placeholder"
+    return RawQuery("SELECT 1 AS placeholder")
 
 
-def _render_projection(ctx: RenderContext, node: Node) -> str:
+def _render_projection(ctx: RenderContext, node: Node) -> Query:
     """Render a projection node."""
 
     if not node.inputs:
         ctx.warnings.append(f"Projection {node.node_id} has no inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
     input_id = node.inputs[0].lstrip("#")
     from_clause = _render_from(ctx, input_id)
 
-    columns: List[str] = []
+    columns: List[SelectItem] = []
     target_sql_map: Dict[str, str] = {}
     for mapping in node.mappings:
         col_expr = _render_expression(ctx, mapping.expression, from_clause)
-        columns.append(f"{col_expr} AS {_quote_identifier(mapping.target_name)}")
+        columns.append(SelectItem(col_expr, _quote_identifier(mapping.target_name)))
         target_sql_map[mapping.target_name.upper()] = col_expr
 
     # Collect calculated column names and build a map for expansion
@@ -427,16 +482,14 @@ def _render_projection(ctx: RenderContext, node: Node) -> str:
             )
         
         calc_expr = _render_expression(ctx, expanded_expr, from_clause)
-        columns.append(f"{calc_expr} AS {_quote_identifier(calc_name)}")
+        columns.append(SelectItem(calc_expr, _quote_identifier(calc_name)))
         
         # Store the rendered expression for future expansions
         calc_column_map[calc_name.upper()] = calc_expr
 
     if not columns:
-        columns = ["*"]
+        columns = [SelectItem("*")]
 
-    select_clause = ",\n    ".join(columns)
-    
     # Build target→source name mapping for filter translation
     target_to_source_map = {}
     for mapping in node.mappings:
@@ -533,10 +586,8 @@ def _render_projection(ctx: RenderContext, node: Node) -> str:
             if qualified_where_stripped in ('', '()'):
                 qualified_where = ''
 
-        if qualified_where:
-            sql = f"SELECT * FROM (\n  SELECT\n      {select_clause.replace(chr(10) + '    ', chr(10) + '      ')}\n  FROM {from_clause}\n) AS calc\nWHERE {qualified_where}"
-        else:
-            sql = f"SELECT * FROM (\n  SELECT\n      {select_clause.replace(chr(10) + '    ', chr(10) + '      ')}\n  FROM {from_clause}\n) AS calc"
+        inner = Select(columns, TableRef(from_clause))
+        return Select([SelectItem("*")], Subquery(inner, "calc"), where=qualified_where or None, inline=True)
     else:
         # No subquery needed
         # For HANA mode, still clean up parameter conditions
@@ -547,19 +598,15 @@ def _render_projection(ctx: RenderContext, node: Node) -> str:
             if where_clause_stripped in ('', '()'):
                 where_clause = ''
 
-        sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
-        if where_clause:
-            sql += f"\nWHERE {where_clause}"
-
-    return sql
+        return Select(columns, TableRef(from_clause), where=where_clause or None)
 
 
-def _render_join(ctx: RenderContext, node: JoinNode) -> str:
+def _render_join(ctx: RenderContext, node: JoinNode) -> Query:
     """Render a join node."""
 
     if len(node.inputs) < 2:
         ctx.warnings.append(f"Join {node.node_id} has fewer than 2 inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
     left_id = node.inputs[0].lstrip("#")
     right_id = node.inputs[1].lstrip("#")
@@ -587,9 +634,7 @@ def _render_join(ctx: RenderContext, node: JoinNode) -> str:
         # Still generate SQL with 1=1 but mark as critical issue
         conditions = ["1=1"]
 
-    on_clause = " AND ".join(conditions)
-
-    columns: List[str] = []
+    columns: List[SelectItem] = []
     seen_targets = set()  # Track columns already added to avoid duplicates
     column_map = {}  # BUG-033: Map target column name → source expression for expansion
 
@@ -610,7 +655,7 @@ def _render_join(ctx: RenderContext, node: JoinNode) -> str:
             # Default to left alias if no source_node specified
             source_alias = left_alias
         source_expr = _render_expression(ctx, mapping.expression, source_alias)
-        columns.append(f"{source_expr} AS {_quote_identifier(mapping.target_name)}")
+        columns.append(SelectItem(source_expr, _quote_identifier(mapping.target_name)))
 
         # BUG-033: Store mapping for calculated column expansion
         column_map[mapping.target_name.upper()] = source_expr
@@ -631,16 +676,15 @@ def _render_join(ctx: RenderContext, node: JoinNode) -> str:
                     # Wrap in parentheses for safety
                     formula = re.sub(pattern, f'({col_expr})', formula, flags=re.IGNORECASE)
 
-            calc_expr = translate_raw_formula(formula, ctx)
+            calc_expr = ctx.translate_formula(formula)
         else:
             calc_expr = _render_expression(ctx, calc_attr.expression, left_alias)
 
-        columns.append(f"{calc_expr} AS {_quote_identifier(calc_name)}")
+        columns.append(SelectItem(calc_expr, _quote_identifier(calc_name)))
 
     if not columns:
-        columns = [f"{left_alias}.*", f"{right_alias}.*"]
+        columns = [SelectItem(f"{left_alias}.*"), SelectItem(f"{right_alias}.*")]
 
-    select_clause = ",\n    ".join(columns)
     where_clause = _render_filters(ctx, node.filters, left_alias)
 
     # BUG-022: Clean up parameter conditions for HANA mode
@@ -651,19 +695,20 @@ def _render_join(ctx: RenderContext, node: JoinNode) -> str:
             where_clause = ''
 
     # BUG-028: Use proper FROM rendering for both CTEs and tables, with AS clauses for aliases
-    sql = f"SELECT\n    {select_clause}\nFROM {left_from} AS {left_alias}\n{join_type_str} JOIN {right_from} AS {right_alias} ON {on_clause}"
-    if where_clause:
-        sql += f"\nWHERE {where_clause}"
-
-    return sql
+    return Select(
+        columns,
+        TableRef(left_from, left_alias),
+        joins=[Join(join_type_str, TableRef(right_from, right_alias), conditions)],
+        where=where_clause or None,
+    )
 
 
-def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
+def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> Query:
     """Render an aggregation node."""
 
     if not node.inputs:
         ctx.warnings.append(f"Aggregation {node.node_id} has no inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
     input_id = node.inputs[0].lstrip("#")
     from_clause = _render_from(ctx, input_id)
@@ -688,7 +733,7 @@ def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
             else:
                 group_by_cols.append(_quote_identifier(col_name))
 
-    select_items: List[str] = []
+    select_items: List[SelectItem] = []
     
     # Identify columns that are aggregated (measures, not dimensions)
     aggregated_col_names = set(agg.target_name.upper() for agg in node.aggregations)
@@ -699,7 +744,7 @@ def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
         if (mapping.target_name.upper() not in calc_col_names and 
             mapping.target_name.upper() not in aggregated_col_names):
             col_expr = _render_expression(ctx, mapping.expression, from_clause)
-            select_items.append(f"{col_expr} AS {_quote_identifier(mapping.target_name)}")
+            select_items.append(SelectItem(col_expr, _quote_identifier(mapping.target_name)))
     
     # Note: Don't add group_by columns separately - they're already in mappings
     # The group_by list just determines which columns go in GROUP BY clause
@@ -724,15 +769,14 @@ def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
         else:
             agg_expr = _render_expression(ctx, agg_spec.expression, from_clause)
         
-        select_items.append(f"{agg_func}({agg_expr}) AS {_quote_identifier(agg_spec.target_name)}")
+        select_items.append(SelectItem(f"{agg_func}({agg_expr})", _quote_identifier(agg_spec.target_name)))
 
     # Note: Don't add calculated columns here - they need special handling
     # because they can't be in GROUP BY of the same SELECT
 
     if not select_items:
-        select_items = ["*"]
+        select_items = [SelectItem("*")]
 
-    select_clause = ",\n    ".join(select_items)
     where_clause = _render_filters(ctx, node.filters, from_clause)
 
     # BUG-022: Clean up parameter conditions for HANA mode
@@ -742,29 +786,20 @@ def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
         if where_clause_stripped in ('', '()'):
             where_clause = ''
 
-    # Build GROUP BY clause first
-    group_by_clause = ""
-    if group_by_cols:
-        group_by_clause = f"GROUP BY {', '.join(group_by_cols)}"
-    
+    grouped = Select(select_items, TableRef(from_clause), where=where_clause or None, group_by=group_by_cols)
+
     # Check if there are calculated columns that need to be added AFTER grouping
     has_calc_cols = len(node.calculated_attributes) > 0
     
     if has_calc_cols:
         # Wrap: inner query groups, outer query adds calculated columns
-        inner_sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
-        if where_clause:
-            inner_sql += f"\nWHERE {where_clause}"
-        if group_by_clause:
-            inner_sql += f"\n{group_by_clause}"
-
         # BUG-032: Build calc_column_map for expansion (similar to projections)
         # Some calculated columns reference OTHER calculated columns in the same SELECT
         # Example: WEEKDAY references YEAR, both are in outer SELECT
         calc_column_map = {}  # Maps calc column name → rendered expression
 
         # Outer SELECT adds calculated columns
-        outer_select = ["agg_inner.*"]
+        outer_select = [SelectItem("agg_inner.*")]
         for calc_name, calc_attr in node.calculated_attributes.items():
             # Qualify column refs in formula with agg_inner
             if calc_attr.expression.expression_type == ExpressionType.RAW:
@@ -781,36 +816,29 @@ def _render_aggregation(ctx: RenderContext, node: AggregationNode) -> str:
                 # Then qualify remaining column refs with agg_inner."COLUMN"
                 # Only qualify if not already qualified (not preceded by .)
                 formula = re.sub(r'(?<!\.)"([A-Z_][A-Z0-9_]*)"', r'agg_inner."\1"', formula)
-                calc_expr = translate_raw_formula(formula, ctx)
+                calc_expr = ctx.translate_formula(formula)
             else:
                 calc_expr = _render_expression(ctx, calc_attr.expression, "agg_inner")
 
-            outer_select.append(f"{calc_expr} AS {_quote_identifier(calc_name)}")
+            outer_select.append(SelectItem(calc_expr, _quote_identifier(calc_name)))
 
             # BUG-032: Store rendered expression for future expansions
             calc_column_map[calc_name.upper()] = calc_expr
 
-        outer_clause = ",\n    ".join(outer_select)
-        sql = f"SELECT\n    {outer_clause}\nFROM (\n  {inner_sql.replace(chr(10), chr(10) + '  ')}\n) AS agg_inner"
-    else:
-        # Simple aggregation - no calculated columns
-        sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
-        if where_clause:
-            sql += f"\nWHERE {where_clause}"
-        if group_by_clause:
-            sql += f"\n{group_by_clause}"
+        return Select(outer_select, Subquery(grouped, "agg_inner"))
 
-    return sql
+    # Simple aggregation - no calculated columns
+    return grouped
 
 
-def _render_union(ctx: RenderContext, node: UnionNode) -> str:
+def _render_union(ctx: RenderContext, node: UnionNode) -> Query:
     """Render a union node."""
 
     if len(node.inputs) < 2:
         ctx.warnings.append(f"Union {node.node_id} has fewer than 2 inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
-    union_queries: List[str] = []
+    union_queries: List[Select] = []
     target_columns = list(dict.fromkeys(mapping.target_name for mapping in node.mappings)) if node.mappings else []
 
     for input_id in node.inputs:
@@ -819,22 +847,21 @@ def _render_union(ctx: RenderContext, node: UnionNode) -> str:
 
         input_mappings = [m for m in node.mappings if (m.source_node or "").lstrip("#") == input_id]
         if input_mappings and target_columns:
-            select_items: List[str] = []
+            select_items: List[SelectItem] = []
             for target_col in target_columns:
                 mapping = next((m for m in input_mappings if m.target_name == target_col), None)
                 if mapping:
                     col_expr = _render_expression(ctx, mapping.expression, input_alias)
-                    select_items.append(f"{col_expr} AS {_quote_identifier(target_col)}")
+                    select_items.append(SelectItem(col_expr, _quote_identifier(target_col)))
                 else:
-                    select_items.append(f"NULL AS {_quote_identifier(target_col)}")
-            select_clause = ",\n    ".join(select_items)
+                    select_items.append(SelectItem("NULL", _quote_identifier(target_col)))
         else:
-            select_clause = "*"
+            select_items = [SelectItem("*")]
 
-        union_queries.append(f"SELECT\n    {select_clause}\nFROM {input_alias}")
+        union_queries.append(Select(select_items, TableRef(input_alias)))
 
     union_keyword = "UNION ALL" if node.union_all else "UNION"
-    sql = f"\n{union_keyword}\n".join(union_queries)
+    union = SetOperation(union_keyword, union_queries)
 
     if node.filters:
         where_clause = _render_filters(ctx, node.filters, None)
@@ -847,25 +874,27 @@ def _render_union(ctx: RenderContext, node: UnionNode) -> str:
                 where_clause = ''
 
         if where_clause:
-            sql = f"SELECT * FROM (\n{sql}\n) AS union_result\nWHERE {where_clause}"
+            return Select(
+                [SelectItem("*")], Subquery(union, "union_result", indent=""), where=where_clause, inline=True
+            )
 
-    return sql
+    return union
 
 
-def _render_rank(ctx: RenderContext, node: RankNode) -> str:
+def _render_rank(ctx: RenderContext, node: RankNode) -> Query:
     """Render a rank/window node to SQL."""
 
     if not node.inputs:
         ctx.warnings.append(f"Rank {node.node_id} has no inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
     input_id = node.inputs[0].lstrip("#")
     from_clause = _render_from(ctx, input_id)
 
-    select_items: List[str] = []
+    select_items: List[SelectItem] = []
     for mapping in node.mappings:
         col_expr = _render_expression(ctx, mapping.expression, from_clause)
-        select_items.append(f"{col_expr} AS {_quote_identifier(mapping.target_name)}")
+        select_items.append(SelectItem(col_expr, _quote_identifier(mapping.target_name)))
 
     partition_exprs = [
         _render_column_ref(ctx, col, from_clause) for col in node.partition_by if col
@@ -885,42 +914,39 @@ def _render_rank(ctx: RenderContext, node: RankNode) -> str:
     window_clause = " ".join(window_parts)
 
     rank_expr = f"ROW_NUMBER() OVER ({window_clause})"
-    select_items.append(f"{rank_expr} AS {_quote_identifier(node.rank_column)}")
+    select_items.append(SelectItem(rank_expr, _quote_identifier(node.rank_column)))
 
-    select_clause = ",\n    ".join(select_items)
-    select_sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
+    ranked = Select(select_items, TableRef(from_clause))
 
     if node.threshold is not None:
-        inner_sql = _indent_sql(select_sql)
-        return (
-            "SELECT * FROM (\n"
-            f"{inner_sql}\n"
-            ") AS ranked\n"
-            f"WHERE {_quote_identifier(node.rank_column)} <= {node.threshold}"
+        return Select(
+            [SelectItem("*")],
+            Subquery(ranked, "ranked"),
+            where=f"{_quote_identifier(node.rank_column)} <= {node.threshold}",
+            inline=True,
         )
 
-    return select_sql
+    return ranked
 
 
-def _render_calculation(ctx: RenderContext, node: Node) -> str:
+def _render_calculation(ctx: RenderContext, node: Node) -> Query:
     """Render a calculation node (fallback for unsupported node types)."""
 
     if not node.inputs:
         ctx.warnings.append(f"Calculation {node.node_id} has no inputs")
-        return "SELECT 1 AS placeholder"
+        return RawQuery("SELECT 1 AS placeholder")
 
     input_id = node.inputs[0].lstrip("#")
     from_clause = _render_from(ctx, input_id)
 
-    columns: List[str] = []
+    columns: List[SelectItem] = []
     for mapping in node.mappings:
         col_expr = _render_expression(ctx, mapping.expression, from_clause)
-        columns.append(f"{col_expr} AS {_quote_identifier(mapping.target_name)}")
+        columns.append(SelectItem(col_expr, _quote_identifier(mapping.target_name)))
 
     if not columns:
-        columns = ["*"]
+        columns = [SelectItem("*")]
 
-    select_clause = ",\n    ".join(columns)
     where_clause = _render_filters(ctx, node.filters, from_clause)
 
     # BUG-022: Clean up parameter conditions for HANA mode
@@ -931,15 +957,7 @@ def _render_calculation(ctx: RenderContext, node: Node) -> str:
         if where_clause_stripped in ('', '()'):
             where_clause = ''
 
-    sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
-    if where_clause:
-        sql += f"\nWHERE {where_clause}"
-
-    return sql
-
-
-def _indent_sql(sql: str, indent: str = "  ") -> str:
-    return "\n".join(f"{indent}{line}" for line in sql.splitlines())
+    return Select(columns, TableRef(from_clause), where=where_clause or None)
 
 
 def _render_from(ctx: RenderContext, input_id: str) -> str:
@@ -1039,7 +1057,7 @@ def _render_expression(ctx: RenderContext, expr: Expression, table_alias: Option
     if expr.expression_type == ExpressionType.LITERAL:
         return _render_literal(expr.value, expr.data_type)
     if expr.expression_type == ExpressionType.RAW:
-        translated = translate_raw_formula(expr.value, ctx)
+        translated = ctx.translate_formula(expr.value)
         if translated != expr.value:
             return translated
         result = _substitute_placeholders(expr.value, ctx)
@@ -1643,37 +1661,23 @@ def _quote_identifier(name: str) -> str:
     return _quote_identifier_part(name)
 
 
-def _assemble_sql(
-    ctes: List[str], 
-    final_select: str, 
-    warnings: List[str], 
+def _build_statement(
+    ctes: List[Cte],
+    final_select: Query,
+    warnings: List[str],
     view_name: Optional[str] = None,
     database_mode: DatabaseMode = DatabaseMode.SNOWFLAKE,
     scenario: Optional[Scenario] = None
-) -> str:
-    """Assemble final SQL with CTEs, warnings, and optional CREATE VIEW."""
-
-    lines: List[str] = []
-
-    if warnings:
-        lines.append("-- Warnings:")
-        for warning in warnings:
-            lines.append(f"--   {warning}")
-        lines.append("")
+) -> SqlStatement:
+    """Assemble the statement AST: CTEs, warnings, and optional CREATE VIEW."""
 
+    view = None
     if view_name:
         # Generate mode-specific VIEW statement with parameters
-        view_statement = _generate_view_statement(view_name, database_mode, scenario)
-        lines.append(view_statement)
-    
-    if ctes:
-        lines.append("WITH")
-        lines.append(",\n".join(ctes))
-        lines.append("")
-
-    lines.append(final_select)
+        view = ViewHeader(view_name, _generate_view_statement(view_name, database_mode, scenario))
 
-    return "\n".join(lines)
+    # Warnings are snapshotted: later validation warnings are not part of the SQL
+    return SqlStatement(ctes=ctes, query=final_select, view=view, comments=list(warnings))
 
 
 def _generate_view_statement(view_name: str, mode: DatabaseMode, scenario: Optional[Scenario] = None) -> str:
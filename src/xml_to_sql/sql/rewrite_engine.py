@@ -0,0 +1,283 @@
+"""Compiled rewrite engine for the pattern and function catalogs.
+
+Both catalogs are compiled once: pattern rules get their regex and per-mode
+replacement precompiled, function rules get their ``NAME(`` call regex. Every
+rule also gets an *anchor*, a literal that must occur in a formula for the
+rule to possibly match (the function name, or the longest literal run the
+pattern regex requires). A single scan over the formula with one alternation
+of all anchors tells which rules are candidates; the others are skipped
+without running their regex, so catalog growth no longer slows every formula
+linearly.
+
+Per-rule counters record how often a rule was a candidate, how often it
+changed the formula and the time spent running it.
+
+Pattern rules run under a time limit. A rule that exceeds it leaves the
+formula unchanged and is disabled for the rest of the process.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Pattern, Set
+
+from ..catalog import FunctionRule, PatternRule, RegexTimeout, get_function_catalog, get_pattern_catalog
+from ..catalog.pattern_linter import run_with_timeout
+from ..domain.types import DatabaseMode
+
+logger = logging.getLogger(__name__)
+
+try:  # Python 3.11+
+    from re import _parser as _regex_parser
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _regex_parser  # type: ignore[no-redef]
+
+# Anchors shorter than this would match nearly every formula; such rules
+# always run instead.
+MIN_ANCHOR_LENGTH = 2
+
+# Runtime limit for a single pattern rule application.
+PATTERN_TIMEOUT_MS = 250.0
+
+FunctionCallRewrite = Callable[[str, FunctionRule, Pattern[str]], str]
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Counters for a single catalog rule."""
+
+    name: str
+    kind: str  # 'pattern' or 'function'
+    candidates: int = 0  # prefilter passed, rule regex was run
+    hits: int = 0  # rule changed the formula
+    total_ns: int = 0
+    timeouts: int = 0
+    disabled: bool = False
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1_000_000
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "candidates": self.candidates,
+            "hits": self.hits,
+            "total_ms": round(self.total_ms, 3),
+            "timeouts": self.timeouts,
+            "disabled": self.disabled,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledPattern:
+    rule: PatternRule
+    regex: Pattern[str]
+    anchor: Optional[str]
+    hana: str
+    snowflake: str
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledFunction:
+    rule: FunctionRule
+    regex: Pattern[str]
+    anchor: str
+
+
+def required_literal(pattern: str, flags: int = re.IGNORECASE) -> Optional[str]:
+    """Return the longest literal run every match of ``pattern`` must contain.
+
+    Only the top-level sequence of the regex is inspected: literals inside
+    groups, branches or repeats are not guaranteed to appear. The result is
+    lower-cased. ``None`` means no usable anchor exists.
+    """
+
+    try:
+        parsed = _regex_parser.parse(pattern, flags)
+    except re.error:
+        return None
+
+    literal_code = _regex_parser.LITERAL
+    best = ""
+    current: List[str] = []
+    for op, value in parsed:
+        if op is literal_code:
+            current.append(chr(value))
+            continue
+        if len(current) > len(best):
+            best = "".join(current)
+        current = []
+    if len(current) > len(best):
+        best = "".join(current)
+
+    best = best.lower()
+    return best if len(best) >= MIN_ANCHOR_LENGTH else None
+
+
+class RewriteEngine:
+    """Apply catalog rules to formula text, running only candidate rules."""
+
+    def __init__(
+        self,
+        patterns: Dict[str, PatternRule],
+        functions: Dict[str, FunctionRule],
+        pattern_timeout_ms: float = PATTERN_TIMEOUT_MS,
+    ):
+        self._pattern_timeout_ms = pattern_timeout_ms
+        self._disabled: Set[str] = set()
+        self._patterns = [self._compile_pattern(rule) for rule in patterns.values()]
+        self._functions = [
+            _CompiledFunction(rule, re.compile(rf"\b{re.escape(rule.name)}\s*\(", re.IGNORECASE), rule.name.lower())
+            for rule in functions.values()
+        ]
+
+        anchors = {compiled.anchor for compiled in self._patterns if compiled.anchor}
+        anchors.update(compiled.anchor for compiled in self._functions)
+        # Zero-width lookahead so overlapping anchors are all reported.
+        alternation = "|".join(re.escape(anchor) for anchor in sorted(anchors, key=len, reverse=True))
+        self._anchor_scan: Optional[Pattern[str]] = (
+            re.compile(f"(?=({alternation}))", re.IGNORECASE) if anchors else None
+        )
+        # The scan reports the longest anchor at each position; anchors that
+        # are a prefix of it occur there as well.
+        self._implied: Dict[str, FrozenSet[str]] = {
+            anchor: frozenset(other for other in anchors if anchor.startswith(other)) for anchor in anchors
+        }
+
+        self._stats: Dict[str, RuleStats] = {}
+        for compiled in self._patterns:
+            self._stats[f"pattern:{compiled.rule.name}"] = RuleStats(compiled.rule.name, "pattern")
+        for compiled in self._functions:
+            self._stats[f"function:{compiled.rule.name}"] = RuleStats(compiled.rule.name, "function")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile_pattern(rule: PatternRule) -> _CompiledPattern:
+        # Catalog templates use $1, $2 for capture groups.
+        return _CompiledPattern(
+            rule=rule,
+            regex=re.compile(rule.match, re.IGNORECASE),
+            anchor=required_literal(rule.match),
+            hana=(rule.hana or "").replace("$", "\\"),
+            snowflake=(rule.snowflake or "").replace("$", "\\"),
+        )
+
+    def anchors_in(self, formula: str) -> Set[str]:
+        """Return the anchors (lower-case) that occur in ``formula``."""
+
+        if self._anchor_scan is None:
+            return set()
+        found: Set[str] = set()
+        for match in self._anchor_scan.finditer(formula):
+            found.update(self._implied[match.group(1).lower()])
+        return found
+
+    def apply_patterns(self, formula: str, mode: DatabaseMode) -> str:
+        """Apply pattern rules in catalog order (one ``re.sub`` per candidate)."""
+
+        result = formula
+        present = self.anchors_in(result)
+        for compiled in self._patterns:
+            replacement = compiled.hana if mode == DatabaseMode.HANA else compiled.snowflake
+            if not replacement:
+                continue
+            if compiled.anchor is not None and compiled.anchor not in present:
+                continue
+            if compiled.rule.name in self._disabled:
+                continue
+
+            start = time.perf_counter_ns()
+            try:
+                rewritten = run_with_timeout(
+                    lambda: compiled.regex.sub(replacement, result), self._pattern_timeout_ms
+                )
+            except RegexTimeout as exc:
+                self._disable_pattern(compiled.rule.name, time.perf_counter_ns() - start, exc)
+                continue
+            changed = rewritten != result
+            self._record(f"pattern:{compiled.rule.name}", changed, time.perf_counter_ns() - start)
+            if changed:
+                result = rewritten
+                # Replacements may introduce anchors of later rules.
+                present = self.anchors_in(result)
+        return result
+
+    def apply_functions(self, formula: str, rewrite_call: FunctionCallRewrite) -> str:
+        """Apply function rules in catalog order to calls present in the text.
+
+        Args:
+            formula: Formula text.
+            rewrite_call: Rewrites every call of one rule, given the formula,
+                the rule and its precompiled ``NAME(`` regex.
+        """
+
+        result = formula
+        present = self.anchors_in(result)
+        for compiled in self._functions:
+            if compiled.anchor not in present:
+                continue
+
+            start = time.perf_counter_ns()
+            rewritten = rewrite_call(result, compiled.rule, compiled.regex)
+            changed = rewritten != result
+            self._record(f"function:{compiled.rule.name}", changed, time.perf_counter_ns() - start)
+            if changed:
+                result = rewritten
+                present = self.anchors_in(result)
+        return result
+
+    def _disable_pattern(self, name: str, elapsed_ns: int, exc: RegexTimeout) -> None:
+        logger.warning("Pattern rule %s disabled: %s", name, exc)
+        with self._lock:
+            self._disabled.add(name)
+            stats = self._stats[f"pattern:{name}"]
+            stats.candidates += 1
+            stats.total_ns += elapsed_ns
+            stats.timeouts += 1
+            stats.disabled = True
+
+    def record_function_hit(self, name: str, elapsed_ns: int) -> None:
+        """Count a function rule applied outside the text pipeline (tree rewrites)."""
+
+        self._record(f"function:{name.upper()}", True, elapsed_ns)
+
+    def _record(self, key: str, changed: bool, elapsed_ns: int) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return
+            stats.candidates += 1
+            stats.total_ns += elapsed_ns
+            if changed:
+                stats.hits += 1
+
+    def stats(self) -> List[RuleStats]:
+        """Return a copy of the per-rule counters, in catalog order."""
+
+        with self._lock:
+            return [
+                RuleStats(s.name, s.kind, s.candidates, s.hits, s.total_ns, s.timeouts, s.disabled)
+                for s in self._stats.values()
+            ]
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for stats in self._stats.values():
+                stats.candidates = stats.hits = stats.total_ns = stats.timeouts = 0
+
+
+@lru_cache(maxsize=1)
+def get_rewrite_engine() -> RewriteEngine:
+    """Return the engine compiled from the pattern and function catalogs."""
+
+    return RewriteEngine(get_pattern_catalog(), get_function_catalog())
+
+
+__all__ = ["RewriteEngine", "RuleStats", "get_rewrite_engine", "required_literal"]
@@ -0,0 +1,548 @@
+"""Local catalog of source table columns for column-reference validation.
+
+Column definitions are exported from the source system and loaded into a
+SQLite database indexed by table name. Two export shapes are understood, as
+CSV or JSON (a list of records, or ``{"columns": [...]}``):
+
+* DD03L-like dictionary dumps: ``TABNAME, FIELDNAME, POSITION, DATATYPE,
+  LENG, DECIMALS``; the schema is optional and can be given at import time;
+* HANA ``SYS.TABLE_COLUMNS`` exports: ``SCHEMA_NAME, TABLE_NAME,
+  COLUMN_NAME, POSITION, DATA_TYPE_NAME, LENGTH, SCALE``.
+
+Lookups are made per table, with one query per table however many columns
+are referenced, and results are kept in an in-memory cache so batch runs
+read each table at most once per process. :meth:`SchemaCatalog.warm` loads
+the whole catalog in a single scan.
+
+The validator checks every column that a node maps directly from a
+``DataSource``. Columns missing from a catalogued table are errors; tables
+absent from the catalog are reported once as info and not judged.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..domain import DataSource, DataSourceType, ExpressionType, Scenario
+from .validator import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the catalog database used by the web service
+CATALOG_PATH_ENV = "SCHEMA_CATALOG_PATH"
+
+# Accepted header names per field, in order of preference
+_FIELD_ALIASES = {
+    "schema": ("SCHEMA_NAME", "TABSCHEMA", "SCHEMA"),
+    "table": ("TABNAME", "TABLE_NAME", "TABLE"),
+    "column": ("FIELDNAME", "COLUMN_NAME", "COLUMN"),
+    "position": ("POSITION",),
+    "data_type": ("DATATYPE", "DATA_TYPE_NAME", "DATA_TYPE"),
+    "length": ("LENG", "LENGTH"),
+    "scale": ("DECIMALS", "SCALE"),
+}
+
+_IMPORT_BATCH = 5000
+
+TableKey = Tuple[str, str]  # (SCHEMA or '', TABLE), upper-cased
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogColumn:
+    """One column of a catalogued table."""
+
+    name: str
+    data_type: Optional[str] = None
+    length: Optional[int] = None
+    scale: Optional[int] = None
+
+
+@dataclass(slots=True)
+class CatalogTable:
+    """Columns of one table, keyed by upper-cased column name."""
+
+    schema_name: str
+    table_name: str
+    columns: Dict[str, CatalogColumn] = field(default_factory=dict)
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema_name}.{self.table_name}" if self.schema_name else self.table_name
+
+    def __contains__(self, column: str) -> bool:
+        return column.upper() in self.columns
+
+
+@dataclass(slots=True)
+class CatalogImport:
+    """Outcome of loading one export file."""
+
+    source: str
+    tables: int
+    columns: int
+    skipped: int = 0
+
+
+@dataclass(slots=True)
+class SchemaCatalogStats:
+    """Snapshot of catalog lookup counters."""
+
+    cached_tables: int = 0
+    hits: int = 0
+    misses: int = 0
+    queries: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "cached_tables": self.cached_tables,
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": self.queries,
+        }
+
+
+def _table_key(schema_name: Optional[str], table_name: str) -> TableKey:
+    return ((schema_name or "").strip().upper(), table_name.strip().upper())
+
+
+def _optional_int(value) -> Optional[int]:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+class SchemaCatalog:
+    """SQLite-backed column catalog with a warm in-memory table cache.
+
+    One connection is shared by all threads and guarded by a lock, so the
+    catalog may be a ``:memory:`` database.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:"):
+        """Open (and if needed create) the catalog database.
+
+        Args:
+            db_path: Path to the SQLite catalog file, or ``:memory:``.
+        """
+        self.db_path = str(db_path)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._tables: Dict[TableKey, Optional[CatalogTable]] = {}
+        self._warm: Optional[Dict[str, Dict[str, CatalogTable]]] = None
+        self._hits = 0
+        self._misses = 0
+        self._queries = 0
+        self._fingerprint: Optional[str] = None
+        self._init_database()
+
+    def _init_database(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS table_columns (
+                    schema_name TEXT NOT NULL DEFAULT '',  -- '' for schema-less dictionary dumps
+                    table_name TEXT NOT NULL,
+                    column_name TEXT NOT NULL,
+                    position INTEGER,
+                    data_type TEXT,
+                    length INTEGER,
+                    scale INTEGER,
+                    PRIMARY KEY (schema_name, table_name, column_name)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_imports (
+                    import_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_file TEXT,
+                    table_count INTEGER,
+                    column_count INTEGER,
+                    import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            # Lookups are by table name across schemas
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_table_name
+                ON table_columns(table_name)
+            """)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- loading ---------------------------------------------------------
+
+    def import_file(self, path: Union[str, Path], schema_name: Optional[str] = None) -> CatalogImport:
+        """Load a CSV or JSON export of table definitions.
+
+        Tables in the file replace their previous definitions; other tables
+        are kept.
+
+        Args:
+            path: Export file; ``.json`` files are read as JSON, anything else as CSV
+            schema_name: Schema for records that do not name one
+
+        Returns:
+            Number of tables and columns loaded, and records skipped
+
+        Raises:
+            ValueError: If the file lacks table or column name fields.
+        """
+        source = Path(path).expanduser()
+        if source.suffix.lower() == ".json":
+            data = json.loads(source.read_text(encoding="utf-8"))
+            records = data.get("columns", []) if isinstance(data, dict) else data
+            if not isinstance(records, list):
+                raise ValueError("Catalog JSON must be a list of column records or {'columns': [...]}.")
+        else:
+            with source.open("r", encoding="utf-8-sig", newline="") as handle:
+                sample = handle.read(4096)
+                handle.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+                except csv.Error:
+                    dialect = csv.excel
+                records = list(csv.DictReader(handle, dialect=dialect))
+        return self.import_records(records, schema_name=schema_name, source=str(source))
+
+    def import_records(
+        self,
+        records: Iterable[Mapping[str, object]],
+        schema_name: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> CatalogImport:
+        """Load column records (dicts keyed by export field names)."""
+
+        rows: List[Tuple] = []
+        skipped = 0
+        fields: Optional[Dict[str, Optional[str]]] = None
+        for record in records:
+            normalized = {str(key).strip().upper(): value for key, value in record.items() if key is not None}
+            if fields is None:
+                fields = {
+                    name: next((alias for alias in aliases if alias in normalized), None)
+                    for name, aliases in _FIELD_ALIASES.items()
+                }
+                if fields["table"] is None or fields["column"] is None:
+                    raise ValueError(
+                        "Catalog records need a table name (TABNAME/TABLE_NAME) "
+                        "and a column name (FIELDNAME/COLUMN_NAME)."
+                    )
+
+            def get(name: str):
+                key = fields[name]
+                return normalized.get(key) if key else None
+
+            table = str(get("table") or "").strip()
+            column = str(get("column") or "").strip()
+            # DD03L lists includes and appends as pseudo fields (.INCLUDE, .APPEND)
+            if not table or not column or column.startswith("."):
+                skipped += 1
+                continue
+            schema = str(get("schema") or schema_name or "").strip()
+            data_type = str(get("data_type") or "").strip() or None
+            rows.append((
+                schema.upper(),
+                table.upper(),
+                column.upper(),
+                _optional_int(get("position")),
+                data_type.upper() if data_type else None,
+                _optional_int(get("length")),
+                _optional_int(get("scale")),
+            ))
+
+        tables = {(row[0], row[1]) for row in rows}
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM table_columns WHERE schema_name = ? AND table_name = ?", sorted(tables)
+            )
+            for start in range(0, len(rows), _IMPORT_BATCH):
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO table_columns
+                    (schema_name, table_name, column_name, position, data_type, length, scale)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows[start:start + _IMPORT_BATCH],
+                )
+            self._conn.execute(
+                "INSERT INTO catalog_imports (source_file, table_count, column_count) VALUES (?, ?, ?)",
+                (source, len(tables), len(rows)),
+            )
+            self._tables.clear()
+            self._warm = None
+            self._fingerprint = None
+
+        logger.info("Loaded %d columns of %d tables into schema catalog %s", len(rows), len(tables), self.db_path)
+        return CatalogImport(source or "<records>", len(tables), len(rows), skipped)
+
+    @classmethod
+    def from_mapping(cls, tables: Mapping[str, object]) -> SchemaCatalog:
+        """Build an in-memory catalog from ``{"SCHEMA.TABLE" or "TABLE": columns}``.
+
+        ``columns`` is a list of column names or a mapping of name to data type.
+        """
+        records = []
+        for name, columns in tables.items():
+            schema, _, table = str(name).rpartition(".")
+            items = columns.items() if isinstance(columns, Mapping) else ((column, None) for column in columns)
+            records.extend(
+                {"SCHEMA_NAME": schema, "TABLE_NAME": table, "COLUMN_NAME": column, "DATA_TYPE_NAME": data_type}
+                for column, data_type in items
+            )
+        catalog = cls()
+        if records:
+            catalog.import_records(records, source="<mapping>")
+        return catalog
+
+    # -- lookups ---------------------------------------------------------
+
+    def get_tables(self, keys: Iterable[TableKey]) -> Dict[TableKey, Optional[CatalogTable]]:
+        """Return the catalogued table for each ``(schema, table)`` key.
+
+        Keys already in the cache are answered from memory; every other table
+        costs one indexed query, whatever the number of its columns in use.
+        A key's schema may be empty. When the catalog has no table under the
+        requested schema, a schema-less definition is used, then the only
+        schema that defines the table.
+        """
+        wanted = {_table_key(schema, table) for schema, table in keys}
+        found: Dict[TableKey, Optional[CatalogTable]] = {}
+        with self._lock:
+            missing = []
+            for key in wanted:
+                if key in self._tables:
+                    self._hits += 1
+                    found[key] = self._tables[key]
+                else:
+                    self._misses += 1
+                    missing.append(key)
+            for table_name, group in _group_by_table(missing).items():
+                if self._warm is not None:
+                    by_schema = self._warm.get(table_name, {})
+                else:
+                    self._queries += 1
+                    by_schema = self._read_table(table_name)
+                for key in group:
+                    table = _resolve_schema(by_schema, key[0])
+                    self._tables[key] = found[key] = table
+        return found
+
+    def get_table(self, schema_name: Optional[str], table_name: str) -> Optional[CatalogTable]:
+        return self.get_tables([(schema_name, table_name)])[_table_key(schema_name, table_name)]
+
+    def warm(self) -> int:
+        """Load the whole catalog into memory with one scan.
+
+        Afterwards every lookup, including lookups of tables the catalog does
+        not have, is answered without touching the database.
+
+        Returns:
+            Number of catalogued tables
+        """
+        with self._lock:
+            self._queries += 1
+            by_table: Dict[str, Dict[str, CatalogTable]] = {}
+            for row in self._conn.execute(
+                "SELECT schema_name, table_name, column_name, data_type, length, scale FROM table_columns"
+            ):
+                _add_row(by_table.setdefault(row[1], {}), row)
+            self._warm = by_table
+            return len(by_table)
+
+    def clear_cache(self) -> None:
+        """Drop cached tables, e.g. after another process imported new definitions."""
+
+        with self._lock:
+            self._tables.clear()
+            self._warm = None
+            self._fingerprint = None
+            self._hits = self._misses = self._queries = 0
+
+    def stats(self) -> SchemaCatalogStats:
+        with self._lock:
+            return SchemaCatalogStats(
+                cached_tables=len(self._tables), hits=self._hits, misses=self._misses, queries=self._queries
+            )
+
+    @property
+    def fingerprint(self) -> str:
+        """Short digest of the catalog contents, for cache keys."""
+
+        with self._lock:
+            if self._fingerprint is None:
+                digest = hashlib.sha256(self.db_path.encode("utf-8"))
+                for row in self._conn.execute("SELECT * FROM catalog_imports ORDER BY import_id"):
+                    digest.update(repr(row).encode("utf-8"))
+                if self.db_path == ":memory:":
+                    # In-memory catalogs are small; their import log is not unique
+                    for row in self._conn.execute("SELECT * FROM table_columns ORDER BY 1, 2, 3"):
+                        digest.update(repr(row).encode("utf-8"))
+                self._fingerprint = digest.hexdigest()[:16]
+            return self._fingerprint
+
+    def _read_table(self, table_name: str) -> Dict[str, CatalogTable]:
+        by_schema: Dict[str, CatalogTable] = {}
+        for row in self._conn.execute(
+            """
+            SELECT schema_name, table_name, column_name, data_type, length, scale
+            FROM table_columns WHERE table_name = ?
+            """,
+            (table_name,),
+        ):
+            _add_row(by_schema, row)
+        return by_schema
+
+
+def _add_row(by_schema: Dict[str, CatalogTable], row: Sequence) -> None:
+    schema, table_name, column, data_type, length, scale = row
+    table = by_schema.get(schema)
+    if table is None:
+        table = by_schema[schema] = CatalogTable(schema, table_name)
+    table.columns[column] = CatalogColumn(column, data_type, length, scale)
+
+
+def _group_by_table(keys: Iterable[TableKey]) -> Dict[str, List[TableKey]]:
+    groups: Dict[str, List[TableKey]] = {}
+    for key in keys:
+        groups.setdefault(key[1], []).append(key)
+    return groups
+
+
+def _resolve_schema(by_schema: Dict[str, CatalogTable], schema: str) -> Optional[CatalogTable]:
+    if schema in by_schema:
+        return by_schema[schema]
+    if "" in by_schema:
+        return by_schema[""]
+    if len(by_schema) == 1:
+        return next(iter(by_schema.values()))
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_default_catalog() -> Optional[SchemaCatalog]:
+    """Return the catalog named by ``SCHEMA_CATALOG_PATH``, opened once per process."""
+
+    path = os.getenv(CATALOG_PATH_ENV)
+    if not path:
+        return None
+    if not Path(path).expanduser().exists():
+        logger.warning("Ignoring schema catalog %s: file not found", path)
+        return None
+    try:
+        return SchemaCatalog(Path(path).expanduser())
+    except sqlite3.Error as exc:
+        logger.warning("Ignoring schema catalog %s: %s", path, exc)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Validation
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnReference:
+    """A column a node reads directly from a data source."""
+
+    node_id: str
+    source_id: str
+    column: str
+    target_name: str
+
+
+def collect_column_references(scenario: Scenario) -> List[ColumnReference]:
+    """List every column that a node maps directly from a ``DataSource``."""
+
+    from ..parser.scenario_parser import _clean_ref
+
+    def clean(value: str) -> str:
+        return re.sub(r"^\d+/", "", _clean_ref(value))
+
+    references: List[ColumnReference] = []
+    for node_id, node in scenario.nodes.items():
+        inputs = [clean(ref) for ref in node.inputs]
+        sources = [input_id for input_id in inputs if input_id in scenario.data_sources]
+        if not sources:
+            continue
+        for mapping in node.mappings:
+            expression = mapping.expression
+            if expression.expression_type != ExpressionType.COLUMN or not expression.value:
+                continue
+            if mapping.source_node:
+                source = clean(mapping.source_node)
+            elif len(inputs) == 1:
+                source = inputs[0]
+            else:
+                continue
+            if source in scenario.data_sources:
+                references.append(ColumnReference(node_id, source, expression.value, mapping.target_name))
+    return references
+
+
+def check_column_references(scenario: Scenario, catalog: SchemaCatalog) -> ValidationResult:
+    """Check data source column references against ``catalog`` in bulk.
+
+    Args:
+        scenario: Scenario IR whose node mappings are checked
+        catalog: Column catalog to check against
+
+    Returns:
+        ValidationResult with an error per column missing from its table
+    """
+    result = ValidationResult()
+    references = collect_column_references(scenario)
+    if not references:
+        return result
+
+    def key(data_source: DataSource) -> TableKey:
+        return _table_key(data_source.schema_name, data_source.object_name or data_source.source_id)
+
+    used = {ref.source_id: scenario.data_sources[ref.source_id] for ref in references}
+    tables = catalog.get_tables(key(data_source) for data_source in used.values())
+
+    for source_id, data_source in used.items():
+        if tables[key(data_source)] is None and data_source.source_type in (
+            DataSourceType.TABLE,
+            DataSourceType.VIEW,
+        ):
+            name = f"{data_source.schema_name}.{data_source.object_name}" if data_source.schema_name else data_source.object_name
+            result.add_info(
+                f"Data source {source_id}: {name} is not in the schema catalog; its columns were not checked",
+                "TABLE_NOT_IN_CATALOG",
+            )
+
+    for ref in references:
+        table = tables[key(scenario.data_sources[ref.source_id])]
+        if table is not None and ref.column not in table:
+            result.add_error(
+                f"Node {ref.node_id}: column {ref.column} (mapped to {ref.target_name}) "
+                f"does not exist in {table.qualified_name}",
+                "UNKNOWN_COLUMN",
+            )
+    return result
+
+
+__all__ = [
+    "CATALOG_PATH_ENV",
+    "CatalogColumn",
+    "CatalogImport",
+    "CatalogTable",
+    "ColumnReference",
+    "SchemaCatalog",
+    "SchemaCatalogStats",
+    "check_column_references",
+    "collect_column_references",
+    "get_default_catalog",
+]
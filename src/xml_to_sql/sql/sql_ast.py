@@ -0,0 +1,322 @@
+"""Lightweight AST for the SQL produced by the renderer.
+
+The renderer knows the structure of every statement it emits: the view
+header, the CTEs, and for each SELECT its items, FROM source, joins and
+predicates. Instead of concatenating text and having the validator and the
+auto-corrector reverse-engineer that structure, the renderer builds these
+nodes and prints them once with :func:`print_statement`.
+
+Expressions, predicates and table references stay pre-rendered strings;
+only the statement skeleton is structured.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+
+@dataclass(slots=True)
+class SelectItem:
+    """One entry of a SELECT list: ``expression [AS alias]``."""
+
+    expression: str
+    alias: Optional[str] = None
+
+
+@dataclass(slots=True)
+class TableRef:
+    """A table, view or CTE name, optionally aliased."""
+
+    name: str
+    alias: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Subquery:
+    """A derived table: ``(query) AS alias``; ``indent`` prefixes each inner line."""
+
+    query: "Query"
+    alias: str
+    indent: str = "  "
+
+
+@dataclass(slots=True)
+class Join:
+    """``<join_type> JOIN source ON condition AND ...``."""
+
+    join_type: str
+    source: TableRef
+    conditions: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Select:
+    """A single SELECT block.
+
+    ``inline`` prints ``SELECT a, b FROM x`` on one line instead of one item
+    per line.
+    """
+
+    items: List[SelectItem]
+    source: Union[TableRef, Subquery]
+    joins: List[Join] = field(default_factory=list)
+    where: Optional[str] = None
+    group_by: List[str] = field(default_factory=list)
+    inline: bool = False
+
+
+@dataclass(slots=True)
+class SetOperation:
+    """SELECTs combined with ``UNION`` / ``UNION ALL``."""
+
+    operator: str
+    queries: List[Select]
+
+
+@dataclass(slots=True)
+class RawQuery:
+    """A query kept as text (placeholders for nodes that cannot be rendered)."""
+
+    text: str
+
+
+Query = Union[Select, SetOperation, RawQuery]
+
+
+@dataclass(slots=True)
+class Cte:
+    """``name AS (query)`` inside the WITH clause."""
+
+    name: str
+    query: Query
+
+
+@dataclass(slots=True)
+class ViewHeader:
+    """The DDL emitted before the query, e.g. ``CREATE OR REPLACE VIEW ... AS``."""
+
+    name: str
+    statement: str
+
+
+@dataclass(slots=True)
+class SqlStatement:
+    """A complete rendered statement."""
+
+    ctes: List[Cte]
+    query: Query
+    view: Optional[ViewHeader] = None
+    comments: List[str] = field(default_factory=list)
+
+    def to_sql(self) -> str:
+        return print_statement(self)
+
+    def to_sql_with_lines(self) -> Tuple[str, List[int]]:
+        return print_statement_with_lines(self)
+
+
+# ---------------------------------------------------------------------------
+# Printing
+
+
+def print_query(query: Query) -> str:
+    """Render a query node to SQL text."""
+
+    if isinstance(query, Select):
+        return _print_select(query)
+    if isinstance(query, SetOperation):
+        return f"\n{query.operator}\n".join(_print_select(select) for select in query.queries)
+    return query.text
+
+
+def _print_select_item(item: SelectItem) -> str:
+    return f"{item.expression} AS {item.alias}" if item.alias else item.expression
+
+
+def _print_table_ref(ref: TableRef) -> str:
+    return f"{ref.name} AS {ref.alias}" if ref.alias else ref.name
+
+
+def _print_source(source: Union[TableRef, Subquery]) -> str:
+    if isinstance(source, Subquery):
+        inner = print_query(source.query)
+        if source.indent:
+            inner = source.indent + inner.replace("\n", "\n" + source.indent)
+        return f"(\n{inner}\n) AS {source.alias}"
+    return _print_table_ref(source)
+
+
+def _print_select(select: Select) -> str:
+    items = [_print_select_item(item) for item in select.items]
+    if select.inline:
+        sql = f"SELECT {', '.join(items)} FROM {_print_source(select.source)}"
+    else:
+        select_clause = ",\n    ".join(items)
+        sql = f"SELECT\n    {select_clause}\nFROM {_print_source(select.source)}"
+    for join in select.joins:
+        sql += f"\n{join.join_type} JOIN {_print_table_ref(join.source)} ON {' AND '.join(join.conditions)}"
+    if select.where:
+        sql += f"\nWHERE {select.where}"
+    if select.group_by:
+        sql += f"\nGROUP BY {', '.join(select.group_by)}"
+    return sql
+
+
+def print_cte(cte: Cte) -> str:
+    body = print_query(cte.query).replace("\n", "\n    ")
+    return f"  {cte.name} AS (\n    {body}\n  )"
+
+
+def print_statement(statement: SqlStatement) -> str:
+    """Render a statement: warning comments, view header, WITH clause, query."""
+
+    lines: List[str] = []
+
+    if statement.comments:
+        lines.append("-- Warnings:")
+        for comment in statement.comments:
+            lines.append(f"--   {comment}")
+        lines.append("")
+
+    if statement.view is not None:
+        lines.append(statement.view.statement)
+
+    if statement.ctes:
+        lines.append("WITH")
+        lines.append(",\n".join(print_cte(cte) for cte in statement.ctes))
+        lines.append("")
+
+    lines.append(print_query(statement.query))
+
+    return "\n".join(lines)
+
+
+# Prefixed to each expression while printing with line numbers; cannot occur in SQL text
+_LINE_MARK = re.compile(r"\x00(\d+)\x00")
+
+
+def print_statement_with_lines(statement: SqlStatement) -> Tuple[str, List[int]]:
+    """Render a statement and record where its expressions start.
+
+    Returns:
+        Tuple of (sql, lines): ``lines[i]`` is the 1-based line of the
+        printed SQL on which the i-th expression visited by
+        :func:`map_expressions` starts.
+    """
+
+    count = 0
+
+    def mark(text: str) -> str:
+        nonlocal count
+        count += 1
+        return f"\x00{count - 1}\x00{text}"
+
+    map_expressions(statement, mark)
+    try:
+        marked = print_statement(statement)
+    finally:
+        map_expressions(statement, lambda text: _LINE_MARK.sub("", text, count=1))
+
+    # Indentation is only ever added after line breaks, so the marks sit on
+    # the lines their expressions are printed on
+    lines = [0] * count
+    line, position = 1, 0
+    for match in _LINE_MARK.finditer(marked):
+        line += marked.count("\n", position, match.start())
+        position = match.start()
+        lines[int(match.group(1))] = line
+    return _LINE_MARK.sub("", marked), lines
+
+
+# ---------------------------------------------------------------------------
+# Traversal
+
+
+def walk_query(query: Query) -> Iterator[Query]:
+    """Yield ``query`` and every query nested in it (union branches, derived tables)."""
+
+    yield query
+    if isinstance(query, SetOperation):
+        for select in query.queries:
+            yield from walk_query(select)
+    elif isinstance(query, Select) and isinstance(query.source, Subquery):
+        yield from walk_query(query.source.query)
+
+
+def iter_queries(statement: SqlStatement) -> Iterator[Query]:
+    """Yield every query node: CTE bodies, the main query and all subqueries."""
+
+    for cte in statement.ctes:
+        yield from walk_query(cte.query)
+    yield from walk_query(statement.query)
+
+
+def iter_selects(statement: SqlStatement) -> Iterator[Select]:
+    """Yield every SELECT block of ``statement``."""
+
+    for query in iter_queries(statement):
+        if isinstance(query, Select):
+            yield query
+
+
+def iter_table_refs(statement: SqlStatement) -> Iterator[tuple]:
+    """Yield ``("FROM" | "JOIN", TableRef)`` for every table reference."""
+
+    for select in iter_selects(statement):
+        if isinstance(select.source, TableRef):
+            yield "FROM", select.source
+        for join in select.joins:
+            yield "JOIN", join.source
+
+
+def map_expressions(statement: SqlStatement, func: Callable[[str], str]) -> int:
+    """Apply ``func`` to every expression and predicate in place.
+
+    Covers select items, join conditions, WHERE clauses and GROUP BY
+    expressions. Returns the number of expressions that changed.
+    """
+
+    changed = 0
+
+    def apply(text: str) -> str:
+        nonlocal changed
+        result = func(text)
+        if result != text:
+            changed += 1
+        return result
+
+    for select in iter_selects(statement):
+        for item in select.items:
+            item.expression = apply(item.expression)
+        for join in select.joins:
+            join.conditions = [apply(condition) for condition in join.conditions]
+        if select.where:
+            select.where = apply(select.where)
+        select.group_by = [apply(expression) for expression in select.group_by]
+    return changed
+
+
+__all__ = [
+    "Cte",
+    "Join",
+    "Query",
+    "RawQuery",
+    "Select",
+    "SelectItem",
+    "SetOperation",
+    "SqlStatement",
+    "Subquery",
+    "TableRef",
+    "ViewHeader",
+    "iter_queries",
+    "iter_selects",
+    "iter_table_refs",
+    "map_expressions",
+    "print_cte",
+    "print_query",
+    "print_statement",
+    "print_statement_with_lines",
+    "walk_query",
+]
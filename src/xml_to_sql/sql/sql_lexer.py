@@ -0,0 +1,235 @@
+"""Single-pass lexer for generated SQL.
+
+The validators used to run dozens of independent regexes over the raw SQL
+text. Besides rescanning the same (often very large) statement many times,
+that matched keywords inside string literals, comments and quoted
+identifiers. This module tokenizes a statement once, with positions, line
+numbers and parenthesis depth, and drives any number of visitors over the
+resulting token stream in a single walk.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class SqlTokenKind(str, Enum):
+    """Lexical category of a SQL token."""
+
+    WORD = "word"  # keyword or unquoted identifier
+    QUOTED_IDENT = "quoted_ident"
+    STRING = "string"
+    NUMBER = "number"
+    OPERATOR = "operator"
+    PUNCT = "punct"  # ( ) , . ;
+    COMMENT = "comment"
+
+
+@dataclass(frozen=True, slots=True)
+class SqlToken:
+    """One token of a SQL statement.
+
+    ``key`` is what visitors dispatch on: the upper-cased text for words,
+    the literal text for operators and punctuation, and the text itself for
+    everything else (literals and quoted identifiers keep their quotes, so
+    they can never collide with a keyword).
+    """
+
+    kind: SqlTokenKind
+    text: str
+    key: str
+    start: int
+    line: int
+    column: int
+    depth: int
+    terminated: bool = True
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<WS>\s+)
+  | (?P<COMMENT>--[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<STRING>[Nn]?'(?:[^']|'')*(?:'|\Z))
+  | (?P<QUOTED>"(?:[^"]|"")*(?:"|\Z))
+  | (?P<NUMBER>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<WORD>[A-Za-z_][A-Za-z0-9_$#]*)
+  | (?P<OP>::|\|\||<>|!=|<=|>=|=>|[-+*/%=<>!|&^~?:@$])
+  | (?P<PUNCT>[(),.;])
+  | (?P<OTHER>.)
+    """,
+    re.VERBOSE,
+)
+
+_KINDS = {
+    "COMMENT": SqlTokenKind.COMMENT,
+    "STRING": SqlTokenKind.STRING,
+    "QUOTED": SqlTokenKind.QUOTED_IDENT,
+    "NUMBER": SqlTokenKind.NUMBER,
+    "WORD": SqlTokenKind.WORD,
+    "OP": SqlTokenKind.OPERATOR,
+    "PUNCT": SqlTokenKind.PUNCT,
+    "OTHER": SqlTokenKind.OPERATOR,
+}
+
+
+def _scan(sql: str) -> Tuple[SqlToken, ...]:
+    tokens: List[SqlToken] = []
+    append = tokens.append
+    line = 1
+    line_start = 0
+    depth = 0
+    for match in _TOKEN_PATTERN.finditer(sql):
+        group = match.lastgroup
+        text = match.group()
+        start = match.start()
+        if group == "WS":
+            newlines = text.count("\n")
+            if newlines:
+                line += newlines
+                line_start = start + text.rindex("\n") + 1
+            continue
+
+        kind = _KINDS[group]
+        terminated = True
+        if kind is SqlTokenKind.WORD:
+            key = text.upper()
+        else:
+            key = text
+            if kind is SqlTokenKind.STRING:
+                body = text[1:] if text[0] in "Nn" else text
+                terminated = len(body) >= 2 and not _ends_in_escape(body, "'")
+            elif kind is SqlTokenKind.QUOTED_IDENT:
+                terminated = len(text) >= 2 and not _ends_in_escape(text, '"')
+            elif kind is SqlTokenKind.COMMENT and text.startswith("/*"):
+                terminated = len(text) >= 4 and text.endswith("*/")
+
+        if text == ")":
+            depth = max(0, depth - 1)
+        append(SqlToken(kind, text, key, start, line, start - line_start + 1, depth, terminated))
+        if text == "(":
+            depth += 1
+
+        if "\n" in text:
+            line += text.count("\n")
+            line_start = start + text.rindex("\n") + 1
+    return tuple(tokens)
+
+
+def _ends_in_escape(literal: str, quote: str) -> bool:
+    """True if ``literal`` ran to the end of input without a closing quote.
+
+    ``'abc''`` is consumed whole by the pattern at end of input, but its
+    trailing quote pair is an escape, not a terminator.
+    """
+
+    inner = literal[1:]
+    run = len(inner) - len(inner.rstrip(quote))
+    return run % 2 == 0
+
+
+@lru_cache(maxsize=32)
+def _tokenize_cached(sql: str) -> Tuple[Tuple[SqlToken, ...], Tuple[SqlToken, ...]]:
+    all_tokens = _scan(sql)
+    significant = tuple(token for token in all_tokens if token.kind is not SqlTokenKind.COMMENT)
+    return all_tokens, significant
+
+
+def tokenize_sql(sql: str, include_comments: bool = False) -> Tuple[SqlToken, ...]:
+    """Tokenize ``sql`` once; repeated calls for the same text are cached.
+
+    Args:
+        sql: SQL text.
+        include_comments: Keep comment tokens in the stream.
+
+    Returns:
+        Tuple of tokens in source order (whitespace is never included).
+    """
+
+    all_tokens, significant = _tokenize_cached(sql)
+    return all_tokens if include_comments else significant
+
+
+def token_at(tokens: Sequence[SqlToken], index: int) -> Optional[SqlToken]:
+    """Return ``tokens[index]`` or ``None`` when out of range."""
+
+    if 0 <= index < len(tokens):
+        return tokens[index]
+    return None
+
+
+def key_at(tokens: Sequence[SqlToken], index: int) -> str:
+    """Return the dispatch key at ``index``, or ``""`` when out of range."""
+
+    if 0 <= index < len(tokens):
+        return tokens[index].key
+    return ""
+
+
+Handler = Callable[[Sequence[SqlToken], int], None]
+
+
+class SqlVisitor:
+    """Base class for checks that run over the token stream.
+
+    Subclasses return a mapping from token key (e.g. ``"JOIN"``, ``"("``) or
+    token kind (e.g. ``SqlTokenKind.STRING``) to a handler in
+    :meth:`handlers`. The walker only calls a handler for tokens it
+    registered for, then calls :meth:`finish` once the stream is exhausted.
+    """
+
+    def handlers(self) -> Dict[object, Handler]:
+        return {}
+
+    def finish(self, tokens: Sequence[SqlToken]) -> None:
+        pass
+
+
+def walk_tokens(tokens: Sequence[SqlToken], visitors: Iterable[SqlVisitor]) -> None:
+    """Drive ``visitors`` over ``tokens`` in one pass."""
+
+    visitors = list(visitors)
+    dispatch: Dict[object, List[Handler]] = {}
+    for visitor in visitors:
+        for key, handler in visitor.handlers().items():
+            dispatch.setdefault(key, []).append(handler)
+
+    if dispatch:
+        get = dispatch.get
+        for index, token in enumerate(tokens):
+            by_key = get(token.key)
+            if by_key:
+                for handler in by_key:
+                    handler(tokens, index)
+            by_kind = get(token.kind)
+            if by_kind:
+                for handler in by_kind:
+                    handler(tokens, index)
+
+    for visitor in visitors:
+        visitor.finish(tokens)
+
+
+def walk_sql(sql: str, visitors: Iterable[SqlVisitor]) -> None:
+    """Tokenize ``sql`` (cached) and drive ``visitors`` over it in one pass."""
+
+    walk_tokens(tokenize_sql(sql), visitors)
+
+
+__all__ = [
+    "SqlToken",
+    "SqlTokenKind",
+    "SqlVisitor",
+    "key_at",
+    "token_at",
+    "tokenize_sql",
+    "walk_sql",
+    "walk_tokens",
+]
@@ -0,0 +1,152 @@
+"""Bounded LRU cache for translated formulas.
+
+The same calculated-column formulas (client/language filters, date
+arithmetic, ``IF(ISNULL(...))`` idioms) recur across many calculation views.
+Translation only depends on the formula text, the target database, the HANA
+version and the ``$$client$$``/``$$language$$`` substitution values, so the
+result can be reused across nodes, scenarios and batch runs.
+
+The cache is shared by all web workers and is guarded by a lock.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Snapshot of translation cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def since(self, earlier: "CacheStats") -> "CacheStats":
+        """Return the counters accumulated after ``earlier`` was taken."""
+
+        return CacheStats(
+            hits=self.hits - earlier.hits,
+            misses=self.misses - earlier.misses,
+            evictions=self.evictions - earlier.evictions,
+            size=self.size,
+            max_entries=self.max_entries,
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": self.size,
+            "max_entries": self.max_entries,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class TranslationCache:
+    """Thread-safe LRU mapping from a translation key to translated SQL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached value for ``key`` (marking it recently used)."""
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Store ``value``, evicting the least recently used entry if full."""
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], str]) -> str:
+        """Return the cached value or compute, store and return it.
+
+        ``compute`` runs outside the lock; two threads missing on the same key
+        may both translate it, which is harmless since translation is pure.
+        """
+
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def resize(self, max_entries: int) -> None:
+        """Change the capacity, evicting entries that no longer fit."""
+
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        with self._lock:
+            self._max_entries = max_entries
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_entries=self._max_entries,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_formula_cache = TranslationCache()
+
+
+def get_formula_cache() -> TranslationCache:
+    """Return the process-wide formula translation cache."""
+
+    return _formula_cache
+
+
+__all__ = ["CacheStats", "DEFAULT_MAX_ENTRIES", "TranslationCache", "get_formula_cache"]
@@ -0,0 +1,285 @@
+"""Content-addressed cache of SQL validation results.
+
+Unchanged calculation views are regenerated to byte-identical SQL (regression
+runs, reconversions from the history UI), and validating that SQL again
+yields the same result. Entries are keyed by the SHA-256 of the SQL, the
+database mode, the HANA version, :data:`VALIDATOR_SET_VERSION` and the names
+of the validators that ran.
+
+Two layers are consulted in order:
+
+* an in-process LRU, shared by all threads of a worker;
+* an optional directory of JSON files (``VALIDATION_CACHE_DIR``), shared by
+  CLI runs and web workers. Files are written atomically, so concurrent
+  writers never expose a partial entry.
+
+An entry may also carry the JSON reports produced alongside the result
+(the cost estimate and the dry run), so a hit can show them without
+running those validators again.
+
+Bump :data:`VALIDATOR_SET_VERSION` whenever a validator's rules change so
+stale entries are no longer found.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from ..domain.types import DatabaseMode, HanaVersion
+from .validator import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+VALIDATOR_SET_VERSION = "2"
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# Directory of the shared on-disk layer; unset disables it
+CACHE_DIR_ENV = "VALIDATION_CACHE_DIR"
+
+
+def validation_cache_key(
+    sql: str,
+    database_mode: DatabaseMode,
+    hana_version: Optional[HanaVersion],
+    validators: Sequence[str],
+) -> str:
+    """Return the hex SHA-256 identifying one validation of ``sql``."""
+
+    digest = hashlib.sha256()
+    for part in (
+        VALIDATOR_SET_VERSION,
+        database_mode.value,
+        hana_version.value if hana_version else "",
+        "\x1f".join(validators),
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(sql.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class CachedValidation:
+    """A cache hit: a fresh copy of the stored result, its validator logs and reports."""
+
+    result: ValidationResult
+    logs: List[str]
+    layer: str  # 'memory' or 'disk'
+    reports: Dict[str, object] = field(default_factory=dict)
+
+    def hit_log_line(self, key: str) -> str:
+        return f"Validation cache: HIT ({self.layer}, key {key[:12]})"
+
+
+@dataclass(slots=True)
+class ValidationCacheStats:
+    """Snapshot of validation cache counters."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    size: int = 0
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    directory: Optional[str] = None
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def to_dict(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "size": self.size,
+            "max_entries": self.max_entries,
+            "directory": self.directory,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@dataclass(slots=True)
+class _Entry:
+    result: Dict[str, object]
+    logs: List[str] = field(default_factory=list)
+    reports: Dict[str, object] = field(default_factory=dict)
+
+
+class ValidationCache:
+    """Thread-safe two-layer cache from a validation key to its result.
+
+    Entries are stored serialized, so every hit returns an independent
+    ValidationResult that callers may modify.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Union[str, Path, None] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @property
+    def directory(self) -> Optional[Path]:
+        return self._directory
+
+    def get(self, key: str) -> Optional[CachedValidation]:
+        """Return the cached validation for ``key``, or None on a miss."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return _hit(entry, "memory")
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(key, entry)
+        return _hit(entry, "disk")
+
+    def put(
+        self,
+        key: str,
+        result: ValidationResult,
+        logs: Sequence[str] = (),
+        reports: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Store ``result`` in memory and, if configured, on disk.
+
+        ``reports`` maps names to JSON-serializable reports returned with the
+        result on a hit.
+        """
+
+        entry = _Entry(result.to_dict(), list(logs), dict(reports or {}))
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset the counters (disk files are kept)."""
+
+        with self._lock:
+            self._entries.clear()
+            self._memory_hits = self._disk_hits = self._misses = 0
+
+    def stats(self) -> ValidationCacheStats:
+        with self._lock:
+            return ValidationCacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                size=len(self._entries),
+                max_entries=self._max_entries,
+                directory=str(self._directory) if self._directory else None,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[_Entry]:
+        if self._directory is None:
+            return None
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return _Entry(data["result"], list(data.get("logs", [])), dict(data.get("reports", {})))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable validation cache entry %s: %s", path, exc)
+            return None
+
+    def _write_disk(self, key: str, entry: _Entry) -> None:
+        if self._directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump({"result": entry.result, "logs": entry.logs, "reports": entry.reports}, handle)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as exc:
+            logger.warning("Could not write validation cache entry %s: %s", path, exc)
+
+
+def _hit(entry: _Entry, layer: str) -> CachedValidation:
+    # Reports are plain JSON; a round trip gives the caller its own copy
+    reports = json.loads(json.dumps(entry.reports)) if entry.reports else {}
+    return CachedValidation(ValidationResult.from_dict(entry.result), list(entry.logs), layer, reports)
+
+
+_validation_cache: Optional[ValidationCache] = None
+_validation_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> ValidationCache:
+    """Return the process-wide validation cache.
+
+    The on-disk layer is enabled when ``VALIDATION_CACHE_DIR`` is set.
+    """
+
+    global _validation_cache
+    if _validation_cache is None:
+        with _validation_cache_lock:
+            if _validation_cache is None:
+                _validation_cache = ValidationCache(directory=os.getenv(CACHE_DIR_ENV) or None)
+    return _validation_cache
+
+
+def configure_validation_cache(
+    directory: Union[str, Path, None] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> ValidationCache:
+    """Replace the process-wide cache, e.g. to point the CLI at a shared directory."""
+
+    global _validation_cache
+    with _validation_cache_lock:
+        _validation_cache = ValidationCache(max_entries=max_entries, directory=directory)
+    return _validation_cache
+
+
+__all__ = [
+    "CACHE_DIR_ENV",
+    "CachedValidation",
+    "DEFAULT_MAX_ENTRIES",
+    "VALIDATOR_SET_VERSION",
+    "ValidationCache",
+    "ValidationCacheStats",
+    "configure_validation_cache",
+    "get_validation_cache",
+    "validation_cache_key",
+]
@@ -0,0 +1,279 @@
+"""Dependency- and cost-aware scheduling of SQL validators.
+
+Each validator is declared as a :class:`ValidatorSpec` with a relative cost
+and the validators it requires. :func:`run_validators` runs independent
+validators concurrently on a shared, bounded thread pool. A validator is
+skipped if one of its requirements reported errors. So a cheap structural
+failure stops the expensive checks, which would only add noise about broken
+SQL.
+
+A :class:`ValidationBudget` can be shared across many conversions (e.g. a
+batch upload) to bound the time spent in expensive validators: once it is
+spent, expensive validators are skipped and reported as such, while cheap
+ones still run.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.instrumentation import ConversionProfile, start_phase
+from .validator import ValidationResult
+
+
+# Skip reason of validators dropped by an exhausted ValidationBudget
+BUDGET_EXHAUSTED = "validation budget exhausted"
+
+
+class ValidatorCost(IntEnum):
+    """Relative cost of a validator; expensive validators are launched first and budgeted."""
+
+    CHEAP = 1
+    MODERATE = 2
+    EXPENSIVE = 3
+
+
+@dataclass(frozen=True, slots=True)
+class ValidatorSpec:
+    """A validator to schedule.
+
+    Attributes:
+        name: Label used in logs and timings (unique within a run).
+        run: Zero-argument callable returning a ValidationResult.
+        cost: Relative cost of the validator.
+        requires: Validators that must pass (no errors) for this one to run.
+    """
+
+    name: str
+    run: Callable[[], ValidationResult]
+    cost: ValidatorCost = ValidatorCost.CHEAP
+    requires: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class ValidatorRun:
+    """Outcome of one scheduled validator."""
+
+    name: str
+    status: str  # 'ok', 'failed' (reported errors) or 'skipped'
+    duration_ms: float = 0.0
+    result: Optional[ValidationResult] = None
+    reason: Optional[str] = None
+    cpu_ms: float = 0.0
+
+    def log_line(self) -> str:
+        if self.result is None:
+            return f"{self.name}: SKIPPED ({self.reason})"
+        result = self.result
+        status = "FAILED" if result.has_errors else "OK"
+        return (
+            f"{self.name}: {status} "
+            f"(errors={len(result.errors)}, warnings={len(result.warnings)}, info={len(result.info)})"
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            "name": self.name,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 2),
+            "cpu_ms": round(self.cpu_ms, 2),
+        }
+        if self.result is not None:
+            data.update(
+                errors=len(self.result.errors),
+                warnings=len(self.result.warnings),
+                info=len(self.result.info),
+            )
+        if self.reason:
+            data["reason"] = self.reason
+        return data
+
+
+@dataclass(slots=True)
+class ValidationReport:
+    """Merged result and per-validator runs, in declaration order."""
+
+    result: ValidationResult
+    runs: List[ValidatorRun] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    @property
+    def logs(self) -> List[str]:
+        return [run.log_line() for run in self.runs]
+
+    @property
+    def skipped(self) -> List[str]:
+        return [run.name for run in self.runs if run.status == "skipped"]
+
+    @property
+    def is_complete(self) -> bool:
+        """True unless a validator was skipped for budget, i.e. the result is reproducible."""
+        return all(run.reason != BUDGET_EXHAUSTED for run in self.runs)
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_ms": round(self.wall_ms, 2),
+            "cpu_ms": round(sum(run.cpu_ms for run in self.runs), 2),
+            "validators": [run.to_dict() for run in self.runs],
+        }
+
+
+class ValidationBudget:
+    """Time allowance for expensive validators, shared across conversions.
+
+    Every validator run is charged; once ``total_ms`` is spent, validators
+    at or above ``expensive`` cost are skipped.
+    """
+
+    def __init__(self, total_ms: float, expensive: ValidatorCost = ValidatorCost.EXPENSIVE) -> None:
+        self.total_ms = total_ms
+        self.expensive = expensive
+        self._spent_ms = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def spent_ms(self) -> float:
+        return self._spent_ms
+
+    @property
+    def exhausted(self) -> bool:
+        return self._spent_ms >= self.total_ms
+
+    def charge(self, duration_ms: float) -> None:
+        with self._lock:
+            self._spent_ms += duration_ms
+
+    def allows(self, cost: ValidatorCost) -> bool:
+        return cost < self.expensive or not self.exhausted
+
+
+# Validation time allowed for expensive validators across one batch upload
+BATCH_VALIDATION_BUDGET_MS = 60_000.0
+
+VALIDATION_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_validation_executor() -> ThreadPoolExecutor:
+    """Return the process-wide validation pool (bounded to VALIDATION_WORKERS threads)."""
+
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=VALIDATION_WORKERS, thread_name_prefix="sql-validate")
+    return _executor
+
+
+def _timed(spec: ValidatorSpec, profile: Optional[ConversionProfile] = None) -> ValidatorRun:
+    timer = start_phase(f"validator:{spec.name}", profile)
+    try:
+        result = spec.run()
+    finally:
+        timing = timer.stop()
+    status = "failed" if result.has_errors else "ok"
+    return ValidatorRun(spec.name, status, timing.wall_ms, result, cpu_ms=timing.cpu_ms)
+
+
+def run_validators(
+    specs: Sequence[ValidatorSpec],
+    *,
+    parallel: bool = True,
+    budget: Optional[ValidationBudget] = None,
+    profile: Optional[ConversionProfile] = None,
+) -> ValidationReport:
+    """Run ``specs`` respecting requirements, cost and budget.
+
+    Args:
+        specs: Validators in the order their results should be merged.
+        parallel: Run independent validators on the shared pool; when False
+            they run one by one on the calling thread.
+        budget: Optional shared budget for expensive validators.
+        profile: Optional profile that receives a ``validator:<name>`` phase
+            per validator run.
+
+    Returns:
+        ValidationReport whose merged result and runs follow ``specs`` order,
+        regardless of completion order.
+
+    Raises:
+        ValueError: If a requirement names an unknown validator or the
+            requirements form a cycle.
+    """
+
+    by_name = {spec.name: spec for spec in specs}
+    for spec in specs:
+        unknown = [name for name in spec.requires if name not in by_name]
+        if unknown:
+            raise ValueError(f"Validator {spec.name!r} requires unknown validator(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    executor = get_validation_executor() if parallel and len(specs) > 1 else None
+    runs: Dict[str, ValidatorRun] = {}
+    pending: List[ValidatorSpec] = list(specs)
+    running: Dict[Future, ValidatorSpec] = {}
+
+    def record(run: ValidatorRun) -> None:
+        runs[run.name] = run
+        if budget is not None and run.status != "skipped":
+            budget.charge(run.duration_ms)
+
+    def launch_ready() -> bool:
+        launched = False
+        progress = True
+        while progress:
+            progress = False
+            ready = [spec for spec in pending if all(name in runs for name in spec.requires)]
+            # Most expensive first, so the long validators overlap the short ones
+            for spec in sorted(ready, key=lambda s: -s.cost):
+                pending.remove(spec)
+                launched = progress = True
+                blocked = [name for name in spec.requires if runs[name].status != "ok"]
+                if blocked:
+                    runs[spec.name] = ValidatorRun(spec.name, "skipped", reason=f"requires {blocked[0]}")
+                elif budget is not None and not budget.allows(spec.cost):
+                    runs[spec.name] = ValidatorRun(spec.name, "skipped", reason=BUDGET_EXHAUSTED)
+                elif executor is not None:
+                    running[executor.submit(_timed, spec, profile)] = spec
+                else:
+                    record(_timed(spec, profile))
+        return launched
+
+    while pending or running:
+        launched = launch_ready()
+        if running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                record(future.result())
+        elif pending and not launched:
+            raise ValueError(f"Validator requirements form a cycle: {', '.join(spec.name for spec in pending)}")
+
+    ordered = [runs[spec.name] for spec in specs]
+    merged = ValidationResult()
+    for run in ordered:
+        if run.result is not None:
+            merged.merge(run.result)
+    return ValidationReport(merged, ordered, (time.perf_counter() - started) * 1000)
+
+
+__all__ = [
+    "BATCH_VALIDATION_BUDGET_MS",
+    "BUDGET_EXHAUSTED",
+    "VALIDATION_WORKERS",
+    "ValidationBudget",
+    "ValidationReport",
+    "ValidatorCost",
+    "ValidatorRun",
+    "ValidatorSpec",
+    "get_validation_executor",
+    "run_validators",
+]
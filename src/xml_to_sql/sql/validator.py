@@ -1,15 +1,29 @@
-"""SQL validation module for ensuring generated SQL is production-ready."""
+"""SQL validation module for ensuring generated SQL is production-ready.
+
+Every validator is a visitor over the token stream produced by
+:mod:`.sql_lexer`, so keywords inside string literals, comments and quoted
+identifiers are never mistaken for SQL, and combined validation
+(:func:`validate_sql`, :func:`validate_hana_sql`) tokenizes and walks the
+statement only once.
+
+Structural facts (CTEs, FROM/JOIN sources, join conditions, WHERE and GROUP
+BY clauses) are collected into a shared shape. When the renderer passes the
+statement AST (``ast=``), the shape is read from the AST instead of being
+reverse-engineered from tokens; the walk then only handles expression-level
+checks.
+"""
 
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ..domain import Scenario
 from ..domain.types import DatabaseMode, HanaVersion
 from .renderer import RenderContext
+from .sql_ast import SqlStatement, Subquery, iter_selects, iter_table_refs
+from .sql_lexer import SqlToken, SqlTokenKind, SqlVisitor, key_at, token_at, tokenize_sql, walk_sql
 
 
 class ValidationSeverity(Enum):
@@ -40,6 +54,27 @@ class ValidationIssue:
             location += ")"
         return f"[{self.severity.value.upper()}] {self.code}: {self.message}{location}"
 
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the issue to JSON-compatible primitives."""
+        return {
+            "severity": self.severity.value,
+            "message": self.message,
+            "code": self.code,
+            "line_number": self.line_number,
+            "column_number": self.column_number,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> ValidationIssue:
+        """Rebuild an issue serialized with :meth:`to_dict`."""
+        return cls(
+            ValidationSeverity(data["severity"]),
+            data["message"],
+            data["code"],
+            data.get("line_number"),
+            data.get("column_number"),
+        )
+
 
 @dataclass
 class ValidationResult:
@@ -88,75 +123,389 @@ class ValidationResult:
         if other.has_errors:
             self.is_valid = False
 
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the result to JSON-compatible primitives."""
+        return {
+            "errors": [issue.to_dict() for issue in self.errors],
+            "warnings": [issue.to_dict() for issue in self.warnings],
+            "info": [issue.to_dict() for issue in self.info],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> ValidationResult:
+        """Rebuild a result serialized with :meth:`to_dict`."""
+        result = cls()
+        result.errors = [ValidationIssue.from_dict(issue) for issue in data.get("errors", [])]
+        result.warnings = [ValidationIssue.from_dict(issue) for issue in data.get("warnings", [])]
+        result.info = [ValidationIssue.from_dict(issue) for issue in data.get("info", [])]
+        result.is_valid = not result.errors
+        return result
+
+
+
+class _TokenValidator(SqlVisitor):
+    """A validator that runs as a visitor over the shared SQL token stream."""
+
+    def __init__(self) -> None:
+        self.result = ValidationResult()
+
+
+def _cte_name_at(tokens: Sequence[SqlToken], index: int) -> Optional[SqlToken]:
+    """Return the CTE name token if ``tokens[index]`` is the AS of ``name AS (``."""
+
+    if index > 0 and key_at(tokens, index + 1) == "(":
+        name = tokens[index - 1]
+        if name.kind in (SqlTokenKind.WORD, SqlTokenKind.NUMBER):
+            return name
+    return None
+
+
+# Keywords that end a JOIN clause without an ON/USING condition
+_JOIN_CLAUSE_END = {
+    'JOIN', 'WHERE', 'GROUP', 'ORDER', 'HAVING', 'QUALIFY', 'LIMIT',
+    'UNION', 'INTERSECT', 'EXCEPT', 'MINUS', ',', ';',
+}
+_JOIN_TYPES = ('INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS')
+
+
+@dataclass(slots=True)
+class _SqlShape:
+    """Structural facts about a statement shared by the validators."""
+
+    has_select: bool = False
+    has_with: bool = False
+    select_after_with: bool = False
+    # (name key, line) for each ``name AS (`` CTE definition
+    ctes: List[Tuple[str, Optional[int]]] = field(default_factory=list)
+    # ("FROM" | "JOIN", name key, token kind) for each unqualified reference
+    references: List[Tuple[str, str, SqlTokenKind]] = field(default_factory=list)
+    join_count: int = 0
+    joins_without_on: List[str] = field(default_factory=list)
+    cartesian: bool = False
+    select_star: bool = False
+    from_count: int = 0
+    where_count: int = 0
+    has_group_by: bool = False
+    subquery_count: int = 0
+
+
+class _ShapeVisitor(SqlVisitor):
+    """Collect a :class:`_SqlShape` from the token stream."""
+
+    def __init__(self) -> None:
+        self.shape = _SqlShape()
+        self.with_token: Optional[SqlToken] = None
+        self.pending_joins: List[tuple] = []
+
+    def handlers(self):
+        handlers = {
+            "SELECT": self._select,
+            "WITH": self._with,
+            "AS": self._as,
+            "FROM": self._from,
+            "JOIN": self._join,
+            "ON": self._on,
+            "USING": self._join_condition,
+            "WHERE": self._where,
+            "GROUP": self._group,
+            "(": self._open,
+            ")": self._end_joins,
+        }
+        for keyword in _JOIN_CLAUSE_END:
+            handlers.setdefault(keyword, self._end_joins)
+        return handlers
+
+    def _select(self, tokens, index):
+        shape = self.shape
+        shape.has_select = True
+        # Only the statement's own SELECT counts, not one inside a CTE body.
+        if self.with_token is not None and tokens[index].depth == self.with_token.depth:
+            shape.select_after_with = True
+        if key_at(tokens, index + 1) == "*":
+            shape.select_star = True
+
+    def _with(self, tokens, index):
+        if self.with_token is None:
+            self.with_token = tokens[index]
+            self.shape.has_with = True
+
+    def _as(self, tokens, index):
+        name = _cte_name_at(tokens, index)
+        if name is not None:
+            self.shape.ctes.append((name.key, name.line))
+
+    def _reference(self, tokens, index):
+        target = token_at(tokens, index + 1)
+        if target is None or target.kind not in (SqlTokenKind.WORD, SqlTokenKind.NUMBER):
+            return
+        # Skip schema.table references
+        if key_at(tokens, index + 2) != ".":
+            self.shape.references.append((tokens[index].key, target.key, target.kind))
+
+    def _from(self, tokens, index):
+        self.shape.from_count += 1
+        self._reference(tokens, index)
+
+    def _join(self, tokens, index):
+        self._end_joins(tokens, index)
+        self.shape.join_count += 1
+        join_type = key_at(tokens, index - 1)
+        if join_type in _JOIN_TYPES and join_type != 'CROSS':
+            self.pending_joins.append((join_type, tokens[index].depth))
+        self._reference(tokens, index)
+
+    def _on(self, tokens, index):
+        if (key_at(tokens, index + 1), key_at(tokens, index + 2), key_at(tokens, index + 3)) == ("1", "=", "1"):
+            self.shape.cartesian = True
+        self._join_condition(tokens, index)
+
+    def _join_condition(self, tokens, index):
+        depth = tokens[index].depth
+        for position in range(len(self.pending_joins) - 1, -1, -1):
+            if self.pending_joins[position][1] == depth:
+                del self.pending_joins[position]
+                break
+
+    def _where(self, tokens, index):
+        self.shape.where_count += 1
+        self._end_joins(tokens, index)
+
+    def _group(self, tokens, index):
+        if key_at(tokens, index + 1) == "BY":
+            self.shape.has_group_by = True
+        self._end_joins(tokens, index)
+
+    def _open(self, tokens, index):
+        if key_at(tokens, index + 1) == "SELECT":
+            self.shape.subquery_count += 1
+
+    def _end_joins(self, tokens, index):
+        """Record JOINs at this depth (or deeper) that ended without a condition."""
+        token = tokens[index]
+        if not self.pending_joins:
+            return
+        depth = token.depth
+        if token.key == ")":
+            # The closing parenthesis ends every JOIN opened inside it
+            depth += 1
+        remaining = []
+        for join_type, join_depth in self.pending_joins:
+            if join_depth >= depth:
+                self.shape.joins_without_on.append(join_type)
+            else:
+                remaining.append((join_type, join_depth))
+        self.pending_joins = remaining
+
+    def finish(self, tokens):
+        self.shape.joins_without_on.extend(join_type for join_type, _ in self.pending_joins)
+        self.pending_joins = []
+
+
+def _single_token(text: str) -> Optional[SqlToken]:
+    tokens = tokenize_sql(text)
+    return tokens[0] if len(tokens) == 1 else None
+
+
+def _shape_from_ast(statement: SqlStatement) -> _SqlShape:
+    """Read the structural facts directly from the renderer's AST."""
+
+    shape = _SqlShape(has_select=True, has_with=bool(statement.ctes), select_after_with=True)
+
+    for cte in statement.ctes:
+        token = _single_token(cte.name)
+        key = token.key if token is not None and token.kind is not SqlTokenKind.QUOTED_IDENT else cte.name.strip('"')
+        shape.ctes.append((key, None))
+
+    for clause, ref in iter_table_refs(statement):
+        token = _single_token(ref.name)
+        if token is not None and token.kind in (SqlTokenKind.WORD, SqlTokenKind.NUMBER):
+            shape.references.append((clause, token.key, token.kind))
+
+    # CTE bodies open with "AS (SELECT", which the token walk counts as well
+    shape.subquery_count = len(statement.ctes)
+    for select in iter_selects(statement):
+        shape.from_count += 1
+        if select.where:
+            shape.where_count += 1
+        if select.group_by:
+            shape.has_group_by = True
+        if select.items and select.items[0].expression == "*":
+            shape.select_star = True
+        if isinstance(select.source, Subquery):
+            shape.subquery_count += 1
+        for join in select.joins:
+            shape.join_count += 1
+            if not join.conditions:
+                join_type = join.join_type.split()[-1].upper() if join.join_type else ""
+                if join_type in _JOIN_TYPES and join_type != 'CROSS':
+                    shape.joins_without_on.append(join_type)
+            elif [token.key for token in tokenize_sql(join.conditions[0])[:3]] == ["1", "=", "1"]:
+                shape.cartesian = True
+    return shape
+
+
+def _shape_for(ast: Optional[SqlStatement]) -> Tuple[_SqlShape, List[SqlVisitor]]:
+    """Return the statement shape and the visitors that must fill it in during the walk."""
+
+    if ast is not None:
+        return _shape_from_ast(ast), []
+    visitor = _ShapeVisitor()
+    return visitor.shape, [visitor]
+
+
+class _StructureVisitor(_TokenValidator):
+    """Basic statement structure: SELECT, parentheses, quotes and CTEs."""
+
+    def __init__(self, sql: str, shape: _SqlShape) -> None:
+        super().__init__()
+        self.sql = sql
+        self.shape = shape
+        self.open_parens = 0
+        self.close_parens = 0
+        self.unterminated_string = False
+
+    def handlers(self):
+        return {
+            "(": self._open,
+            ")": self._close,
+            SqlTokenKind.STRING: self._string,
+        }
+
+    def _open(self, tokens, index):
+        self.open_parens += 1
+
+    def _close(self, tokens, index):
+        self.close_parens += 1
+
+    def _string(self, tokens, index):
+        if not tokens[index].terminated:
+            self.unterminated_string = True
+
+    def finish(self, tokens):
+        result = self.result
+        shape = self.shape
+        if not self.sql or not self.sql.strip():
+            result.add_error("SQL is empty", "EMPTY_SQL")
+            return
+
+        # Check for SELECT statement
+        if not shape.has_select:
+            result.add_error("SQL does not contain a SELECT statement", "NO_SELECT", 1)
+
+        # Check for balanced parentheses (outside literals and comments)
+        if self.open_parens != self.close_parens:
+            result.add_error(
+                f"Unbalanced parentheses: {self.open_parens} opening, {self.close_parens} closing",
+                "UNBALANCED_PARENTHESES",
+            )
+
+        # A string literal that runs to the end of the statement
+        if self.unterminated_string:
+            result.add_warning("Possible unbalanced single quotes", "UNBALANCED_QUOTES")
+
+        # Check CTE structure
+        if shape.has_with:
+            if not shape.ctes:
+                result.add_warning("WITH clause found but no CTEs with AS detected", "INVALID_CTE_STRUCTURE")
+
+            # Check for duplicate CTE names
+            seen = set()
+            for name, line in shape.ctes:
+                if name in seen:
+                    result.add_error(f"Duplicate CTE name: {name}", "DUPLICATE_CTE", line)
+                seen.add(name)
 
-def validate_sql_structure(sql: str) -> ValidationResult:
+            # Check for final SELECT after CTEs
+            if not shape.select_after_with:
+                result.add_error("WITH clause found but no SELECT statement after CTEs", "NO_SELECT_AFTER_CTE")
+
+        # Check for proper statement structure
+        if not shape.has_select:
+            result.add_error("No SELECT statement found", "NO_SELECT_STATEMENT")
+
+
+def validate_sql_structure(sql: str, ast: Optional[SqlStatement] = None) -> ValidationResult:
     """
     Validate basic SQL structure and syntax.
 
     Args:
         sql: SQL string to validate
+        ast: Optional statement AST the SQL was printed from
 
     Returns:
         ValidationResult with any issues found
     """
-    result = ValidationResult()
-
     if not sql or not sql.strip():
+        result = ValidationResult()
         result.add_error("SQL is empty", "EMPTY_SQL")
         return result
 
-    sql_lines = sql.split("\n")
-    sql_upper = sql.upper()
-
-    # Check for SELECT statement
-    if "SELECT" not in sql_upper:
-        result.add_error("SQL does not contain a SELECT statement", "NO_SELECT", 1)
-
-    # Check for balanced parentheses
-    open_parens = sql.count("(")
-    close_parens = sql.count(")")
-    if open_parens != close_parens:
-        result.add_error(
-            f"Unbalanced parentheses: {open_parens} opening, {close_parens} closing",
-            "UNBALANCED_PARENTHESES",
-        )
+    shape, prelude = _shape_for(ast)
+    return _run_validators(sql, [*prelude, _StructureVisitor(sql, shape)])
+
+
+class _CompletenessVisitor(_TokenValidator):
+    """CTE and data source references against the scenario and render context."""
+
+    def __init__(self, scenario: Scenario, ctx: Optional[RenderContext], shape: _SqlShape) -> None:
+        super().__init__()
+        self.scenario = scenario
+        self.ctx = ctx
+        self.shape = shape
+
+    def finish(self, tokens):
+        result = self.result
+        scenario = self.scenario
+        ctx = self.ctx
+
+        # Also get CTE aliases from context (these are the actual CTE names used)
+        cte_aliases = ctx.cte_aliases if ctx is not None else {}
+        cte_aliases_from_ctx = {alias.upper() for alias in cte_aliases.values()}
+        all_cte_names = {name for name, _ in self.shape.ctes} | cte_aliases_from_ctx
+        referenced_ctes = dict.fromkeys(name for _, name, _ in self.shape.references)
+
+        # Check that all referenced nodes exist
+        for node_id in cte_aliases.keys():
+            if node_id not in scenario.nodes and node_id not in scenario.data_sources:
+                result.add_error(f"Node {node_id} referenced but not found in scenario", "MISSING_NODE")
+
+        # Check if CTEs referenced in FROM/JOIN clauses are defined
+        for ref_cte in referenced_ctes:
+            if ref_cte not in all_cte_names:
+                # Check if it's a data source object name
+                is_data_source = any(
+                    ds.object_name.upper() == ref_cte for ds in scenario.data_sources.values()
+                )
+                if not is_data_source:
+                    result.add_warning(f"CTE {ref_cte} referenced in FROM/JOIN but not defined", "UNDEFINED_CTE_REFERENCE")
+
+        # Check data source references
+        for ds_id, data_source in scenario.data_sources.items():
+            if not data_source.schema_name or not data_source.schema_name.strip():
+                result.add_warning(f"Data source {ds_id} has empty schema name", "EMPTY_SCHEMA_NAME")
+            if not data_source.object_name or not data_source.object_name.strip():
+                result.add_warning(f"Data source {ds_id} has empty object name", "EMPTY_OBJECT_NAME")
+
+        # Check final node exists (only if we have nodes)
+        if len(scenario.nodes) > 0:
+            final_node_id = None
+            for node_id in scenario.nodes.keys():
+                # Find the node that's not referenced as input by other nodes
+                is_final = True
+                for other_node in scenario.nodes.values():
+                    if hasattr(other_node, 'inputs') and node_id in other_node.inputs:
+                        is_final = False
+                        break
+                if is_final:
+                    final_node_id = node_id
+                    break
 
-    # Check for balanced quotes (basic check)
-    single_quotes = sql.count("'") - sql.count("''") * 2  # Account for escaped quotes
-    if single_quotes % 2 != 0:
-        result.add_warning("Possible unbalanced single quotes", "UNBALANCED_QUOTES")
-
-    # Check CTE structure
-    if "WITH" in sql_upper:
-        # Check for AS clauses in CTEs
-        cte_pattern = r"(\w+)\s+AS\s*\("
-        cte_matches = re.findall(cte_pattern, sql, re.IGNORECASE)
-        if not cte_matches:
-            result.add_warning("WITH clause found but no CTEs with AS detected", "INVALID_CTE_STRUCTURE")
-
-        # Check for duplicate CTE names
-        cte_names = [name.upper() for name in cte_matches]
-        seen = set()
-        for i, name in enumerate(cte_names):
-            if name in seen:
-                result.add_error(f"Duplicate CTE name: {name}", "DUPLICATE_CTE", i + 1)
-            seen.add(name)
-
-        # Check for final SELECT after CTEs
-        with_index = sql_upper.find("WITH")
-        select_after_with = sql_upper.find("SELECT", with_index + 4)
-        if select_after_with == -1:
-            result.add_error("WITH clause found but no SELECT statement after CTEs", "NO_SELECT_AFTER_CTE")
-
-    # Check for proper statement structure
-    if sql_upper.count("SELECT") == 0:
-        result.add_error("No SELECT statement found", "NO_SELECT_STATEMENT")
-
-    return result
+            if not final_node_id:
+                result.add_warning("Could not determine final node in scenario", "NO_FINAL_NODE")
 
 
 def validate_query_completeness(
-    scenario: Scenario, sql: str, ctx: RenderContext
+    scenario: Scenario, sql: str, ctx: Optional[RenderContext], ast: Optional[SqlStatement] = None
 ) -> ValidationResult:
     """
     Validate that all references in SQL are complete and valid.
@@ -164,77 +513,15 @@ def validate_query_completeness(
     Args:
         scenario: Scenario IR object
         sql: Generated SQL string
-        ctx: Render context used during generation
+        ctx: Render context used during generation. May be None when ``ast``
+            is given: the AST already names every CTE the renderer emitted.
+        ast: Optional statement AST the SQL was printed from
 
     Returns:
         ValidationResult with any issues found
     """
-    result = ValidationResult()
-
-    # Extract CTE names from SQL
-    cte_pattern = r"(\w+)\s+AS\s*\("
-    cte_names_in_sql = set(re.findall(cte_pattern, sql, re.IGNORECASE))
-    cte_names_in_sql = {name.upper() for name in cte_names_in_sql}
-
-    # Also get CTE aliases from context (these are the actual CTE names used)
-    cte_aliases_from_ctx = {alias.upper() for alias in ctx.cte_aliases.values()}
-    all_cte_names = cte_names_in_sql | cte_aliases_from_ctx
-
-    # Check that all referenced nodes exist
-    for node_id in ctx.cte_aliases.keys():
-        if node_id not in scenario.nodes and node_id not in scenario.data_sources:
-            result.add_error(f"Node {node_id} referenced but not found in scenario", "MISSING_NODE")
-
-    # Check CTE references in FROM/JOIN clauses
-    from_pattern = r"FROM\s+(\w+)"
-    join_pattern = r"JOIN\s+(\w+)"
-    referenced_ctes = set()
-    for match in re.finditer(from_pattern, sql, re.IGNORECASE):
-        ref_name = match.group(1).upper()
-        # Skip if it's a schema.table reference
-        if "." not in ref_name:
-            referenced_ctes.add(ref_name)
-    for match in re.finditer(join_pattern, sql, re.IGNORECASE):
-        ref_name = match.group(1).upper()
-        # Skip if it's a schema.table reference
-        if "." not in ref_name:
-            referenced_ctes.add(ref_name)
-
-    # Check if referenced CTEs are defined
-    for ref_cte in referenced_ctes:
-        if ref_cte not in all_cte_names:
-            # Check if it's a data source object name
-            is_data_source = any(
-                ds.object_name.upper() == ref_cte for ds in scenario.data_sources.values()
-            )
-            if not is_data_source:
-                result.add_warning(f"CTE {ref_cte} referenced in FROM/JOIN but not defined", "UNDEFINED_CTE_REFERENCE")
-
-    # Check data source references
-    for ds_id, data_source in scenario.data_sources.items():
-        if not data_source.schema_name or not data_source.schema_name.strip():
-            result.add_warning(f"Data source {ds_id} has empty schema name", "EMPTY_SCHEMA_NAME")
-        if not data_source.object_name or not data_source.object_name.strip():
-            result.add_warning(f"Data source {ds_id} has empty object name", "EMPTY_OBJECT_NAME")
-
-    # Check final node exists (only if we have nodes)
-    if len(scenario.nodes) > 0:
-        final_node_id = None
-        for node_id in scenario.nodes.keys():
-            # Find the node that's not referenced as input by other nodes
-            is_final = True
-            for other_node in scenario.nodes.values():
-                if hasattr(other_node, 'inputs') and node_id in other_node.inputs:
-                    is_final = False
-                    break
-            if is_final:
-                final_node_id = node_id
-                break
-
-        if not final_node_id:
-            result.add_warning("Could not determine final node in scenario", "NO_FINAL_NODE")
-
-    return result
+    shape, prelude = _shape_for(ast)
+    return _run_validators(sql, [*prelude, _CompletenessVisitor(scenario, ctx, shape)])
 
 
 # Snowflake reserved keywords
@@ -257,397 +544,543 @@ SNOWFLAKE_RESERVED_KEYWORDS = {
 }
 
 
-def validate_performance(sql: str, scenario: Scenario) -> ValidationResult:
-    """
-    Validate SQL for performance issues.
 
-    Args:
-        sql: SQL string to validate
-        scenario: Scenario IR object for context
+_AGGREGATE_FUNCTIONS = ('COUNT', 'SUM', 'AVG', 'MAX', 'MIN', 'STDDEV', 'VARIANCE')
 
-    Returns:
-        ValidationResult with performance warnings
-    """
-    result = ValidationResult()
-    sql_upper = sql.upper()
 
-    # Check for cartesian products (ON 1=1)
-    if re.search(r'ON\s+1\s*=\s*1', sql_upper):
-        result.add_warning(
-            "Cartesian product detected (JOIN ON 1=1) - may cause large result sets",
-            "CARTESIAN_PRODUCT"
-        )
+class _PerformanceVisitor(_TokenValidator):
+    """Cartesian products, SELECT *, missing filters and ungrouped aggregates."""
+
+    def __init__(self, scenario: Scenario, shape: _SqlShape) -> None:
+        super().__init__()
+        self.scenario = scenario
+        self.shape = shape
+        self.has_agg = False
+
+    def handlers(self):
+        return {func: self._aggregate for func in _AGGREGATE_FUNCTIONS}
+
+    def _aggregate(self, tokens, index):
+        if key_at(tokens, index + 1) == "(":
+            self.has_agg = True
 
-    # Check for SELECT * usage
-    select_star_pattern = r'SELECT\s+\*'
-    if re.search(select_star_pattern, sql_upper):
-        # Check if logical model provides column list
-        if scenario.logical_model and scenario.logical_model.attributes:
+    def finish(self, tokens):
+        result = self.result
+        scenario = self.scenario
+        shape = self.shape
+
+        # Check for cartesian products (ON 1=1)
+        if shape.cartesian:
             result.add_warning(
-                "SELECT * used when explicit column list is available - consider using explicit columns",
-                "SELECT_STAR_USAGE"
+                "Cartesian product detected (JOIN ON 1=1) - may cause large result sets",
+                "CARTESIAN_PRODUCT"
             )
-        else:
-            result.add_info(
-                "SELECT * used - consider explicit column list for better performance",
-                "SELECT_STAR_USAGE"
-            )
-
-    # Check for missing WHERE clauses on large tables
-    # This is a heuristic - if we have FROM but no WHERE, warn
-    from_count = len(re.findall(r'\bFROM\b', sql_upper))
-    where_count = len(re.findall(r'\bWHERE\b', sql_upper))
-    if from_count > 0 and where_count == 0:
-        result.add_info(
-            "No WHERE clause found - consider adding filters for better performance",
-            "MISSING_WHERE_CLAUSE"
-        )
 
-    # Check for aggregation without GROUP BY
-    agg_functions = ['COUNT', 'SUM', 'AVG', 'MAX', 'MIN', 'STDDEV', 'VARIANCE']
-    has_agg = any(re.search(rf'\b{func}\s*\(', sql_upper) for func in agg_functions)
-    has_group_by = 'GROUP BY' in sql_upper
-    if has_agg and not has_group_by:
-        # Check if it's a scalar aggregation (single row result)
-        # This is usually OK, but warn if there are multiple FROM/JOIN
-        if from_count > 1:
-            result.add_warning(
-                "Aggregation functions used without GROUP BY on multiple tables - verify correctness",
-                "AGGREGATION_WITHOUT_GROUPBY"
+        # Check for SELECT * usage
+        if shape.select_star:
+            # Check if logical model provides column list
+            if scenario.logical_model and scenario.logical_model.attributes:
+                result.add_warning(
+                    "SELECT * used when explicit column list is available - consider using explicit columns",
+                    "SELECT_STAR_USAGE"
+                )
+            else:
+                result.add_info(
+                    "SELECT * used - consider explicit column list for better performance",
+                    "SELECT_STAR_USAGE"
+                )
+
+        # Check for missing WHERE clauses on large tables
+        # This is a heuristic - if we have FROM but no WHERE, warn
+        if shape.from_count > 0 and shape.where_count == 0:
+            result.add_info(
+                "No WHERE clause found - consider adding filters for better performance",
+                "MISSING_WHERE_CLAUSE"
             )
 
-    return result
+        # Check for aggregation without GROUP BY
+        if self.has_agg and not shape.has_group_by:
+            # Check if it's a scalar aggregation (single row result)
+            # This is usually OK, but warn if there are multiple FROM/JOIN
+            if shape.from_count > 1:
+                result.add_warning(
+                    "Aggregation functions used without GROUP BY on multiple tables - verify correctness",
+                    "AGGREGATION_WITHOUT_GROUPBY"
+                )
 
 
-def validate_snowflake_specific(sql: str) -> ValidationResult:
+def validate_performance(sql: str, scenario: Scenario, ast: Optional[SqlStatement] = None) -> ValidationResult:
     """
-    Validate Snowflake-specific syntax and features.
+    Validate SQL for performance issues.
 
     Args:
         sql: SQL string to validate
+        scenario: Scenario IR object for context
+        ast: Optional statement AST the SQL was printed from
 
     Returns:
-        ValidationResult with Snowflake-specific issues
+        ValidationResult with performance warnings
     """
-    result = ValidationResult()
-    sql_upper = sql.upper()
+    shape, prelude = _shape_for(ast)
+    return _run_validators(sql, [*prelude, _PerformanceVisitor(scenario, shape)])
 
-    # 1. Identifier Validation
-    # Check for unquoted reserved keywords used as identifiers
-    # We need to be smart about this - only flag keywords that are actually used as identifiers,
-    # not when they appear in SQL keyword positions
-    
-    # Patterns that indicate identifier usage (not SQL keywords):
-    # Exclude common SQL keyword contexts to avoid false positives
-    identifier_contexts = [
-        r'SELECT\s+([A-Z_][A-Z0-9_]*)\s+AS',  # Column AS alias
-        r'SELECT\s+([A-Z_][A-Z0-9_]*)\s*,',   # Column in SELECT list
-        r'SELECT\s+([A-Z_][A-Z0-9_]*)\s+FROM',  # Column before FROM
-        r'FROM\s+([A-Z_][A-Z0-9_]*)\s+(?:WHERE|JOIN|GROUP|ORDER|$)',  # Table name
-        r'JOIN\s+([A-Z_][A-Z0-9_]*)\s+(?:ON|WHERE|$)',  # Table in JOIN
-        r'AS\s+([A-Z_][A-Z0-9_]*)\s*(?:,|\(|$)',  # Alias after AS
-        r'GROUP\s+BY\s+([A-Z_][A-Z0-9_]*)\s*(?:,|$)',  # Column in GROUP BY
-        r'ORDER\s+BY\s+([A-Z_][A-Z0-9_]*)\s*(?:,|$)',  # Column in ORDER BY
-        r'WHERE\s+([A-Z_][A-Z0-9_]*)\s*[=<>!]',  # Column in WHERE (but not IS NULL)
-        r'\.([A-Z_][A-Z0-9_]*)\s*(?:,|$|AS|FROM|WHERE|JOIN|GROUP|ORDER)',  # Column after table.
-        r'\.([A-Z_][A-Z0-9_]*)\s*[=<>!]',  # Column after table. in condition
-    ]
-    
-    # Keywords that should never be flagged (common SQL patterns)
-    excluded_keywords = {'NULL', 'TRUE', 'FALSE', 'CURRENT_DATE', 'CURRENT_TIME', 'CURRENT_TIMESTAMP'}
-    
-    found_identifiers = set()
-    for pattern in identifier_contexts:
-        for match in re.finditer(pattern, sql_upper):
-            identifier = match.group(1)
-            # Skip excluded keywords and check if it's actually a reserved keyword
-            if identifier not in excluded_keywords and identifier in SNOWFLAKE_RESERVED_KEYWORDS:
-                # Additional check: skip if it's in a context like "IS NULL", "IS NOT NULL", etc.
-                context_before = sql_upper[max(0, match.start()-10):match.start()]
-                if not re.search(r'\b(IS|IS\s+NOT)\s+$', context_before):
-                    found_identifiers.add(identifier)
-    
-    # Also check CTE names (after WITH ... AS)
-    cte_pattern = r'WITH\s+([A-Z_][A-Z0-9_]*)\s+AS\s*\('
-    for match in re.finditer(cte_pattern, sql_upper):
-        identifier = match.group(1)
-        if identifier in SNOWFLAKE_RESERVED_KEYWORDS:
-            found_identifiers.add(identifier)
-    
-    # Report warnings for found identifiers
-    for identifier in found_identifiers:
-        result.add_warning(
-            f"Reserved keyword '{identifier}' used as identifier - should be quoted",
-            "RESERVED_KEYWORD_AS_IDENTIFIER"
-        )
 
-    # Check identifier length (unquoted identifiers max 255 chars)
-    long_identifier_pattern = r'\b([A-Z_][A-Z0-9_]{255,})\b'
-    if re.search(long_identifier_pattern, sql_upper):
-        result.add_warning(
-            "Unquoted identifier exceeds 255 characters - should be quoted",
-            "IDENTIFIER_TOO_LONG"
-        )
+# Keywords that should never be flagged as identifiers (common SQL patterns)
+_EXCLUDED_IDENTIFIER_KEYWORDS = {'NULL', 'TRUE', 'FALSE', 'CURRENT_DATE', 'CURRENT_TIME', 'CURRENT_TIMESTAMP'}
+_COMPARISON_START = ('=', '<', '>', '!')
+_DDL_KEYWORDS = ('CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'TRUNCATE')
+_CONCAT_OPERAND_KINDS = (SqlTokenKind.STRING, SqlTokenKind.QUOTED_IDENT)
+_WINDOW_RANKING_FUNCTIONS = {'ROW_NUMBER', 'RANK', 'DENSE_RANK', 'PERCENT_RANK'}
 
-    # 2. Schema/Table Naming
-    # Check for unqualified table references
-    from_pattern = r'FROM\s+([A-Z_][A-Z0-9_]*)'
-    for match in re.finditer(from_pattern, sql_upper):
-        table_name = match.group(1)
-        # Skip if it's a CTE or reserved word
-        if table_name not in SNOWFLAKE_RESERVED_KEYWORDS and '.' not in match.group(0):
-            result.add_info(
-                f"Unqualified table reference '{table_name}' - consider using schema.table format",
-                "UNQUALIFIED_TABLE_REFERENCE"
+
+def _is_comparison(token: Optional[SqlToken]) -> bool:
+    return token is not None and token.kind is SqlTokenKind.OPERATOR and token.text.startswith(_COMPARISON_START)
+
+
+def _follows_is(tokens: Sequence[SqlToken], index: int) -> bool:
+    """True if the context starting at ``index`` follows ``IS`` or ``IS NOT``."""
+
+    before = key_at(tokens, index - 1)
+    return before == "IS" or (before == "NOT" and key_at(tokens, index - 2) == "IS")
+
+
+def _identifier_context(tokens: Sequence[SqlToken], index: int) -> Optional[int]:
+    """Index where an identifier context around word ``index`` starts, if any.
+
+    Recognised contexts are a column in a SELECT list, a table after FROM or
+    JOIN, an alias after AS, a column in GROUP BY/ORDER BY or in a WHERE
+    comparison, and a qualified ``table.column`` reference.
+    """
+
+    before = key_at(tokens, index - 1)
+    after = key_at(tokens, index + 1)
+    if before == "SELECT" and after in ("AS", ",", "FROM"):
+        return index - 1
+    if before == "FROM" and after in ("WHERE", "JOIN", "GROUP", "ORDER", ""):
+        return index - 1
+    if before == "JOIN" and after in ("ON", "WHERE", ""):
+        return index - 1
+    if before == "AS" and after in (",", "(", ""):
+        return index - 1
+    if before == "BY" and key_at(tokens, index - 2) in ("GROUP", "ORDER") and after in (",", ""):
+        return index - 2
+    if before == "WHERE" and _is_comparison(token_at(tokens, index + 1)):
+        return index - 1
+    if before == "." and (
+        after in (",", "", "AS", "FROM", "WHERE", "JOIN", "GROUP", "ORDER")
+        or _is_comparison(token_at(tokens, index + 1))
+    ):
+        return index - 1
+    return None
+
+
+class _CallFrame:
+    __slots__ = ("name", "commas")
+
+    def __init__(self, name: Optional[str]) -> None:
+        self.name = name
+        self.commas = 0
+
+
+class _SnowflakeVisitor(_TokenValidator):
+    """Snowflake identifier, function, type, CTE and JOIN syntax checks."""
+
+    def __init__(self, shape: _SqlShape) -> None:
+        super().__init__()
+        self.shape = shape
+        self.reserved_identifiers: Dict[str, None] = {}
+        self.long_identifier = False
+        self.calls: List[_CallFrame] = []
+        self.invalid_iff = 0
+        self.hana_if = False
+        self.string_concat_plus = False
+        self.casts_without_length: List[str] = []
+        self.boolean_numeric = False
+        self.has_recursive = False
+        self.with_recursive = False
+        self.view_name: Optional[str] = None
+        self.has_lateral = False
+        self.lateral_ok = False
+        self.hana_functions: Dict[str, None] = {}
+        self.has_ddl = False
+        self.has_sample = False
+        self.sample_ok = False
+        self.has_qualify = False
+        self.has_ranking = False
+
+    def handlers(self):
+        handlers = {
+            SqlTokenKind.WORD: self._word,
+            SqlTokenKind.NUMBER: self._number,
+            "(": self._open,
+            ",": self._comma,
+            ")": self._close,
+            "+": self._plus,
+            "::": self._cast,
+            "RECURSIVE": self._recursive,
+            "CREATE": self._create,
+            "LATERAL": self._lateral,
+            "SUBSTRING": self._hana_function,
+            "TO_DATE": self._hana_function,
+            "SAMPLE": self._sample,
+            "QUALIFY": self._qualify,
+        }
+        for keyword in _DDL_KEYWORDS:
+            handlers.setdefault(keyword, self._ddl)
+        for function in _WINDOW_RANKING_FUNCTIONS:
+            handlers.setdefault(function, self._ranking)
+        return handlers
+
+    # 1. Identifiers
+    def _word(self, tokens, index):
+        key = tokens[index].key
+        if len(key) >= 256:
+            self.long_identifier = True
+        if key not in SNOWFLAKE_RESERVED_KEYWORDS:
+            return
+        if key_at(tokens, index - 1) == "WITH" and key_at(tokens, index + 1) == "AS" and key_at(tokens, index + 2) == "(":
+            self.reserved_identifiers[key] = None
+            return
+        if key in _EXCLUDED_IDENTIFIER_KEYWORDS:
+            return
+        start = _identifier_context(tokens, index)
+        if start is not None and not _follows_is(tokens, start):
+            self.reserved_identifiers[key] = None
+
+    # 3. Function syntax
+    def _open(self, tokens, index):
+        previous = token_at(tokens, index - 1)
+        name = previous.key if previous is not None and previous.kind is SqlTokenKind.WORD else None
+        self.calls.append(_CallFrame(name))
+
+    def _comma(self, tokens, index):
+        if self.calls:
+            self.calls[-1].commas += 1
+
+    def _close(self, tokens, index):
+        if self.calls:
+            frame = self.calls.pop()
+            if frame.name == "IFF" and frame.commas != 2:  # IFF(condition, then, else)
+                self.invalid_iff += 1
+            elif frame.name == "IF" and frame.commas >= 2:
+                self.hana_if = True
+
+    def _plus(self, tokens, index):
+        before = token_at(tokens, index - 1)
+        after = token_at(tokens, index + 1)
+        if before is None or after is None:
+            return
+        # A string literal added to another literal or to a quoted column
+        kinds = (before.kind, after.kind)
+        if SqlTokenKind.STRING in kinds and all(kind in _CONCAT_OPERAND_KINDS for kind in kinds):
+            self.string_concat_plus = True
+
+    # 4. Data types
+    def _cast(self, tokens, index):
+        type_name = key_at(tokens, index + 1)
+        if type_name in ('CHAR', 'VARCHAR') and key_at(tokens, index + 2) != "(":
+            self.casts_without_length.append(type_name)
+
+    def _number(self, tokens, index):
+        if (
+            tokens[index].key in ("1", "0")
+            and key_at(tokens, index + 1) in ("=", "!=", "<>")
+            and key_at(tokens, index + 2) in ("TRUE", "FALSE")
+        ):
+            self.boolean_numeric = True
+
+    # 5. CTE and query structure
+    def _recursive(self, tokens, index):
+        self.has_recursive = True
+        if key_at(tokens, index - 1) == "WITH":
+            self.with_recursive = True
+
+    # 6. View creation
+    def _create(self, tokens, index):
+        self._ddl(tokens, index)
+        if self.view_name is not None:
+            return
+        position = index + 1
+        if key_at(tokens, position) == "OR" and key_at(tokens, position + 1) == "REPLACE":
+            position += 2
+        name = token_at(tokens, position + 1)
+        if key_at(tokens, position) == "VIEW" and name is not None and name.kind in (SqlTokenKind.WORD, SqlTokenKind.NUMBER):
+            self.view_name = name.key
+
+    # 7. JOIN syntax
+    def _lateral(self, tokens, index):
+        self.has_lateral = True
+        if key_at(tokens, index + 1) in ("FLATTEN", "TABLE"):
+            self.lateral_ok = True
+
+    # 8. HANA to Snowflake compatibility
+    def _hana_function(self, tokens, index):
+        if key_at(tokens, index + 1) == "(":
+            self.hana_functions[tokens[index].key] = None
+
+    # 10. Statement types
+    def _ddl(self, tokens, index):
+        self.has_ddl = True
+
+    # 11. Performance-specific clauses
+    def _sample(self, tokens, index):
+        self.has_sample = True
+        if key_at(tokens, index + 1) in ("ROW", "BLOCK", "SYSTEM") and key_at(tokens, index + 2) == "(":
+            self.sample_ok = True
+
+    def _qualify(self, tokens, index):
+        self.has_qualify = True
+
+    def _ranking(self, tokens, index):
+        self.has_ranking = True
+
+    def finish(self, tokens):
+        result = self.result
+        shape = self.shape
+        cte_names = {name for name, _ in shape.ctes}
+        cte_count = len(shape.ctes)
+
+        # 1. Identifier validation
+        for identifier in self.reserved_identifiers:
+            result.add_warning(
+                f"Reserved keyword '{identifier}' used as identifier - should be quoted",
+                "RESERVED_KEYWORD_AS_IDENTIFIER"
             )
 
-    # 3. Snowflake Function Syntax
-    # Check IFF() function (3 parameters)
-    iff_pattern = r'IFF\s*\([^)]*\)'
-    for match in re.finditer(iff_pattern, sql, re.IGNORECASE):
-        params = match.group(0).count(',')
-        if params != 2:  # IFF(condition, then, else) = 2 commas
+        # Check identifier length (unquoted identifiers max 255 chars)
+        if self.long_identifier:
             result.add_warning(
-                f"IFF() function should have 3 parameters (condition, then, else)",
+                "Unquoted identifier exceeds 255 characters - should be quoted",
+                "IDENTIFIER_TOO_LONG"
+            )
+
+        # 2. Unqualified table references (CTE names are not tables)
+        for clause, table_name, kind in shape.references:
+            if (
+                clause == "FROM"
+                and kind is SqlTokenKind.WORD
+                and table_name not in SNOWFLAKE_RESERVED_KEYWORDS
+                and table_name not in cte_names
+            ):
+                result.add_info(
+                    f"Unqualified table reference '{table_name}' - consider using schema.table format",
+                    "UNQUALIFIED_TABLE_REFERENCE"
+                )
+
+        # 3. Snowflake function syntax
+        for _ in range(self.invalid_iff):
+            result.add_warning(
+                "IFF() function should have 3 parameters (condition, then, else)",
                 "INVALID_IFF_SYNTAX"
             )
 
-    # Check string concatenation (should use ||, not +)
-    # Look for string + string patterns (but not numeric addition)
-    string_concat_pattern = r"(['\"][^'\"]*['\"])\s*\+\s*(['\"][^'\"]*['\"])"
-    if re.search(string_concat_pattern, sql):
-        result.add_warning(
-            "String concatenation using '+' operator - should use '||' in Snowflake",
-            "STRING_CONCAT_PLUS"
-        )
+        # String concatenation should use ||, not +
+        if self.string_concat_plus:
+            result.add_warning(
+                "String concatenation using '+' operator - should use '||' in Snowflake",
+                "STRING_CONCAT_PLUS"
+            )
 
-    # Check for HANA IF() function (should be IFF())
-    hana_if_pattern = r'\bIF\s*\([^)]+,\s*[^)]+,\s*[^)]+\)'
-    if re.search(hana_if_pattern, sql, re.IGNORECASE):
-        result.add_warning(
-            "HANA IF() function detected - should be translated to IFF() for Snowflake",
-            "HANA_IF_NOT_TRANSLATED"
-        )
+        if self.hana_if:
+            result.add_warning(
+                "HANA IF() function detected - should be translated to IFF() for Snowflake",
+                "HANA_IF_NOT_TRANSLATED"
+            )
 
-    # 4. Data Type Validation
-    # Check type casting syntax (::TYPE)
-    type_cast_pattern = r'::\s*[A-Z_][A-Z0-9_]*'
-    # This is valid Snowflake syntax, so we just verify it's used correctly
-    # Check for invalid type names (basic check)
-    invalid_types = ['CHAR', 'VARCHAR']  # Should have length
-    for match in re.finditer(type_cast_pattern, sql_upper):
-        type_name = match.group(0)[2:].strip()
-        if type_name in invalid_types and '(' not in match.group(0):
+        # 4. Data type validation
+        for type_name in self.casts_without_length:
             result.add_warning(
                 f"Type casting to {type_name} without length specification",
                 "TYPE_CAST_WITHOUT_LENGTH"
             )
 
-    # Check boolean values (should be TRUE/FALSE, not 1/0)
-    boolean_pattern = r'\b(1|0)\s*(?:=|\!=|<>)\s*(?:TRUE|FALSE)'
-    if re.search(boolean_pattern, sql_upper):
-        result.add_warning(
-            "Boolean comparison with numeric values - use TRUE/FALSE instead of 1/0",
-            "BOOLEAN_NUMERIC_COMPARISON"
-        )
+        if self.boolean_numeric:
+            result.add_warning(
+                "Boolean comparison with numeric values - use TRUE/FALSE instead of 1/0",
+                "BOOLEAN_NUMERIC_COMPARISON"
+            )
 
-    # 5. CTE and Query Structure
-    # Check CTE count (Snowflake limit is 100)
-    cte_pattern = r'(\w+)\s+AS\s*\('
-    cte_count = len(re.findall(cte_pattern, sql, re.IGNORECASE))
-    if cte_count > 100:
-        result.add_error(
-            f"CTE count ({cte_count}) exceeds Snowflake limit of 100",
-            "CTE_COUNT_EXCEEDED"
-        )
-    elif cte_count > 20:
-        result.add_warning(
-            f"High CTE count ({cte_count}) - consider breaking into views for better maintainability",
-            "HIGH_CTE_COUNT"
-        )
+        # 5. CTE count (Snowflake limit is 100)
+        if cte_count > 100:
+            result.add_error(
+                f"CTE count ({cte_count}) exceeds Snowflake limit of 100",
+                "CTE_COUNT_EXCEEDED"
+            )
+        elif cte_count > 20:
+            result.add_warning(
+                f"High CTE count ({cte_count}) - consider breaking into views for better maintainability",
+                "HIGH_CTE_COUNT"
+            )
 
-    # Check for recursive CTEs
-    if 'RECURSIVE' in sql_upper and 'WITH' in sql_upper:
-        # Validate recursive CTE structure
-        if not re.search(r'WITH\s+RECURSIVE', sql_upper):
+        if self.has_recursive and not self.with_recursive:
             result.add_warning(
                 "RECURSIVE keyword found but not in WITH RECURSIVE clause",
                 "INVALID_RECURSIVE_CTE"
             )
 
-    # 6. View Creation Syntax
-    if 'CREATE' in sql_upper and 'VIEW' in sql_upper:
-        view_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+(\w+)'
-        view_match = re.search(view_pattern, sql_upper)
-        if view_match:
-            view_name = view_match.group(1)
-            if view_name.upper() in SNOWFLAKE_RESERVED_KEYWORDS:
-                result.add_error(
-                    f"View name '{view_name}' is a reserved keyword - must be quoted",
-                    "VIEW_NAME_RESERVED_KEYWORD"
-                )
+        # 6. View creation syntax
+        if self.view_name is not None and self.view_name in SNOWFLAKE_RESERVED_KEYWORDS:
+            result.add_error(
+                f"View name '{self.view_name}' is a reserved keyword - must be quoted",
+                "VIEW_NAME_RESERVED_KEYWORD"
+            )
 
-    # 7. JOIN Syntax
-    # Check JOIN types
-    join_types = ['INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS']
-    for join_type in join_types:
-        join_pattern = rf'\b{join_type}\s+JOIN'
-        if re.search(join_pattern, sql_upper):
-            # Validate ON clause exists (except for CROSS JOIN)
-            if join_type != 'CROSS':
-                # Check if ON clause follows
-                join_matches = list(re.finditer(join_pattern, sql_upper))
-                for join_match in join_matches:
-                    after_join = sql_upper[join_match.end():join_match.end()+50]
-                    if 'ON' not in after_join:
-                        result.add_warning(
-                            f"{join_type} JOIN without ON clause",
-                            "JOIN_WITHOUT_ON"
-                        )
-
-    # Check for LATERAL joins
-    if 'LATERAL' in sql_upper:
-        if not re.search(r'LATERAL\s+(?:FLATTEN|TABLE)', sql_upper):
+        # 7. JOIN syntax (reported per join type, in a stable order)
+        for join_type in sorted(shape.joins_without_on, key=_JOIN_TYPES.index):
+            result.add_warning(
+                f"{join_type} JOIN without ON clause",
+                "JOIN_WITHOUT_ON"
+            )
+
+        if self.has_lateral and not self.lateral_ok:
             result.add_info(
                 "LATERAL keyword found - ensure proper usage with FLATTEN or TABLE functions",
                 "LATERAL_JOIN_USAGE"
             )
 
-    # 8. HANA to Snowflake Compatibility
-    # Already checked IF() -> IFF() above
-    # Check for other HANA-specific patterns
-    hana_patterns = [
-        (r'\bSUBSTRING\s*\(', "SUBSTRING() function - verify parameter count (Snowflake uses 1-based indexing)"),
-        (r'\bTO_DATE\s*\([^)]*\)', "TO_DATE() function - verify date format string"),
-    ]
-    for pattern, message in hana_patterns:
-        if re.search(pattern, sql, re.IGNORECASE):
-            result.add_info(message, "HANA_FUNCTION_CHECK")
-
-    # 9. Reserved Keywords (already checked in identifier validation)
-
-    # 10. SQL Statement Validation
-    # Check for DDL/DML mixed with SELECT
-    ddl_keywords = ['CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'TRUNCATE']
-    has_select = 'SELECT' in sql_upper
-    has_ddl = any(keyword in sql_upper for keyword in ddl_keywords)
-    if has_select and has_ddl:
-        result.add_warning(
-            "DDL/DML statements mixed with SELECT - ensure proper statement separation",
-            "MIXED_STATEMENT_TYPES"
-        )
+        # 8. HANA-specific functions
+        if "SUBSTRING" in self.hana_functions:
+            result.add_info(
+                "SUBSTRING() function - verify parameter count (Snowflake uses 1-based indexing)",
+                "HANA_FUNCTION_CHECK"
+            )
+        if "TO_DATE" in self.hana_functions:
+            result.add_info("TO_DATE() function - verify date format string", "HANA_FUNCTION_CHECK")
+
+        # 10. DDL/DML mixed with SELECT
+        if shape.has_select and self.has_ddl:
+            result.add_warning(
+                "DDL/DML statements mixed with SELECT - ensure proper statement separation",
+                "MIXED_STATEMENT_TYPES"
+            )
 
-    # 11. Performance-Specific Checks
-    # Check for SAMPLE clause
-    if 'SAMPLE' in sql_upper:
-        sample_pattern = r'SAMPLE\s+(?:ROW|BLOCK|SYSTEM)\s*\([^)]+\)'
-        if not re.search(sample_pattern, sql_upper):
+        # 11. SAMPLE and QUALIFY clauses
+        if self.has_sample and not self.sample_ok:
             result.add_warning(
                 "SAMPLE clause found - verify syntax (SAMPLE ROW/BLOCK/SYSTEM)",
                 "SAMPLE_CLAUSE_SYNTAX"
             )
 
-    # Check for QUALIFY clause (Snowflake-specific)
-    if 'QUALIFY' in sql_upper:
-        if 'ROW_NUMBER' not in sql_upper and 'RANK' not in sql_upper:
+        if self.has_qualify and not self.has_ranking:
             result.add_info(
                 "QUALIFY clause found - typically used with window functions",
                 "QUALIFY_CLAUSE_USAGE"
             )
 
-    return result
-
 
-def analyze_query_complexity(sql: str, scenario: Scenario) -> ValidationResult:
+def validate_snowflake_specific(sql: str, ast: Optional[SqlStatement] = None) -> ValidationResult:
     """
-    Analyze query complexity and provide recommendations.
+    Validate Snowflake-specific syntax and features.
 
     Args:
-        sql: SQL string to analyze
-        scenario: Scenario IR object for context
+        sql: SQL string to validate
+        ast: Optional statement AST the SQL was printed from
 
     Returns:
-        ValidationResult with complexity warnings
+        ValidationResult with Snowflake-specific issues
     """
-    result = ValidationResult()
+    shape, prelude = _shape_for(ast)
+    return _run_validators(sql, [*prelude, _SnowflakeVisitor(shape)])
 
-    # Count CTEs
-    cte_pattern = r'(\w+)\s+AS\s*\('
-    cte_count = len(re.findall(cte_pattern, sql, re.IGNORECASE))
-    if cte_count > 20:
-        result.add_warning(
-            f"High CTE count ({cte_count}) - consider breaking into views for better maintainability",
-            "HIGH_CTE_COUNT"
-        )
-    elif cte_count > 10:
-        result.add_info(
-            f"Moderate CTE count ({cte_count}) - query may benefit from view decomposition",
-            "MODERATE_CTE_COUNT"
-        )
 
-    # Count JOINs
-    join_count = len(re.findall(r'\bJOIN\b', sql.upper()))
-    if join_count > 10:
-        result.add_warning(
-            f"High JOIN count ({join_count}) - consider query optimization",
-            "HIGH_JOIN_COUNT"
-        )
-    elif join_count > 5:
-        result.add_info(
-            f"Moderate JOIN count ({join_count}) - verify query performance",
-            "MODERATE_JOIN_COUNT"
-        )
+class _ComplexityVisitor(_TokenValidator):
+    """CTE, JOIN and subquery counts."""
 
-    # Count subqueries (nested SELECT)
-    subquery_pattern = r'\(\s*SELECT\s+'
-    subquery_count = len(re.findall(subquery_pattern, sql.upper()))
-    if subquery_count > 5:
-        result.add_warning(
-            f"High subquery count ({subquery_count}) - consider using CTEs or joins",
-            "HIGH_SUBQUERY_COUNT"
-        )
+    def __init__(self, scenario: Scenario, shape: _SqlShape) -> None:
+        super().__init__()
+        self.scenario = scenario
+        self.shape = shape
 
-    # Count nodes in scenario
-    node_count = len(scenario.nodes)
-    if node_count > 15:
-        result.add_info(
-            f"Complex scenario with {node_count} nodes - verify conversion correctness",
-            "COMPLEX_SCENARIO"
-        )
+    def finish(self, tokens):
+        result = self.result
+        cte_count = len(self.shape.ctes)
+        join_count = self.shape.join_count
+        subquery_count = self.shape.subquery_count
 
-    return result
+        # Count CTEs
+        if cte_count > 20:
+            result.add_warning(
+                f"High CTE count ({cte_count}) - consider breaking into views for better maintainability",
+                "HIGH_CTE_COUNT"
+            )
+        elif cte_count > 10:
+            result.add_info(
+                f"Moderate CTE count ({cte_count}) - query may benefit from view decomposition",
+                "MODERATE_CTE_COUNT"
+            )
+
+        # Count JOINs
+        if join_count > 10:
+            result.add_warning(
+                f"High JOIN count ({join_count}) - consider query optimization",
+                "HIGH_JOIN_COUNT"
+            )
+        elif join_count > 5:
+            result.add_info(
+                f"Moderate JOIN count ({join_count}) - verify query performance",
+                "MODERATE_JOIN_COUNT"
+            )
+
+        # Count subqueries (nested SELECT)
+        if subquery_count > 5:
+            result.add_warning(
+                f"High subquery count ({subquery_count}) - consider using CTEs or joins",
+                "HIGH_SUBQUERY_COUNT"
+            )
+
+        # Count nodes in scenario
+        node_count = len(self.scenario.nodes)
+        if node_count > 15:
+            result.add_info(
+                f"Complex scenario with {node_count} nodes - verify conversion correctness",
+                "COMPLEX_SCENARIO"
+            )
+
+
+def analyze_query_complexity(sql: str, scenario: Scenario, ast: Optional[SqlStatement] = None) -> ValidationResult:
+    """
+    Analyze query complexity and provide recommendations.
+
+    Args:
+        sql: SQL string to analyze
+        scenario: Scenario IR object for context
+        ast: Optional statement AST the SQL was printed from
+
+    Returns:
+        ValidationResult with complexity warnings
+    """
+    shape, prelude = _shape_for(ast)
+    return _run_validators(sql, [*prelude, _ComplexityVisitor(scenario, shape)])
 
 
 def validate_column_references(
-    sql: str, scenario: Scenario, schema_metadata: Optional[Dict] = None
+    sql: str, scenario: Scenario, schema_metadata: Optional[object] = None
 ) -> ValidationResult:
     """
     Validate column references against schema metadata (Phase 3 - Optional).
 
+    Every column a node maps directly from a data source is checked against
+    the catalogued columns of its table, with one catalog lookup per table
+    (see ``schema_catalog``).
+
     Args:
-        sql: SQL string to validate
+        sql: SQL string to validate (references are taken from the scenario)
         scenario: Scenario IR object for context
-        schema_metadata: Optional schema metadata dictionary with table/column info
+        schema_metadata: Optional ``SchemaCatalog``, or a dictionary mapping
+            ``SCHEMA.TABLE`` (or ``TABLE``) to its column names or to a
+            column-name-to-type dictionary
 
     Returns:
         ValidationResult with column reference issues
     """
-    result = ValidationResult()
-
-    # Phase 3: Column reference validation requires schema metadata
-    # This is an optional feature that requires Snowflake connection
+    # No metadata available - skip validation
     if not schema_metadata:
-        # No metadata available - skip validation
-        return result
+        return ValidationResult()
 
-    # Placeholder for column reference validation
-    # In full implementation, this would:
-    # 1. Parse SQL to extract table.column references
-    # 2. Check each column exists in schema_metadata
-    # 3. Validate column types for compatibility
-    # 4. Check aggregation compatibility
+    from .schema_catalog import SchemaCatalog, check_column_references
 
-    return result
+    catalog = schema_metadata if isinstance(schema_metadata, SchemaCatalog) else SchemaCatalog.from_mapping(schema_metadata)
+    return check_column_references(scenario, catalog)
 
 
 def validate_expressions(scenario: Scenario) -> ValidationResult:
@@ -693,33 +1126,33 @@ def validate_expressions(scenario: Scenario) -> ValidationResult:
     return result
 
 
-def test_sql_execution(sql: str, connection: Optional[object] = None) -> ValidationResult:
+def test_sql_execution(
+    sql: str,
+    connection: Optional[object] = None,
+    scenario: Optional[Scenario] = None,
+) -> ValidationResult:
     """
-    Test SQL execution with EXPLAIN PLAN or dry run (Phase 3 - Optional).
+    Test SQL execution with a dry run in an embedded database (Phase 3).
+
+    The statement is prepared and executed against synthetic stand-in tables
+    for the scenario's data sources (see ``dry_run``); no live database is
+    contacted.
 
     Args:
         sql: SQL string to test
-        connection: Optional database connection for execution testing
+        connection: Unused; kept for backward compatibility
+        scenario: Scenario the SQL was generated from
 
     Returns:
         ValidationResult with execution test issues
     """
-    result = ValidationResult()
+    if scenario is None:
+        # Stand-in tables are derived from the scenario's data sources
+        return ValidationResult()
 
-    # Phase 3: SQL execution testing requires database connection
-    # This is an optional feature
-    if not connection:
-        # No connection available - skip testing
-        return result
-
-    # Placeholder for SQL execution testing
-    # In full implementation, this would:
-    # 1. Execute EXPLAIN PLAN to validate syntax
-    # 2. Run with LIMIT 0 for dry run
-    # 3. Check for runtime errors
-    # 4. Validate result structure
+    from .dry_run import dry_run_sql
 
-    return result
+    return dry_run_sql(sql, scenario).result
 
 
 def validate_sql(
@@ -727,7 +1160,8 @@ def validate_sql(
     mode: DatabaseMode,
     scenario: Scenario,
     hana_version: Optional[HanaVersion] = None,
-    ctx: Optional[RenderContext] = None
+    ctx: Optional[RenderContext] = None,
+    ast: Optional[SqlStatement] = None,
 ) -> ValidationResult:
     """Validate SQL based on target database mode and version.
     
@@ -739,155 +1173,222 @@ def validate_sql(
         scenario: Scenario being validated
         hana_version: HANA version for HANA-specific validation
         ctx: Optional render context for additional context
+        ast: Optional statement AST the SQL was printed from
     
     Returns:
         ValidationResult with all validation issues
     """
     if mode == DatabaseMode.HANA:
-        return validate_hana_sql(sql, scenario, hana_version)
+        return validate_hana_sql(sql, scenario, hana_version, ast=ast)
     elif mode == DatabaseMode.SNOWFLAKE:
-        # Use existing Snowflake validation functions
-        result = ValidationResult()
-        
-        # Run all Snowflake-specific validations
-        structure_result = validate_sql_structure(sql)
-        result.merge(structure_result)
-        
+        # Run all Snowflake validations in a single walk over the token stream
+        shape, prelude = _shape_for(ast)
+        visitors: List[SqlVisitor] = [*prelude, _StructureVisitor(sql, shape)]
         if ctx:
-            completeness_result = validate_query_completeness(scenario, sql, ctx)
-            result.merge(completeness_result)
-        
-        performance_result = validate_performance(sql, scenario)
-        result.merge(performance_result)
-        
-        snowflake_result = validate_snowflake_specific(sql)
-        result.merge(snowflake_result)
-        
-        complexity_result = analyze_query_complexity(sql, scenario)
-        result.merge(complexity_result)
-        
-        return result
+            visitors.append(_CompletenessVisitor(scenario, ctx, shape))
+        visitors.append(_PerformanceVisitor(scenario, shape))
+        visitors.append(_SnowflakeVisitor(shape))
+        visitors.append(_ComplexityVisitor(scenario, shape))
+        return _run_validators(sql, visitors)
     else:
         # Unknown mode - return generic structure validation
-        return validate_sql_structure(sql)
+        return validate_sql_structure(sql, ast=ast)
+
+
+def _sequence_at(tokens: Sequence[SqlToken], index: int, keys: Sequence[str]) -> bool:
+    return all(key_at(tokens, index + offset) == key for offset, key in enumerate(keys))
+
+
+class _HanaSyntaxVisitor(_TokenValidator):
+    """Snowflake constructs that are invalid or unusual in HANA."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.iff = False
+        self.concat = False
+        self.create_or_replace = False
+        self.number_type = False
+        self.timestamp_ntz = False
+
+    def handlers(self):
+        return {
+            "IFF": self._iff,
+            "||": self._concat,
+            "CREATE": self._create,
+            "NUMBER": self._number,
+            "TIMESTAMP_NTZ": self._timestamp_ntz,
+        }
+
+    def _iff(self, tokens, index):
+        if key_at(tokens, index + 1) == "(":
+            self.iff = True
+
+    def _concat(self, tokens, index):
+        self.concat = True
+
+    def _create(self, tokens, index):
+        if _sequence_at(tokens, index + 1, ("OR", "REPLACE", "VIEW")):
+            self.create_or_replace = True
+
+    def _number(self, tokens, index):
+        if key_at(tokens, index + 1) == "(":
+            self.number_type = True
+
+    def _timestamp_ntz(self, tokens, index):
+        self.timestamp_ntz = True
+
+    def finish(self, tokens):
+        result = self.result
+
+        # Check for IFF (should be IF in HANA)
+        if self.iff:
+            result.add_error(
+                "IFF() function is not supported in HANA - should be IF()",
+                "HANA_INVALID_IFF_FUNCTION"
+            )
+
+        # Check for Snowflake-specific || concatenation
+        # Note: HANA supports || but + is more common, so this is a warning
+        if self.concat:
+            result.add_warning(
+                "String concatenation using '||' detected - HANA typically uses '+' operator",
+                "HANA_CONCAT_SYNTAX"
+            )
+
+        # Check for CREATE OR REPLACE VIEW (not supported in older HANA)
+        if self.create_or_replace:
+            result.add_warning(
+                "CREATE OR REPLACE VIEW not supported in all HANA versions - may need to DROP VIEW first",
+                "HANA_CREATE_OR_REPLACE"
+            )
+
+        # Check for NUMBER data type (should be DECIMAL in HANA)
+        if self.number_type:
+            result.add_warning(
+                "NUMBER data type is Snowflake-specific - HANA uses DECIMAL",
+                "HANA_NUMBER_TYPE"
+            )
+
+        # Check for TIMESTAMP_NTZ (should be TIMESTAMP in HANA)
+        if self.timestamp_ntz:
+            result.add_warning(
+                "TIMESTAMP_NTZ is Snowflake-specific - HANA uses TIMESTAMP",
+                "HANA_TIMESTAMP_TYPE"
+            )
 
 
 def validate_hana_sql(
     sql: str,
     scenario: Scenario,
-    hana_version: Optional[HanaVersion] = None
+    hana_version: Optional[HanaVersion] = None,
+    ast: Optional[SqlStatement] = None,
 ) -> ValidationResult:
     """Validate SQL for SAP HANA with version-specific checks.
-    
+
     Args:
         sql: SQL string to validate
         scenario: Scenario being validated
         hana_version: HANA version for version-specific validation
-    
+        ast: Optional statement AST the SQL was printed from
+
     Returns:
         ValidationResult with HANA-specific validation issues
     """
-    result = ValidationResult()
-    
-    # 1. Basic structure validation (common for all databases)
-    structure_result = validate_sql_structure(sql)
-    result.merge(structure_result)
-    
-    # 2. HANA-specific syntax checks
-    
-    # Check for IFF (should be IF in HANA)
-    if re.search(r'\bIFF\s*\(', sql, re.IGNORECASE):
-        result.add_error(
-            "IFF() function is not supported in HANA - should be IF()",
-            "HANA_INVALID_IFF_FUNCTION"
-        )
-    
-    # Check for Snowflake-specific || concatenation
-    # Note: HANA supports || but + is more common, so this is a warning
-    if ' || ' in sql:
-        result.add_warning(
-            "String concatenation using '||' detected - HANA typically uses '+' operator",
-            "HANA_CONCAT_SYNTAX"
-        )
-    
-    # Check for CREATE OR REPLACE VIEW (not supported in older HANA)
-    if re.search(r'CREATE\s+OR\s+REPLACE\s+VIEW', sql, re.IGNORECASE):
-        result.add_warning(
-            "CREATE OR REPLACE VIEW not supported in all HANA versions - may need to DROP VIEW first",
-            "HANA_CREATE_OR_REPLACE"
-        )
-    
-    # Check for NUMBER data type (should be DECIMAL in HANA)
-    if re.search(r'\bNUMBER\s*\(', sql, re.IGNORECASE):
-        result.add_warning(
-            "NUMBER data type is Snowflake-specific - HANA uses DECIMAL",
-            "HANA_NUMBER_TYPE"
-        )
-    
-    # Check for TIMESTAMP_NTZ (should be TIMESTAMP in HANA)
-    if re.search(r'\bTIMESTAMP_NTZ\b', sql, re.IGNORECASE):
-        result.add_warning(
-            "TIMESTAMP_NTZ is Snowflake-specific - HANA uses TIMESTAMP",
-            "HANA_TIMESTAMP_TYPE"
-        )
-    
-    # 3. Version-specific feature validation
+    # 1. Basic structure (common for all databases), 2. HANA-specific syntax,
+    # 3. version-specific features, 4. performance and 5. query complexity,
+    # all in a single walk over the token stream.
+    shape, prelude = _shape_for(ast)
+    visitors: List[SqlVisitor] = [*prelude, _StructureVisitor(sql, shape), _HanaSyntaxVisitor()]
     if hana_version:
-        version_result = _validate_hana_version_features(sql, hana_version)
-        result.merge(version_result)
-    
-    # 4. Performance validation (same for all modes)
-    performance_result = validate_performance(sql, scenario)
-    result.merge(performance_result)
-    
-    # 5. Query complexity (informational, same for all modes)
-    complexity_result = analyze_query_complexity(sql, scenario)
-    result.merge(complexity_result)
-    
-    return result
-
-
-def _validate_hana_version_features(sql: str, version: HanaVersion) -> ValidationResult:
-    """Check if SQL uses features available in target HANA version.
-    
-    Args:
-        sql: SQL string to validate
-        version: Target HANA version
-    
-    Returns:
-        ValidationResult with version-specific issues
-    """
-    result = ValidationResult()
-    
-    # Features requiring HANA 2.0 SPS01+
-    if version < HanaVersion.HANA_2_0_SPS01:
-        if re.search(r'\bINTERSECT\b', sql, re.IGNORECASE):
+        visitors.append(_HanaVersionVisitor(hana_version))
+    visitors.append(_PerformanceVisitor(scenario, shape))
+    visitors.append(_ComplexityVisitor(scenario, shape))
+    return _run_validators(sql, visitors)
+
+
+class _HanaVersionVisitor(_TokenValidator):
+    """Features that require a minimum HANA version."""
+
+    def __init__(self, version: HanaVersion) -> None:
+        super().__init__()
+        self.version = version
+        self.seen: set = set()
+
+    def handlers(self):
+        handlers = {}
+        # Features requiring HANA 2.0 SPS01+
+        if self.version < HanaVersion.HANA_2_0_SPS01:
+            handlers.update({"INTERSECT": self._mark, "EXCEPT": self._mark, "MINUS": self._mark})
+        # Features requiring HANA 2.0 SPS03+
+        if self.version < HanaVersion.HANA_2_0_SPS03:
+            handlers["IGNORE"] = self._ignore
+        # Features requiring minimum HANA 1.0
+        if self.version < HanaVersion.HANA_1_0:
+            handlers["ADD_MONTHS"] = self._add_months
+        return handlers
+
+    def _mark(self, tokens, index):
+        self.seen.add(tokens[index].key)
+
+    def _ignore(self, tokens, index):
+        if key_at(tokens, index + 1) == "NULLS":
+            self.seen.add("IGNORE NULLS")
+
+    def _add_months(self, tokens, index):
+        if key_at(tokens, index + 1) == "(":
+            self.seen.add("ADD_MONTHS")
+
+    def finish(self, tokens):
+        result = self.result
+        version = self.version
+        if "INTERSECT" in self.seen:
             result.add_error(
                 f"INTERSECT operator requires HANA 2.0 SPS01+ (current: {version.value})",
                 "HANA_VERSION_INTERSECT"
             )
-        if re.search(r'\bEXCEPT\b|\bMINUS\b', sql, re.IGNORECASE):
+        if "EXCEPT" in self.seen or "MINUS" in self.seen:
             result.add_error(
                 f"EXCEPT/MINUS operator requires HANA 2.0 SPS01+ (current: {version.value})",
                 "HANA_VERSION_MINUS"
             )
-    
-    # Features requiring HANA 2.0 SPS03+
-    if version < HanaVersion.HANA_2_0_SPS03:
         # Window functions with IGNORE NULLS
-        if re.search(r'IGNORE\s+NULLS', sql, re.IGNORECASE):
+        if "IGNORE NULLS" in self.seen:
             result.add_warning(
                 f"IGNORE NULLS in window functions may not be supported in HANA < 2.0 SPS03 (current: {version.value})",
                 "HANA_VERSION_IGNORE_NULLS"
             )
-    
-    # Features requiring minimum HANA 1.0
-    if version < HanaVersion.HANA_1_0:
-        if re.search(r'\bADD_MONTHS\s*\(', sql, re.IGNORECASE):
+        if "ADD_MONTHS" in self.seen:
             result.add_error(
                 f"ADD_MONTHS function not available in HANA < 1.0 (current: {version.value})",
                 "HANA_VERSION_ADD_MONTHS"
             )
-    
-    return result
 
+
+def _validate_hana_version_features(sql: str, version: HanaVersion) -> ValidationResult:
+    """Check if SQL uses features available in target HANA version.
+
+    Args:
+        sql: SQL string to validate
+        version: Target HANA version
+
+    Returns:
+        ValidationResult with version-specific issues
+    """
+    visitor = _HanaVersionVisitor(version)
+    walk_sql(sql, [visitor])
+    return visitor.result
+
+
+def _run_validators(sql: str, visitors: Sequence[SqlVisitor]) -> ValidationResult:
+    """Run ``visitors`` in one walk over ``sql`` and merge the validators' results in order.
+
+    Shape visitors must come first so the shape is complete before any
+    validator's ``finish`` reads it.
+    """
+
+    walk_sql(sql, visitors)
+    result = ValidationResult()
+    for visitor in visitors:
+        if isinstance(visitor, _TokenValidator):
+            result.merge(visitor.result)
+    return result
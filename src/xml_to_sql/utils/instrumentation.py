@@ -0,0 +1,330 @@
+"""Wall time, CPU time and peak allocation per conversion phase.
+
+A phase is a named span of work: a conversion stage (``stage:Generate SQL``)
+or a sub-phase inside one (``formula_translation``, ``validator:Dry Run``,
+``fix:cte_naming``). Phases are measured with :func:`measure`, or with
+:func:`start_phase` when start and end live in different places. Every
+finished phase is
+
+* appended to the :class:`ConversionProfile` passed in, if any, so a single
+  conversion can report its own breakdown, and
+* observed by the process-wide :class:`MetricsRegistry`, which aggregates
+  phases by name into fixed-bucket histograms for regression tracking and
+  worker sizing.
+
+CPU time is the measuring thread's own (``time.thread_time``), so validators
+running concurrently on a pool are not charged for each other.
+
+Peak allocation uses ``tracemalloc``, which slows allocation-heavy code
+noticeably and is therefore off unless ``CONVERSION_PROFILE_MEMORY`` is set
+or :func:`enable_memory_tracing` is called. tracemalloc counts allocations
+process-wide, so peaks are only attributed to phases on the thread that
+opened the outermost traced phase; phases on other threads report no peak.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Environment variable enabling peak allocation tracking
+PROFILE_MEMORY_ENV = "CONVERSION_PROFILE_MEMORY"
+
+# Histogram bucket upper bounds; values above the last bound land in an overflow bucket
+TIME_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 30_000)
+MEMORY_BUCKETS_KIB = (64, 256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576)
+
+
+@dataclass(slots=True)
+class PhaseTiming:
+    """Measurements of one finished phase."""
+
+    name: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_bytes: Optional[int] = None  # None when memory was not traced
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "peak_kib": None if self.peak_bytes is None else round(self.peak_bytes / 1024, 1),
+        }
+
+
+@dataclass(slots=True)
+class ConversionProfile:
+    """Phases of one conversion (or one CLI scenario), in completion order."""
+
+    phases: List[PhaseTiming] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, timing: PhaseTiming) -> None:
+        with self._lock:
+            self.phases.append(timing)
+
+    def get(self, name: str) -> Optional[PhaseTiming]:
+        with self._lock:
+            return next((phase for phase in self.phases if phase.name == name), None)
+
+    def to_dict(self) -> Dict[str, object]:
+        with self._lock:
+            return {"phases": [phase.to_dict() for phase in self.phases]}
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile by interpolating inside its bucket."""
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.maximum
+                lower = max(lower, self.minimum)
+                upper = min(upper, self.maximum)
+                return lower + (upper - lower) * ((rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.maximum
+
+    def to_dict(self) -> Dict[str, object]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 3)
+
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "min": rounded(self.minimum),
+            "max": rounded(self.maximum),
+            "mean": rounded(self.total / self.count) if self.count else None,
+            "p50": rounded(self.quantile(0.5)),
+            "p95": rounded(self.quantile(0.95)),
+            "p99": rounded(self.quantile(0.99)),
+            "buckets": [
+                {"le": bound, "count": count}
+                for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts)
+            ],
+        }
+
+
+class _PhaseStats:
+    __slots__ = ("wall_ms", "cpu_ms", "peak_kib")
+
+    def __init__(self) -> None:
+        self.wall_ms = Histogram(TIME_BUCKETS_MS)
+        self.cpu_ms = Histogram(TIME_BUCKETS_MS)
+        self.peak_kib = Histogram(MEMORY_BUCKETS_KIB)
+
+
+class MetricsRegistry:
+    """Thread-safe aggregation of finished phases into per-name histograms."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._phases: Dict[str, _PhaseStats] = {}
+        self._started = time.time()
+
+    def observe(self, timing: PhaseTiming) -> None:
+        with self._lock:
+            stats = self._phases.get(timing.name)
+            if stats is None:
+                stats = self._phases[timing.name] = _PhaseStats()
+            stats.wall_ms.observe(timing.wall_ms)
+            stats.cpu_ms.observe(timing.cpu_ms)
+            if timing.peak_bytes is not None:
+                stats.peak_kib.observe(timing.peak_bytes / 1024)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phases.clear()
+            self._started = time.time()
+
+    def snapshot(self) -> Dict[str, object]:
+        """Histograms per phase name, sorted by name."""
+
+        with self._lock:
+            return {
+                "since": self._started,
+                "memory_tracing": memory_tracing_enabled(),
+                "phases": {
+                    name: {
+                        "count": stats.wall_ms.count,
+                        "wall_ms": stats.wall_ms.to_dict(),
+                        "cpu_ms": stats.cpu_ms.to_dict(),
+                        "peak_kib": stats.peak_kib.to_dict() if stats.peak_kib.count else None,
+                    }
+                    for name, stats in sorted(self._phases.items())
+                },
+            }
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Peak allocation tracking
+
+
+class _MemoryFrame:
+    __slots__ = ("baseline", "peak")
+
+    def __init__(self, baseline: int) -> None:
+        self.baseline = baseline
+        self.peak = baseline
+
+
+_memory_lock = threading.Lock()
+_memory_frames: List[_MemoryFrame] = []
+_memory_owner: Optional[int] = None
+_memory_tracing = bool(os.getenv(PROFILE_MEMORY_ENV))
+
+
+def enable_memory_tracing(enabled: bool = True) -> None:
+    """Turn peak allocation tracking on or off for subsequently started phases."""
+
+    global _memory_tracing
+    _memory_tracing = enabled
+    if not enabled and tracemalloc.is_tracing():
+        with _memory_lock:
+            if not _memory_frames:
+                tracemalloc.stop()
+
+
+def memory_tracing_enabled() -> bool:
+    return _memory_tracing
+
+
+def _enter_memory() -> Optional[_MemoryFrame]:
+    global _memory_owner
+    if not _memory_tracing:
+        return None
+    thread = threading.get_ident()
+    with _memory_lock:
+        if _memory_owner not in (None, thread):
+            return None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        if _memory_frames:
+            # reset_peak() below forgets the enclosing phase's peak so far
+            _memory_frames[-1].peak = max(_memory_frames[-1].peak, peak)
+        tracemalloc.reset_peak()
+        frame = _MemoryFrame(current)
+        _memory_frames.append(frame)
+        _memory_owner = thread
+        return frame
+
+
+def _exit_memory(frame: _MemoryFrame) -> int:
+    global _memory_owner
+    with _memory_lock:
+        _, peak = tracemalloc.get_traced_memory()
+        index = _memory_frames.index(frame)
+        for inner in _memory_frames[index + 1:]:
+            peak = max(peak, inner.peak)
+        frame.peak = max(frame.peak, peak)
+        del _memory_frames[index]
+        if index:
+            _memory_frames[index - 1].peak = max(_memory_frames[index - 1].peak, frame.peak)
+        if not _memory_frames:
+            _memory_owner = None
+        return max(0, frame.peak - frame.baseline)
+
+
+# ---------------------------------------------------------------------------
+# Measuring
+
+
+class PhaseTimer:
+    """A running phase; :meth:`stop` records it (only the first call counts)."""
+
+    __slots__ = ("name", "profile", "_wall", "_cpu", "_memory", "_timing")
+
+    def __init__(self, name: str, profile: Optional[ConversionProfile] = None) -> None:
+        self.name = name
+        self.profile = profile
+        self._timing: Optional[PhaseTiming] = None
+        self._memory = _enter_memory()
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+
+    def stop(self) -> PhaseTiming:
+        if self._timing is not None:
+            return self._timing
+        wall_ms = (time.perf_counter() - self._wall) * 1000
+        cpu_ms = (time.thread_time() - self._cpu) * 1000
+        peak = _exit_memory(self._memory) if self._memory is not None else None
+        self._timing = PhaseTiming(self.name, wall_ms, cpu_ms, peak)
+        if self.profile is not None:
+            self.profile.add(self._timing)
+        _registry.observe(self._timing)
+        return self._timing
+
+
+def start_phase(name: str, profile: Optional[ConversionProfile] = None) -> PhaseTimer:
+    """Start measuring ``name``; call ``stop()`` on the returned timer to record it."""
+
+    return PhaseTimer(name, profile)
+
+
+@contextmanager
+def measure(name: str, profile: Optional[ConversionProfile] = None) -> Iterator[PhaseTimer]:
+    """Measure the enclosed block as phase ``name`` (recorded even if it raises)."""
+
+    timer = PhaseTimer(name, profile)
+    try:
+        yield timer
+    finally:
+        timer.stop()
+
+
+__all__ = [
+    "MEMORY_BUCKETS_KIB",
+    "PROFILE_MEMORY_ENV",
+    "TIME_BUCKETS_MS",
+    "ConversionProfile",
+    "Histogram",
+    "MetricsRegistry",
+    "PhaseTimer",
+    "PhaseTiming",
+    "enable_memory_tracing",
+    "get_metrics_registry",
+    "measure",
+    "memory_tracing_enabled",
+    "start_phase",
+]
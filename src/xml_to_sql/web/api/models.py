@@ -91,6 +91,40 @@ class BatchConversionResponse(BaseModel):
     created_at: datetime
 
 
+class JobSubmitResponse(BaseModel):
+    """Response model for a queued background batch job."""
+
+    job_id: str
+    status: str  # 'queued', 'running' or 'completed'
+    total_files: int
+    created_at: datetime
+
+
+class JobFileStatus(BaseModel):
+    """Progress of a single file in a background batch job."""
+
+    position: int
+    filename: str
+    status: str  # 'pending', 'running', 'success' or 'error'
+    conversion_id: Optional[int] = None
+    error_message: Optional[str] = None
+
+
+class JobStatusResponse(BaseModel):
+    """Response model for background batch job progress."""
+
+    job_id: str
+    status: str  # 'queued', 'running' or 'completed'
+    total_files: int
+    pending: int
+    running: int
+    successful: int
+    failed: int
+    files: List[JobFileStatus] = Field(default_factory=list)
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
 class HistoryEntry(BaseModel):
     """History entry for list view."""
 
@@ -107,9 +141,11 @@ class HistoryListResponse(BaseModel):
     """Response model for history list."""
 
     entries: List[HistoryEntry]
-    total: int
+    total: Optional[int] = None  # None when the count was not requested
+    total_is_estimate: bool = False
     page: int = 1
     page_size: int = 50
+    next_cursor: Optional[str] = None  # Pass as ``cursor`` to fetch the following page
 
 
 class ConversionStageInfo(BaseModel):
@@ -150,7 +186,7 @@ class CorrectionResult(BaseModel):
 class ConversionResponse(BaseModel):
     """Response model for single conversion."""
 
-    id: int
+    id: Optional[int] = None  # None when the conversion was not stored in the history
     filename: str
     scenario_id: Optional[str] = None
     sql_content: str
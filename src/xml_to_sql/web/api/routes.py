@@ -2,22 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
+import logging
+import threading
 import uuid
 from datetime import datetime
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import List
-from zipfile import ZipFile
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Query
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, Response, UploadFile, Query
 from fastapi.responses import FileResponse, StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session, sessionmaker
 
 from ...web.database import get_db, Conversion, BatchConversion, BatchFile
-from ...web.services.converter import convert_xml_to_sql, ConversionResult
+from ...web.database.blobs import conversion_digests, delete_unreferenced_blobs, store_texts
+from ...web.database.db import estimate_row_count
+from ...web.services.converter import convert_xml_to_sql, ConversionCancelled, ConversionResult
+from ...web.services.conversion_pool import convert_as_completed, get_conversion_thread_pool
+from ...web.services.batch_jobs import JobQueueFull, conversion_options, get_job_manager
+from ...web.services.batch_store import BatchWriter
+from ...web.services.history_writer import get_history_writer
+from ...web.services.maintenance import (
+    MaintenanceInProgress,
+    RetentionPolicy,
+    last_maintenance_report,
+    maintenance_interval_hours,
+    run_maintenance,
+)
+from ...web.services.result_cache import get_result_cache, result_cache_key
+from ...web.services.zip_export import batch_zip_entries, has_successful_conversions, stream_zip
 from ...web.services.xml_utils import prettify_xml
-from ...package_mapper import get_package
+from ...sql.validation_scheduler import BATCH_VALIDATION_BUDGET_MS, ValidationBudget
+from ...utils.instrumentation import get_metrics_registry
 from ...package_mapping_db import PackageMappingDB
 from .models import (
     ConversionConfig,
@@ -33,11 +54,16 @@ from .models import (
     BatchConversionRequest,
     BatchConversionResponse,
     BatchFileResult,
+    JobFileStatus,
+    JobStatusResponse,
+    JobSubmitResponse,
     HistoryEntry,
     HistoryListResponse,
     HistoryDetailResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api", tags=["conversion"])
 
 
@@ -63,8 +89,13 @@ def write_latest_sql_to_file(sql_content: str, scenario_id: str) -> None:
 # NOTE: More specific routes must come BEFORE less specific ones in FastAPI
 # So /convert/single/stream must be defined before /convert/single
 
+# How often a stream that has nothing to send checks whether the client is still there
+STREAM_DISCONNECT_POLL_SECONDS = 1.0
+
+
 @router.post("/convert/single/stream")
 async def convert_single_stream(
+    request: Request,
     file: UploadFile = File(..., description="XML file to convert"),
     config_json: str = Form(default="{}", description="Configuration as JSON string"),
     db: Session = Depends(get_db),
@@ -84,57 +115,59 @@ async def convert_single_stream(
 
     # Read file content
     xml_content_bytes = await file.read()
-
-    # Auto-detect package if not provided and database mode is HANA
-    hana_package = config.hana_package
-    if not hana_package and config.database_mode.lower() == "hana" and file.filename:
-        cv_name = Path(file.filename).stem
-        auto_package = get_package(cv_name)
-        if auto_package:
-            hana_package = auto_package
+    options = conversion_options(config, file.filename)
 
     async def event_generator():
-        """Generate SSE events as conversion progresses."""
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
+        """Generate SSE events as each conversion stage completes."""
+        loop = asyncio.get_running_loop()
+        stage_events: asyncio.Queue = asyncio.Queue()
+        cancel_event = threading.Event()
+
+        def progress_callback(stage):
+            """Hand a completed stage to the event loop (runs on the conversion thread)."""
+            loop.call_soon_threadsafe(stage_events.put_nowait, stage_to_sse_dict(stage))
+
+        # Run the synchronous conversion on the shared thread pool
+        conversion = loop.run_in_executor(
+            get_conversion_thread_pool(),
+            partial(
+                convert_xml_to_sql,
+                xml_content_bytes,
+                on_stage_update=progress_callback,
+                cancel_event=cancel_event,
+                **options,
+            ),
+        )
 
         try:
             # Start conversion message
             yield format_sse_message("start", {"filename": file.filename})
 
-            # Track stages for streaming
-            streamed_stages = []
-
-            def progress_callback(stage):
-                """Capture and stream stage updates."""
-                stage_dict = stage_to_sse_dict(stage)
-                streamed_stages.append(stage_dict)
-
-            # Run the synchronous conversion in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                result = await loop.run_in_executor(
-                    executor,
-                    lambda: convert_xml_to_sql(
-                        xml_content=xml_content_bytes,
-                        database_mode=config.database_mode,
-                        hana_version=config.hana_version,
-                        hana_package=hana_package,
-                        client=config.client,
-                        language=config.language,
-                        schema_overrides=config.schema_overrides,
-                        view_schema=config.view_schema,
-                        currency_udf_name=config.currency_udf_name,
-                        currency_rates_table=config.currency_rates_table,
-                        currency_schema=config.currency_schema,
-                        auto_fix=config.auto_fix,
-                        on_stage_update=progress_callback,
-                    )
+            # Send each stage the moment it completes
+            next_stage = None
+            while True:
+                if next_stage is None:
+                    next_stage = asyncio.ensure_future(stage_events.get())
+                done, _ = await asyncio.wait(
+                    {next_stage, conversion},
+                    timeout=STREAM_DISCONNECT_POLL_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-
-            # Stream all stages that were captured
-            for stage in streamed_stages:
-                yield format_sse_message("stage_update", stage)
+                if next_stage in done:
+                    yield format_sse_message("stage_update", next_stage.result())
+                    next_stage = None
+                elif conversion in done:
+                    next_stage.cancel()
+                    break
+                elif await request.is_disconnected():
+                    next_stage.cancel()
+                    return
+
+            # Stages are queued before the conversion's result is delivered
+            while not stage_events.empty():
+                yield format_sse_message("stage_update", stage_events.get_nowait())
+
+            result = conversion.result()
 
             # Send completion event with full result
             if result.error:
@@ -143,34 +176,37 @@ async def convert_single_stream(
                     "scenario_id": result.scenario_id
                 })
             else:
-                # Save to database
-                conversion = Conversion(
+                # Save to database (written in the background; the id is reserved now)
+                conversion_id = await get_history_writer().submit_async(dict(
                     filename=file.filename,
                     scenario_id=result.scenario_id,
-                    xml_content=xml_content_bytes.decode('utf-8', errors='ignore'),
+                    xml_content=prettify_xml(xml_content_bytes),
                     sql_content=result.sql_content or "",
                     abap_content=result.abap_content,
+                    config_json=config_json,
+                    warnings=json.dumps(list(result.warnings)),
+                    file_size=len(xml_content_bytes),
                     status="success",
-                    database_mode=config.database_mode,
-                    created_at=datetime.now(),
-                )
-                db.add(conversion)
-                db.commit()
-                db.refresh(conversion)
+                ))
 
                 # Write SQL to LATEST_SQL_FROM_DB.txt for Claude Code analysis
                 write_latest_sql_to_file(result.sql_content, result.scenario_id)
 
                 yield format_sse_message("complete", {
-                    "conversion_id": conversion.id,
+                    "conversion_id": conversion_id,
                     "scenario_id": result.scenario_id,
                     "sql_content": result.sql_content,
                     "abap_content": result.abap_content,
-                    "warnings": [w.message for w in result.warnings] if result.warnings else [],
+                    "warnings": list(result.warnings),
                 })
 
         except Exception as e:
             yield format_sse_message("error", {"error": str(e)})
+        finally:
+            if not conversion.done():
+                # Client disconnected: stop the conversion at its next stage
+                cancel_event.set()
+                conversion.add_done_callback(_discard_cancelled_conversion)
 
     return StreamingResponse(
         event_generator(),
@@ -183,13 +219,41 @@ async def convert_single_stream(
     )
 
 
+def _discard_cancelled_conversion(conversion: asyncio.Future) -> None:
+    if not conversion.cancelled() and isinstance(conversion.exception(), ConversionCancelled):
+        logger.info("Streamed conversion cancelled after client disconnect")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` with an ``If-None-Match`` header value."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
 @router.post("/convert/single", response_model=ConversionResponse)
 async def convert_single(
     file: UploadFile = File(..., description="XML file to convert"),
     config_json: str = Form(default="{}", description="Configuration as JSON string"),
     db: Session = Depends(get_db),
+    response: Response = None,
+    if_none_match: Optional[str] = Header(None),
+    record_history: bool = Form(default=True, description="Store the conversion in the history"),
 ) -> ConversionResponse:
-    """Convert a single XML file to SQL."""
+    """Convert a single XML file to SQL.
+
+    The response's ``ETag`` identifies the result: it is derived from the
+    XML, the configuration, the converter version and (HANA) the package
+    mappings. A client sending it back in ``If-None-Match`` with the same
+    upload gets ``304 Not Modified`` instead of the result; with
+    ``record_history`` off this skips the conversion entirely. Identical
+    submissions are answered from the result cache when it is enabled
+    (``X-Result-Cache: hit``).
+    """
     
     # Validate file type
     if not file.filename or not file.filename.lower().endswith((".xml", ".XML")):
@@ -211,53 +275,47 @@ async def convert_single(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
     
+    # Auto-detects the package if not provided and database mode is HANA
+    options = conversion_options(config, file.filename)
+    cache_key = await asyncio.to_thread(result_cache_key, xml_content_bytes, options)
+    etag = f'W/"{cache_key}"'
+    not_modified = _etag_matches(if_none_match, etag)
+    if not_modified and not record_history:
+        return Response(status_code=304, headers={"ETag": etag})
+
     # Format XML for storage
     xml_content_formatted = prettify_xml(xml_content_bytes)
 
-    # Auto-detect package if not provided and database mode is HANA
-    hana_package = config.hana_package
-    if not hana_package and config.database_mode.lower() == "hana" and file.filename:
-        cv_name = Path(file.filename).stem
-        auto_package = get_package(cv_name)
-        if auto_package:
-            hana_package = auto_package
-
-    # Convert XML to SQL
-    result = convert_xml_to_sql(
-        xml_content=xml_content_bytes,
-        database_mode=config.database_mode,
-        hana_version=config.hana_version,
-        hana_package=hana_package,
-        client=config.client,
-        language=config.language,
-        schema_overrides=config.schema_overrides,
-        view_schema=config.view_schema,
-        currency_udf_name=config.currency_udf_name,
-        currency_rates_table=config.currency_rates_table,
-        currency_schema=config.currency_schema,
-        auto_fix=config.auto_fix,
-    )
+    # Convert XML to SQL, unless the same submission was converted before
+    cache = get_result_cache()
+    result = await asyncio.to_thread(cache.get, cache_key) if cache is not None else None
+    if cache is not None:
+        response.headers["X-Result-Cache"] = "hit" if result is not None else "miss"
+    if result is None:
+        result = convert_xml_to_sql(xml_content=xml_content_bytes, **options)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, cache_key, result)
     
     if result.error:
-        # Save error to database
-        conversion = Conversion(
-            filename=file.filename or "unknown.xml",
-            scenario_id=result.scenario_id,
-            sql_content="",
-            xml_content=xml_content_formatted,
-            config_json=config_json,
-            warnings=json.dumps([]),
-            validation_result=None,
-            validation_logs=json.dumps(result.validation_logs or []),
-            file_size=file_size,
-            status="error",
-            error_message=result.error,
-        )
-        db.add(conversion)
-        db.commit()
-        db.refresh(conversion)
+        # Save error to database (written in the background)
+        if record_history:
+            await get_history_writer().submit_async(dict(
+                filename=file.filename or "unknown.xml",
+                scenario_id=result.scenario_id,
+                sql_content="",
+                xml_content=xml_content_formatted,
+                config_json=config_json,
+                warnings=json.dumps([]),
+                validation_result=None,
+                validation_logs=json.dumps(result.validation_logs or []),
+                file_size=file_size,
+                status="error",
+                error_message=result.error,
+            ))
         
         raise HTTPException(status_code=500, detail=result.error)
+
+    response.headers["ETag"] = etag
     
     warnings = [WarningResponse(message=w, level="warning") for w in result.warnings]
     metadata = ConversionMetadata(**result.metadata) if result.metadata else None
@@ -342,43 +400,47 @@ async def convert_single(
         for stage in result.stages
     ]
     
-    # Save to database
-    conversion = Conversion(
-        filename=file.filename or "unknown.xml",
-        scenario_id=result.scenario_id,
-        sql_content=result.sql_content,
-        abap_content=result.abap_content,
-        xml_content=xml_content_formatted,
-        config_json=config_json,
-        warnings=json.dumps([w for w in result.warnings]),
-        validation_result=validation.json() if validation else None,
-        validation_logs=json.dumps(result.validation_logs or []),
-        file_size=file_size,
-        status="success",
-    )
-    db.add(conversion)
-    db.commit()
-    db.refresh(conversion)
+    # Save to database (written in the background; the id is reserved now)
+    created_at = datetime.utcnow()
+    conversion_id = None
+    if record_history:
+        conversion_id = await get_history_writer().submit_async(dict(
+            filename=file.filename or "unknown.xml",
+            scenario_id=result.scenario_id,
+            sql_content=result.sql_content,
+            abap_content=result.abap_content,
+            xml_content=xml_content_formatted,
+            config_json=config_json,
+            warnings=json.dumps([w for w in result.warnings]),
+            validation_result=validation.json() if validation else None,
+            validation_logs=json.dumps(result.validation_logs or []),
+            file_size=file_size,
+            status="success",
+            created_at=created_at,
+        ))
 
     # Write SQL to LATEST_SQL_FROM_DB.txt for Claude Code analysis
     write_latest_sql_to_file(result.sql_content, result.scenario_id)
 
+    if not_modified:
+        return Response(status_code=304, headers={"ETag": etag})
+
     return ConversionResponse(
-        id=conversion.id,
-        filename=conversion.filename,
-        scenario_id=conversion.scenario_id,
-        sql_content=conversion.sql_content,
-        abap_content=conversion.abap_content,
-        xml_content=conversion.xml_content,
+        id=conversion_id,
+        filename=file.filename or "unknown.xml",
+        scenario_id=result.scenario_id,
+        sql_content=result.sql_content,
+        abap_content=result.abap_content,
+        xml_content=xml_content_formatted,
         warnings=warnings,
         metadata=metadata,
         validation=validation,
         validation_logs=result.validation_logs or [],
         corrections=corrections,
         stages=stages,
-        status=conversion.status,
-        error_message=conversion.error_message,
-        created_at=conversion.created_at,
+        status="success",
+        error_message=None,
+        created_at=created_at,
     )
 
 
@@ -413,16 +475,22 @@ async def convert_batch(
     db.add(batch)
     db.commit()
     
-    results: List[BatchFileResult] = []
-    
-    # Process each file
-    for file in files:
+    results: List[Optional[BatchFileResult]] = [None] * len(files)
+    # Expensive validators share one time budget across the whole batch
+    validation_budget = ValidationBudget(BATCH_VALIDATION_BUDGET_MS)
+
+    # Read and check every file, then fan the conversions out to the shared
+    # process pool so the event loop stays free for other requests
+    jobs = []
+    uploads = {}
+    for index, file in enumerate(files):
+        filename = file.filename or "unknown.xml"
         if not file.filename or not file.filename.lower().endswith((".xml", ".XML")):
-            results.append(BatchFileResult(
-                filename=file.filename or "unknown.xml",
+            results[index] = BatchFileResult(
+                filename=filename,
                 status="error",
                 error_message="File must be an XML file",
-            ))
+            )
             batch.failed += 1
             continue
         
@@ -430,110 +498,52 @@ async def convert_batch(
             xml_content_bytes = await file.read()
             file_size = len(xml_content_bytes)
         except Exception as e:
-            results.append(BatchFileResult(
-                filename=file.filename or "unknown.xml",
+            results[index] = BatchFileResult(
+                filename=filename,
                 status="error",
                 error_message=f"Error reading file: {str(e)}",
-            ))
+            )
             batch.failed += 1
             continue
-        
-        # Format XML for storage
-        xml_content_formatted = prettify_xml(xml_content_bytes)
-
-        # Auto-detect package if not provided and database mode is HANA
-        hana_package = config.hana_package
-        if not hana_package and config.database_mode.lower() == "hana" and file.filename:
-            cv_name = Path(file.filename).stem
-            auto_package = get_package(cv_name)
-            if auto_package:
-                hana_package = auto_package
-
-        # Convert XML to SQL
-        result = convert_xml_to_sql(
-            xml_content=xml_content_bytes,
-            database_mode=config.database_mode,
-            hana_version=config.hana_version,
-            hana_package=hana_package,
-            client=config.client,
-            language=config.language,
-            schema_overrides=config.schema_overrides,
-            view_schema=config.view_schema,
-            currency_udf_name=config.currency_udf_name,
-            currency_rates_table=config.currency_rates_table,
-            currency_schema=config.currency_schema,
-            auto_fix=config.auto_fix,
-        )
-        
+
+        uploads[index] = (filename, xml_content_bytes, file_size)
+        jobs.append((index, xml_content_bytes, conversion_options(config, file.filename)))
+
+    # Collect conversions as they complete; they are inserted in chunks.
+    # Prettifying, compressing and inserting block, so they run off the event
+    # loop (one call at a time, so the session is never shared between threads)
+    writer = BatchWriter(db, batch_id, config_json)
+    latest = None
+    async for index, result in convert_as_completed(jobs, validation_budget=validation_budget):
+        filename, xml_content_bytes, file_size = uploads[index]
+        await asyncio.to_thread(writer.add, index, filename, xml_content_bytes, file_size, result)
+
         if result.error:
-            conversion = Conversion(
-                filename=file.filename or "unknown.xml",
-                scenario_id=result.scenario_id,
-                sql_content="",
-                xml_content=xml_content_formatted,
-                config_json=config_json,
-                warnings=json.dumps([]),
-                file_size=file_size,
+            results[index] = BatchFileResult(
+                filename=filename,
                 status="error",
                 error_message=result.error,
             )
-            db.add(conversion)
-            db.commit()
-            db.refresh(conversion)
-            
-            # Link to batch
-            batch_file = BatchFile(
-                batch_id=batch_id,
-                conversion_id=conversion.id,
-                filename=file.filename or "unknown.xml",
-            )
-            db.add(batch_file)
-            
-            results.append(BatchFileResult(
-                filename=file.filename or "unknown.xml",
-                conversion_id=conversion.id,
-                status="error",
-                error_message=result.error,
-            ))
             batch.failed += 1
         else:
-            # Save successful conversion
-            conversion = Conversion(
-                filename=file.filename or "unknown.xml",
-                scenario_id=result.scenario_id,
-                sql_content=result.sql_content,
-                abap_content=result.abap_content,
-                xml_content=xml_content_formatted,
-                config_json=config_json,
-                warnings=json.dumps([w for w in result.warnings]),
-                file_size=file_size,
+            results[index] = BatchFileResult(
+                filename=filename,
                 status="success",
             )
-            db.add(conversion)
-            db.commit()
-            db.refresh(conversion)
-
-            # Write SQL to LATEST_SQL_FROM_DB.txt for Claude Code analysis
-            write_latest_sql_to_file(result.sql_content, result.scenario_id)
-
-            # Link to batch
-            batch_file = BatchFile(
-                batch_id=batch_id,
-                conversion_id=conversion.id,
-                filename=file.filename or "unknown.xml",
-            )
-            db.add(batch_file)
-            
-            results.append(BatchFileResult(
-                filename=file.filename or "unknown.xml",
-                conversion_id=conversion.id,
-                status="success",
-            ))
             batch.successful += 1
-    
-    db.commit()
+            latest = result
+
+    batch.completed_at = datetime.utcnow()
+    await asyncio.to_thread(writer.flush)
     db.refresh(batch)
-    
+    for index, conversion_id in writer.conversion_ids.items():
+        results[index].conversion_id = conversion_id
+
+    if latest is not None:
+        # Write SQL to LATEST_SQL_FROM_DB.txt for Claude Code analysis
+        # (once per batch, off the event loop)
+        await asyncio.to_thread(write_latest_sql_to_file, latest.sql_content, latest.scenario_id)
+
     return BatchConversionResponse(
         batch_id=batch.batch_id,
         total_files=batch.total_files,
@@ -544,6 +554,136 @@ async def convert_batch(
     )
 
 
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(
+    files: List[UploadFile] = File(..., description="XML files to convert"),
+    config_json: str = Form(default="{}", description="Configuration as JSON string"),
+    db: Session = Depends(get_db),
+) -> JobSubmitResponse:
+    """Queue multiple XML files for background conversion and return the job id."""
+
+    if not files:
+        raise HTTPException(status_code=400, detail="At least one file is required")
+
+    # Validate configuration now; the job converts with it later
+    try:
+        ConversionConfig(**(json.loads(config_json) if config_json else {}))
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON in config_json")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid configuration: {str(e)}")
+
+    uploads = []
+    for file in files:
+        try:
+            uploads.append((file.filename or "unknown.xml", await file.read()))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error reading file {file.filename}: {str(e)}")
+
+    try:
+        batch = get_job_manager().submit(db, uploads, config_json or "{}")
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return JobSubmitResponse(
+        job_id=batch.batch_id,
+        status=batch.status,
+        total_files=batch.total_files,
+        created_at=batch.created_at,
+    )
+
+
+def _job_status(batch: BatchConversion) -> JobStatusResponse:
+    files = [
+        JobFileStatus(
+            position=job_file.position,
+            filename=job_file.filename,
+            status=job_file.status,
+            conversion_id=job_file.conversion_id,
+            error_message=job_file.error_message,
+        )
+        for job_file in batch.job_files
+    ]
+    return JobStatusResponse(
+        job_id=batch.batch_id,
+        status=batch.status,
+        total_files=batch.total_files,
+        pending=sum(f.status == "pending" for f in files),
+        running=sum(f.status == "running" for f in files),
+        successful=batch.successful,
+        failed=batch.failed,
+        files=files,
+        created_at=batch.created_at,
+        completed_at=batch.completed_at,
+    )
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    db: Session = Depends(get_db),
+):
+    """Stream per-file results of a background job via SSE until it completes."""
+    from .sse_helper import format_sse_message
+
+    if not db.query(BatchConversion).filter(BatchConversion.batch_id == job_id).first():
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    manager = get_job_manager()
+
+    async def event_generator():
+        sent = set()
+        while True:
+            db.expire_all()
+            batch = db.query(BatchConversion).filter(BatchConversion.batch_id == job_id).first()
+            status = _job_status(batch)
+            for file_status in status.files:
+                if file_status.status in ("success", "error") and file_status.position not in sent:
+                    sent.add(file_status.position)
+                    yield format_sse_message("file", file_status.model_dump())
+            if status.status == "completed":
+                yield format_sse_message("complete", status.model_dump(mode="json", exclude={"files"}))
+                return
+            # Poll now and then as well, in case another process runs the job
+            if not await manager.wait_for_progress(timeout=5.0):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+) -> JobStatusResponse:
+    """Get per-file progress of a background batch job."""
+
+    batch = db.query(BatchConversion).filter(BatchConversion.batch_id == job_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(batch)
+
+
+async def _get_conversion(db: Session, conversion_id: int) -> Optional[Conversion]:
+    """Load a conversion, waiting for it if it is still in the write-behind queue."""
+
+    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    if conversion is None:
+        writer = get_history_writer()
+        if writer.is_pending(conversion_id):
+            await asyncio.to_thread(writer.wait_for, conversion_id, 10.0)
+            conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    return conversion
+
+
 @router.get("/download/{conversion_id}")
 async def download_sql(
     conversion_id: int,
@@ -551,7 +691,7 @@ async def download_sql(
 ) -> StreamingResponse:
     """Download SQL file for a conversion."""
 
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    conversion = await _get_conversion(db, conversion_id)
     if not conversion:
         raise HTTPException(status_code=404, detail="Conversion not found")
 
@@ -576,7 +716,7 @@ async def generate_abap(
     """Generate ABAP Report for a conversion on demand."""
     from ...abap import generate_abap_report
 
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    conversion = await _get_conversion(db, conversion_id)
     if not conversion:
         raise HTTPException(status_code=404, detail="Conversion not found")
 
@@ -596,7 +736,7 @@ async def generate_abap(
         raise HTTPException(status_code=500, detail=f"ABAP generation failed: {str(e)}")
 
     # Save to database
-    conversion.abap_content = abap_content
+    conversion.abap_content_digest = store_texts(db, [abap_content])[0]
     db.commit()
 
     return {
@@ -614,7 +754,7 @@ async def download_abap(
 ) -> StreamingResponse:
     """Download ABAP Report file for a conversion."""
 
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    conversion = await _get_conversion(db, conversion_id)
     if not conversion:
         raise HTTPException(status_code=404, detail="Conversion not found")
 
@@ -638,78 +778,107 @@ async def download_abap(
 @router.get("/download/batch/{batch_id}")
 async def download_batch_zip(
     batch_id: str,
+    include_abap: bool = Query(False, description="Add an ABAP report per conversion"),
+    include_validation: bool = Query(False, description="Add the validation report per conversion"),
     db: Session = Depends(get_db),
 ) -> StreamingResponse:
-    """Download all SQL files from a batch as a ZIP."""
+    """Download all SQL files from a batch as a ZIP, streamed entry by entry."""
     
     batch = db.query(BatchConversion).filter(BatchConversion.batch_id == batch_id).first()
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    # Get all successful conversions for this batch
-    batch_files = db.query(BatchFile).filter(
-        BatchFile.batch_id == batch_id
-    ).all()
-    
-    conversions = [
-        db.query(Conversion).filter(Conversion.id == bf.conversion_id).first()
-        for bf in batch_files
-    ]
-    conversions = [c for c in conversions if c and c.status == "success"]
-    
-    if not conversions:
+    if not has_successful_conversions(db, batch_id):
         raise HTTPException(status_code=404, detail="No successful conversions found in batch")
     
-    # Create ZIP in memory
-    zip_buffer = BytesIO()
-    with ZipFile(zip_buffer, "w") as zip_file:
-        for conversion in conversions:
-            filename = conversion.filename.rsplit(".", 1)[0] + ".sql" if "." in conversion.filename else conversion.filename + ".sql"
-            zip_file.writestr(filename, conversion.sql_content.encode("utf-8"))
-    
-    zip_buffer.seek(0)
+    # The archive is built while it is sent, from rows streamed by one joined
+    # query on a session of its own
+    entries = batch_zip_entries(
+        sessionmaker(bind=db.get_bind()),
+        batch_id,
+        include_abap=include_abap,
+        include_validation=include_validation,
+    )
     
     return StreamingResponse(
-        zip_buffer,
+        stream_zip(entries),
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="batch_{batch_id}.zip"'},
     )
 
 
+# Columns shown in the history list; the XML, SQL and ABAP texts are never loaded for it
+_HISTORY_LIST_COLUMNS = (
+    Conversion.id,
+    Conversion.filename,
+    Conversion.scenario_id,
+    Conversion.status,
+    Conversion.created_at,
+    Conversion.file_size,
+    Conversion.error_message,
+)
+
+
+def _encode_history_cursor(created_at: datetime, conversion_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{conversion_id}".encode()).decode()
+
+
+def _decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, conversion_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(conversion_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
+
+
 @router.get("/history", response_model=HistoryListResponse)
 async def get_history(
-    page: int = 1,
-    page_size: int = 50,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
+    count: Literal["exact", "estimate", "none"] = "exact",
     db: Session = Depends(get_db),
 ) -> HistoryListResponse:
-    """Get conversion history with pagination."""
-    
-    offset = (page - 1) * page_size
-    
-    # Get total count
-    total = db.query(Conversion).count()
-    
-    # Get paginated entries
-    conversions = db.query(Conversion).order_by(Conversion.created_at.desc()).offset(offset).limit(page_size).all()
-    
-    entries = [
-        HistoryEntry(
-            id=c.id,
-            filename=c.filename,
-            scenario_id=c.scenario_id,
-            status=c.status,
-            created_at=c.created_at,
-            file_size=c.file_size,
-            error_message=c.error_message,
-        )
-        for c in conversions
-    ]
-    
+    """Get conversion history, newest first.
+
+    Pages are addressed either by ``page`` number or, for constant cost at
+    any depth, by the ``cursor`` returned as ``next_cursor`` with the
+    previous page; ``page`` is ignored when a cursor is given. The order is
+    ``(created_at, id)`` descending, so rows created within the same instant
+    are neither skipped nor repeated across pages.
+
+    ``count`` selects how ``total`` is produced: ``exact`` counts the rows,
+    ``estimate`` derives it from the id range without scanning, ``none``
+    leaves it out.
+    """
+    query = db.query(*_HISTORY_LIST_COLUMNS).order_by(Conversion.created_at.desc(), Conversion.id.desc())
+    if cursor:
+        # The created_at index carries the rowid, so it serves this seek and order directly
+        query = query.filter(tuple_(Conversion.created_at, Conversion.id) < _decode_history_cursor(cursor))
+    else:
+        query = query.offset((page - 1) * page_size)
+    # One extra row tells whether another page follows
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_history_cursor(rows[-1].created_at, rows[-1].id)
+
+    if count == "exact":
+        total = db.query(func.count(Conversion.id)).scalar()
+    elif count == "estimate":
+        total = estimate_row_count(db, Conversion)
+    else:
+        total = None
+
     return HistoryListResponse(
-        entries=entries,
+        entries=[HistoryEntry(**row._asdict()) for row in rows],
         total=total,
+        total_is_estimate=count == "estimate",
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -720,7 +889,7 @@ async def get_history_detail(
 ) -> HistoryDetailResponse:
     """Get detailed information about a conversion."""
     
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    conversion = await _get_conversion(db, conversion_id)
     if not conversion:
         raise HTTPException(status_code=404, detail="Conversion not found")
     
@@ -774,15 +943,18 @@ async def delete_history(
 ) -> dict:
     """Delete a conversion from history."""
     
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
+    conversion = await _get_conversion(db, conversion_id)
     if not conversion:
         raise HTTPException(status_code=404, detail="Conversion not found")
     
     # Delete associated batch file links
     db.query(BatchFile).filter(BatchFile.conversion_id == conversion_id).delete()
     
-    # Delete conversion
+    # Delete conversion, and the texts no other conversion shares
+    digests = conversion_digests(db, [conversion_id])
     db.delete(conversion)
+    db.flush()
+    delete_unreferenced_blobs(db, digests)
     db.commit()
     
     return {"message": "Conversion deleted successfully"}
@@ -812,9 +984,11 @@ async def delete_history_bulk(
             synchronize_session=False
         )
 
+        digests = conversion_digests(db, id_list)
         deleted = db.query(Conversion).filter(Conversion.id.in_(id_list)).delete(
             synchronize_session=False
         )
+        delete_unreferenced_blobs(db, digests)
         db.commit()
 
         return {"message": "Selected conversions deleted successfully", "deleted": deleted}
@@ -822,6 +996,7 @@ async def delete_history_bulk(
     # Delete entire history
     db.query(BatchFile).delete()
     deleted = db.query(Conversion).delete()
+    delete_unreferenced_blobs(db)
     db.commit()
 
     return {"message": "All conversion history deleted successfully", "deleted": deleted}
@@ -1094,3 +1269,77 @@ async def get_default_config() -> dict:
         "currency_schema": None,
     }
 
+
+@router.get("/metrics")
+async def get_metrics(
+    reset: bool = Query(False, description="Clear the histograms after reading them"),
+) -> dict:
+    """Get wall time, CPU time and peak allocation histograms per conversion phase.
+
+    Covers every conversion served by this worker process since start-up
+    (or the last reset). ``history_writer`` reports the depth and lag of the
+    write-behind queue that stores single conversions; ``result_cache`` the
+    hits and size of the result cache, when it is enabled.
+    """
+
+    registry = get_metrics_registry()
+    snapshot = registry.snapshot()
+    if reset:
+        registry.reset()
+    snapshot["history_writer"] = get_history_writer().stats().to_dict()
+    cache = get_result_cache()
+    if cache is not None:
+        snapshot["result_cache"] = (await asyncio.to_thread(cache.stats)).to_dict()
+    return snapshot
+
+
+# Admin Endpoints
+
+@router.get("/admin/maintenance")
+async def get_maintenance_status() -> dict:
+    """Get the retention policy, the background interval and the last maintenance report."""
+
+    report = last_maintenance_report()
+    return {
+        "policy": RetentionPolicy.from_env().to_dict(),
+        "interval_hours": maintenance_interval_hours(),
+        "last_report": report.to_dict() if report is not None else None,
+    }
+
+
+@router.post("/admin/maintenance")
+async def run_maintenance_now(
+    retention: bool = Query(True, description="Archive and delete the conversions the retention policy no longer keeps"),
+    retention_days: Optional[int] = Query(None, ge=1, description="Override HISTORY_RETENTION_DAYS"),
+    max_rows: Optional[int] = Query(None, ge=1, description="Override HISTORY_RETENTION_MAX_ROWS"),
+    vacuum: bool = Query(True, description="Return free pages to the file system"),
+    full_vacuum: bool = Query(False, description="Rewrite the files and enable incremental vacuum (locks the databases)"),
+    analyze: bool = Query(True, description="Refresh the query planner statistics"),
+    reindex: bool = Query(False, description="Rebuild all indexes"),
+) -> dict:
+    """Run retention and compaction of the history and package mapping databases now.
+
+    Returns the rows removed, the archive files written and the bytes each
+    database file gave back. Responds 409 while a run is in progress.
+    """
+
+    policy = RetentionPolicy.from_env()
+    if not retention:
+        policy = RetentionPolicy()
+    else:
+        policy.max_age_days = retention_days or policy.max_age_days
+        policy.max_rows = max_rows or policy.max_rows
+    try:
+        report = await asyncio.to_thread(
+            partial(
+                run_maintenance,
+                policy,
+                vacuum=vacuum,
+                full_vacuum=full_vacuum,
+                analyze=analyze,
+                reindex=reindex,
+            )
+        )
+    except MaintenanceInProgress as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return report.to_dict()
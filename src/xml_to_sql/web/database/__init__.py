@@ -1,7 +1,7 @@
 """Database layer for web interface."""
 
 from .db import get_db, init_db
-from .models import Conversion, BatchConversion, BatchFile
+from .models import Blob, Conversion, BatchConversion, BatchFile, BatchJobFile
 
-__all__ = ["get_db", "init_db", "Conversion", "BatchConversion", "BatchFile"]
+__all__ = ["get_db", "init_db", "Blob", "Conversion", "BatchConversion", "BatchFile", "BatchJobFile"]
 
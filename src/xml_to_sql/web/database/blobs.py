@@ -0,0 +1,197 @@
+"""Content-addressed storage of conversion texts.
+
+The XML, SQL, ABAP and JSON texts of a ``Conversion`` are kept in the
+``blobs`` table, zlib-compressed and keyed by the SHA-256 of the text, and
+the conversion row holds only the digests (``<field>_digest``). Identical
+texts, such as a view uploaded again or the same warnings on many rows, are
+stored once.
+
+Writers turn row dicts into digest rows with :func:`with_blob_digests` in
+the transaction that inserts the conversions. Rows written before the blob
+store keep their texts inline (the ``legacy_*`` columns) until
+:func:`migrate_inline_texts` moves them; ``Conversion.sql_content`` and the
+other text properties read either form.
+
+Blobs no longer referenced by any conversion are removed by
+:func:`delete_unreferenced_blobs`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, false, or_, select, union, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import CONTENT_FIELDS, Blob, Conversion
+
+logger = logging.getLogger(__name__)
+
+# zlib level: close to the ratio of level 9 on XML/SQL at a fraction of the time
+BLOB_COMPRESSION_LEVEL = 6
+
+# Conversions moved per transaction by migrate_inline_texts
+MIGRATION_CHUNK_SIZE = 200
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def stored_text(data: Optional[bytes], legacy: Optional[str]) -> Optional[str]:
+    """Text from a blob's ``data`` column, or the inline text when there is no blob."""
+
+    return zlib.decompress(data).decode("utf-8") if data is not None else legacy
+
+
+def store_texts(db: Session, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Store the texts not stored yet and return their digests (``None`` for ``None``).
+
+    Texts already in the store are neither compressed nor written again. The
+    blobs are added in the caller's transaction.
+    """
+    digests: List[Optional[str]] = []
+    new: Dict[str, bytes] = {}
+    for text in texts:
+        if text is None:
+            digests.append(None)
+            continue
+        encoded = text.encode("utf-8")
+        digest = hashlib.sha256(encoded).hexdigest()
+        digests.append(digest)
+        new.setdefault(digest, encoded)
+
+    if new:
+        # Take the write lock before looking up stored blobs, so that
+        # delete_unreferenced_blobs cannot remove one between the lookup and
+        # the caller's insert of the conversion referring to it
+        db.execute(update(Blob).where(false()).values(size=Blob.size).execution_options(synchronize_session=False))
+        existing = set(db.scalars(select(Blob.digest).where(Blob.digest.in_(list(new)))))
+        rows = [
+            {"digest": digest, "data": zlib.compress(encoded, BLOB_COMPRESSION_LEVEL), "size": len(encoded)}
+            for digest, encoded in new.items()
+            if digest not in existing
+        ]
+        if rows:
+            # Another writer may have stored the same text in the meantime
+            db.execute(sqlite_insert(Blob).on_conflict_do_nothing(index_elements=["digest"]), rows)
+    return digests
+
+
+def with_blob_digests(db: Session, rows: List[dict]) -> List[dict]:
+    """Store the texts of ``Conversion`` row dicts and return the rows with digests instead.
+
+    Each text field (``sql_content``, ``xml_content``, ...) is replaced by its
+    ``<field>_digest``; the other values are kept.
+    """
+    digests = iter(store_texts(db, [row.get(field) for row in rows for field in CONTENT_FIELDS]))
+    stored = []
+    for row in rows:
+        row = {key: value for key, value in row.items() if key not in CONTENT_FIELDS}
+        row.update((f"{field}_digest", next(digests)) for field in CONTENT_FIELDS)
+        stored.append(row)
+    return stored
+
+
+def delete_unreferenced_blobs(db: Session, candidates: Optional[Iterable[str]] = None) -> int:
+    """Delete blobs no conversion refers to and return how many were deleted.
+
+    Args:
+        db: Session; the deletion is not committed
+        candidates: Only consider these digests (e.g. those of conversions
+            just deleted); all blobs when omitted
+    """
+    referenced = union(*(
+        select(column).where(column.is_not(None))
+        for column in (getattr(Conversion, f"{field}_digest") for field in CONTENT_FIELDS)
+    ))
+    statement = delete(Blob).where(Blob.digest.not_in(referenced))
+    if candidates is not None:
+        candidates = {digest for digest in candidates if digest}
+        if not candidates:
+            return 0
+        statement = statement.where(Blob.digest.in_(candidates))
+    return db.execute(statement).rowcount
+
+
+def conversion_digests(db: Session, conversion_ids: Iterable[int]) -> set:
+    """Digests referenced by the given conversions."""
+
+    columns = [getattr(Conversion, f"{field}_digest") for field in CONTENT_FIELDS]
+    digests = set()
+    for row in db.execute(select(*columns).where(Conversion.id.in_(list(conversion_ids)))):
+        digests.update(digest for digest in row if digest)
+    return digests
+
+
+def migrate_inline_texts(
+    session_factory: Callable[[], Session],
+    chunk_size: int = MIGRATION_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Move texts stored inline on ``conversions`` into the blob store.
+
+    Conversions are migrated in id order, one transaction per chunk, so the
+    migration can be interrupted and run again; the application keeps
+    working meanwhile. The inline columns are emptied, but the file only
+    shrinks once the database is vacuumed.
+
+    Args:
+        session_factory: Creates sessions on the database to migrate
+        chunk_size: Conversions per transaction
+        progress: Called with the number of conversions migrated so far
+
+    Returns:
+        Number of conversions migrated
+    """
+    legacy = [getattr(Conversion, f"legacy_{field}") for field in CONTENT_FIELDS]
+    has_inline_text = or_(Conversion.legacy_sql_content != "", *(column.is_not(None) for column in legacy[1:]))
+
+    migrated = 0
+    last_id = 0
+    while True:
+        with session_factory() as db:
+            rows = db.execute(
+                select(Conversion.id, *legacy)
+                .where(Conversion.id > last_id, has_inline_text)
+                .order_by(Conversion.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return migrated
+
+            digests = iter(store_texts(db, [text for row in rows for text in row[1:]]))
+            updates = []
+            for row in rows:
+                values = {"id": row.id, "legacy_sql_content": ""}
+                values.update((f"legacy_{field}", None) for field in CONTENT_FIELDS[1:])
+                for field in CONTENT_FIELDS:
+                    digest = next(digests)
+                    if digest is not None:
+                        values[f"{field}_digest"] = digest
+                updates.append(values)
+            db.execute(update(Conversion), updates)
+            db.commit()
+
+        migrated += len(rows)
+        last_id = rows[-1].id
+        logger.info("Moved the texts of %d conversions into the blob store", migrated)
+        if progress is not None:
+            progress(migrated)
+
+
+__all__ = [
+    "BLOB_COMPRESSION_LEVEL",
+    "MIGRATION_CHUNK_SIZE",
+    "conversion_digests",
+    "delete_unreferenced_blobs",
+    "migrate_inline_texts",
+    "store_texts",
+    "stored_text",
+    "text_digest",
+    "with_blob_digests",
+]
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from .models import Base
+from .models import CONTENT_FIELDS, Base
 
 # SQLite database file location
 # Check for environment variable, then try data directory, then project root
@@ -33,15 +34,21 @@ engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def init_db() -> None:
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
-    _ensure_additional_columns()
+def init_db(bind: Optional[Engine] = None) -> None:
+    """Initialize database tables (of ``bind``, default: the web database)."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # Lets maintenance return freed pages to the file system; only
+            # takes effect on a new database (see services/maintenance.py)
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        Base.metadata.create_all(bind=conn)
+    _ensure_additional_columns(bind)
 
 
-def _ensure_additional_columns() -> None:
+def _ensure_additional_columns(bind: Engine) -> None:
     """Ensure new columns exist in legacy databases."""
-    inspector = inspect(engine)
+    inspector = inspect(bind)
     existing_tables = inspector.get_table_names()
     if "conversions" not in existing_tables:
         return
@@ -52,13 +59,41 @@ def _ensure_additional_columns() -> None:
         statements.append("ALTER TABLE conversions ADD COLUMN validation_result TEXT")
     if "validation_logs" not in existing_columns:
         statements.append("ALTER TABLE conversions ADD COLUMN validation_logs TEXT")
+    for field in CONTENT_FIELDS:
+        if f"{field}_digest" not in existing_columns:
+            statements.append(f"ALTER TABLE conversions ADD COLUMN {field}_digest VARCHAR(64) REFERENCES blobs(digest)")
+
+    if "batch_conversions" in existing_tables:
+        batch_columns = {col["name"] for col in inspector.get_columns("batch_conversions")}
+        if "status" not in batch_columns:
+            statements.append("ALTER TABLE batch_conversions ADD COLUMN status VARCHAR NOT NULL DEFAULT 'completed'")
+        if "config_json" not in batch_columns:
+            statements.append("ALTER TABLE batch_conversions ADD COLUMN config_json TEXT")
+        if "completed_at" not in batch_columns:
+            statements.append("ALTER TABLE batch_conversions ADD COLUMN completed_at DATETIME")
 
     if statements:
-        with engine.begin() as conn:
+        with bind.begin() as conn:
             for stmt in statements:
                 conn.execute(text(stmt))
 
 
+def estimate_row_count(db: Session, model) -> int:
+    """Approximate row count of ``model``'s table from its integer primary key span.
+
+    Reads only the first and last key of the primary key index instead of
+    counting every row, so it stays cheap on large tables. Deleted rows and
+    unused reserved ids make it an overestimate.
+    """
+    key = model.__mapper__.primary_key[0]
+    # Separate statements: SQLite only takes the index shortcut for a lone MIN or MAX
+    lowest = db.execute(select(func.min(key))).scalar()
+    if lowest is None:
+        return 0
+    highest = db.execute(select(func.max(key))).scalar()
+    return highest - lowest + 1
+
+
 def get_db() -> Generator[Session, None, None]:
     """Dependency for FastAPI to get database session."""
     db = SessionLocal()
@@ -0,0 +1,99 @@
+"""Conversion ids reserved ahead of the insert.
+
+Conversions written in the background (see ``history_writer``) and in bulk
+(see ``batch_store``) need their id before the row exists, so every
+``Conversion`` is inserted with an explicit id taken from here rather than
+with SQLite's ``max(id) + 1``.
+
+Ids are reserved from the ``id_sequences`` table in blocks (hi/lo), so
+reserving is one small write per block. Blocks are claimed with a compare-and-set
+update, which keeps them disjoint across processes sharing the database.
+Ids of a block that is not used up before the process exits are skipped.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import List
+
+from sqlalchemy import func, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import Conversion, IdSequence
+
+# Ids reserved per write to id_sequences
+ID_BLOCK_SIZE = 100
+
+_CONVERSIONS = "conversions"
+
+
+class ConversionIdAllocator:
+    """Hands out conversion ids from blocks reserved in ``engine``'s database."""
+
+    def __init__(self, engine: Engine, block_size: int = ID_BLOCK_SIZE) -> None:
+        self.block_size = block_size
+        self._sessions = sessionmaker(bind=engine)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def reserve(self, count: int = 1) -> List[int]:
+        """Return ``count`` unused ids, in increasing order."""
+
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < count:
+                if self._next >= self._end:
+                    self._next, self._end = self._reserve_block(max(self.block_size, count - len(ids)))
+                take = min(count - len(ids), self._end - self._next)
+                ids.extend(range(self._next, self._next + take))
+                self._next += take
+        return ids
+
+    def _reserve_block(self, size: int) -> tuple[int, int]:
+        while True:
+            with self._sessions() as db:
+                # Never hand out ids below existing rows (legacy rows, other writers)
+                max_id = db.query(func.max(Conversion.id)).scalar() or 0
+                sequence = db.get(IdSequence, _CONVERSIONS)
+                start = max(max_id + 1, sequence.next_value if sequence else 1)
+                try:
+                    if sequence is None:
+                        db.add(IdSequence(name=_CONVERSIONS, next_value=start + size))
+                        claimed = True
+                    else:
+                        claimed = db.execute(
+                            update(IdSequence)
+                            .where(IdSequence.name == _CONVERSIONS, IdSequence.next_value == sequence.next_value)
+                            .values(next_value=start + size)
+                        ).rowcount == 1
+                    if claimed:
+                        db.commit()
+                        return start, start + size
+                except IntegrityError:
+                    pass  # another process created the sequence first
+                db.rollback()
+
+
+_allocators: "weakref.WeakKeyDictionary[Engine, ConversionIdAllocator]" = weakref.WeakKeyDictionary()
+_allocators_lock = threading.Lock()
+
+
+def reserve_conversion_ids(db: Session, count: int = 1) -> List[int]:
+    """Reserve ``count`` conversion ids in the database ``db`` is bound to.
+
+    The reservation is committed on its own connection; ``db``'s transaction
+    is left alone.
+    """
+    engine = db.get_bind()
+    with _allocators_lock:
+        allocator = _allocators.get(engine)
+        if allocator is None:
+            allocator = _allocators[engine] = ConversionIdAllocator(engine)
+    return allocator.reserve(count)
+
+
+__all__ = ["ID_BLOCK_SIZE", "ConversionIdAllocator", "reserve_conversion_ids"]
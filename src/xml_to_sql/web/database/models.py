@@ -2,15 +2,54 @@
 
 from __future__ import annotations
 
+import zlib
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String, Text, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 Base = declarative_base()
 
 
+class Blob(Base):
+    """Compressed text stored once, keyed by the SHA-256 of its content."""
+
+    __tablename__ = "blobs"
+
+    digest = Column(String(64), primary_key=True)  # SHA-256 hex of the UTF-8 text
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed UTF-8 text
+    size = Column(Integer, nullable=False)  # Uncompressed bytes
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+
+# Conversion texts kept in ``blobs`` (see ``blobs.py``)
+CONTENT_FIELDS = ("sql_content", "abap_content", "xml_content", "warnings", "validation_result", "validation_logs")
+
+
+def _stored_text(field: str) -> property:
+    """Text of ``field``: its blob, or the inline column of rows not moved to blobs yet.
+
+    Assigning stores the text inline (uncompressed); ``store_texts`` and the
+    ``*_digest`` columns are the way to write it into the blob store.
+    """
+
+    def get(self) -> Optional[str]:
+        blob = getattr(self, f"{field}_blob")
+        return blob.text if blob is not None else getattr(self, f"legacy_{field}")
+
+    def set(self, value: Optional[str]) -> None:
+        setattr(self, f"legacy_{field}", value)
+        setattr(self, f"{field}_digest", None)
+
+    return property(get, set)
+
+
 class Conversion(Base):
     """Single XML to SQL conversion record."""
 
@@ -19,20 +58,41 @@ class Conversion(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False, index=True)
     scenario_id = Column(String, nullable=True, index=True)
-    sql_content = Column(Text, nullable=False)
-    abap_content = Column(Text, nullable=True)  # Generated ABAP Report program
-    xml_content = Column(Text, nullable=True)  # Original XML file content
+    # Digests of the texts in ``blobs``
+    sql_content_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)
+    abap_content_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)  # Generated ABAP Report program
+    xml_content_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)  # Original XML file content
+    warnings_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)  # JSON array of warnings
+    validation_result_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)  # JSON serialized validation result
+    validation_logs_digest = Column(String(64), ForeignKey("blobs.digest"), nullable=True)  # JSON array of validation logs
     config_json = Column(Text, nullable=True)  # JSON string of config used
-    warnings = Column(Text, nullable=True)  # JSON array of warnings
-    validation_result = Column(Text, nullable=True)  # JSON serialized validation result
-    validation_logs = Column(Text, nullable=True)  # JSON array of validation logs
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     file_size = Column(Integer, nullable=True)
     status = Column(String, default="success", nullable=False)  # 'success' or 'error'
     error_message = Column(Text, nullable=True)
+    # Texts stored inline before the blob store; emptied by ``migrate_inline_texts``
+    legacy_sql_content = Column("sql_content", Text, nullable=False, default="")
+    legacy_abap_content = Column("abap_content", Text, nullable=True)
+    legacy_xml_content = Column("xml_content", Text, nullable=True)
+    legacy_warnings = Column("warnings", Text, nullable=True)
+    legacy_validation_result = Column("validation_result", Text, nullable=True)
+    legacy_validation_logs = Column("validation_logs", Text, nullable=True)
 
     # Relationships
     batch_files = relationship("BatchFile", back_populates="conversion")
+    sql_content_blob = relationship(Blob, foreign_keys=[sql_content_digest], viewonly=True)
+    abap_content_blob = relationship(Blob, foreign_keys=[abap_content_digest], viewonly=True)
+    xml_content_blob = relationship(Blob, foreign_keys=[xml_content_digest], viewonly=True)
+    warnings_blob = relationship(Blob, foreign_keys=[warnings_digest], viewonly=True)
+    validation_result_blob = relationship(Blob, foreign_keys=[validation_result_digest], viewonly=True)
+    validation_logs_blob = relationship(Blob, foreign_keys=[validation_logs_digest], viewonly=True)
+
+    sql_content = _stored_text("sql_content")
+    abap_content = _stored_text("abap_content")
+    xml_content = _stored_text("xml_content")
+    warnings = _stored_text("warnings")
+    validation_result = _stored_text("validation_result")
+    validation_logs = _stored_text("validation_logs")
 
 
 class BatchConversion(Base):
@@ -46,9 +106,13 @@ class BatchConversion(Base):
     total_files = Column(Integer, nullable=False, default=0)
     successful = Column(Integer, nullable=False, default=0)
     failed = Column(Integer, nullable=False, default=0)
+    status = Column(String, default="completed", nullable=False)  # 'queued', 'running' or 'completed'
+    config_json = Column(Text, nullable=True)  # JSON string of config used (background jobs)
+    completed_at = Column(DateTime, nullable=True)
 
     # Relationships
     files = relationship("BatchFile", back_populates="batch")
+    job_files = relationship("BatchJobFile", back_populates="batch", order_by="BatchJobFile.position")
 
 
 class BatchFile(Base):
@@ -65,3 +129,32 @@ class BatchFile(Base):
     batch = relationship("BatchConversion", back_populates="files")
     conversion = relationship("Conversion", back_populates="batch_files")
 
+
+
+class BatchJobFile(Base):
+    """Queued file of a background batch job, kept until it has been converted."""
+
+    __tablename__ = "batch_job_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String, ForeignKey("batch_conversions.batch_id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # Upload order within the job
+    filename = Column(String, nullable=False)
+    xml_content = Column(LargeBinary, nullable=True)  # Uploaded bytes, dropped once converted
+    file_size = Column(Integer, nullable=True)
+    status = Column(String, default="pending", nullable=False, index=True)  # 'pending', 'running', 'success' or 'error'
+    conversion_id = Column(Integer, ForeignKey("conversions.id"), nullable=True)
+    error_message = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    batch = relationship("BatchConversion", back_populates="job_files")
+
+
+class IdSequence(Base):
+    """Next free value of an id sequence whose ids are reserved in blocks."""
+
+    __tablename__ = "id_sequences"
+
+    name = Column(String, primary_key=True)  # e.g. 'conversions'
+    next_value = Column(Integer, nullable=False)
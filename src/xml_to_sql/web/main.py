@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -11,14 +12,35 @@ from fastapi.staticfiles import StaticFiles
 from ..version import __version__
 from .api.routes import router
 from .database import init_db
+from .services.batch_jobs import get_job_manager
+from .services.conversion_pool import shutdown_conversion_pool
+from .services.history_writer import shutdown_history_writer
+from .services.maintenance import shutdown_maintenance_scheduler, start_maintenance_scheduler
 
 # Initialize database on startup
 init_db()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume background jobs interrupted by the last shutdown
+    await get_job_manager().start()
+    # Retention and compaction of the databases every MAINTENANCE_INTERVAL_HOURS
+    start_maintenance_scheduler()
+    yield
+    shutdown_maintenance_scheduler()
+    await get_job_manager().stop()
+    # Stop the batch conversion worker processes with the server
+    shutdown_conversion_pool()
+    # Write conversions still queued for the history table
+    shutdown_history_writer()
+
+
 app = FastAPI(
     title="XML to SQL Converter",
     description="Convert SAP HANA calculation view XML definitions into Snowflake SQL artifacts",
     version=__version__,
+    lifespan=lifespan,
 )
 
 # CORS middleware for development
@@ -0,0 +1,429 @@
+"""Background batch jobs: submit, poll and resume after restart.
+
+``POST /api/jobs`` stores the uploaded files as ``BatchJobFile`` rows and
+returns at once; a :class:`JobManager` running on the web server's event loop
+converts them on the shared conversion pool. Every file is persisted as it
+finishes, in one transaction that adds its ``Conversion`` and ``BatchFile``
+rows, updates the ``BatchConversion`` counters and marks the queued file
+done, so a file is never recorded twice. A file whose result still cannot
+be stored after a few attempts is marked failed, so its job completes.
+
+Concurrency is bounded by the number of files in flight (one per conversion
+process by default). Backpressure is applied at submission: once
+``JOB_QUEUE_LIMIT`` files are waiting, new jobs are refused until the queue
+drains.
+
+The queue lives in the database. Files that were being converted when the
+server stopped are put back in the queue by :meth:`JobManager.start`, which
+assumes a single job runner per database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ...package_mapper import get_package
+from ...sql.validation_scheduler import BATCH_VALIDATION_BUDGET_MS, ValidationBudget
+from ..api.models import ConversionConfig
+from ..database.db import SessionLocal
+from ..database.models import BatchConversion, BatchJobFile
+from .batch_store import record_batch_file
+from .conversion_pool import conversion_pool_size, convert_in_pool
+from .converter import ConversionResult
+
+logger = logging.getLogger(__name__)
+
+# Environment variable limiting the number of queued files across all jobs
+JOB_QUEUE_LIMIT_ENV = "JOB_QUEUE_LIMIT"
+DEFAULT_JOB_QUEUE_LIMIT = 5_000
+
+_UNFINISHED = ("pending", "running")
+
+# Retry delays (seconds) when the database cannot be read or written, e.g.
+# while it is locked by a vacuum
+_RETRY_SECONDS = 1.0
+_RETRY_MAX_SECONDS = 30.0
+
+# Attempts to store a converted file before it is marked failed
+_RECORD_ATTEMPTS = 3
+
+
+class JobQueueFull(Exception):
+    """Raised when a job would exceed the queued file limit."""
+
+
+def conversion_options(config: ConversionConfig, filename: Optional[str]) -> dict:
+    """Keyword arguments of ``convert_xml_to_sql`` for one uploaded file.
+
+    Auto-detects the HANA package from the file name when the configuration
+    does not set one and the target is HANA.
+    """
+    hana_package = config.hana_package
+    if not hana_package and config.database_mode.lower() == "hana" and filename:
+        auto_package = get_package(Path(filename).stem)
+        if auto_package:
+            hana_package = auto_package
+
+    return dict(
+        database_mode=config.database_mode,
+        hana_version=config.hana_version,
+        hana_package=hana_package,
+        client=config.client,
+        language=config.language,
+        schema_overrides=config.schema_overrides,
+        view_schema=config.view_schema,
+        currency_udf_name=config.currency_udf_name,
+        currency_rates_table=config.currency_rates_table,
+        currency_schema=config.currency_schema,
+        auto_fix=config.auto_fix,
+    )
+
+
+def job_queue_limit() -> int:
+    """Maximum number of queued files: ``JOB_QUEUE_LIMIT`` or the default."""
+
+    configured = os.getenv(JOB_QUEUE_LIMIT_ENV)
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", JOB_QUEUE_LIMIT_ENV, configured)
+    return DEFAULT_JOB_QUEUE_LIMIT
+
+
+class JobManager:
+    """Converts queued batch job files in the background.
+
+    Args:
+        session_factory: Creates database sessions (default: the web database)
+        max_in_flight: Files converted at the same time (default: one per
+            conversion process)
+        queue_limit: Queued files accepted across all jobs (default:
+            ``JOB_QUEUE_LIMIT``)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_in_flight: Optional[int] = None,
+        queue_limit: Optional[int] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_in_flight = max_in_flight
+        self._queue_limit = queue_limit or job_queue_limit()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._budgets: Dict[str, ValidationBudget] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._progress: Optional[asyncio.Event] = None
+        # Claims and results are written from worker threads; the counters on
+        # a job are read-modify-write, so one writer at a time
+        self._db_lock = threading.Lock()
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def start(self) -> int:
+        """Requeue files interrupted by a shutdown and start converting.
+
+        Returns:
+            Number of interrupted files put back in the queue.
+        """
+        with self._session_factory() as db:
+            requeued = (
+                db.query(BatchJobFile)
+                .filter(BatchJobFile.status == "running")
+                .update({BatchJobFile.status: "pending"}, synchronize_session=False)
+            )
+            pending = db.query(BatchJobFile).filter(BatchJobFile.status == "pending").count()
+            db.commit()
+        if pending:
+            logger.info("Resuming %d queued job files (%d interrupted)", pending, requeued)
+        self._ensure_dispatcher()
+        return requeued
+
+    async def stop(self) -> None:
+        """Stop converting; files in flight are resumed by the next :meth:`start`."""
+
+        tasks = list(self._tasks)
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+        self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._wakeup = self._progress = None
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    # -- submission ----------------------------------------------------------
+
+    def submit(self, db: Session, files: Sequence[Tuple[str, bytes]], config_json: str) -> BatchConversion:
+        """Queue ``(filename, content)`` files as a new job.
+
+        Files without an ``.xml`` extension are recorded as failed right away.
+
+        Returns:
+            The job's ``BatchConversion``; its ``batch_id`` is the job id.
+
+        Raises:
+            JobQueueFull: If the queue cannot take the job's files.
+        """
+        queued = db.query(BatchJobFile).filter(BatchJobFile.status.in_(_UNFINISHED)).count()
+        if queued + len(files) > self._queue_limit:
+            raise JobQueueFull(
+                f"{queued} files are queued; a job of {len(files)} files exceeds the limit of {self._queue_limit}"
+            )
+
+        batch = BatchConversion(
+            batch_id=str(uuid.uuid4()),
+            total_files=len(files),
+            successful=0,
+            failed=0,
+            status="queued",
+            config_json=config_json,
+        )
+        db.add(batch)
+        for position, (filename, content) in enumerate(files):
+            if not filename.lower().endswith(".xml"):
+                db.add(BatchJobFile(
+                    batch_id=batch.batch_id,
+                    position=position,
+                    filename=filename,
+                    file_size=len(content),
+                    status="error",
+                    error_message="File must be an XML file",
+                ))
+                batch.failed += 1
+                continue
+            db.add(BatchJobFile(
+                batch_id=batch.batch_id,
+                position=position,
+                filename=filename,
+                xml_content=content,
+                file_size=len(content),
+            ))
+        if batch.failed == batch.total_files:
+            batch.status = "completed"
+            batch.completed_at = datetime.utcnow()
+        db.commit()
+        db.refresh(batch)
+
+        self._ensure_dispatcher()
+        self._wakeup.set()
+        return batch
+
+    # -- progress ------------------------------------------------------------
+
+    async def wait_for_progress(self, timeout: Optional[float] = None) -> bool:
+        """Wait until any job file finishes; False if ``timeout`` expired first."""
+
+        self._ensure_events()
+        # Taken before the first await, so progress made meanwhile is not missed
+        progress = self._progress
+        try:
+            await asyncio.wait_for(progress.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    # -- processing ----------------------------------------------------------
+
+    def _ensure_events(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+            self._progress = asyncio.Event()
+
+    def _ensure_dispatcher(self) -> None:
+        self._ensure_events()
+        if not self.running:
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        slots = asyncio.Semaphore(self._max_in_flight or conversion_pool_size())
+        while True:
+            await slots.acquire()
+            retry_in = _RETRY_SECONDS
+            while True:
+                self._wakeup.clear()
+                try:
+                    # Queries and commits block; keep them off the event loop
+                    claimed = await asyncio.to_thread(self._claim_next)
+                except Exception:
+                    logger.exception("Could not read the job queue; retrying in %.0f s", retry_in)
+                    await asyncio.sleep(retry_in)
+                    retry_in = min(retry_in * 2, _RETRY_MAX_SECONDS)
+                    continue
+                retry_in = _RETRY_SECONDS
+                if claimed is not None:
+                    break
+                await self._wakeup.wait()
+
+            task = asyncio.create_task(self._process(*claimed))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    def _claim_next(self) -> Optional[Tuple[int, str, bytes, dict]]:
+        with self._db_lock, self._session_factory() as db:
+            while True:
+                job_file = (
+                    db.query(BatchJobFile)
+                    .filter(BatchJobFile.status == "pending")
+                    .order_by(BatchJobFile.id)
+                    .first()
+                )
+                if job_file is None:
+                    return None
+                # Conditional update, so a file is only claimed once
+                claimed = (
+                    db.query(BatchJobFile)
+                    .filter(BatchJobFile.id == job_file.id, BatchJobFile.status == "pending")
+                    .update({BatchJobFile.status: "running"}, synchronize_session=False)
+                )
+                if claimed:
+                    break
+                db.rollback()
+
+            batch = job_file.batch
+            if batch.status == "queued":
+                batch.status = "running"
+            config = ConversionConfig(**json.loads(batch.config_json or "{}"))
+            claim = (job_file.id, batch.batch_id, job_file.xml_content or b"", conversion_options(config, job_file.filename))
+            db.commit()
+            return claim
+
+    async def _process(self, file_id: int, batch_id: str, xml_content: bytes, options: dict) -> None:
+        budget = self._budgets.get(batch_id)
+        if budget is None:
+            # Expensive validators share one time budget across the whole job
+            budget = self._budgets[batch_id] = ValidationBudget(BATCH_VALIDATION_BUDGET_MS)
+        try:
+            result = await convert_in_pool(xml_content, validation_budget=budget, **options)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # worker crashed or payload could not be pickled
+            logger.error("Job %s: conversion failed: %s", batch_id, exc)
+            result = ConversionResult(sql_content="", error=f"Conversion failed: {exc}")
+        if await self._store(file_id, batch_id, result):
+            self._budgets.pop(batch_id, None)
+
+        # Wake the current waiters; later ones wait for the next file
+        progress, self._progress = self._progress, asyncio.Event()
+        progress.set()
+
+    async def _store(self, file_id: int, batch_id: str, result: ConversionResult) -> bool:
+        """Record a converted file, marking it failed if that keeps failing.
+
+        Returns:
+            True when the file was the last one of its job.
+        """
+        retry_in = _RETRY_SECONDS
+        for attempt in range(1, _RECORD_ATTEMPTS + 1):
+            try:
+                # Prettifying, blob compression and the commit run off the event loop
+                return await asyncio.to_thread(self._record, file_id, result)
+            except Exception:
+                logger.exception(
+                    "Job %s: could not record file %d (attempt %d of %d)", batch_id, file_id, attempt, _RECORD_ATTEMPTS
+                )
+            if attempt < _RECORD_ATTEMPTS:
+                await asyncio.sleep(retry_in)
+                retry_in *= 2
+
+        # A file left running would keep its job from ever completing
+        try:
+            return await asyncio.to_thread(self._mark_failed, file_id, "Conversion result could not be stored")
+        except Exception:
+            # The file stays claimed and is retried after the next restart
+            logger.exception("Job %s: could not mark file %d as failed", batch_id, file_id)
+            return False
+
+    def _record(self, file_id: int, result: ConversionResult) -> bool:
+        """Store a converted file; True when it was the last file of its job."""
+
+        with self._db_lock, self._session_factory() as db:
+            job_file = db.get(BatchJobFile, file_id)
+            batch = job_file.batch
+            conversion = record_batch_file(
+                db,
+                batch.batch_id,
+                job_file.filename,
+                job_file.xml_content or b"",
+                job_file.file_size,
+                batch.config_json,
+                result,
+            )
+            job_file.conversion_id = conversion.id
+            job_file.xml_content = None
+            if result.error:
+                job_file.status = "error"
+                job_file.error_message = result.error
+                batch.failed += 1
+            else:
+                job_file.status = "success"
+                batch.successful += 1
+
+            completed = self._complete_if_done(batch)
+            db.commit()
+        return completed
+
+    def _mark_failed(self, file_id: int, message: str) -> bool:
+        """Mark a claimed file as failed without a result; True when its job is complete."""
+
+        with self._db_lock, self._session_factory() as db:
+            job_file = db.get(BatchJobFile, file_id)
+            batch = job_file.batch
+            job_file.status = "error"
+            job_file.error_message = message
+            job_file.xml_content = None
+            batch.failed += 1
+            completed = self._complete_if_done(batch)
+            db.commit()
+        return completed
+
+    @staticmethod
+    def _complete_if_done(batch: BatchConversion) -> bool:
+        completed = batch.successful + batch.failed >= batch.total_files
+        if completed:
+            batch.status = "completed"
+            batch.completed_at = datetime.utcnow()
+        return completed
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager of the web database."""
+
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
+
+
+__all__ = [
+    "DEFAULT_JOB_QUEUE_LIMIT",
+    "JOB_QUEUE_LIMIT_ENV",
+    "JobManager",
+    "JobQueueFull",
+    "conversion_options",
+    "get_job_manager",
+    "job_queue_limit",
+]
@@ -0,0 +1,180 @@
+"""Persisting batch conversion results.
+
+:func:`record_batch_file` stores one file's ``Conversion`` and ``BatchFile``
+rows in the caller's transaction; background jobs use it so each finished
+file is committed together with its queue entry.
+
+:class:`BatchWriter` is the bulk path for ``/convert/batch``: it collects
+the rows of many files and inserts them with one multi-row ``INSERT`` per
+table and one commit per chunk, with ids reserved up front, instead of a commit (and on SQLite an
+fsync) per file. Its methods block (prettifying, compression, inserts), so
+async callers run them with ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..database.blobs import with_blob_digests
+from ..database.ids import reserve_conversion_ids
+from ..database.models import BatchFile, Conversion
+from .converter import ConversionResult
+from .xml_utils import prettify_xml
+
+logger = logging.getLogger(__name__)
+
+# Files collected before BatchWriter inserts and commits them
+BATCH_COMMIT_CHUNK_SIZE = 200
+
+
+def validation_json(result: ConversionResult) -> Optional[str]:
+    """Serialize ``result.validation`` the way the single-conversion endpoint stores it."""
+
+    validation = result.validation
+    if validation is None:
+        return None
+
+    def issues(items) -> List[dict]:
+        return [
+            {"severity": issue.severity.value, "message": issue.message, "code": issue.code, "line_number": issue.line_number}
+            for issue in items
+        ]
+
+    return json.dumps({
+        "is_valid": validation.is_valid,
+        "errors": issues(validation.errors),
+        "warnings": issues(validation.warnings),
+        "info": issues(validation.info),
+    })
+
+
+def conversion_row(
+    filename: str,
+    xml_content: bytes,
+    file_size: Optional[int],
+    config_json: Optional[str],
+    result: ConversionResult,
+) -> dict:
+    """Column values of the ``Conversion`` recording ``result``, texts not yet stored as blobs."""
+
+    row = dict(
+        filename=filename,
+        scenario_id=result.scenario_id,
+        xml_content=prettify_xml(xml_content),
+        config_json=config_json,
+        file_size=file_size,
+        abap_content=None,
+        error_message=None,
+        validation_result=validation_json(result),
+        validation_logs=json.dumps(result.validation_logs or []),
+    )
+    if result.error:
+        row.update(sql_content="", warnings=json.dumps([]), status="error", error_message=result.error)
+    else:
+        row.update(
+            sql_content=result.sql_content,
+            abap_content=result.abap_content,
+            warnings=json.dumps([w for w in result.warnings]),
+            status="success",
+        )
+    return row
+
+
+def record_batch_file(
+    db: Session,
+    batch_id: str,
+    filename: str,
+    xml_content: bytes,
+    file_size: Optional[int],
+    config_json: Optional[str],
+    result: ConversionResult,
+) -> Conversion:
+    """Add the ``Conversion`` for one batch file and link it to the batch.
+
+    The rows are flushed but not committed.
+    """
+    conversion = Conversion(
+        id=reserve_conversion_ids(db)[0],
+        **with_blob_digests(db, [conversion_row(filename, xml_content, file_size, config_json, result)])[0],
+    )
+    db.add(conversion)
+    db.flush()
+
+    db.add(BatchFile(batch_id=batch_id, conversion_id=conversion.id, filename=filename))
+    return conversion
+
+
+class BatchWriter:
+    """Collects a batch's conversions and inserts them in chunks.
+
+    Args:
+        db: Session to insert with; pending changes to other objects (such as
+            the batch counters) are committed with each chunk
+        batch_id: Batch the files belong to
+        config_json: Configuration stored with every conversion
+        chunk_size: Files per ``INSERT``/commit; ``0`` keeps everything for
+            one transaction at :meth:`flush`
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_id: str,
+        config_json: Optional[str],
+        chunk_size: int = BATCH_COMMIT_CHUNK_SIZE,
+    ) -> None:
+        self.db = db
+        self.batch_id = batch_id
+        self.config_json = config_json
+        self.chunk_size = chunk_size
+        self.conversion_ids: Dict[Hashable, int] = {}
+        self._pending: List[Tuple[Hashable, dict]] = []
+
+    def add(
+        self,
+        key: Hashable,
+        filename: str,
+        xml_content: bytes,
+        file_size: Optional[int],
+        result: ConversionResult,
+    ) -> None:
+        """Queue one file's conversion; ``conversion_ids[key]`` is set once it is inserted."""
+
+        self._pending.append((key, conversion_row(filename, xml_content, file_size, self.config_json, result)))
+        if self.chunk_size and len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert and commit the queued conversions and their batch links."""
+
+        pending, self._pending = self._pending, []
+        if pending:
+            ids = reserve_conversion_ids(self.db, len(pending))
+            self.db.execute(
+                insert(Conversion),
+                with_blob_digests(self.db, [dict(row, id=conversion_id) for conversion_id, (_, row) in zip(ids, pending)]),
+            )
+            self.db.execute(
+                insert(BatchFile),
+                [
+                    {"batch_id": self.batch_id, "conversion_id": conversion_id, "filename": row["filename"]}
+                    for conversion_id, (_, row) in zip(ids, pending)
+                ],
+            )
+            self.conversion_ids.update((key, conversion_id) for conversion_id, (key, _) in zip(ids, pending))
+            logger.debug("Inserted %d conversions of batch %s", len(pending), self.batch_id)
+        self.db.commit()
+
+
+__all__ = [
+    "BATCH_COMMIT_CHUNK_SIZE",
+    "BatchWriter",
+    "conversion_row",
+    "record_batch_file",
+    "validation_json",
+]
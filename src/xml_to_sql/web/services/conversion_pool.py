@@ -0,0 +1,247 @@
+"""Shared process pool for CPU-bound conversions.
+
+``convert_xml_to_sql`` is pure Python and CPU-bound: run on the event loop
+it blocks every other request, and run on threads it serializes on the GIL.
+Batch conversions are therefore fanned out to a process pool that is
+created on first use, sized to the machine's cores (``CONVERSION_WORKERS``
+overrides the size) and shared by all requests of the web process.
+
+Workers are started with the ``spawn`` method, because the web process runs
+thread pools (validation, database access) that must not be forked
+mid-operation.
+
+Conversions that report stage progress as they run (``/convert/single/stream``)
+need their callback in this process; they run on a shared thread pool of the
+same size instead.
+
+A ``ValidationBudget`` cannot be shared across processes. Each file gets
+the batch's remaining allowance when it is submitted, and its spend is
+charged back when it completes. At most one file per worker is in flight,
+so a batch overruns its budget by at most the files already running.
+
+When the result cache is enabled (see ``result_cache``), files already
+converted with the same options are answered from it without reaching the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import AsyncIterator, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ...sql.validation_scheduler import ValidationBudget
+from ...utils.instrumentation import ConversionProfile, PhaseTiming, get_metrics_registry
+from .converter import ConversionResult, convert_xml_to_sql
+from .result_cache import get_result_cache, result_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the number of conversion processes
+CONVERSION_WORKERS_ENV = "CONVERSION_WORKERS"
+
+
+def conversion_worker_count() -> int:
+    """Number of conversion processes: ``CONVERSION_WORKERS`` or the CPU count."""
+
+    configured = os.getenv(CONVERSION_WORKERS_ENV)
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", CONVERSION_WORKERS_ENV, configured)
+    return os.cpu_count() or 1
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_conversion_pool() -> ProcessPoolExecutor:
+    """Return the process-wide conversion pool, starting it on first use."""
+
+    global _pool, _pool_workers
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool_workers = conversion_worker_count()
+                _pool = ProcessPoolExecutor(
+                    max_workers=_pool_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info("Started conversion pool with %d worker processes", _pool_workers)
+    return _pool
+
+
+def get_conversion_thread_pool() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool for in-process conversions, starting it on first use."""
+
+    global _thread_pool
+    if _thread_pool is None:
+        with _pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(
+                    max_workers=conversion_worker_count(), thread_name_prefix="conversion"
+                )
+    return _thread_pool
+
+
+def conversion_pool_size() -> int:
+    """Worker processes of the running pool (or of the pool that would be started)."""
+
+    return _pool_workers if _pool is not None else conversion_worker_count()
+
+
+def shutdown_conversion_pool(wait: bool = True) -> None:
+    """Stop the pools' workers; the next conversion starts new pools."""
+
+    global _pool, _thread_pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+        thread_pool, _thread_pool = _thread_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+    if thread_pool is not None:
+        thread_pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass(slots=True)
+class _PooledConversion:
+    result: ConversionResult
+    validation_spent_ms: float = 0.0
+    phases: List[PhaseTiming] = field(default_factory=list)
+
+
+def _convert_in_worker(xml_content: bytes, options: dict, budget_ms: Optional[float]) -> _PooledConversion:
+    budget = ValidationBudget(budget_ms) if budget_ms is not None else None
+    result = convert_xml_to_sql(xml_content, validation_budget=budget, **options)
+    # Only what callers use crosses the process boundary: the profile holds
+    # a lock and the corrected AST is large
+    phases = list(result.profile.phases) if result.profile is not None else []
+    result.profile = None
+    if result.corrections is not None:
+        result.corrections.corrected_ast = None
+    return _PooledConversion(result, budget.spent_ms if budget is not None else 0.0, phases)
+
+
+async def convert_in_pool(
+    xml_content: bytes,
+    validation_budget: Optional[ValidationBudget] = None,
+    **options,
+) -> ConversionResult:
+    """Run ``convert_xml_to_sql`` on the shared pool without blocking the event loop.
+
+    Args:
+        xml_content: XML file content as bytes
+        validation_budget: Optional budget shared with other conversions; this
+            conversion receives its remaining allowance and charges its spend
+        **options: Further keyword arguments of ``convert_xml_to_sql``
+
+    Returns:
+        ConversionResult whose profile holds the phases measured in the worker;
+        the phases are also added to this process's metrics registry. A
+        result served from the result cache has no profile.
+
+    Raises:
+        BrokenProcessPool: If a worker process died; the pool is replaced on
+            the next call.
+    """
+    cache = get_result_cache()
+    if cache is not None:
+        # The key reads the mapping database and the cache is SQLite too
+        cache_key = await asyncio.to_thread(result_cache_key, xml_content, options)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+    remaining = None
+    if validation_budget is not None:
+        remaining = max(0.0, validation_budget.total_ms - validation_budget.spent_ms)
+
+    pool = get_conversion_pool()
+    loop = asyncio.get_running_loop()
+    try:
+        pooled = await loop.run_in_executor(pool, partial(_convert_in_worker, xml_content, options, remaining))
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        raise
+
+    if validation_budget is not None:
+        validation_budget.charge(pooled.validation_spent_ms)
+    registry = get_metrics_registry()
+    for phase in pooled.phases:
+        registry.observe(phase)
+    pooled.result.profile = ConversionProfile(pooled.phases)
+    if cache is not None:
+        await asyncio.to_thread(cache.put, cache_key, pooled.result)
+    return pooled.result
+
+
+async def convert_as_completed(
+    jobs: Iterable[Tuple[Hashable, bytes, dict]],
+    validation_budget: Optional[ValidationBudget] = None,
+    max_in_flight: Optional[int] = None,
+) -> AsyncIterator[Tuple[Hashable, ConversionResult]]:
+    """Convert ``(key, xml_content, options)`` jobs on the pool, yielding results as they complete.
+
+    At most ``max_in_flight`` jobs (default: one per worker process) are
+    submitted at a time, so a shared budget sees the spend of finished jobs
+    and a large batch does not queue all of its payloads at once. A job whose
+    worker fails yields an error result instead of aborting the others.
+    """
+    limit = max_in_flight or conversion_pool_size()
+    queue = iter(jobs)
+    running: Dict[asyncio.Task, Hashable] = {}
+
+    def submit_next() -> bool:
+        job = next(queue, None)
+        if job is None:
+            return False
+        key, xml_content, options = job
+        running[asyncio.ensure_future(convert_in_pool(xml_content, validation_budget, **options))] = key
+        return True
+
+    try:
+        while len(running) < limit and submit_next():
+            pass
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as exc:  # worker crashed or payload could not be pickled
+                    logger.error("Pooled conversion failed: %s", exc)
+                    result = ConversionResult(sql_content="", error=f"Conversion failed: {exc}")
+                submit_next()
+                yield key, result
+    finally:
+        for task in running:
+            task.cancel()
+
+
+__all__ = [
+    "CONVERSION_WORKERS_ENV",
+    "conversion_pool_size",
+    "conversion_worker_count",
+    "convert_as_completed",
+    "convert_in_pool",
+    "get_conversion_pool",
+    "get_conversion_thread_pool",
+    "shutdown_conversion_pool",
+]
@@ -0,0 +1,288 @@
+"""Write-behind persistence of conversion history.
+
+Single conversions used to commit their ``Conversion`` row (full XML and SQL
+text) before responding, so under concurrent load every response waited for
+SQLite's write lock. :class:`HistoryWriter` takes that write off the request
+path: :meth:`HistoryWriter.submit` reserves the conversion's id, queues the
+row and returns the id at once; a dedicated writer thread drains the queue
+and inserts the queued rows in batches, one transaction per batch, storing
+their texts in the blob store (see ``database/blobs.py``).
+
+The queue is bounded (``HISTORY_QUEUE_SIZE``). When it is full, the row is
+written synchronously by the caller instead, so memory stays bounded and no
+conversion is dropped. Async callers use :meth:`HistoryWriter.submit_async`,
+which reserves the id and makes any such write on a worker thread rather
+than on the event loop. :meth:`HistoryWriter.close` (called on shutdown)
+writes everything still queued.
+
+Readers that look up a conversion right after it was submitted should call
+:meth:`HistoryWriter.wait_for` when the row is not found yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..database.blobs import with_blob_digests
+from ..database.db import SessionLocal
+from ..database.ids import reserve_conversion_ids
+from ..database.models import Conversion
+
+logger = logging.getLogger(__name__)
+
+# Environment variable bounding the number of queued conversions
+HISTORY_QUEUE_SIZE_ENV = "HISTORY_QUEUE_SIZE"
+DEFAULT_HISTORY_QUEUE_SIZE = 1_000
+
+# Rows inserted per transaction
+HISTORY_WRITE_BATCH = 100
+
+_STOP = object()
+
+
+@dataclass(slots=True)
+class HistoryWriterStats:
+    """Queue depth, lag and totals of a history writer."""
+
+    depth: int  # Rows queued, not yet written
+    max_depth: int
+    lag_ms: float  # Age of the oldest queued row
+    last_commit_lag_ms: float  # Queue-to-commit time of the oldest row in the last batch
+    max_commit_lag_ms: float
+    written: int
+    failed: int
+    synchronous_writes: int  # Rows written by the caller because the queue was full
+    batches: int
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        for key in ("lag_ms", "last_commit_lag_ms", "max_commit_lag_ms"):
+            data[key] = round(data[key], 3)
+        return data
+
+
+def history_queue_size() -> int:
+    """Queue bound: ``HISTORY_QUEUE_SIZE`` or the default."""
+
+    configured = os.getenv(HISTORY_QUEUE_SIZE_ENV)
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", HISTORY_QUEUE_SIZE_ENV, configured)
+    return DEFAULT_HISTORY_QUEUE_SIZE
+
+
+class HistoryWriter:
+    """Bounded queue of ``Conversion`` rows drained by a writer thread.
+
+    Args:
+        session_factory: Creates database sessions (default: the web database)
+        max_queue: Rows that may wait in the queue (default: ``HISTORY_QUEUE_SIZE``)
+        batch_size: Rows inserted per transaction
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue: Optional[int] = None,
+        batch_size: int = HISTORY_WRITE_BATCH,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._queue: "queue.Queue[object]" = queue.Queue(max_queue or history_queue_size())
+        self._lock = threading.Lock()
+        self._written_cond = threading.Condition(self._lock)
+        self._pending: Dict[int, float] = {}  # id -> time queued
+        self._max_depth = 0
+        self._last_commit_lag_ms = 0.0
+        self._max_commit_lag_ms = 0.0
+        self._written = 0
+        self._failed = 0
+        self._synchronous = 0
+        self._batches = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    # -- producers -----------------------------------------------------------
+
+    def submit(self, row: dict) -> int:
+        """Queue a ``Conversion`` row and return its id.
+
+        ``row`` holds the column values; ``id`` is reserved here and
+        ``created_at`` defaults to now, so the caller can respond with both.
+        """
+        if self._closed:
+            raise RuntimeError("History writer is closed")
+        with self._session_factory() as db:
+            conversion_id = reserve_conversion_ids(db)[0]
+        row = dict(row, id=conversion_id)
+        row.setdefault("created_at", datetime.utcnow())
+
+        queued_at = time.monotonic()
+        with self._lock:
+            self._pending[conversion_id] = queued_at
+        try:
+            self._queue.put_nowait((queued_at, row))
+        except queue.Full:
+            logger.warning("History queue full; writing conversion %d synchronously", conversion_id)
+            self._write([(queued_at, row)], synchronous=True)
+            return conversion_id
+
+        with self._lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return conversion_id
+
+    async def submit_async(self, row: dict) -> int:
+        """:meth:`submit` for coroutines: the id reservation and a write forced
+        by a full queue run on a worker thread, never on the event loop."""
+
+        return await asyncio.to_thread(self.submit, row)
+
+    def is_pending(self, conversion_id: int) -> bool:
+        with self._lock:
+            return conversion_id in self._pending
+
+    def wait_for(self, conversion_id: int, timeout: Optional[float] = None) -> bool:
+        """Block until ``conversion_id`` is no longer queued; False on timeout."""
+
+        with self._written_cond:
+            return self._written_cond.wait_for(lambda: conversion_id not in self._pending, timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row queued so far is written; False on timeout."""
+
+        with self._written_cond:
+            waiting_for = set(self._pending)
+            return self._written_cond.wait_for(lambda: not waiting_for & self._pending.keys(), timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write everything still queued and stop the writer thread."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error("History writer did not finish within %s s; %d rows unwritten", timeout, self._queue.qsize())
+
+    def stats(self) -> HistoryWriterStats:
+        now = time.monotonic()
+        with self._lock:
+            oldest = min(self._pending.values(), default=None)
+            return HistoryWriterStats(
+                depth=len(self._pending),
+                max_depth=self._max_depth,
+                lag_ms=(now - oldest) * 1000 if oldest is not None else 0.0,
+                last_commit_lag_ms=self._last_commit_lag_ms,
+                max_commit_lag_ms=self._max_commit_lag_ms,
+                written=self._written,
+                failed=self._failed,
+                synchronous_writes=self._synchronous,
+                batches=self._batches,
+            )
+
+    # -- writer thread -------------------------------------------------------
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[float, dict]], synchronous: bool = False) -> None:
+        written, failed = self._insert([row for _, row in batch])
+        commit_lag_ms = (time.monotonic() - min(queued_at for queued_at, _ in batch)) * 1000
+        with self._written_cond:
+            for _, row in batch:
+                self._pending.pop(row["id"], None)
+            self._written += written
+            self._failed += failed
+            self._batches += 1
+            if synchronous:
+                self._synchronous += len(batch)
+            self._last_commit_lag_ms = commit_lag_ms
+            self._max_commit_lag_ms = max(self._max_commit_lag_ms, commit_lag_ms)
+            self._written_cond.notify_all()
+
+    def _insert(self, rows: List[dict]) -> Tuple[int, int]:
+        try:
+            with self._session_factory() as db:
+                db.execute(insert(Conversion), with_blob_digests(db, rows))
+                db.commit()
+            return len(rows), 0
+        except Exception:
+            if len(rows) == 1:
+                logger.exception("Could not write conversion %d to history", rows[0]["id"])
+                return 0, 1
+        # Isolate the row that failed the batch
+        written = failed = 0
+        for row in rows:
+            ok, bad = self._insert([row])
+            written += ok
+            failed += bad
+        return written, failed
+
+
+_writer: Optional[HistoryWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_history_writer() -> HistoryWriter:
+    """Return the process-wide history writer of the web database, starting it on first use."""
+
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = HistoryWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def shutdown_history_writer(timeout: Optional[float] = None) -> None:
+    """Write all queued conversions and stop the writer; the next use starts a new one."""
+
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+
+__all__ = [
+    "DEFAULT_HISTORY_QUEUE_SIZE",
+    "HISTORY_QUEUE_SIZE_ENV",
+    "HISTORY_WRITE_BATCH",
+    "HistoryWriter",
+    "HistoryWriterStats",
+    "get_history_writer",
+    "history_queue_size",
+    "shutdown_history_writer",
+]
@@ -0,0 +1,595 @@
+"""Retention, archival and compaction of the SQLite stores.
+
+Neither the conversion history (``conversions.db``) nor the package mapping
+database (``package_mappings.db``) shrinks by itself: deleted rows leave free
+pages in the file, and the history keeps every conversion ever made. This
+module keeps both in check.
+
+* :func:`apply_retention` removes conversions older than
+  ``HISTORY_RETENTION_DAYS`` or beyond the newest ``HISTORY_RETENTION_MAX_ROWS``,
+  oldest first. Before they are deleted they are appended to gzip-compressed
+  JSON Lines files, one per month of creation
+  (``conversions-YYYY-MM.jsonl.gz`` in ``HISTORY_ARCHIVE_DIR``). Their batch
+  links, their blobs no other conversion uses and batches left without files
+  go with them.
+* :func:`compact_database` returns free pages to the file system with
+  ``PRAGMA incremental_vacuum``, refreshes the query planner statistics and
+  optionally rebuilds the indexes. Databases created before incremental
+  auto-vacuum was enabled (see ``init_db``) need one full ``VACUUM``
+  (``full_vacuum``) to switch over.
+* :func:`run_maintenance` does both for both databases and returns a
+  :class:`MaintenanceReport` with the bytes reclaimed.
+
+The web app runs :func:`run_maintenance` every
+``MAINTENANCE_INTERVAL_HOURS`` on a background thread
+(:class:`MaintenanceScheduler`); ``xml-to-sql maintenance`` and
+``POST /api/admin/maintenance`` run it on demand.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import delete, exists, false, or_, select, tuple_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+
+from ...package_mapping_db import DEFAULT_DB_PATH as MAPPINGS_DB_PATH
+from ..database.blobs import conversion_digests, delete_unreferenced_blobs
+from ..database.db import DB_PATH, engine
+from ..database.models import CONTENT_FIELDS, BatchConversion, BatchFile, BatchJobFile, Conversion
+
+logger = logging.getLogger(__name__)
+
+# Conversions older than this many days are archived and deleted; unset keeps them
+HISTORY_RETENTION_DAYS_ENV = "HISTORY_RETENTION_DAYS"
+
+# Only this many of the newest conversions are kept; unset keeps all
+HISTORY_RETENTION_MAX_ROWS_ENV = "HISTORY_RETENTION_MAX_ROWS"
+
+# Directory of the monthly archive files; "none" deletes without archiving
+HISTORY_ARCHIVE_DIR_ENV = "HISTORY_ARCHIVE_DIR"
+DEFAULT_HISTORY_ARCHIVE_DIR = DB_PATH.parent / "history_archive"
+
+# Hours between background maintenance runs of the web app; 0 disables them
+MAINTENANCE_INTERVAL_HOURS_ENV = "MAINTENANCE_INTERVAL_HOURS"
+DEFAULT_MAINTENANCE_INTERVAL_HOURS = 24.0
+
+# Conversions archived and deleted per transaction
+RETENTION_CHUNK_SIZE = 200
+
+# Rows ANALYZE samples per index, so it stays fast on large tables
+ANALYSIS_LIMIT = 1_000
+
+# PRAGMA auto_vacuum value of INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+class MaintenanceInProgress(Exception):
+    """Raised when maintenance is started while this process is already running it."""
+
+
+def _optional_positive_int(name: str) -> Optional[int]:
+    configured = os.getenv(name)
+    if not configured:
+        return None
+    try:
+        value = int(configured)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, configured)
+        return None
+    return value if value > 0 else None
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """Which conversions to keep; the defaults keep all of them.
+
+    Args:
+        max_age_days: Delete conversions created more than this many days ago
+        max_rows: Keep only this many of the newest conversions
+        archive_dir: Archive deleted conversions here; None deletes them unarchived
+    """
+
+    max_age_days: Optional[int] = None
+    max_rows: Optional[int] = None
+    archive_dir: Optional[Path] = None
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Policy from ``HISTORY_RETENTION_DAYS``, ``HISTORY_RETENTION_MAX_ROWS`` and ``HISTORY_ARCHIVE_DIR``."""
+
+        configured = os.getenv(HISTORY_ARCHIVE_DIR_ENV)
+        if not configured:
+            archive_dir = DEFAULT_HISTORY_ARCHIVE_DIR
+        elif configured.lower() == "none":
+            archive_dir = None
+        else:
+            archive_dir = Path(configured)
+        return cls(
+            max_age_days=_optional_positive_int(HISTORY_RETENTION_DAYS_ENV),
+            max_rows=_optional_positive_int(HISTORY_RETENTION_MAX_ROWS_ENV),
+            archive_dir=archive_dir,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days is not None or self.max_rows is not None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "max_age_days": self.max_age_days,
+            "max_rows": self.max_rows,
+            "archive_dir": str(self.archive_dir) if self.archive_dir else None,
+        }
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    """What :func:`apply_retention` removed."""
+
+    conversions_deleted: int = 0
+    conversions_archived: int = 0
+    blobs_deleted: int = 0
+    batches_deleted: int = 0
+    import_history_deleted: int = 0
+    archive_files: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """Size of a database file before and after :func:`compact_database`."""
+
+    path: str
+    size_before: int
+    size_after: int
+    free_pages_before: int
+    steps: List[str]  # e.g. ['reindex', 'incremental_vacuum', 'analyze']
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return max(0, self.size_before - self.size_after)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["reclaimed_bytes"] = self.reclaimed_bytes
+        return data
+
+
+@dataclass(slots=True)
+class MaintenanceReport:
+    """Outcome of :func:`run_maintenance`."""
+
+    started_at: datetime
+    duration_ms: float
+    retention: RetentionReport
+    databases: List[CompactionReport]
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return sum(database.reclaimed_bytes for database in self.databases)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "retention": self.retention.to_dict(),
+            "databases": [database.to_dict() for database in self.databases],
+            "reclaimed_bytes": self.reclaimed_bytes,
+        }
+
+
+# -- retention ---------------------------------------------------------------
+
+
+def _archive_entry(conversion: Conversion) -> dict:
+    entry = {
+        "id": conversion.id,
+        "filename": conversion.filename,
+        "scenario_id": conversion.scenario_id,
+        "status": conversion.status,
+        "error_message": conversion.error_message,
+        "created_at": conversion.created_at.isoformat(),
+        "file_size": conversion.file_size,
+        "config_json": conversion.config_json,
+    }
+    entry.update((name, getattr(conversion, name)) for name in CONTENT_FIELDS)
+    return entry
+
+
+def _archive(conversions: List[Conversion], archive_dir: Path) -> List[Path]:
+    """Append ``conversions`` to the archive file of their month and return the files written."""
+
+    by_month: Dict[str, List[Conversion]] = defaultdict(list)
+    for conversion in conversions:
+        by_month[conversion.created_at.strftime("%Y-%m")].append(conversion)
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for month, entries in sorted(by_month.items()):
+        path = archive_dir / f"conversions-{month}.jsonl.gz"
+        # Each append adds a gzip member; readers see one continuous stream
+        with gzip.open(path, "at", encoding="utf-8") as archive:
+            for conversion in entries:
+                archive.write(json.dumps(_archive_entry(conversion), ensure_ascii=False) + "\n")
+        paths.append(path)
+    return paths
+
+
+def _expired(db: Session, policy: RetentionPolicy, now: datetime):
+    """SQL condition matching the conversions ``policy`` no longer keeps, or None."""
+
+    conditions = []
+    if policy.max_age_days is not None:
+        conditions.append(Conversion.created_at < now - timedelta(days=policy.max_age_days))
+    if policy.max_rows is not None:
+        # The oldest conversion still kept; everything ordered before it goes
+        boundary = db.execute(
+            select(Conversion.created_at, Conversion.id)
+            .order_by(Conversion.created_at.desc(), Conversion.id.desc())
+            .offset(policy.max_rows - 1)
+            .limit(1)
+        ).first()
+        if boundary is not None:
+            conditions.append(tuple_(Conversion.created_at, Conversion.id) < tuple(boundary))
+    return or_(*conditions) if conditions else None
+
+
+def apply_retention(
+    session_factory: Callable[[], Session],
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+    chunk_size: int = RETENTION_CHUNK_SIZE,
+) -> RetentionReport:
+    """Archive and delete the conversions ``policy`` no longer keeps.
+
+    Conversions go oldest first, one transaction per chunk. Each chunk holds
+    the write lock from selecting its rows until they are deleted, so
+    concurrent runs (e.g. of several web workers) never archive a
+    conversion twice. A run interrupted between writing a chunk to the
+    archive and committing its deletion archives that chunk again next time.
+
+    Args:
+        session_factory: Creates sessions on the history database
+        policy: Conversions to keep and where to archive the others
+        now: Reference time of ``max_age_days`` (default: now, UTC)
+        chunk_size: Conversions per transaction
+
+    Returns:
+        Counts of what was deleted and the archive files written
+    """
+    report = RetentionReport()
+    if not policy.enabled:
+        return report
+
+    now = now or datetime.utcnow()
+    archive_files = set()
+    newest_deleted: Optional[datetime] = None
+    with session_factory() as db:
+        expired = _expired(db, policy, now)
+    if expired is None:
+        return report
+
+    while True:
+        with session_factory() as db:
+            # Lock before selecting, see the docstring
+            db.execute(update(Conversion).where(false()).values(status=Conversion.status).execution_options(synchronize_session=False))
+            conversions = (
+                db.query(Conversion)
+                .options(*(selectinload(getattr(Conversion, f"{name}_blob")) for name in CONTENT_FIELDS))
+                .filter(expired)
+                .order_by(Conversion.created_at, Conversion.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not conversions:
+                break
+
+            if policy.archive_dir is not None:
+                archive_files.update(_archive(conversions, policy.archive_dir))
+                report.conversions_archived += len(conversions)
+            ids = [conversion.id for conversion in conversions]
+            newest_deleted = conversions[-1].created_at
+            db.expunge_all()
+
+            digests = conversion_digests(db, ids)
+            db.execute(delete(BatchFile).where(BatchFile.conversion_id.in_(ids)))
+            db.execute(update(BatchJobFile).where(BatchJobFile.conversion_id.in_(ids)).values(conversion_id=None))
+            report.conversions_deleted += db.execute(delete(Conversion).where(Conversion.id.in_(ids))).rowcount
+            report.blobs_deleted += delete_unreferenced_blobs(db, digests)
+            db.commit()
+        logger.info("Retention removed %d conversions", report.conversions_deleted)
+
+    if newest_deleted is not None:
+        with session_factory() as db:
+            # Finished batches whose files were all removed
+            emptied = select(BatchConversion.batch_id).where(
+                BatchConversion.status == "completed",
+                BatchConversion.created_at <= newest_deleted,
+                ~exists().where(BatchFile.batch_id == BatchConversion.batch_id),
+            )
+            batch_ids = list(db.scalars(emptied))
+            if batch_ids:
+                db.execute(delete(BatchJobFile).where(BatchJobFile.batch_id.in_(batch_ids)))
+                report.batches_deleted = db.execute(
+                    delete(BatchConversion).where(BatchConversion.batch_id.in_(batch_ids))
+                ).rowcount
+                db.commit()
+
+    report.archive_files = sorted(str(path) for path in archive_files)
+    return report
+
+
+def trim_import_history(path: Union[str, Path], policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+    """Delete package mapping import records ``policy`` no longer keeps and return how many.
+
+    The mappings themselves are never touched.
+    """
+    if not policy.enabled:
+        return 0
+    now = now or datetime.utcnow()
+    deleted = 0
+    with closing(sqlite3.connect(path, timeout=30)) as conn, conn:
+        if policy.max_age_days is not None:
+            # import_date is SQLite's CURRENT_TIMESTAMP (UTC, 'YYYY-MM-DD HH:MM:SS')
+            cutoff = (now - timedelta(days=policy.max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+            deleted += conn.execute("DELETE FROM import_history WHERE import_date < ?", (cutoff,)).rowcount
+        if policy.max_rows is not None:
+            deleted += conn.execute(
+                "DELETE FROM import_history WHERE import_id NOT IN"
+                " (SELECT import_id FROM import_history ORDER BY import_date DESC, import_id DESC LIMIT ?)",
+                (policy.max_rows,),
+            ).rowcount
+    return deleted
+
+
+# -- compaction --------------------------------------------------------------
+
+
+def _file_size(path: Path) -> int:
+    """Bytes of a database file including its write-ahead log."""
+
+    size = 0
+    for candidate in (path, path.with_name(path.name + "-wal")):
+        try:
+            size += candidate.stat().st_size
+        except OSError:
+            pass
+    return size
+
+
+def compact_database(
+    path: Union[str, Path],
+    vacuum: bool = True,
+    full_vacuum: bool = False,
+    analyze: bool = True,
+    reindex: bool = False,
+) -> CompactionReport:
+    """Reclaim the free pages of a SQLite file and refresh its statistics.
+
+    Args:
+        path: Database file
+        vacuum: Truncate free pages off the file (``PRAGMA incremental_vacuum``).
+            Without incremental auto-vacuum this needs ``full_vacuum``.
+        full_vacuum: Rewrite the whole file with ``VACUUM`` and switch it to
+            incremental auto-vacuum. Locks the database for the duration and
+            needs free disk space of the file's size.
+        analyze: Refresh the query planner statistics (``ANALYZE``)
+        reindex: Rebuild all indexes (``REINDEX``)
+
+    Returns:
+        File sizes before and after and the steps that ran
+    """
+    path = Path(path)
+    size_before = _file_size(path)
+    steps = []
+    # Autocommit: VACUUM cannot run inside a transaction
+    with closing(sqlite3.connect(path, timeout=60, isolation_level=None)) as conn:
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if reindex:
+            conn.execute("REINDEX")
+            steps.append("reindex")
+        if full_vacuum:
+            conn.execute(f"PRAGMA auto_vacuum = {_AUTO_VACUUM_INCREMENTAL}")
+            conn.execute("VACUUM")
+            steps.append("vacuum")
+        elif vacuum:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+                # executescript steps the pragma to completion; execute() frees a single page
+                conn.executescript("PRAGMA incremental_vacuum;")
+                steps.append("incremental_vacuum")
+            elif free_pages:
+                logger.warning(
+                    "%s has %d free pages but no incremental auto-vacuum; run a full vacuum once to enable it",
+                    path, free_pages,
+                )
+        if analyze:
+            conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            conn.execute("ANALYZE")
+            steps.append("analyze")
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    report = CompactionReport(str(path), size_before, _file_size(path), free_pages, steps)
+    logger.info("Compacted %s: %d bytes reclaimed (%s)", path, report.reclaimed_bytes, ", ".join(steps) or "no steps")
+    return report
+
+
+# -- runs --------------------------------------------------------------------
+
+_run_lock = threading.Lock()
+_last_report: Optional[MaintenanceReport] = None
+
+
+def run_maintenance(
+    policy: Optional[RetentionPolicy] = None,
+    *,
+    bind: Engine = engine,
+    mappings_path: Optional[Path] = MAPPINGS_DB_PATH,
+    vacuum: bool = True,
+    full_vacuum: bool = False,
+    analyze: bool = True,
+    reindex: bool = False,
+) -> MaintenanceReport:
+    """Apply the retention policy, then compact the history and package mapping databases.
+
+    Args:
+        policy: Retention policy (default: from the environment, see
+            :meth:`RetentionPolicy.from_env`)
+        bind: Engine of the history database (default: the web database)
+        mappings_path: Package mapping database; skipped when None or missing
+        vacuum, full_vacuum, analyze, reindex: See :func:`compact_database`
+
+    Returns:
+        What was removed and how many bytes each database gave back
+
+    Raises:
+        MaintenanceInProgress: This process is already running maintenance
+    """
+    global _last_report
+    if not _run_lock.acquire(blocking=False):
+        raise MaintenanceInProgress("Maintenance is already running")
+    try:
+        policy = policy if policy is not None else RetentionPolicy.from_env()
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+
+        retention = apply_retention(sessionmaker(bind=bind), policy)
+        paths = [Path(bind.url.database)]
+        if mappings_path is not None and Path(mappings_path).exists():
+            retention.import_history_deleted = trim_import_history(mappings_path, policy)
+            paths.append(Path(mappings_path))
+        databases = [
+            compact_database(path, vacuum=vacuum, full_vacuum=full_vacuum, analyze=analyze, reindex=reindex)
+            for path in paths
+        ]
+
+        report = MaintenanceReport(started_at, (time.perf_counter() - started) * 1000, retention, databases)
+        _last_report = report
+        logger.info(
+            "Maintenance removed %d conversions and reclaimed %d bytes",
+            retention.conversions_deleted, report.reclaimed_bytes,
+        )
+        return report
+    finally:
+        _run_lock.release()
+
+
+def last_maintenance_report() -> Optional[MaintenanceReport]:
+    """Report of the last maintenance run in this process, if any."""
+
+    return _last_report
+
+
+def maintenance_interval_hours() -> float:
+    """Hours between background runs: ``MAINTENANCE_INTERVAL_HOURS`` or the default."""
+
+    configured = os.getenv(MAINTENANCE_INTERVAL_HOURS_ENV)
+    if configured:
+        try:
+            return max(0.0, float(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", MAINTENANCE_INTERVAL_HOURS_ENV, configured)
+    return DEFAULT_MAINTENANCE_INTERVAL_HOURS
+
+
+class MaintenanceScheduler:
+    """Thread running maintenance every ``interval_seconds``, first after one interval.
+
+    Scheduled runs apply the retention policy of the environment and
+    reclaim free pages incrementally; full vacuums and index rebuilds are
+    left to on-demand runs.
+
+    Args:
+        interval_seconds: Time between runs
+        run: Called for each run (default: :func:`run_maintenance`)
+    """
+
+    def __init__(self, interval_seconds: float, run: Callable[[], MaintenanceReport] = run_maintenance) -> None:
+        self.interval_seconds = interval_seconds
+        self._run = run
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scheduling; a run in progress finishes first."""
+
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self._run()
+            except MaintenanceInProgress:
+                logger.info("Skipping scheduled maintenance: a run is in progress")
+            except Exception:
+                logger.exception("Scheduled maintenance failed")
+
+
+_scheduler: Optional[MaintenanceScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def start_maintenance_scheduler() -> Optional[MaintenanceScheduler]:
+    """Start the process-wide maintenance thread, unless ``MAINTENANCE_INTERVAL_HOURS`` is 0."""
+
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            hours = maintenance_interval_hours()
+            if hours > 0:
+                _scheduler = MaintenanceScheduler(hours * 3600)
+        return _scheduler
+
+
+def shutdown_maintenance_scheduler(timeout: Optional[float] = None) -> None:
+    """Stop the maintenance thread started by :func:`start_maintenance_scheduler`."""
+
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop(timeout)
+
+
+__all__ = [
+    "ANALYSIS_LIMIT",
+    "CompactionReport",
+    "DEFAULT_HISTORY_ARCHIVE_DIR",
+    "DEFAULT_MAINTENANCE_INTERVAL_HOURS",
+    "HISTORY_ARCHIVE_DIR_ENV",
+    "HISTORY_RETENTION_DAYS_ENV",
+    "HISTORY_RETENTION_MAX_ROWS_ENV",
+    "MAINTENANCE_INTERVAL_HOURS_ENV",
+    "MaintenanceInProgress",
+    "MaintenanceReport",
+    "MaintenanceScheduler",
+    "RETENTION_CHUNK_SIZE",
+    "RetentionPolicy",
+    "RetentionReport",
+    "apply_retention",
+    "compact_database",
+    "last_maintenance_report",
+    "maintenance_interval_hours",
+    "run_maintenance",
+    "shutdown_maintenance_scheduler",
+    "start_maintenance_scheduler",
+    "trim_import_history",
+]
@@ -0,0 +1,291 @@
+"""Cache of conversion results for repeated submissions.
+
+Users and CI pipelines submit the same calculation view with the same
+configuration over and over. The result of such a submission is fully
+determined by the XML bytes, the conversion options, the converter version,
+the table statistics and column catalog validation reads and, in HANA
+mode, the package mappings, so :func:`result_cache_key`
+hashes exactly those and :class:`ResultCache` maps the key to the stored
+``ConversionResult``.
+
+Entries live in a SQLite file (``RESULT_CACHE_PATH``; unset disables the
+cache), shared by all uvicorn workers and web processes on the host. Entries are
+zlib-compressed JSON. When the entries outgrow ``RESULT_CACHE_MAX_BYTES``,
+the least recently used ones are evicted. Only successful conversions are
+stored, and only when their validation ran completely (a batch's
+validation budget may skip validators); a cache that cannot be read or
+written counts as a miss.
+
+Bump :data:`RESULT_CACHE_VERSION` when the stored format or anything else
+that changes results without changing ``__version__`` needs to invalidate
+existing entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from ...package_mapper import mapping_version
+from ...sql.cost_model import get_default_statistics
+from ...sql.schema_catalog import get_default_catalog
+from ...version import __version__
+from .converter import ConversionResult
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_VERSION = "1"
+
+# SQLite file of the cache; unset disables it
+RESULT_CACHE_PATH_ENV = "RESULT_CACHE_PATH"
+
+# Compressed bytes kept before least recently used entries are evicted
+RESULT_CACHE_MAX_BYTES_ENV = "RESULT_CACHE_MAX_BYTES"
+DEFAULT_RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# A hit refreshes its entry's last use at most this often, so hits rarely write
+TOUCH_INTERVAL_SECONDS = 60.0
+
+# Eviction frees space down to this share of the limit, so it does not run on every store
+EVICTION_TARGET = 0.9
+
+
+def result_cache_key(xml_content: bytes, options: dict) -> str:
+    """Return the hex SHA-256 identifying the conversion of ``xml_content`` with ``options``.
+
+    Args:
+        xml_content: Uploaded XML bytes
+        options: Keyword arguments of ``convert_xml_to_sql`` (see
+            ``conversion_options``); key order does not matter
+    """
+    hana = str(options.get("database_mode", "")).lower() == "hana"
+    # Validation reads the table statistics and the column catalog
+    statistics = get_default_statistics()
+    catalog = get_default_catalog()
+    digest = hashlib.sha256()
+    for part in (
+        RESULT_CACHE_VERSION,
+        __version__,
+        json.dumps(options, sort_keys=True, default=str),
+        # Package paths are looked up while rendering HANA SQL
+        mapping_version() if hana else "",
+        statistics.fingerprint if statistics is not None else "",
+        catalog.fingerprint if catalog is not None else "",
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(xml_content)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class ResultCacheStats:
+    """Counters of this process's use of the result cache, and the cache's size."""
+
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    errors: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    path: str
+
+    def to_dict(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": self.entries,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "path": self.path,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ResultCache:
+    """Conversion results by :func:`result_cache_key`, kept in a SQLite file.
+
+    Args:
+        path: SQLite file; created with its directory if missing
+        max_bytes: Compressed bytes kept before eviction
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._stores = self._evictions = self._errors = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            # WAL lets workers read while another one stores
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            # Covers both the eviction order and the size total
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_results_used_at ON results (used_at, size)")
+
+    def get(self, key: str) -> Optional[ConversionResult]:
+        """Return the cached result for ``key``, or None on a miss."""
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT data, used_at FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    now = time.time()
+                    if now - row[1] > TOUCH_INTERVAL_SECONDS:
+                        conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (now, key))
+                    result = ConversionResult.from_dict(json.loads(zlib.decompress(row[0])))
+        except (sqlite3.Error, OSError, ValueError, KeyError, TypeError, zlib.error) as exc:
+            logger.warning("Ignoring unreadable result cache entry %s: %s", key[:12], exc)
+            self._count("_errors", "_misses")
+            return None
+
+        if row is None:
+            self._count("_misses")
+            return None
+        self._count("_hits")
+        return result
+
+    def put(self, key: str, result: ConversionResult) -> None:
+        """Store a successful ``result`` and evict old entries beyond the size limit."""
+
+        # Validation cut short by a batch budget must not be served to later requests
+        if result.error or not result.validation_complete:
+            return
+        data = zlib.compress(json.dumps(result.to_dict(), default=str).encode("utf-8"))
+        if len(data) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, data, size, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now),
+                )
+                evicted = self._evict(conn)
+                conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            logger.warning("Could not store result cache entry %s: %s", key[:12], exc)
+            self._count("_errors")
+            return
+
+        with self._lock:
+            self._stores += 1
+            self._evictions += evicted
+
+    def clear(self) -> None:
+        """Drop all entries (of every process) and reset this process's counters."""
+
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM results")
+        with self._lock:
+            self._hits = self._misses = self._stores = self._evictions = self._errors = 0
+
+    def stats(self) -> ResultCacheStats:
+        try:
+            with closing(self._connect()) as conn:
+                entries, size_bytes = conn.execute("SELECT count(*), total(size) FROM results").fetchone()
+        except sqlite3.Error:
+            entries = size_bytes = 0
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                errors=self._errors,
+                entries=entries,
+                size_bytes=int(size_bytes),
+                max_bytes=self.max_bytes,
+                path=str(self.path),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit; put() opens its transaction explicitly
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        total = conn.execute("SELECT total(size) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        excess = total - self.max_bytes * EVICTION_TARGET
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY used_at"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        logger.info("Evicted %d result cache entries", len(victims))
+        return len(victims)
+
+    def _count(self, *counters: str) -> None:
+        with self._lock:
+            for counter in counters:
+                setattr(self, counter, getattr(self, counter) + 1)
+
+
+def result_cache_max_bytes() -> int:
+    """Size limit: ``RESULT_CACHE_MAX_BYTES`` or the default."""
+
+    configured = os.getenv(RESULT_CACHE_MAX_BYTES_ENV)
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", RESULT_CACHE_MAX_BYTES_ENV, configured)
+    return DEFAULT_RESULT_CACHE_MAX_BYTES
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the process-wide result cache, or None when ``RESULT_CACHE_PATH`` is not set."""
+
+    global _result_cache
+    if _result_cache is None:
+        path = os.getenv(RESULT_CACHE_PATH_ENV)
+        if not path:
+            return None
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(path, result_cache_max_bytes())
+    return _result_cache
+
+
+__all__ = [
+    "DEFAULT_RESULT_CACHE_MAX_BYTES",
+    "RESULT_CACHE_MAX_BYTES_ENV",
+    "RESULT_CACHE_PATH_ENV",
+    "RESULT_CACHE_VERSION",
+    "ResultCache",
+    "ResultCacheStats",
+    "get_result_cache",
+    "result_cache_key",
+    "result_cache_max_bytes",
+]
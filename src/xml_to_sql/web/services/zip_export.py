@@ -0,0 +1,168 @@
+"""Streaming ZIP export of a batch's conversions.
+
+The archive is produced entry by entry: one joined query streams the
+batch's conversions in chunks, each entry is deflated on its own and the
+compressed bytes are handed to the response as soon as the entry is
+written. Memory therefore depends on the largest single file, not on the
+size of the batch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session, aliased
+
+from ..database.blobs import stored_text
+from ..database.models import BatchFile, Blob, Conversion
+
+logger = logging.getLogger(__name__)
+
+# Conversions fetched per round trip while streaming
+EXPORT_FETCH_SIZE = 200
+
+
+class _ChunkSink:
+    """Unseekable file object collecting what ``ZipFile`` writes."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``(name, text)`` entries, one entry at a time.
+
+    Entries are deflated individually and written with data descriptors, so
+    nothing but the current entry is held in memory.
+    """
+    sink = _ChunkSink()
+    with ZipFile(sink, "w", compression=ZIP_DEFLATED) as archive:
+        for name, text in entries:
+            info = ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = ZIP_DEFLATED
+            archive.writestr(info, text.encode("utf-8"))
+            yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
+def has_successful_conversions(db: Session, batch_id: str) -> bool:
+    return db.query(
+        exists().where(
+            BatchFile.batch_id == batch_id,
+            BatchFile.conversion_id == Conversion.id,
+            Conversion.status == "success",
+        )
+    ).scalar()
+
+
+def batch_zip_entries(
+    session_factory: Callable[[], Session],
+    batch_id: str,
+    include_abap: bool = False,
+    include_validation: bool = False,
+) -> Iterator[Tuple[str, str]]:
+    """``(name, text)`` archive entries for a batch's successful conversions.
+
+    Args:
+        session_factory: Creates the session the rows are streamed with; it
+            is held open until the entries are exhausted
+        batch_id: Batch to export
+        include_abap: Add an ABAP report per conversion (generated on the
+            fly when it was never requested)
+        include_validation: Add the stored validation result and logs per
+            conversion as JSON
+
+    Yields:
+        One SQL entry per conversion, followed by its optional artefacts.
+        Names repeated within the batch get a numeric suffix.
+    """
+    fields = ["sql_content"]
+    if include_abap:
+        fields.append("abap_content")
+    if include_validation:
+        fields += ["validation_result", "validation_logs"]
+
+    # Each text comes from its blob, or inline for conversions not migrated yet
+    columns = [Conversion.filename, Conversion.scenario_id]
+    joins = []
+    for field in fields:
+        blob = aliased(Blob)
+        columns += [blob.data.label(f"{field}_data"), getattr(Conversion, f"legacy_{field}").label(f"legacy_{field}")]
+        joins.append((blob, blob.digest == getattr(Conversion, f"{field}_digest")))
+
+    statement = select(*columns).join(BatchFile, BatchFile.conversion_id == Conversion.id)
+    for blob, on_clause in joins:
+        statement = statement.outerjoin(blob, on_clause)
+    statement = (
+        statement.where(BatchFile.batch_id == batch_id, Conversion.status == "success")
+        .order_by(BatchFile.id)
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+
+    used: Set[str] = set()
+    with session_factory() as db:
+        for row in db.execute(statement):
+            texts = {field: stored_text(getattr(row, f"{field}_data"), getattr(row, f"legacy_{field}")) for field in fields}
+            base_name = _unique(_base_name(row.filename), used)
+            yield f"{base_name}.sql", texts["sql_content"]
+
+            if include_abap:
+                abap_content = texts["abap_content"] or _generate_abap(texts["sql_content"], row.scenario_id)
+                if abap_content:
+                    yield f"Z_XDS_{base_name}.abap".upper(), abap_content
+
+            if include_validation and texts["validation_result"]:
+                report = {
+                    "validation": json.loads(texts["validation_result"]),
+                    "validation_logs": json.loads(texts["validation_logs"]) if texts["validation_logs"] else [],
+                }
+                yield f"{base_name}.validation.json", json.dumps(report, indent=2)
+
+
+def _base_name(filename: str) -> str:
+    return filename.rsplit(".", 1)[0] if "." in filename else filename
+
+
+def _unique(name: str, used: Set[str]) -> str:
+    candidate, counter = name, 1
+    while candidate.lower() in used:
+        counter += 1
+        candidate = f"{name}_{counter}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def _generate_abap(sql_content: str, scenario_id: Optional[str]) -> Optional[str]:
+    from ...abap import generate_abap_report
+
+    try:
+        return generate_abap_report(sql_content=sql_content, scenario_id=scenario_id or "GENERATED_VIEW")
+    except Exception as exc:  # one bad view must not break the archive
+        logger.warning("ABAP generation failed for %s: %s", scenario_id, exc)
+        return None
+
+
+__all__ = [
+    "EXPORT_FETCH_SIZE",
+    "batch_zip_entries",
+    "has_successful_conversions",
+    "stream_zip",
+]
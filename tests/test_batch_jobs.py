@@ -0,0 +1,130 @@
+"""Tests for background batch jobs: submission, progress and resume."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.api.routes import get_job
+from xml_to_sql.web.database.models import Base, BatchConversion, BatchFile, BatchJobFile
+from xml_to_sql.web.services.batch_jobs import JobManager, JobQueueFull
+from xml_to_sql.web.services.conversion_pool import shutdown_conversion_pool
+
+_VIEWS = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA"
+_CONFIG = '{"database_mode": "snowflake"}'
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    shutdown_conversion_pool()
+    engine.dispose()
+
+
+async def _wait_until_completed(manager: JobManager, session_factory, job_id: str) -> None:
+    while True:
+        with session_factory() as db:
+            if db.query(BatchConversion).filter_by(batch_id=job_id).one().status == "completed":
+                return
+        assert await manager.wait_for_progress(timeout=60), "job made no progress"
+
+
+def test_submitted_job_is_converted_in_the_background(session_factory):
+    views = sorted(_VIEWS.glob("*.XML"))[:2]
+    uploads = [(path.name, path.read_bytes()) for path in views]
+    uploads += [("notes.txt", b"not a view"), ("broken.xml", b"<not-xml")]
+
+    async def run():
+        manager = JobManager(session_factory, max_in_flight=2)
+        with session_factory() as db:
+            batch = manager.submit(db, uploads, _CONFIG)
+            job_id = batch.batch_id
+            assert batch.status == "queued" and batch.failed == 1
+
+        with pytest.raises(JobQueueFull):
+            with session_factory() as db:
+                JobManager(session_factory, queue_limit=3).submit(db, uploads, _CONFIG)
+
+        await _wait_until_completed(manager, session_factory, job_id)
+        await manager.stop()
+        with session_factory() as db:
+            return await get_job(job_id, db=db)
+
+    status = asyncio.run(run())
+    assert (status.status, status.successful, status.failed, status.pending, status.running) == ("completed", 2, 2, 0, 0)
+    assert [f.status for f in status.files] == ["success", "success", "error", "error"]
+    assert status.files[2].conversion_id is None and status.files[3].conversion_id is not None
+
+    with session_factory() as db:
+        assert db.query(BatchFile).filter_by(batch_id=status.job_id).count() == 3
+        assert db.query(BatchJobFile).filter(BatchJobFile.xml_content.isnot(None)).count() == 0
+
+
+def test_interrupted_job_resumes_after_restart(session_factory):
+    view = sorted(_VIEWS.glob("*.XML"))[0]
+    with session_factory() as db:
+        db.add(BatchConversion(batch_id="job-1", total_files=3, successful=1, status="running", config_json=_CONFIG))
+        for position, status in enumerate(("success", "running", "pending")):
+            content = None if status == "success" else view.read_bytes()
+            db.add(BatchJobFile(batch_id="job-1", position=position, filename=view.name, xml_content=content, status=status))
+        db.commit()
+
+    async def run():
+        manager = JobManager(session_factory)
+        assert await manager.start() == 1
+        await _wait_until_completed(manager, session_factory, "job-1")
+        await manager.stop()
+
+    asyncio.run(run())
+    with session_factory() as db:
+        batch = db.query(BatchConversion).filter_by(batch_id="job-1").one()
+        assert (batch.successful, batch.failed, batch.completed_at is not None) == (3, 0, True)
+        assert db.query(BatchFile).filter_by(batch_id="job-1").count() == 2
+
+
+def test_queue_errors_are_retried_and_unrecordable_files_fail(session_factory, monkeypatch):
+    from xml_to_sql.web.services import batch_jobs
+    from xml_to_sql.web.services.converter import ConversionResult
+
+    async def convert(xml_content, validation_budget=None, **options):
+        return ConversionResult(sql_content="SELECT 1")
+
+    monkeypatch.setattr(batch_jobs, "convert_in_pool", convert)
+    monkeypatch.setattr(batch_jobs, "_RETRY_SECONDS", 0.01)
+    manager = JobManager(session_factory, max_in_flight=1)
+    claim_next, claim_errors = manager._claim_next, []
+
+    def locked_once():
+        if not claim_errors:
+            claim_errors.append(True)
+            raise sqlite3.OperationalError("database is locked")
+        return claim_next()
+
+    def record(file_id, result):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(manager, "_claim_next", locked_once)
+    monkeypatch.setattr(manager, "_record", record)
+
+    async def run():
+        with session_factory() as db:
+            job_id = manager.submit(db, [("a.xml", b"<a/>")], _CONFIG).batch_id
+        await _wait_until_completed(manager, session_factory, job_id)
+        await manager.stop()
+        return job_id
+
+    job_id = asyncio.run(run())
+    assert claim_errors
+    with session_factory() as db:
+        batch = db.query(BatchConversion).filter_by(batch_id=job_id).one()
+        job_file = db.query(BatchJobFile).filter_by(batch_id=job_id).one()
+        assert (batch.successful, batch.failed) == (0, 1)
+        assert (job_file.status, job_file.conversion_id) == ("error", None)
+        assert "could not be stored" in job_file.error_message
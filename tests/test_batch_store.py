@@ -0,0 +1,43 @@
+"""Tests for bulk persistence of batch conversion results."""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.database.models import Base, BatchConversion, BatchFile, Conversion
+from xml_to_sql.web.services.batch_store import BatchWriter
+from xml_to_sql.web.services.converter import ConversionResult
+
+
+def test_chunks_are_inserted_with_ids_in_submission_order(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    with sessionmaker(bind=engine)() as db:
+        batch = BatchConversion(batch_id="b1", total_files=5)
+        db.add(batch)
+        db.commit()
+
+        writer = BatchWriter(db, "b1", '{"database_mode": "hana"}', chunk_size=2)
+        for key in ("e", "d", "c", "b", "a"):
+            result = (
+                ConversionResult("", error=f"failed {key}")
+                if key == "c"
+                else ConversionResult(f"SELECT '{key}'", scenario_id=key.upper(), warnings=[f"warn {key}"])
+            )
+            writer.add(key, f"{key}.xml", b"<root/>", 7, result)
+            batch.successful += result.error is None
+        # Two full chunks were committed on the way, with the counters
+        assert len(writer.conversion_ids) == 4
+        writer.flush()
+
+        conversions = {c.id: c for c in db.query(Conversion)}
+        for key, conversion_id in writer.conversion_ids.items():
+            assert conversions[conversion_id].filename == f"{key}.xml"
+        assert conversions[writer.conversion_ids["c"]].status == "error"
+        assert conversions[writer.conversion_ids["a"]].sql_content == "SELECT 'a'"
+        assert conversions[writer.conversion_ids["a"]].warnings == '["warn a"]'
+        assert {f.conversion_id for f in db.query(BatchFile).filter_by(batch_id="b1")} == set(conversions)
+        assert db.query(BatchConversion).one().successful == 4
+    engine.dispose()
@@ -0,0 +1,72 @@
+"""Tests for the content-addressed blob store of conversion texts."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.database.blobs import delete_unreferenced_blobs, migrate_inline_texts, text_digest, with_blob_digests
+from xml_to_sql.web.database.db import init_db
+from xml_to_sql.web.database.models import Base, Blob, Conversion
+
+_XML = "<Calculation:scenario id='V'>" + "<node/>" * 500 + "</Calculation:scenario>"
+
+
+def test_identical_texts_are_stored_once_and_removed_with_their_last_conversion(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blobs.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    with sessionmaker(bind=engine)() as db:
+        rows = [
+            dict(id=index, filename="v.xml", xml_content=_XML, sql_content=f"SELECT {index}", warnings="[]")
+            for index in (1, 2)
+        ]
+        db.execute(insert(Conversion), with_blob_digests(db, rows))
+        db.commit()
+
+        # One XML, two SQL texts, one warnings list
+        assert db.query(Blob).count() == 4
+        xml_blob = db.get(Blob, text_digest(_XML))
+        assert xml_blob.size == len(_XML) and len(xml_blob.data) < len(_XML) / 10
+        assert db.get(Conversion, 2).xml_content == _XML
+        assert db.get(Conversion, 2).sql_content == "SELECT 2"
+        assert db.get(Conversion, 2).abap_content is None
+
+        db.query(Conversion).filter(Conversion.id == 1).delete()
+        assert delete_unreferenced_blobs(db) == 1  # SELECT 1
+        db.query(Conversion).delete()
+        assert delete_unreferenced_blobs(db) == 3
+        db.commit()
+    engine.dispose()
+
+
+def test_inline_texts_of_a_legacy_database_are_migrated(tmp_path):
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE conversions (id INTEGER NOT NULL PRIMARY KEY, filename VARCHAR NOT NULL, scenario_id VARCHAR,"
+            " sql_content TEXT NOT NULL, abap_content TEXT, xml_content TEXT, config_json TEXT, warnings TEXT,"
+            " created_at DATETIME NOT NULL, file_size INTEGER, status VARCHAR NOT NULL, error_message TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO conversions VALUES (?, 'v.xml', 'V', ?, NULL, ?, '{}', '[]', '2024-01-01 00:00:00', 1, 'success', NULL)",
+            [(index, f"SELECT {index % 2}", _XML) for index in range(1, 6)],
+        )
+    engine = create_engine(f"sqlite:///{path}")
+    init_db(engine)
+    sessions = sessionmaker(bind=engine)
+
+    with sessions() as db:
+        before = {c.id: (c.sql_content, c.xml_content, c.warnings) for c in db.query(Conversion)}
+
+    assert migrate_inline_texts(sessions, chunk_size=2) == 5
+    assert migrate_inline_texts(sessions) == 0
+
+    with sessions() as db:
+        assert {c.id: (c.sql_content, c.xml_content, c.warnings) for c in db.query(Conversion)} == before
+        assert db.query(Conversion).filter(Conversion.legacy_sql_content != "").count() == 0
+        assert db.query(Conversion).filter(Conversion.legacy_xml_content.is_not(None)).count() == 0
+        assert db.query(Blob).count() == 4  # SELECT 0, SELECT 1, the XML and '[]'
+    engine.dispose()
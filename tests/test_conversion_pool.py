@@ -0,0 +1,59 @@
+"""Tests for the shared process pool behind batch conversion."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from xml_to_sql.sql.validation_scheduler import ValidationBudget
+from xml_to_sql.web.services import conversion_pool
+from xml_to_sql.web.services.conversion_pool import convert_as_completed, shutdown_conversion_pool
+from xml_to_sql.web.services.converter import convert_xml_to_sql
+
+_VIEWS = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA"
+
+
+@pytest.fixture
+def two_workers(monkeypatch):
+    monkeypatch.setenv(conversion_pool.CONVERSION_WORKERS_ENV, "2")
+    shutdown_conversion_pool()
+    yield
+    shutdown_conversion_pool()
+
+
+def test_batch_results_match_in_process_conversion(two_workers):
+    paths = sorted(_VIEWS.glob("*.XML"))[:4]
+    jobs = [(path.name, path.read_bytes(), {"database_mode": "snowflake"}) for path in paths]
+    jobs.append(("broken.xml", b"<not-xml", {"database_mode": "snowflake"}))
+    budget = ValidationBudget(60_000)
+
+    async def run():
+        ticks = 0
+        results = {}
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        clock = asyncio.ensure_future(ticker())
+        async for key, result in convert_as_completed(jobs, validation_budget=budget):
+            results[key] = result
+        clock.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+
+    assert sorted(results) == sorted(key for key, _, _ in jobs)
+    for path in paths:
+        expected = convert_xml_to_sql(path.read_bytes(), database_mode="snowflake")
+        # Workers run with their own hash seed, which may order independent CTEs differently
+        assert sorted(results[path.name].sql_content.splitlines()) == sorted(expected.sql_content.splitlines())
+        assert results[path.name].profile.get("conversion") is not None
+    assert "Invalid XML file format" in results["broken.xml"].error
+    assert budget.spent_ms > 0
+    # The event loop kept running while the workers converted
+    assert ticks > 0
@@ -0,0 +1,133 @@
+"""Tests for the static cost estimator."""
+
+from __future__ import annotations
+
+import pytest
+
+from xml_to_sql.domain import (
+    AggregationNode,
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    JoinCondition,
+    JoinNode,
+    JoinType,
+    Node,
+    NodeKind,
+    Predicate,
+    PredicateKind,
+    Scenario,
+    ScenarioMetadata,
+    UnionNode,
+)
+from xml_to_sql.sql.cost_model import TableStatistics, estimate_cost, load_statistics
+
+STATS = {
+    "tables": {
+        "SAPABAP1.VBAK": {"rows": 2_000_000, "columns": {"VBELN": {"distinct": 2_000_000, "width": 10}}},
+        "SAPABAP1.VBAP": {
+            "rows": 20_000_000,
+            "columns": {
+                "VBELN": {"distinct": 2_000_000, "width": 10},
+                "WERKS": {"distinct": 50, "width": 4},
+            },
+        },
+    }
+}
+
+
+def _column(name: str) -> Expression:
+    return Expression(ExpressionType.COLUMN, name)
+
+
+def _projection(node_id: str, source: str, *columns: str, filters=()) -> Node:
+    return Node(
+        node_id=node_id,
+        kind=NodeKind.PROJECTION,
+        inputs=[source],
+        mappings=[AttributeMapping(column, _column(column)) for column in columns],
+        filters=list(filters),
+    )
+
+
+def _scenario(*nodes: Node) -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="cost"))
+    for name in ("VBAK", "VBAP"):
+        scenario.data_sources[name] = DataSource(
+            source_id=name, source_type=DataSourceType.TABLE, schema_name="SAPABAP1", object_name=name
+        )
+    for node in nodes:
+        scenario.add_node(node)
+    return scenario
+
+
+def _join(conditions) -> JoinNode:
+    return JoinNode(
+        node_id="Join_1",
+        kind=NodeKind.JOIN,
+        inputs=["#/0/Header", "#/0/Items"],
+        mappings=[AttributeMapping("VBELN", _column("VBELN"))],
+        join_type=JoinType.INNER,
+        conditions=conditions,
+    )
+
+
+def test_key_join_filter_and_aggregation_propagate_cardinality():
+    plant = Predicate(PredicateKind.COMPARISON, _column("WERKS"), "=", Expression(ExpressionType.LITERAL, "1000"))
+    scenario = _scenario(
+        _projection("Header", "VBAK", "VBELN"),
+        _projection("Items", "VBAP", "VBELN", "WERKS", filters=[plant]),
+        _join([JoinCondition(_column("VBELN"), _column("VBELN"))]),
+        AggregationNode(
+            node_id="Aggregation_1", kind=NodeKind.AGGREGATION, inputs=["Items"], group_by=["WERKS"]
+        ),
+    )
+    report = estimate_cost(scenario, TableStatistics.from_dict(STATS))
+    rows = {node_id: round(estimate.rows) for node_id, estimate in report.estimates.items()}
+
+    assert rows["Items"] == 400_000  # 20M rows, 1 of 50 plants
+    assert rows["Join_1"] == 400_000  # every item matches one header
+    assert rows["Aggregation_1"] == 1
+    assert report.estimates["Items"].row_bytes == 14
+    assert not report.result.has_issues
+
+
+def test_join_without_conditions_is_flagged_with_rows_and_bytes():
+    scenario = _scenario(
+        _projection("Header", "VBAK", "VBELN"),
+        _projection("Items", "VBAP", "VBELN"),
+        _join([]),
+    )
+    report = estimate_cost(scenario, TableStatistics.from_dict(STATS))
+    codes = {issue.code: issue.message for issue in report.result.warnings}
+
+    assert "~40,000,000,000,000 rows" in codes["EXPLOSIVE_JOIN"]
+    assert "OVERSIZED_INTERMEDIATE" not in codes  # the join is the final node
+    assert "Items" in codes["MISSING_SELECTIVE_FILTER"]
+    assert report.to_dict()["final"]["node"] == "Join_1"
+
+
+def test_union_adds_rows_and_defaults_only_produce_info():
+    scenario = _scenario(
+        _projection("Header", "VBAK", "VBELN"),
+        _projection("Items", "VBAP", "VBELN"),
+        UnionNode(node_id="Union_1", kind=NodeKind.UNION, inputs=["Header", "Items"]),
+        _join([]),
+    )
+    assert round(estimate_cost(scenario).estimates["Union_1"].rows) == 200_000
+    result = estimate_cost(scenario).result
+    assert not result.warnings and {issue.code for issue in result.info} == {"EXPLOSIVE_JOIN"}
+
+
+def test_statistics_file_is_validated(tmp_path):
+    path = tmp_path / "stats.yaml"
+    path.write_text("tables:\n  vbak:\n    rows: 10\n    columns:\n      vbeln: {distinct: 10}\n", encoding="utf-8")
+    statistics = load_statistics(path)
+    assert statistics.tables["VBAK"].columns["VBELN"].distinct == 10
+    assert statistics.source == str(path)
+
+    path.write_text("tables:\n  vbak: {columns: {}}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="rows"):
+        load_statistics(path)
@@ -0,0 +1,106 @@
+"""Tests for the embedded SQLite dry run of generated SQL."""
+
+from __future__ import annotations
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    Node,
+    NodeKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.domain.types import DatabaseMode
+from xml_to_sql.sql import render_scenario
+from xml_to_sql.sql.dry_run import dry_run_sql, transpile_for_sqlite
+from xml_to_sql.sql.validator import test_sql_execution as run_execution_test
+
+
+def _scenario(*tables: str) -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="dry"))
+    for table in tables:
+        scenario.data_sources[table] = DataSource(
+            source_id=table, source_type=DataSourceType.TABLE, schema_name="SAPABAP1", object_name=table
+        )
+    return scenario
+
+
+def _codes(report) -> list:
+    result = report.result
+    return [issue.code for issue in result.errors + result.warnings + result.info]
+
+
+def test_transpile_keeps_only_what_sqlite_cannot_parse():
+    sql = (
+        'DROP VIEW "_SYS_BIC"."V" CASCADE;\n'
+        'CREATE VIEW "_SYS_BIC"."V" AS\n'
+        "SELECT RIGHT(a, 2), b::NUMBER(10, 2), DATEADD(day, -1, c), $$IP_X$$, '$$IP_Y$$'\n"
+        "FROM DB.SAP.KNA1 WHERE DB.SAP.KNA1.d = 1;\n"
+        "COMMENT ON VIEW x IS 'y'"
+    )
+    assert transpile_for_sqlite(sql) == (
+        "SELECT \"RIGHT\"(a, 2), b, DATEADD('day', -1, c), NULL, '$$IP_Y$$'\n"
+        'FROM "DB.SAP".KNA1 WHERE "DB.SAP".KNA1.d = 1'
+    )
+
+
+def test_rendered_scenario_runs_on_discovered_columns():
+    scenario = _scenario("KNA1")
+    scenario.add_node(
+        Node(
+            node_id="Projection_1",
+            kind=NodeKind.PROJECTION,
+            inputs=["KNA1"],
+            mappings=[
+                AttributeMapping("KUNNR", Expression(ExpressionType.COLUMN, "KUNNR")),
+                AttributeMapping("LAND1", Expression(ExpressionType.COLUMN, "LAND1")),
+            ],
+        )
+    )
+    for mode in DatabaseMode:
+        sql = render_scenario(scenario, database_mode=mode, validate=False)
+        report = dry_run_sql(sql, scenario, sample_rows=5)
+
+        assert _codes(report) == ["DRY_RUN_OK"]
+        assert report.executed and report.rows_returned == 5
+        assert report.discovered_columns == 2
+        assert report.plan_shape()["scans"] == 1
+        assert report.to_dict()["plan"] == ["SCAN SAPABAP1.KNA1"]
+
+
+def test_semantic_errors_fail_but_emulation_gaps_do_not():
+    scenario = _scenario("KNA1")
+    missing = "WITH p AS (SELECT SAPABAP1.KNA1.A AS A FROM SAPABAP1.KNA1) SELECT p.B FROM p"
+    report = dry_run_sql(missing, scenario)
+    assert _codes(report) == ["DRY_RUN_FAILED"]
+    assert report.result.errors[0].message == "Dry run failed: no such column: p.B"
+
+    arity = "SELECT A FROM SAPABAP1.KNA1 UNION ALL SELECT A, B FROM SAPABAP1.KNA1"
+    assert _codes(dry_run_sql(arity, scenario)) == ["DRY_RUN_FAILED"]
+
+    unknown = "SELECT HANA_ONLY_FUNC(A) FROM SAPABAP1.KNA1"
+    report = dry_run_sql(unknown, scenario)
+    assert _codes(report) == ["DRY_RUN_UNSUPPORTED_FUNCTION"] and report.result.is_valid
+
+    assert run_execution_test(missing, scenario=scenario).has_errors
+    assert run_execution_test(missing).is_valid
+
+
+def test_pathological_joins_are_reported():
+    scenario = _scenario("KNA1", "MARA")
+    keyed = "SELECT k.A FROM SAPABAP1.KNA1 AS k INNER JOIN SAPABAP1.MARA AS m ON k.A = m.A"
+    assert _codes(dry_run_sql(keyed, scenario, sample_rows=20)) == ["DRY_RUN_OK"]
+
+    cross = "SELECT k.A FROM SAPABAP1.KNA1 AS k INNER JOIN SAPABAP1.MARA AS m ON k.A > m.A"
+    report = dry_run_sql(cross, scenario, sample_rows=20)
+    assert _codes(report) == ["DRY_RUN_ROW_EXPLOSION", "DRY_RUN_OK"]
+    assert report.rows_returned == 190
+
+    runaway = (
+        "SELECT COUNT(*) FROM SAPABAP1.KNA1 a, SAPABAP1.KNA1 b, SAPABAP1.KNA1 c, SAPABAP1.MARA d"
+    )
+    report = dry_run_sql(runaway, scenario, sample_rows=200, timeout_ms=20)
+    assert report.timed_out and _codes(report) == ["DRY_RUN_TIMEOUT"]
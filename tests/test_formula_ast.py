@@ -0,0 +1,166 @@
+"""Tests for the formula expression tree: lexer, parser, rewrites and printers."""
+
+from __future__ import annotations
+
+import pytest
+
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion
+from xml_to_sql.sql.formula_ast import (
+    BinaryOp,
+    Case,
+    FormulaSyntaxError,
+    FunctionCall,
+    Identifier,
+    InList,
+    Placeholder,
+    StringLiteral,
+    parse_formula,
+    parse_template,
+    print_formula,
+    strip_parens,
+    substitute_slots,
+    tokenize,
+)
+from xml_to_sql.sql.formula_rewriter import rewrite_formula
+from xml_to_sql.sql.function_translator import translate_raw_formula
+
+
+class _Ctx:
+    def __init__(self, database_mode: DatabaseMode, hana_version=None):
+        self.database_mode = database_mode
+        self.hana_version = hana_version
+        self.client = "PROD"
+        self.language = "EN"
+        self.warnings = []
+
+
+HANA_2 = _Ctx(DatabaseMode.HANA, HanaVersion.HANA_2_0)
+HANA_1 = _Ctx(DatabaseMode.HANA, HanaVersion.HANA_1_0)
+SNOWFLAKE = _Ctx(DatabaseMode.SNOWFLAKE)
+
+
+def _translate(formula: str, ctx: _Ctx) -> str:
+    tree = rewrite_formula(parse_formula(formula), ctx, ctx.database_mode)
+    return print_formula(tree, ctx.database_mode)
+
+
+class TestTokenizer:
+    def test_quote_escapes(self):
+        tokens = tokenize("'it''s' + \"A\"\"B\"")
+        assert [(t.kind, t.value) for t in tokens[:-1]] == [
+            ("STRING", "it's"),
+            ("OP", "+"),
+            ("QUOTED", 'A"B'),
+        ]
+
+    def test_placeholder_is_single_token(self):
+        tokens = tokenize("'$$IP_X$$' = $$IP_Y$$")
+        assert tokens[0].value == "$$IP_X$$"
+        assert tokens[2].kind == "PLACEHOLDER"
+        assert tokens[2].value == "$$IP_Y$$"
+
+    def test_comments_are_skipped(self):
+        tokens = tokenize("1 -- trailing\n+ /* inline */ 2")
+        assert [t.value for t in tokens[:-1]] == ["1", "+", "2"]
+
+    def test_slots_only_in_templates(self):
+        assert tokenize("f({0})", allow_slots=True)[2].kind == "SLOT"
+        with pytest.raises(FormulaSyntaxError):
+            tokenize("f({0})")
+
+    @pytest.mark.parametrize("text", ["'open", '"open', "$$IP_X", "a ? b"])
+    def test_invalid_input(self, text):
+        with pytest.raises(FormulaSyntaxError):
+            tokenize(text)
+
+
+class TestParser:
+    def test_and_binds_tighter_than_or(self):
+        tree = parse_formula("a = 1 or b = 2 and c = 3")
+        assert isinstance(tree, BinaryOp) and tree.op.upper() == "OR"
+        assert isinstance(tree.right, BinaryOp) and tree.right.op.upper() == "AND"
+
+    def test_function_call_and_identifiers(self):
+        tree = parse_formula('leftstr("COL", 4)')
+        assert isinstance(tree, FunctionCall)
+        assert tree.name == "leftstr"
+        assert isinstance(tree.args[0], Identifier)
+
+    def test_in_predicate(self):
+        tree = parse_formula("\"MTART\" in ('FERT', 'HAWA')")
+        assert isinstance(tree, InList)
+        assert [value.value for value in tree.values] == ["FERT", "HAWA"]
+
+    def test_placeholder(self):
+        assert isinstance(parse_formula("$$IP_DATE$$"), Placeholder)
+
+    @pytest.mark.parametrize("text", ["if(a, b", "a +", "(a", "a b"])
+    def test_syntax_errors(self, text):
+        with pytest.raises(FormulaSyntaxError):
+            parse_formula(text)
+
+    def test_template_substitution(self):
+        template = parse_template("SUBSTRING({0}, 1, {1})")
+        tree = substitute_slots(template, [Identifier(["COL"], [True]), StringLiteral("x")])
+        assert print_formula(tree, DatabaseMode.HANA) == "SUBSTRING(\"COL\", 1, 'x')"
+
+
+class TestPrinter:
+    def test_round_trip_is_canonical(self):
+        tree = parse_formula("if( \"A\"=1 ,  'x''y' , ((\"B\")) )")
+        assert print_formula(tree, DatabaseMode.HANA) == "if(\"A\" = 1, 'x''y', (\"B\"))"
+
+    def test_precedence_adds_parentheses(self):
+        tree = BinaryOp("*", BinaryOp("+", Identifier(["A"], [True]), Identifier(["B"], [True])), Identifier(["C"], [True]))
+        assert print_formula(tree, DatabaseMode.HANA) == '("A" + "B") * "C"'
+
+    def test_hana_prints_concat_as_plus(self):
+        tree = parse_formula("'a' || \"B\"")
+        assert print_formula(tree, DatabaseMode.HANA) == "'a' + \"B\""
+        assert print_formula(tree, DatabaseMode.SNOWFLAKE) == "'a' || \"B\""
+
+    def test_hana_keeps_concat_inside_regexp_like(self):
+        tree = parse_formula("REGEXP_LIKE(\"C\", '^' || 'A' || '$')")
+        assert print_formula(tree, DatabaseMode.HANA) == "REGEXP_LIKE(\"C\", '^' || 'A' || '$')"
+
+
+class TestRewrites:
+    def test_in_function_becomes_operator(self):
+        tree = rewrite_formula(parse_formula("\"X\" = 1 and in(\"Y\", 'a', 'b')"), HANA_2, DatabaseMode.HANA)
+        assert isinstance(strip_parens(tree.right), InList)
+
+    def test_hana_1_expands_in_to_or(self):
+        assert _translate("in(\"X\", 'a', 'b')", HANA_1) == "(\"X\" = 'a' OR \"X\" = 'b')"
+
+    def test_hana_1_nested_in_inside_function(self):
+        result = _translate("if(in(rightstr_x(\"M\"), '01', '02'), 1, 0)", HANA_1)
+        assert result == "CASE WHEN (rightstr_x(\"M\") = '01' OR rightstr_x(\"M\") = '02') THEN 1 ELSE 0 END"
+
+    def test_isnull_comparison_is_folded(self):
+        assert _translate('isnull("X") = 1', HANA_2) == '"X" IS NULL'
+        assert _translate('isnull("X") = 0', HANA_2) == '"X" IS NOT NULL'
+
+    def test_if_to_case_with_empty_else(self):
+        result = _translate("if(\"A\" = 1, \"B\", '')", HANA_2)
+        assert result == 'CASE WHEN "A" = 1 THEN "B" ELSE NULL END'
+
+    def test_snowflake_if_to_iff_nested(self):
+        result = _translate("if(\"A\" = 1, if(\"B\" = 2, 'x', 'y'), 'z')", SNOWFLAKE)
+        assert result == "IFF(\"A\" = 1, IFF(\"B\" = 2, 'x', 'y'), 'z')"
+
+    def test_snowflake_plus_to_concat(self):
+        assert _translate("\"A\" + '-' + \"B\"", SNOWFLAKE) == "\"A\" || '-' || \"B\""
+        assert _translate("\"QTY\" + 1", SNOWFLAKE) == "\"QTY\" + 1"
+
+    def test_case_branches_are_rewritten(self):
+        tree = rewrite_formula(parse_formula("if(\"a\" = 1, 2, 3)"), HANA_2, DatabaseMode.HANA)
+        assert isinstance(tree, Case)
+        assert print_formula(tree.whens[0][0], DatabaseMode.HANA) == '"A" = 1'
+
+
+def test_unparsable_formula_falls_back_to_regex_pipeline():
+    assert translate_raw_formula("if(a, b", HANA_2) == "IF(a, b"
+
+
+def test_empty_formula_is_null():
+    assert translate_raw_formula("", HANA_2) == "NULL"
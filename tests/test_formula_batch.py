@@ -0,0 +1,157 @@
+"""Tests for batch translation of scenario formulas."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    CalculatedAttribute,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    Node,
+    NodeKind,
+    Predicate,
+    PredicateKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion
+from xml_to_sql.sql import render_scenario
+from xml_to_sql.sql.formula_batch import FormulaTarget, collect_formulas, translate_formulas
+from xml_to_sql.sql.function_translator import translate_raw_formula
+from xml_to_sql.sql.translation_cache import get_formula_cache
+from xml_to_sql.sql.validation_cache import configure_validation_cache
+from xml_to_sql.web.services import converter
+
+FLAG = "if(\"KUNNR\" = '', 'N', 'Y')"
+FILTER = "\"MANDT\" = '$$client$$'"
+CALC = "if(\"LAND1\" = '', 'N', 'Y')"
+
+
+@pytest.fixture(autouse=True)
+def _clear_formula_cache():
+    get_formula_cache().clear()
+    yield
+    get_formula_cache().clear()
+
+
+def _scenario() -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="batch", default_client="100"))
+    scenario.data_sources["KNA1"] = DataSource(
+        source_id="KNA1",
+        source_type=DataSourceType.TABLE,
+        schema_name="SAPABAP1",
+        object_name="KNA1",
+    )
+    scenario.add_node(
+        Node(
+            node_id="Projection_1",
+            kind=NodeKind.PROJECTION,
+            inputs=["KNA1"],
+            mappings=[
+                AttributeMapping(target_name="KUNNR", expression=Expression(ExpressionType.COLUMN, "KUNNR")),
+                AttributeMapping(target_name="FLAG_COPY", expression=Expression(ExpressionType.RAW, FLAG)),
+            ],
+            filters=[Predicate(kind=PredicateKind.RAW, left=Expression(ExpressionType.RAW, FILTER))],
+            calculated_attributes={
+                "FLAG": CalculatedAttribute(name="FLAG", expression=Expression(ExpressionType.RAW, CALC)),
+            },
+        )
+    )
+    return scenario
+
+
+def _target(mode=DatabaseMode.HANA, version=HanaVersion.HANA_2_0) -> FormulaTarget:
+    return FormulaTarget(database_mode=mode, hana_version=version, client="100", language="EN")
+
+
+def test_collect_formulas_covers_mappings_filters_and_calculated_attributes():
+    assert collect_formulas(_scenario()) == [FLAG, FILTER, CALC]
+
+
+def test_translate_formulas_deduplicates_and_matches_single_translation():
+    target = _target()
+    translations, stats = translate_formulas([FLAG, FILTER, FLAG], target)
+
+    assert (stats.formulas, stats.unique, stats.translated, stats.cache_hits) == (3, 2, 2, 0)
+    get_formula_cache().clear()
+    assert translations[FLAG] == translate_raw_formula(FLAG, target)
+    assert translations[FILTER] == translate_raw_formula(FILTER, target)
+    assert "'100'" in translations[FILTER]
+
+
+def test_translate_formulas_uses_and_fills_cache():
+    target = _target(DatabaseMode.SNOWFLAKE, None)
+    translate_raw_formula(FLAG, target)
+
+    _, stats = translate_formulas([FLAG, FILTER], target)
+    assert (stats.cache_hits, stats.translated) == (1, 1)
+
+    _, stats = translate_formulas([FLAG, FILTER], target)
+    assert (stats.cache_hits, stats.translated) == (2, 0)
+
+
+def test_translate_formulas_in_process_pool():
+    formulas = [f"\"A\" + {n}" for n in range(8)] + [FLAG]
+    target = _target()
+
+    parallel, stats = translate_formulas(formulas, target, max_workers=2, parallel_threshold=4)
+    get_formula_cache().clear()
+    serial, _ = translate_formulas(formulas, target)
+
+    assert parallel == serial
+    assert stats.workers in (1, 2)  # 1 when the sandbox cannot start processes
+
+
+def test_render_scenario_uses_precomputed_translations():
+    scenario = _scenario()
+    sql = render_scenario(
+        scenario,
+        database_mode=DatabaseMode.HANA,
+        hana_version=HanaVersion.HANA_2_0,
+        validate=False,
+        formula_translations={CALC: "'BATCHED'"},
+    )
+    assert "'BATCHED' AS FLAG" in sql
+
+
+def test_render_scenario_output_unchanged_by_batching():
+    scenario = _scenario()
+    batched = render_scenario(scenario, database_mode=DatabaseMode.HANA, hana_version=HanaVersion.HANA_2_0, validate=False)
+    unbatched = render_scenario(
+        scenario,
+        database_mode=DatabaseMode.HANA,
+        hana_version=HanaVersion.HANA_2_0,
+        validate=False,
+        formula_translations={},
+    )
+    assert batched == unbatched
+
+
+def test_conversion_reports_its_own_formula_cache_use(monkeypatch):
+    sample = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+    render = converter.render_scenario
+
+    def render_alongside_other_requests(*args, **kwargs):
+        # Lookups a concurrent conversion makes while this one renders
+        for index in range(5):
+            get_formula_cache().get(("other request", index))
+        return render(*args, **kwargs)
+
+    monkeypatch.setattr(converter, "render_scenario", render_alongside_other_requests)
+    configure_validation_cache()
+    try:
+        result = converter.convert_xml_to_sql(sample.read_bytes(), database_mode="snowflake")
+    finally:
+        configure_validation_cache()
+    details = next(stage.details for stage in result.stages if stage.stage_name == "Generate SQL")
+
+    batch, cache = details["formula_batch"], details["formula_cache"]
+    assert (cache["hits"], cache["misses"]) == (batch["cache_hits"], batch["translated"])
+    assert cache["hits"] + cache["misses"] == batch["unique"]
+    assert 0 <= cache["lifetime_hit_ratio"] <= 1
@@ -0,0 +1,72 @@
+"""Tests for cursor pagination of the history list."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.api.routes import get_history
+from xml_to_sql.web.database.models import Base, Conversion
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with sessionmaker(bind=engine)() as session:
+        # Groups of three rows share a timestamp
+        session.add_all(
+            Conversion(
+                id=index + 1,
+                filename=f"view_{index}.xml",
+                xml_content="<root/>" * 100,
+                sql_content="SELECT 1",
+                status="success",
+                created_at=start + timedelta(seconds=index // 3),
+            )
+            for index in range(10)
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _history(db, **params):
+    params = {"page": 1, "page_size": 4, "cursor": None, "count": "exact", **params}
+    return asyncio.run(get_history(db=db, **params))
+
+
+def test_cursor_pages_cover_every_row_once_in_order(db):
+    pages = [_history(db)]
+    while pages[-1].next_cursor:
+        pages.append(_history(db, cursor=pages[-1].next_cursor, count="none"))
+
+    ids = [entry.id for page in pages for entry in page.entries]
+    assert ids == list(range(10, 0, -1))
+    assert [len(page.entries) for page in pages] == [4, 4, 2]
+    assert pages[0].total == 10 and pages[1].total is None
+    # Page numbers still address the same order
+    assert [entry.id for entry in _history(db, page=2).entries] == ids[4:8]
+
+
+def test_list_does_not_load_conversion_texts(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = _history(db, count="estimate")
+
+    assert response.total == 10 and response.total_is_estimate
+    assert statements and not any("xml_content" in sql or "sql_content" in sql for sql in statements)
+    assert not any("count(" in sql.lower() for sql in statements)
+
+
+def test_invalid_cursor_is_rejected(db):
+    with pytest.raises(HTTPException) as excinfo:
+        _history(db, cursor="not-a-cursor")
+    assert excinfo.value.status_code == 400
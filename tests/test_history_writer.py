@@ -0,0 +1,103 @@
+"""Tests for write-behind persistence of conversion history."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.database.ids import ConversionIdAllocator
+from xml_to_sql.web.database.models import Base, Conversion
+from xml_to_sql.web.services.history_writer import HistoryWriter
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _row(index: int) -> dict:
+    return dict(filename=f"view_{index}.xml", sql_content=f"SELECT {index}", status="success")
+
+
+def test_concurrent_submissions_are_written_in_batches(engine):
+    sessions = sessionmaker(bind=engine)
+    with sessions() as db:
+        db.add(Conversion(id=41, filename="legacy.xml", sql_content=""))
+        db.commit()
+
+    writer = HistoryWriter(sessions, batch_size=25)
+    ids = {}
+
+    def produce(start: int) -> None:
+        for index in range(start, start + 50):
+            ids[index] = writer.submit(_row(index))
+
+    threads = [threading.Thread(target=produce, args=(start,)) for start in range(0, 200, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.flush(10)
+    stats = writer.stats()
+    assert (stats.depth, stats.written, stats.failed, stats.lag_ms) == (0, 200, 0, 0.0)
+    assert stats.batches < 200 and stats.max_commit_lag_ms > 0
+    assert len(set(ids.values())) == 200 and min(ids.values()) > 41
+    with sessions() as db:
+        stored = {c.id: c.filename for c in db.query(Conversion).filter(Conversion.id > 41)}
+    assert stored == {conversion_id: f"view_{index}.xml" for index, conversion_id in ids.items()}
+    writer.close()
+
+
+def test_full_queue_falls_back_to_synchronous_writes_and_close_flushes(engine):
+    sessions = sessionmaker(bind=engine)
+    writer = HistoryWriter(sessions, max_queue=1)
+    ids = [writer.submit(_row(index)) for index in range(20)]
+    writer.close()
+
+    with sessions() as db:
+        assert sorted(c.id for c in db.query(Conversion)) == ids
+    stats = writer.stats()
+    assert stats.written == 20 and stats.synchronous_writes > 0
+    assert not writer.is_pending(ids[-1]) and writer.wait_for(ids[-1], 0)
+    with pytest.raises(RuntimeError):
+        writer.submit(_row(21))
+
+
+def test_id_blocks_do_not_overlap_between_processes(engine):
+    # Two allocators on one database behave like two server processes
+    first, second = ConversionIdAllocator(engine, block_size=10), ConversionIdAllocator(engine, block_size=10)
+    reserved = first.reserve(3) + second.reserve(12) + first.reserve(10)
+    assert len(set(reserved)) == len(reserved) == 25
+
+
+def test_async_submit_writes_on_a_worker_thread_when_the_queue_is_full(engine):
+    sessions = sessionmaker(bind=engine)
+    writer = HistoryWriter(sessions, max_queue=1)
+    loop_thread = threading.get_ident()
+    writing_threads = set()
+    insert = writer._insert
+
+    def record_thread(rows):
+        writing_threads.add(threading.get_ident())
+        return insert(rows)
+
+    writer._insert = record_thread
+
+    async def submit_all():
+        return [await writer.submit_async(_row(index)) for index in range(20)]
+
+    ids = asyncio.run(submit_all())
+    writer.close()
+
+    with sessions() as db:
+        assert sorted(c.id for c in db.query(Conversion)) == ids
+    assert writer.stats().synchronous_writes > 0
+    assert loop_thread not in writing_threads
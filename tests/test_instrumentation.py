@@ -0,0 +1,71 @@
+"""Tests for per-phase wall time, CPU time and peak allocation metrics."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from xml_to_sql.utils.instrumentation import (
+    ConversionProfile,
+    Histogram,
+    enable_memory_tracing,
+    get_metrics_registry,
+    measure,
+    start_phase,
+)
+from xml_to_sql.web.api.routes import get_metrics
+from xml_to_sql.web.services.converter import convert_xml_to_sql
+
+_SAMPLE = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((10, 100))
+    for value in (1, 2, 3, 4, 50, 500):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert [bucket["count"] for bucket in data["buckets"]] == [4, 1, 1]
+    assert (data["count"], data["min"], data["max"], data["sum"]) == (6, 1, 500, 560)
+    assert 1 <= data["p50"] <= 10
+    assert 100 <= data["p99"] <= 500
+
+
+def test_nested_phases_attribute_peak_allocation():
+    profile = ConversionProfile()
+    enable_memory_tracing()
+    try:
+        with measure("outer", profile):
+            with measure("inner", profile):
+                block = bytearray(4 * 1024 * 1024)
+                del block
+            small = [0] * 1000
+        timer = start_phase("unfinished", profile)
+    finally:
+        timer.stop()
+        enable_memory_tracing(False)
+
+    inner, outer = profile.get("inner"), profile.get("outer")
+    assert inner.peak_bytes >= 4 * 1024 * 1024
+    assert outer.peak_bytes >= inner.peak_bytes
+    assert outer.wall_ms >= inner.wall_ms and outer.cpu_ms >= 0
+    assert timer.stop() is profile.get("unfinished")
+    assert [phase.name for phase in profile.phases] == ["inner", "outer", "unfinished"]
+    del small
+
+
+def test_conversion_phases_reach_the_metrics_endpoint():
+    registry = get_metrics_registry()
+    registry.reset()
+
+    result = convert_xml_to_sql(_SAMPLE.read_bytes(), database_mode="snowflake", auto_fix=True)
+    names = [phase.name for phase in result.profile.phases]
+    assert {"stage:Parse XML", "formula_translation", "render", "validator:Dry Run", "conversion"} <= set(names)
+    assert any(name.startswith("fix:") for name in names)
+    assert names[-1] == "conversion"
+    assert all(phase.peak_bytes is None for phase in result.profile.phases)
+
+    snapshot = asyncio.run(get_metrics(reset=True))
+    assert snapshot["phases"]["conversion"]["count"] == 1
+    assert snapshot["phases"]["stage:Generate SQL"]["wall_ms"]["count"] == 1
+    assert registry.snapshot()["phases"] == {}
@@ -0,0 +1,109 @@
+"""Tests for the pre-render structural validation of the scenario IR."""
+
+from __future__ import annotations
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    Node,
+    NodeKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.sql.ir_validator import validate_scenario_ir
+from xml_to_sql.web.services.converter import convert_xml_to_sql
+
+
+def _mapping(target: str, column: str) -> AttributeMapping:
+    return AttributeMapping(target, Expression(ExpressionType.COLUMN, column))
+
+
+def _scenario(*nodes: Node) -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="ir"))
+    scenario.data_sources["VBAP"] = DataSource(
+        source_id="VBAP", source_type=DataSourceType.TABLE, schema_name="SAPK5D", object_name="VBAP"
+    )
+    for node in nodes:
+        scenario.add_node(node)
+    return scenario
+
+
+def _errors(scenario: Scenario) -> list:
+    return [(issue.code, issue.message) for issue in validate_scenario_ir(scenario).errors]
+
+
+def test_well_formed_graph_passes():
+    scenario = _scenario(
+        Node("Projection_1", NodeKind.PROJECTION, inputs=["#VBAP"], mappings=[_mapping("MATNR", "MATNR")]),
+        Node("Projection_2", NodeKind.PROJECTION, inputs=["#/0/Projection_1"], mappings=[_mapping("M", "MATNR")]),
+    )
+    assert validate_scenario_ir(scenario).is_valid
+
+
+def test_graph_errors_name_the_node_at_fault():
+    scenario = _scenario(
+        Node("Projection_1", NodeKind.PROJECTION, inputs=["#VBAP", "#Missing_1"]),
+        Node("Join_1", NodeKind.JOIN, inputs=["#Projection_1"]),
+    )
+    assert _errors(scenario) == [
+        ("DANGLING_INPUT", "Node Projection_1: input #Missing_1 does not match any node or data source"),
+        ("UNSUPPORTED_NODE_KIND", "Node Join_1: unsupported node kind JOIN for Node"),
+        ("INSUFFICIENT_INPUTS", "Node Join_1: join needs at least 2 inputs, found 1"),
+    ]
+
+
+def test_cycle_leaves_no_final_node():
+    scenario = _scenario(
+        Node("A", NodeKind.PROJECTION, inputs=["#B"]),
+        Node("B", NodeKind.PROJECTION, inputs=["#A"]),
+    )
+    assert _errors(scenario) == [
+        ("DEPENDENCY_CYCLE", "Node A: dependency cycle A -> B -> A"),
+        ("MISSING_FINAL_NODE", "No terminal node found: every node is the input of another node"),
+    ]
+
+
+def test_unresolved_columns_are_checked_only_against_explicit_outputs():
+    scenario = _scenario(
+        Node("Projection_1", NodeKind.PROJECTION, inputs=["#VBAP"], mappings=[_mapping("MATNR", "MATNR")]),
+        Node("Projection_2", NodeKind.PROJECTION, inputs=["#VBAP"]),
+        Node("Projection_3", NodeKind.PROJECTION, inputs=["#Projection_1"], mappings=[_mapping("X", "ERDAT")]),
+        Node("Projection_4", NodeKind.PROJECTION, inputs=["#Projection_2"], mappings=[_mapping("X", "ERDAT")]),
+    )
+    assert _errors(scenario) == [
+        ("UNRESOLVED_COLUMN", "Node Projection_3: column ERDAT (mapped to X) is not produced by Projection_1"),
+    ]
+
+
+_BROKEN_VIEW = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Calculation:scenario xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:Calculation="http://www.sap.com/ndb/BiModelCalculation.ecore" id="BROKEN">
+  <dataSources>
+    <DataSource id="VBAP" type="DATA_BASE_TABLE">
+      <columnObject schemaName="SAPK5D" columnObjectName="VBAP"/>
+    </DataSource>
+  </dataSources>
+  <calculationViews>
+    <calculationView xsi:type="Calculation:ProjectionView" id="Projection_1">
+      <viewAttributes><viewAttribute id="MATNR"/></viewAttributes>
+      <input node="#Projection_9">
+        <mapping xsi:type="Calculation:AttributeMapping" target="MATNR" source="MATNR"/>
+      </input>
+    </calculationView>
+  </calculationViews>
+</Calculation:scenario>
+"""
+
+
+def test_converter_stops_before_rendering_broken_views():
+    result = convert_xml_to_sql(_BROKEN_VIEW, database_mode="snowflake")
+
+    assert result.sql_content == ""
+    assert "Node Projection_1: input Projection_9 does not match" in result.error
+    assert [issue.code for issue in result.validation.errors] == ["DANGLING_INPUT"]
+    assert [stage.stage_name for stage in result.stages] == ["Parse XML", "Build IR"]
+    assert result.stages[-1].status == "failed"
+    assert result.stages[-1].details["ir_validation"]["error_count"] == 1
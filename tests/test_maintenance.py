@@ -0,0 +1,133 @@
+"""Tests for history retention, archival and database compaction."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.database.blobs import with_blob_digests
+from xml_to_sql.web.database.db import init_db
+from xml_to_sql.web.database.models import BatchConversion, BatchFile, Blob, Conversion
+from xml_to_sql.web.services import maintenance
+from xml_to_sql.web.services.maintenance import (
+    MaintenanceInProgress,
+    RetentionPolicy,
+    apply_retention,
+    compact_database,
+    run_maintenance,
+)
+
+_NOW = datetime(2024, 6, 15)
+
+
+@pytest.fixture
+def history(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    init_db(engine)
+    sessions = sessionmaker(bind=engine)
+    # Ten conversions, one every 20 days back from _NOW; the oldest four in one batch
+    rows = [
+        dict(
+            id=index,
+            filename=f"view_{index}.xml",
+            status="success",
+            created_at=_NOW - timedelta(days=20 * (10 - index)),
+            xml_content=f"<view id='{index}'/>",
+            sql_content=f"SELECT {index} -- {os.urandom(2_000).hex()}",
+            warnings="[]",
+        )
+        for index in range(1, 11)
+    ]
+    with sessions() as db:
+        db.execute(insert(Conversion), with_blob_digests(db, rows))
+        db.add(BatchConversion(batch_id="old", created_at=_NOW - timedelta(days=200), total_files=4))
+        db.add_all(BatchFile(batch_id="old", conversion_id=index, filename=f"view_{index}.xml") for index in range(1, 5))
+        db.commit()
+    yield engine, sessions
+    engine.dispose()
+
+
+def test_retention_archives_expired_conversions_per_month(history, tmp_path):
+    engine, sessions = history
+    archive_dir = tmp_path / "archive"
+
+    # 100 days drops 1-4 (and 5 at exactly 100 days stays); 7 rows keep 4-10
+    report = apply_retention(
+        sessions, RetentionPolicy(max_age_days=100, max_rows=7, archive_dir=archive_dir), now=_NOW, chunk_size=3
+    )
+
+    assert (report.conversions_deleted, report.conversions_archived, report.batches_deleted) == (4, 4, 1)
+    assert report.blobs_deleted == 8  # XML and SQL of each; '[]' is still used
+    with sessions() as db:
+        assert sorted(c.id for c in db.query(Conversion)) == list(range(5, 11))
+        assert db.query(BatchFile).count() == 0 and db.query(BatchConversion).count() == 0
+        assert db.query(Blob).count() == 13
+
+    archived = {}
+    for path in report.archive_files:
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            archived[os.path.basename(path)] = [json.loads(line) for line in archive]
+    assert {name: [entry["id"] for entry in entries] for name, entries in archived.items()} == {
+        "conversions-2023-12.jsonl.gz": [1],
+        "conversions-2024-01.jsonl.gz": [2, 3],
+        "conversions-2024-02.jsonl.gz": [4],
+    }
+    entry = archived["conversions-2024-01.jsonl.gz"][0]
+    assert entry["xml_content"] == "<view id='2'/>" and entry["sql_content"].startswith("SELECT 2 -- ")
+
+    # Nothing left to remove; a second run appends nothing
+    assert apply_retention(sessions, RetentionPolicy(max_age_days=100, archive_dir=archive_dir), now=_NOW).conversions_deleted == 0
+
+
+def test_compaction_returns_free_pages_of_new_and_legacy_databases(history, tmp_path):
+    engine, sessions = history
+    path = tmp_path / "history.db"
+    with sessions() as db:
+        db.query(Conversion).delete()
+        db.query(Blob).delete()
+        db.commit()
+    engine.dispose()
+
+    report = compact_database(path)
+    assert report.steps == ["incremental_vacuum", "analyze"]
+    assert report.free_pages_before > 0 and report.reclaimed_bytes > 20_000
+    assert report.size_after == path.stat().st_size
+
+    legacy = tmp_path / "legacy.db"
+    with sqlite3.connect(legacy) as conn:
+        conn.execute("CREATE TABLE import_history (import_id INTEGER PRIMARY KEY, data BLOB)")
+        conn.executemany("INSERT INTO import_history (data) VALUES (?)", [(os.urandom(4_000),) for _ in range(20)])
+        conn.execute("DELETE FROM import_history")
+    # Without incremental auto-vacuum only a full vacuum reclaims the pages
+    assert compact_database(legacy, analyze=False).reclaimed_bytes == 0
+    assert compact_database(legacy, full_vacuum=True, reindex=True).steps == ["reindex", "vacuum", "analyze"]
+    with sqlite3.connect(legacy) as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_run_covers_both_databases_once_at_a_time(history, tmp_path):
+    engine, _ = history
+    mappings = tmp_path / "mappings.db"
+    with sqlite3.connect(mappings) as conn:
+        conn.execute("CREATE TABLE import_history (import_id INTEGER PRIMARY KEY, import_date TIMESTAMP)")
+        conn.executemany(
+            "INSERT INTO import_history (import_date) VALUES (?)", [(f"2020-0{month}-01 00:00:00",) for month in (1, 2, 3)]
+        )
+
+    report = run_maintenance(RetentionPolicy(max_rows=2), bind=engine, mappings_path=mappings)
+    assert report.retention.conversions_deleted == 8 and report.retention.import_history_deleted == 1
+    assert [database.path for database in report.databases] == [str(tmp_path / "history.db"), str(mappings)]
+    assert report.to_dict()["reclaimed_bytes"] == report.reclaimed_bytes > 0
+    assert maintenance.last_maintenance_report() is report
+
+    with maintenance._run_lock:
+        with pytest.raises(MaintenanceInProgress):
+            run_maintenance(RetentionPolicy(), bind=engine, mappings_path=None)
@@ -0,0 +1,106 @@
+"""Tests for the pattern catalog linter and the runtime regex guard."""
+
+from __future__ import annotations
+
+import re
+import threading
+
+import pytest
+
+from xml_to_sql.catalog import PatternRule, RegexTimeout, get_pattern_catalog, lint_pattern_catalog
+from xml_to_sql.catalog.pattern_linter import fuzz_inputs, lint_regex, run_with_timeout
+from xml_to_sql.catalog.pattern_loader import parse_pattern_rules
+from xml_to_sql.domain.types import DatabaseMode
+from xml_to_sql.sql.rewrite_engine import RewriteEngine
+
+
+def _codes(pattern: str) -> set:
+    return {issue.code for issue in lint_regex("rule", pattern)}
+
+
+@pytest.mark.parametrize(
+    "pattern,code",
+    [
+        (r"(a+)+$", "NESTED_QUANTIFIER"),
+        (r"(\w+\s*)*x", "NESTED_QUANTIFIER"),
+        (r"(ab|\wc)*$", "AMBIGUOUS_ALTERNATION"),
+        (r"\w+\d+!", "ADJACENT_QUANTIFIERS"),
+        (r"[unclosed", "INVALID_REGEX"),
+    ],
+)
+def test_static_checks_flag_hazards(pattern, code):
+    assert code in _codes(pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"NOW\s*\(\s*\)\s*-\s*(\d+)",
+        r"date\s*\(\s*NOW\s*\(\s*\)\s*-\s*(\d+)\s*\)",
+        r"(ab|cd)+",
+        r"(\d{4})-(\d{2})",
+    ],
+)
+def test_static_checks_accept_safe_patterns(pattern):
+    assert not [issue for issue in lint_regex("rule", pattern) if issue.severity == "error"]
+
+
+def test_packaged_catalog_passes_lint():
+    report = lint_pattern_catalog(get_pattern_catalog())
+    assert not report.errors
+    assert set(report.worst_ms) == set(get_pattern_catalog())
+
+
+def test_slow_rule_exceeds_time_budget():
+    # Statically only a warning, but cubic on long runs of spaces.
+    rules = {"slow": PatternRule(name="slow", match=r"\s*\s*\s*x", hana="y", snowflake="y")}
+    report = lint_pattern_catalog(rules, budget_ms=5)
+    assert [issue.code for issue in report.errors] == ["TIME_BUDGET"]
+
+
+def test_dangerous_rule_is_not_timed():
+    rules = parse_pattern_rules('patterns:\n  - name: bad\n    match: "(a+)+$"\n    hana: x\n')
+    report = lint_pattern_catalog(rules)
+    assert [issue.code for issue in report.errors] == ["NESTED_QUANTIFIER"]
+    assert "bad" not in report.worst_ms
+
+
+def test_fuzz_inputs_include_backtracking_triggers_and_corpus():
+    inputs = fuzz_inputs(r"NOW\s*\(", corpus=["NOW() - 1"])
+    assert "N" * 512 + "\x00" in inputs
+    assert "NOW() - 1" in inputs
+
+
+def test_run_with_timeout_interrupts_on_main_thread():
+    if threading.current_thread() is not threading.main_thread():
+        pytest.skip("signal timers require the main thread")
+    catastrophic = re.compile(r"(a+)+$")
+    with pytest.raises(RegexTimeout):
+        run_with_timeout(lambda: catastrophic.match("a" * 40 + "!"), 50)
+
+
+def test_run_with_timeout_reports_overrun_in_worker_thread():
+    errors = []
+
+    def work():
+        try:
+            run_with_timeout(lambda: sum(range(2_000_000)), 0.001)
+        except RegexTimeout as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert errors
+
+
+def test_engine_disables_rule_after_timeout():
+    rules = {"slow": PatternRule(name="slow", match=r"\s*\s*\s*x", hana="y", snowflake="y")}
+    engine = RewriteEngine(rules, {}, pattern_timeout_ms=1)
+    text = " " * 600 + "!"
+
+    assert engine.apply_patterns(text, DatabaseMode.HANA) == text
+    stats = engine.stats()[0]
+    assert stats.timeouts == 1 and stats.disabled
+    # Disabled rules no longer run, even on input they would match.
+    assert engine.apply_patterns("x", DatabaseMode.HANA) == "x"
@@ -0,0 +1,161 @@
+"""Tests for the conversion result cache and the ETag of /convert/single."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import Response, UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.package_mapping_db import PackageMappingDB, mapping_data_version
+from xml_to_sql.sql.cost_model import TableStatistics
+from xml_to_sql.sql.schema_catalog import SchemaCatalog
+from xml_to_sql.web.api import routes
+from xml_to_sql.web.database.models import Base, Conversion
+from xml_to_sql.web.services import result_cache
+from xml_to_sql.web.services.converter import ConversionResult, convert_xml_to_sql
+from xml_to_sql.web.services.history_writer import HistoryWriter
+from xml_to_sql.web.services.result_cache import ResultCache, result_cache_key
+
+_SAMPLE = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+
+
+def test_key_covers_options_and_hana_package_mappings(monkeypatch):
+    xml = b"<root/>"
+    snowflake = result_cache_key(xml, {"database_mode": "snowflake", "client": "PROD"})
+    assert snowflake == result_cache_key(xml, {"client": "PROD", "database_mode": "snowflake"})
+    assert snowflake != result_cache_key(xml, {"database_mode": "snowflake", "client": "TEST"})
+    assert snowflake != result_cache_key(b"<root />", {"database_mode": "snowflake", "client": "PROD"})
+
+    hana = result_cache_key(xml, {"database_mode": "hana"})
+    monkeypatch.setattr(result_cache, "mapping_version", lambda: "imported-again")
+    assert result_cache_key(xml, {"database_mode": "hana"}) != hana
+    assert result_cache_key(xml, {"database_mode": "snowflake", "client": "PROD"}) == snowflake
+
+
+def test_key_covers_statistics_and_schema_catalog(monkeypatch):
+    xml, options = b"<root/>", {"database_mode": "snowflake"}
+    catalog = SchemaCatalog.from_mapping({"SAPK5D.VBAK": ["VBELN"]})
+    monkeypatch.setattr(result_cache, "get_default_catalog", lambda: catalog)
+    before_import = result_cache_key(xml, options)
+
+    catalog.import_records([{"TABNAME": "VBAP", "FIELDNAME": "POSNR"}], schema_name="SAPK5D")
+    after_import = result_cache_key(xml, options)
+    assert after_import != before_import
+
+    statistics = TableStatistics.from_dict({"SAPK5D.VBAK": {"rows": 10}})
+    monkeypatch.setattr(result_cache, "get_default_statistics", lambda: statistics)
+    assert result_cache_key(xml, options) != after_import
+
+
+def test_mapping_version_survives_maintenance_but_not_imports(tmp_path):
+    path = tmp_path / "mappings.db"
+    PackageMappingDB(path)
+    initial = mapping_data_version(path)
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO hana_instances (instance_name) VALUES ('MBD (ECC)')")
+        conn.execute("INSERT INTO package_mappings (instance_id, cv_name, package_path) VALUES (1, 'CV_A', 'P.A')")
+    imported = mapping_data_version(path)
+    assert imported != initial
+
+    with sqlite3.connect(path, isolation_level=None) as conn:
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    assert mapping_data_version(path) == imported
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE package_mappings SET is_active = 0")
+    assert mapping_data_version(path) != imported
+
+
+def test_results_with_budget_skipped_validation_are_not_stored(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db")
+
+    cache.put("skipped", ConversionResult("SELECT 1", validation_complete=False))
+    cache.put("complete", ConversionResult("SELECT 1"))
+
+    assert cache.get("skipped") is None
+    assert cache.get("complete").validation_complete
+    assert cache.stats().stores == 1
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "TOUCH_INTERVAL_SECONDS", 0.0)
+    cache = ResultCache(tmp_path / "cache.db", max_bytes=12_000)
+
+    def result(index: int) -> ConversionResult:
+        # Random hex compresses to about half: under 5 KB per entry
+        return ConversionResult(f"SELECT {index} -- {os.urandom(4_000).hex()}")
+
+    cache.put("a", result(1))
+    cache.put("b", result(2))
+    assert cache.get("a").sql_content.startswith("SELECT 1")
+    cache.put("c", result(3))
+    cache.put("failed", ConversionResult("", error="broken"))
+
+    assert cache.get("b") is None  # least recently used
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get("failed") is None
+    stats = cache.stats()
+    assert stats.evictions >= 1 and stats.size_bytes <= 12_000 and stats.stores == 3
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    writer = HistoryWriter(sessions)
+    cache = ResultCache(tmp_path / "cache.db")
+    conversions = []
+
+    def convert(xml_content, **options):
+        conversions.append(options)
+        return convert_xml_to_sql(xml_content, **options)
+
+    monkeypatch.setattr(routes, "get_history_writer", lambda: writer)
+    monkeypatch.setattr(routes, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(routes, "convert_xml_to_sql", convert)
+    monkeypatch.setattr(routes, "write_latest_sql_to_file", lambda *args: None)
+    with sessions() as db:
+        yield db, writer, conversions
+    writer.close()
+    engine.dispose()
+
+
+def _submit(db, if_none_match=None, record_history=True):
+    upload = UploadFile(BytesIO(_SAMPLE.read_bytes()), filename=_SAMPLE.name)
+    response = Response()
+    body = asyncio.run(routes.convert_single(
+        upload, '{"database_mode": "snowflake"}', db,
+        response=response, if_none_match=if_none_match, record_history=record_history,
+    ))
+    return body, response
+
+
+def test_repeated_submission_is_served_from_the_cache_and_revalidated(service):
+    db, writer, conversions = service
+
+    first, first_headers = _submit(db)
+    second, second_headers = _submit(db)
+    assert len(conversions) == 1
+    assert (first_headers.headers["x-result-cache"], second_headers.headers["x-result-cache"]) == ("miss", "hit")
+    assert first_headers.headers["etag"] == second_headers.headers["etag"]
+    assert second.sql_content == first.sql_content and second.id != first.id
+
+    etag = first_headers.headers["etag"]
+    not_modified, _ = _submit(db, if_none_match=etag, record_history=False)
+    assert not_modified.status_code == 304 and not_modified.headers["etag"] == etag
+    recorded, _ = _submit(db, if_none_match=f'"other", {etag}')
+    assert recorded.status_code == 304
+
+    assert writer.flush(10)
+    # Both full responses and the revalidation that asked for it were recorded
+    assert db.query(Conversion).count() == 3
+    assert len(conversions) == 1
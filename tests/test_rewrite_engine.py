@@ -0,0 +1,98 @@
+"""Tests for the literal-prefiltered catalog rewrite engine."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from xml_to_sql.catalog import FunctionRule, PatternRule
+from xml_to_sql.domain.types import DatabaseMode
+from xml_to_sql.sql.rewrite_engine import RewriteEngine, required_literal
+
+
+PATTERNS = {
+    "date_now_minus_days": PatternRule(
+        name="date_now_minus_days",
+        match=r"date\s*\(\s*NOW\s*\(\s*\)\s*-\s*(\d+)\s*\)",
+        hana="TO_DATE(ADD_DAYS(CURRENT_TIMESTAMP, -$1))",
+        snowflake="DATEADD(DAY, -$1, CURRENT_DATE)",
+    ),
+    "now_minus_days": PatternRule(
+        name="now_minus_days",
+        match=r"NOW\s*\(\s*\)\s*-\s*(\d+)",
+        hana="ADD_DAYS(CURRENT_DATE, -$1)",
+        snowflake="",
+    ),
+    "make_marker": PatternRule(name="make_marker", match=r"MARKER_A", hana="MARKER_B", snowflake=""),
+    "use_marker": PatternRule(name="use_marker", match=r"MARKER_B", hana="DONE", snowflake=""),
+}
+
+FUNCTIONS = {
+    "LEFTSTR": FunctionRule(name="LEFTSTR", handler="template", template="SUBSTRING({0}, 1, {1})"),
+    "STRING": FunctionRule(name="STRING", handler="rename", target="TO_VARCHAR"),
+}
+
+
+def _rename_calls(text: str, rule: FunctionRule, pattern: re.Pattern) -> str:
+    return pattern.sub(f"{rule.target or rule.name.lower()}_X(", text)
+
+
+@pytest.fixture
+def engine() -> RewriteEngine:
+    return RewriteEngine(PATTERNS, FUNCTIONS)
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        (r"NOW\s*\(\s*\)\s*-\s*(\d+)", "now"),
+        (r"CURRENT_TIMESTAMP\s*-\s*(\d+)", "current_timestamp"),
+        (r"(?:foo|bar)\s*x", None),
+        (r"a+b", None),
+        (r"[unclosed", None),
+    ],
+)
+def test_required_literal(pattern, expected):
+    assert required_literal(pattern) == expected
+
+
+def test_anchor_scan_reports_overlapping_anchors(engine):
+    anchors = engine.anchors_in("leftstr(DATE(now() - 3), 2)")
+    assert {"leftstr", "date", "now"} <= anchors
+    assert "string" not in anchors
+
+
+def test_patterns_match_plain_regex_semantics(engine):
+    assert engine.apply_patterns("date(NOW() - 270)", DatabaseMode.HANA) == "TO_DATE(ADD_DAYS(CURRENT_TIMESTAMP, -270))"
+    assert engine.apply_patterns("now() - 5 + 1", DatabaseMode.HANA) == "ADD_DAYS(CURRENT_DATE, -5) + 1"
+    # Empty replacement for the mode: rule is skipped.
+    assert engine.apply_patterns("now() - 5", DatabaseMode.SNOWFLAKE) == "now() - 5"
+
+
+def test_replacement_can_enable_later_rule(engine):
+    assert engine.apply_patterns("MARKER_A", DatabaseMode.HANA) == "DONE"
+
+
+def test_only_candidate_rules_run(engine):
+    engine.apply_patterns("\"AMOUNT\" * 2", DatabaseMode.HANA)
+    engine.apply_functions("leftstr(\"A\", 2)", _rename_calls)
+
+    stats = {(s.kind, s.name): s for s in engine.stats()}
+    assert all(s.candidates == 0 for (kind, _), s in stats.items() if kind == "pattern")
+    assert stats[("function", "LEFTSTR")].candidates == 1
+    assert stats[("function", "LEFTSTR")].hits == 1
+    assert stats[("function", "STRING")].candidates == 0
+
+
+def test_function_rules_get_precompiled_call_regex(engine):
+    result = engine.apply_functions("string(\"A\") + string (\"B\")", _rename_calls)
+    assert result == "TO_VARCHAR_X(\"A\") + TO_VARCHAR_X(\"B\")"
+
+
+def test_reset_stats(engine):
+    engine.apply_patterns("now() - 1", DatabaseMode.HANA)
+    engine.record_function_hit("leftstr", 1000)
+    assert any(s.hits for s in engine.stats())
+    engine.reset_stats()
+    assert not any(s.hits or s.candidates or s.total_ns for s in engine.stats())
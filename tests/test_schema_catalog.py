@@ -0,0 +1,113 @@
+"""Tests for the local column catalog and column-reference validation."""
+
+from __future__ import annotations
+
+import json
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    Node,
+    NodeKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.sql.schema_catalog import SchemaCatalog
+from xml_to_sql.sql.validator import validate_column_references
+
+_DD03L_CSV = """TABNAME;FIELDNAME;POSITION;DATATYPE;LENG;DECIMALS
+KNA1;MANDT;0001;CLNT;000003;000000
+KNA1;KUNNR;0002;CHAR;000010;000000
+KNA1;.INCLUDE;0003;;000000;000000
+KNA1;LAND1;0004;CHAR;000003;000000
+VBAP;VBELN;0001;CHAR;000010;000000
+VBAP;NETWR;0002;CURR;000015;000002
+"""
+
+
+def _mapping(target: str, column: str, source: str) -> AttributeMapping:
+    return AttributeMapping(target, Expression(ExpressionType.COLUMN, column), source_node=source)
+
+
+def _scenario() -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="columns"))
+    for table in ("KNA1", "VBAP", "ZMISSING"):
+        scenario.data_sources[table] = DataSource(
+            source_id=table, source_type=DataSourceType.TABLE, schema_name="SAPABAP1", object_name=table
+        )
+    scenario.add_node(
+        Node(
+            "Projection_1",
+            NodeKind.PROJECTION,
+            inputs=["#KNA1", "#VBAP", "#ZMISSING"],
+            mappings=[
+                _mapping("KUNNR", "KUNNR", "#KNA1"),
+                _mapping("COUNTRY", "LAND1", "#KNA1"),
+                _mapping("NAME", "NAME1", "#KNA1"),
+                _mapping("NETWR", "netwr", "#VBAP"),
+                _mapping("X", "ANY", "#ZMISSING"),
+            ],
+        )
+    )
+    return scenario
+
+
+def test_dd03l_dump_is_loaded_and_indexed(tmp_path):
+    export = tmp_path / "dd03l.csv"
+    export.write_text(_DD03L_CSV, encoding="utf-8")
+    catalog = SchemaCatalog(tmp_path / "catalog.db")
+
+    summary = catalog.import_file(export)
+    assert (summary.tables, summary.columns, summary.skipped) == (2, 5, 1)
+
+    kna1 = catalog.get_table("SAPABAP1", "kna1")
+    assert sorted(kna1.columns) == ["KUNNR", "LAND1", "MANDT"]
+    assert kna1.columns["KUNNR"].data_type == "CHAR" and kna1.columns["KUNNR"].length == 10
+    assert catalog.get_table(None, "MARA") is None
+
+    # Re-importing a table replaces its definition
+    catalog.import_records([{"TABNAME": "KNA1", "FIELDNAME": "KUNNR"}])
+    assert sorted(catalog.get_table("", "KNA1").columns) == ["KUNNR"]
+    catalog.close()
+
+
+def test_references_are_checked_with_one_query_per_table(tmp_path):
+    export = tmp_path / "table_columns.json"
+    export.write_text(
+        json.dumps({"columns": [
+            {"SCHEMA_NAME": "SAPABAP1", "TABLE_NAME": "KNA1", "COLUMN_NAME": "KUNNR"},
+            {"SCHEMA_NAME": "SAPABAP1", "TABLE_NAME": "KNA1", "COLUMN_NAME": "LAND1"},
+            {"SCHEMA_NAME": "OTHER", "TABLE_NAME": "KNA1", "COLUMN_NAME": "NAME1"},
+            {"SCHEMA_NAME": "SAPABAP1", "TABLE_NAME": "VBAP", "COLUMN_NAME": "NETWR"},
+        ]}),
+        encoding="utf-8",
+    )
+    catalog = SchemaCatalog()
+    catalog.import_file(export)
+
+    result = validate_column_references("", _scenario(), catalog)
+    assert [(issue.code, issue.message) for issue in result.errors] == [
+        ("UNKNOWN_COLUMN", "Node Projection_1: column NAME1 (mapped to NAME) does not exist in SAPABAP1.KNA1"),
+    ]
+    assert [issue.code for issue in result.info] == ["TABLE_NOT_IN_CATALOG"]
+    assert catalog.stats().queries == 3
+
+    # A batch run reuses the cached tables
+    validate_column_references("", _scenario(), catalog)
+    stats = catalog.stats()
+    assert (stats.queries, stats.hits) == (3, 3)
+
+
+def test_warm_catalog_answers_without_queries():
+    catalog = SchemaCatalog.from_mapping({"KNA1": ["KUNNR", "LAND1", "NAME1"], "VBAP": {"NETWR": "DECIMAL"}})
+    assert catalog.warm() == 2
+
+    result = validate_column_references("", _scenario(), catalog)
+    assert result.is_valid and len(result.info) == 1
+    assert catalog.stats().queries == 1
+
+    assert validate_column_references("", _scenario(), {"SAPABAP1.KNA1": ["KUNNR"]}).has_errors
+    assert validate_column_references("", _scenario()).is_valid
@@ -0,0 +1,217 @@
+"""Tests for the rendered SQL AST and the validation/correction paths that use it."""
+
+from __future__ import annotations
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    JoinCondition,
+    JoinNode,
+    JoinType,
+    Node,
+    NodeKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.domain.types import DatabaseMode
+from xml_to_sql.sql import render_scenario
+from xml_to_sql.sql.corrector import auto_correct_sql
+from xml_to_sql.sql.sql_ast import (
+    Cte,
+    Join,
+    Select,
+    SelectItem,
+    SetOperation,
+    SqlStatement,
+    Subquery,
+    TableRef,
+    ViewHeader,
+)
+from xml_to_sql.sql.validator import ValidationResult, validate_sql
+
+
+def _join_scenario() -> Scenario:
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="ast"))
+    for name in ("VBAK", "VBAP"):
+        scenario.data_sources[name] = DataSource(
+            source_id=name, source_type=DataSourceType.TABLE, schema_name="SAPK5D", object_name=name
+        )
+    for node_id, source in (("Projection_1", "VBAK"), ("Projection_2", "VBAP")):
+        scenario.add_node(
+            Node(
+                node_id=node_id,
+                kind=NodeKind.PROJECTION,
+                inputs=[source],
+                mappings=[AttributeMapping("VBELN", Expression(ExpressionType.COLUMN, "VBELN"))],
+            )
+        )
+    scenario.add_node(
+        JoinNode(
+            node_id="Join_1",
+            kind=NodeKind.JOIN,
+            inputs=["Projection_1", "Projection_2"],
+            mappings=[AttributeMapping("VBELN", Expression(ExpressionType.COLUMN, "VBELN"))],
+            join_type=JoinType.INNER,
+            conditions=[
+                JoinCondition(
+                    left=Expression(ExpressionType.COLUMN, "VBELN"),
+                    right=Expression(ExpressionType.COLUMN, "VBELN"),
+                )
+            ],
+        )
+    )
+    return scenario
+
+
+def _statement(*items: SelectItem, where=None) -> SqlStatement:
+    body = Select(list(items), TableRef("SAPK5D.VBAK"), where=where)
+    return SqlStatement(ctes=[Cte("p", body)], query=Select([SelectItem("*")], TableRef("p"), inline=True))
+
+
+def test_printer_reproduces_renderer_layouts():
+    inner = Select([SelectItem('"A"', '"X"')], TableRef("s.t"))
+    union = SetOperation("UNION ALL", [Select([SelectItem("*")], TableRef("a")), Select([SelectItem("*")], TableRef("b"))])
+    statement = SqlStatement(
+        ctes=[
+            Cte("calc_1", Select([SelectItem("*")], Subquery(inner, "calc"), where='calc."X" > 1', inline=True)),
+            Cte("u", Select([SelectItem("*")], Subquery(union, "union_result", indent=""), where="1 = 1", inline=True)),
+            Cte(
+                "j",
+                Select(
+                    [SelectItem("calc_1.*")],
+                    TableRef("calc_1", "calc_1"),
+                    joins=[Join("LEFT OUTER", TableRef("u", "u"), ["calc_1.x = u.x", "calc_1.y = u.y"])],
+                    group_by=["calc_1.x"],
+                ),
+            ),
+        ],
+        query=Select([SelectItem('"X"')], TableRef("j"), inline=True),
+        view=ViewHeader("V", 'CREATE OR REPLACE VIEW "V" AS'),
+        comments=["careful"],
+    )
+
+    assert statement.to_sql() == (
+        "-- Warnings:\n--   careful\n\n"
+        'CREATE OR REPLACE VIEW "V" AS\n'
+        "WITH\n"
+        "  calc_1 AS (\n"
+        "    SELECT * FROM (\n      SELECT\n          \"A\" AS \"X\"\n      FROM s.t\n    ) AS calc\n"
+        "    WHERE calc.\"X\" > 1\n  ),\n"
+        "  u AS (\n"
+        "    SELECT * FROM (\n    SELECT\n        *\n    FROM a\n    UNION ALL\n    SELECT\n        *\n    FROM b\n"
+        "    ) AS union_result\n    WHERE 1 = 1\n  ),\n"
+        "  j AS (\n"
+        "    SELECT\n        calc_1.*\n    FROM calc_1 AS calc_1\n"
+        "    LEFT OUTER JOIN u AS u ON calc_1.x = u.x AND calc_1.y = u.y\n"
+        "    GROUP BY calc_1.x\n  )\n\n"
+        'SELECT "X" FROM j'
+    )
+
+
+def test_render_scenario_returns_the_ast_it_printed():
+    scenario = _join_scenario()
+    sql, warnings, ast = render_scenario(scenario, return_warnings=True, return_ast=True, validate=False)
+
+    assert ast.to_sql() == sql
+    names = [cte.name for cte in ast.ctes]
+    assert sorted(names[:2]) == ["projection_1", "projection_2"] and names[2] == "join_1"
+    (join,) = ast.ctes[2].query.joins
+    assert join.join_type == "INNER" and join.source.name == "projection_2"
+
+    sql_only, ast_only = render_scenario(scenario, return_ast=True)
+    assert sql_only == sql and ast_only.to_sql() == sql
+
+
+def test_ast_validation_matches_token_validation():
+    scenario = _join_scenario()
+    sql, ast = render_scenario(scenario, return_ast=True, validate=False)
+
+    def issues(result: ValidationResult) -> list:
+        return [str(issue) for issue in result.errors + result.warnings + result.info]
+
+    for mode in (DatabaseMode.SNOWFLAKE, DatabaseMode.HANA):
+        assert issues(validate_sql(sql, mode, scenario, ast=ast)) == issues(validate_sql(sql, mode, scenario))
+
+
+def test_ast_shape_drives_structural_checks():
+    statement = _statement(SelectItem("a"))
+    statement.ctes[0].query.joins.append(Join("INNER", TableRef("SAPK5D.VBAP"), ["1=1"]))
+    sql = statement.to_sql()
+    codes = {issue.code for issue in validate_sql(sql, DatabaseMode.SNOWFLAKE, Scenario(metadata=ScenarioMetadata("x")), ast=statement).warnings}
+    assert "CARTESIAN_PRODUCT" in codes
+
+
+def test_corrections_edit_expressions_and_print_once():
+    statement = _statement(
+        SelectItem("IF(a = 'IF(', 'x' + b, c)", '"R"'),
+        SelectItem("a + b", '"S"'),
+    )
+    sql = statement.to_sql()
+    validation = ValidationResult()
+    validation.add_warning("String concatenation using '+' operator", "STRING_CONCAT_PLUS")
+    validation.add_warning("IF() function", "HANA_IF_FUNCTION")
+
+    result = auto_correct_sql(sql, validation, ast=statement)
+
+    assert result.corrected_ast is not statement
+    assert statement.to_sql() == sql  # the caller's AST is untouched
+    assert result.corrected_sql == result.corrected_ast.to_sql()
+    items = [item.expression for item in result.corrected_ast.ctes[0].query.items]
+    assert items == ["IFF(a = 'IF(', 'x' || b, c)", "a + b"]
+    assert {c.issue_code for c in result.corrections_applied} == {"STRING_CONCAT_PLUS", "HANA_IF_FUNCTION"}
+
+
+
+def test_corrections_on_the_ast_keep_statement_line_numbers():
+    statement = _statement(
+        SelectItem("a", "order"),
+        SelectItem("CASE\n  WHEN a = 1 THEN 'x' + b\nEND", '"R"'),
+        where="IF(c = 1, 1, 0) = 1",
+    )
+    statement.comments.append("header comment")
+    validation = ValidationResult()
+    validation.add_warning("String concatenation using '+' operator", "STRING_CONCAT_PLUS")
+    validation.add_warning("IF() function", "HANA_IF_FUNCTION")
+    validation.add_warning("Reserved keyword 'ORDER' used as identifier", "RESERVED_KEYWORD")
+
+    result = auto_correct_sql(statement.to_sql(), validation, ast=statement)
+    lines = result.corrected_sql.split("\n")
+
+    located = {c.issue_code: c.line_number for c in result.corrections_applied}
+    assert None not in located.values()
+    assert '"ORDER"' in lines[located["RESERVED_KEYWORD"] - 1]
+    assert "'x' || b" in lines[located["STRING_CONCAT_PLUS"] - 1]
+    assert "IFF(c = 1" in lines[located["HANA_IF_FUNCTION"] - 1]
+    assert "\x00" not in result.corrected_sql and result.corrected_sql == result.corrected_ast.to_sql()
+
+def test_duplicate_cte_is_renamed_with_later_references():
+    first = Select([SelectItem("1", "n")], TableRef("SAPK5D.VBAK"))
+    second = Select([SelectItem("2", "n")], TableRef("p"))
+    statement = SqlStatement(
+        ctes=[Cte("p", first), Cte("p", second)],
+        query=Select([SelectItem("*")], TableRef("p"), inline=True),
+    )
+    validation = ValidationResult()
+    validation.add_error("Duplicate CTE name: P", "DUPLICATE_CTE")
+
+    result = auto_correct_sql(statement.to_sql(), validation, ast=statement)
+    ast = result.corrected_ast
+
+    assert [cte.name for cte in ast.ctes] == ["p", "p_2"]
+    assert ast.ctes[1].query.source.name == "p"  # still reads the first definition
+    assert ast.query.source.name == "p_2"
+
+
+def test_reserved_keyword_aliases_are_quoted_structurally():
+    statement = _statement(SelectItem("t.order", "order"), SelectItem("'order'", "x"))
+    validation = ValidationResult()
+    validation.add_warning("Reserved keyword 'ORDER' used as identifier", "RESERVED_KEYWORD")
+
+    result = auto_correct_sql(statement.to_sql(), validation, ast=statement)
+    items = result.corrected_ast.ctes[0].query.items
+
+    assert (items[0].expression, items[0].alias) == ('t."ORDER"', '"ORDER"')
+    assert (items[1].expression, items[1].alias) == ("'order'", "x")
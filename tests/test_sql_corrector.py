@@ -0,0 +1,107 @@
+"""Tests for the token-stream correction rule engine."""
+
+from __future__ import annotations
+
+from xml_to_sql.domain import DataSource, DataSourceType, Scenario, ScenarioMetadata
+from xml_to_sql.sql.corrector import (
+    AutoFixConfig,
+    CorrectionRule,
+    apply_correction_rules,
+    auto_correct_sql,
+    fix_cte_naming,
+    fix_schema_qualification,
+)
+from xml_to_sql.sql.validator import ValidationResult
+
+
+def _validation(*codes: str, message: str = "issue") -> ValidationResult:
+    result = ValidationResult()
+    for code in codes:
+        result.add_warning(message, code)
+    return result
+
+
+def test_all_rules_apply_in_one_rebuild_with_source_lines():
+    sql = (
+        "WITH p AS (\n"
+        "  SELECT IF(a = 1, 'x' + b, c) AS order FROM s.t\n"
+        ")\n"
+        "SELECT p.order, 'IF(' + 'y' FROM p"
+    )
+    validation = _validation("STRING_CONCAT_PLUS", "HANA_IF_FUNCTION")
+    validation.add_warning("Reserved keyword 'ORDER' used as identifier", "RESERVED_KEYWORD")
+
+    result = auto_correct_sql(sql, validation)
+
+    assert result.corrected_sql == (
+        "WITH p AS (\n"
+        "  SELECT IFF(a = 1, 'x' || b, c) AS \"ORDER\" FROM s.t\n"
+        ")\n"
+        "SELECT p.\"ORDER\", 'IF(' || 'y' FROM p"
+    )
+    located = [(c.issue_code, c.line_number) for c in result.corrections_applied]
+    assert located == [
+        ("RESERVED_KEYWORD", 2),
+        ("STRING_CONCAT_PLUS", 2),
+        ("STRING_CONCAT_PLUS", 4),
+        ("HANA_IF_FUNCTION", 2),
+    ]
+
+
+def test_duplicate_cte_rename_applies_after_its_body():
+    sql = "WITH p AS (SELECT 1 AS n),\np AS (SELECT * FROM p)\nSELECT * FROM p"
+    fixed, corrections = fix_cte_naming(sql, _validation("DUPLICATE_CTE").warnings, AutoFixConfig())
+
+    assert fixed == "WITH p AS (SELECT 1 AS n),\np_2 AS (SELECT * FROM p)\nSELECT * FROM p_2"
+    assert [(c.corrected_text, c.line_number) for c in corrections] == [("p_2", 2)]
+
+
+def test_schema_qualification_skips_ctes_and_qualified_names():
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="schema"))
+    for name in ("KNA1", "MARA"):
+        scenario.data_sources[name] = DataSource(
+            source_id=name, source_type=DataSourceType.TABLE, schema_name="SAPABAP1", object_name=name
+        )
+    sql = "WITH mara AS (SELECT * FROM kna1) SELECT * FROM mara JOIN other.KNA1 ON 1 = 1 JOIN KNA1 ON 1 = 1"
+    fixed, corrections = fix_schema_qualification(
+        sql, _validation("UNQUALIFIED_TABLE").warnings, scenario, AutoFixConfig()
+    )
+
+    assert fixed == (
+        "WITH mara AS (SELECT * FROM SAPABAP1.kna1) SELECT * FROM mara "
+        "JOIN other.KNA1 ON 1 = 1 JOIN SAPABAP1.KNA1 ON 1 = 1"
+    )
+    assert len(corrections) == 2
+
+
+def test_overlapping_edit_of_a_later_rule_is_dropped():
+    class First(CorrectionRule):
+        def handlers(self):
+            return {"X": lambda tokens, i: self.propose(tokens[i], "Y")}
+
+    class Second(CorrectionRule):
+        def handlers(self):
+            return {"X": lambda tokens, i: self.propose(tokens[i], "Z")}
+
+    fixed, _ = apply_correction_rules("SELECT X FROM t", [First(), Second()])
+    assert fixed == "SELECT Y FROM t"
+
+
+def test_non_idempotent_rule_stops_at_pass_cap():
+    class Grow(CorrectionRule):
+        def handlers(self):
+            return {"FROM": lambda tokens, i: self.propose(tokens[i], "FROM x")}
+
+    fixed, _ = apply_correction_rules("SELECT 1 FROM t", [Grow()], max_passes=3)
+    assert fixed == "SELECT 1 FROM x x x t"
+
+
+def test_many_issues_are_corrected_in_few_passes():
+    lines = [f"SELECT 'a{i}' + col{i} AS c{i} FROM s.t" for i in range(2000)]
+    sql = "\nUNION ALL\n".join(lines)
+    result = auto_correct_sql(sql, _validation("STRING_CONCAT_PLUS"))
+
+    assert "+" not in result.corrected_sql
+    corrections = result.corrections_applied
+    assert len(corrections) == 2000
+    assert [c.line_number for c in corrections[:3]] == [1, 3, 5]
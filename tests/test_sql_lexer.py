@@ -0,0 +1,142 @@
+"""Tests for the SQL lexer and the token-stream validators built on it."""
+
+from __future__ import annotations
+
+from xml_to_sql.domain import Scenario, ScenarioMetadata
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion
+from xml_to_sql.sql.sql_lexer import SqlTokenKind, SqlVisitor, tokenize_sql, walk_sql
+from xml_to_sql.sql.validator import (
+    analyze_query_complexity,
+    validate_hana_sql,
+    validate_performance,
+    validate_snowflake_specific,
+    validate_sql,
+    validate_sql_structure,
+)
+
+
+def _scenario() -> Scenario:
+    return Scenario(metadata=ScenarioMetadata(scenario_id="lexer"))
+
+
+def _codes(result) -> set:
+    return {issue.code for issue in result.errors + result.warnings + result.info}
+
+
+def test_tokens_carry_kind_position_line_and_depth():
+    sql = "SELECT a,\n  f(\"B\", 'x''y') -- note\nFROM t"
+    tokens = tokenize_sql(sql)
+
+    assert [t.kind for t in tokens] == [
+        SqlTokenKind.WORD,
+        SqlTokenKind.WORD,
+        SqlTokenKind.PUNCT,
+        SqlTokenKind.WORD,
+        SqlTokenKind.PUNCT,
+        SqlTokenKind.QUOTED_IDENT,
+        SqlTokenKind.PUNCT,
+        SqlTokenKind.STRING,
+        SqlTokenKind.PUNCT,
+        SqlTokenKind.WORD,
+        SqlTokenKind.WORD,
+    ]
+    string = tokens[7]
+    assert string.text == "'x''y'" and string.terminated
+    assert (string.line, string.column) == (2, 10)
+    assert sql[string.start:string.end] == string.text
+    assert [t.depth for t in tokens[3:9]] == [0, 0, 1, 1, 1, 0]
+    assert tokens[-1].line == 3 and tokens[-2].key == "FROM"
+
+
+def test_comments_are_kept_only_on_request():
+    sql = "SELECT 1 /* FROM x */ -- WHERE\n"
+    assert [t.key for t in tokenize_sql(sql)] == ["SELECT", "1"]
+    kinds = [t.kind for t in tokenize_sql(sql, include_comments=True)]
+    assert kinds.count(SqlTokenKind.COMMENT) == 2
+
+
+def test_unterminated_literal_is_flagged():
+    assert not tokenize_sql("SELECT 'abc")[-1].terminated
+    assert not tokenize_sql("SELECT 'abc''")[-1].terminated
+    assert tokenize_sql("SELECT ''''")[-1].terminated
+
+
+def test_tokenize_is_cached_per_text():
+    sql = "SELECT * FROM cached_t"
+    assert tokenize_sql(sql) is tokenize_sql(sql)
+
+
+def test_walker_dispatches_on_key_and_kind_in_one_pass():
+    seen = []
+
+    class Recorder(SqlVisitor):
+        def handlers(self):
+            return {
+                "JOIN": lambda tokens, i: seen.append(("key", tokens[i].text)),
+                SqlTokenKind.STRING: lambda tokens, i: seen.append(("kind", tokens[i].text)),
+            }
+
+        def finish(self, tokens):
+            seen.append(("finish", len(tokens)))
+
+    walk_sql("select 'join' from a join b on 1 = 1", [Recorder()])
+    assert seen == [("kind", "'join'"), ("key", "join"), ("finish", 10)]
+
+
+def test_keywords_inside_literals_and_identifiers_are_ignored():
+    sql = "SELECT 'IFF(a) || MINUS' AS \"IGNORE NULLS\" FROM s.t WHERE x = 1"
+    result = validate_hana_sql(sql, _scenario(), HanaVersion.HANA_1_0)
+    assert not result.errors
+    assert not {"HANA_CONCAT_SYNTAX", "HANA_VERSION_IGNORE_NULLS"} & _codes(result)
+
+
+def test_parentheses_in_literals_do_not_unbalance():
+    result = validate_sql_structure("SELECT ')' AS p, \"(\" FROM t -- (")
+    assert "UNBALANCED_PARENTHESES" not in _codes(result)
+
+
+def test_with_requires_final_select_outside_cte_bodies():
+    assert "NO_SELECT_AFTER_CTE" in _codes(validate_sql_structure("WITH a AS (SELECT 1)"))
+    assert "NO_SELECT_AFTER_CTE" not in _codes(validate_sql_structure("WITH a AS (SELECT 1) SELECT * FROM a"))
+
+
+def test_duplicate_cte_reports_its_line():
+    sql = "WITH a AS (SELECT 1),\nb AS (SELECT 2),\na AS (SELECT 3)\nSELECT * FROM a"
+    (error,) = validate_sql_structure(sql).errors
+    assert error.code == "DUPLICATE_CTE" and error.line_number == 3
+
+
+def test_iff_arguments_are_counted_at_call_depth():
+    good = "SELECT IFF(a = '', LPAD(b, 30, '0'), '') FROM s.t"
+    bad = "SELECT IFF(a, b) FROM s.t"
+    assert "INVALID_IFF_SYNTAX" not in _codes(validate_snowflake_specific(good))
+    assert "INVALID_IFF_SYNTAX" in _codes(validate_snowflake_specific(bad))
+
+
+def test_join_condition_after_subquery_is_found():
+    sql = "SELECT * FROM s.a LEFT JOIN (SELECT x, y, z FROM s.b WHERE z > 1 AND y < 2) b ON a.x = b.x"
+    assert "JOIN_WITHOUT_ON" not in _codes(validate_snowflake_specific(sql))
+    assert "JOIN_WITHOUT_ON" in _codes(validate_snowflake_specific("SELECT * FROM s.a LEFT JOIN s.b WHERE 1 = 1"))
+
+
+def test_cte_and_schema_names_are_not_unqualified_tables():
+    sql = "WITH p AS (SELECT * FROM SAPABAP1.KNA1) SELECT * FROM p JOIN raw_t ON p.x = raw_t.x"
+    infos = [i.message for i in validate_snowflake_specific(sql).info if i.code == "UNQUALIFIED_TABLE_REFERENCE"]
+    assert infos == []
+    infos = [i.message for i in validate_snowflake_specific("SELECT * FROM raw_t").info]
+    assert any("RAW_T" in message for message in infos)
+
+
+def test_validate_sql_single_walk_matches_individual_validators():
+    sql = "WITH a AS (SELECT COUNT(*) AS n FROM s.t) SELECT * FROM a JOIN b ON 1 = 1"
+    scenario = _scenario()
+    combined = validate_sql(sql, DatabaseMode.SNOWFLAKE, scenario)
+    expected = set()
+    for result in (
+        validate_sql_structure(sql),
+        validate_performance(sql, scenario),
+        validate_snowflake_specific(sql),
+        analyze_query_complexity(sql, scenario),
+    ):
+        expected |= {str(issue) for issue in result.errors + result.warnings + result.info}
+    assert {str(issue) for issue in combined.errors + combined.warnings + combined.info} == expected
@@ -14,6 +14,7 @@ from xml_to_sql.sql.validator import (
 )
 from xml_to_sql.domain.models import Scenario, ScenarioMetadata, DataSource, DataSourceType
 from xml_to_sql.sql.renderer import RenderContext
+from xml_to_sql.sql.sql_ast import Cte, Join, Select, SelectItem, SqlStatement, TableRef
 
 
 class TestValidationResult:
@@ -227,6 +228,23 @@ class TestValidateQueryCompleteness:
         cte_warnings = [w for w in result.warnings if "undefined" in str(w).lower()]
         assert len(cte_warnings) == 0
 
+    def test_undefined_cte_reference_from_ast_without_context(self):
+        """Without a render context the CTE names are read from the AST."""
+        scenario = Scenario(metadata=ScenarioMetadata(scenario_id="test"))
+        ast = SqlStatement(
+            ctes=[Cte("projection_1", Select([SelectItem("A")], TableRef("SCHEMA1.TABLE1")))],
+            query=Select(
+                [SelectItem("*")],
+                TableRef("projection_1"),
+                joins=[Join("INNER", TableRef("missing_cte"), ["projection_1.A = missing_cte.A"])],
+            ),
+        )
+
+        result = validate_query_completeness(scenario, ast.to_sql(), None, ast)
+        undefined = [w for w in result.warnings if w.code == "UNDEFINED_CTE_REFERENCE"]
+        assert len(undefined) == 1
+        assert "MISSING_CTE" in undefined[0].message
+
 
 class TestValidationIssue:
     """Tests for ValidationIssue class."""
@@ -300,6 +318,17 @@ class TestValidateSnowflakeSpecific:
         result = validate_snowflake_specific(sql)
         assert any("||" in str(w) or "concatenation" in str(w).lower() for w in result.warnings)
 
+    def test_string_concat_plus_with_quoted_column(self):
+        """A string literal added to a quoted column should warn, on either side."""
+        for sql in ('SELECT "COL" + \'x\' FROM s.t', 'SELECT \'a\' + "B" FROM s.t'):
+            result = validate_snowflake_specific(sql)
+            assert any(w.code == "STRING_CONCAT_PLUS" for w in result.warnings), sql
+
+    def test_numeric_plus_is_not_concatenation(self):
+        """Adding columns or numbers is arithmetic."""
+        result = validate_snowflake_specific('SELECT "A" + "B", 1 + 2 FROM s.t')
+        assert not any(w.code == "STRING_CONCAT_PLUS" for w in result.warnings)
+
     def test_hana_if_not_translated(self):
         """HANA IF() function should warn."""
         sql = "SELECT IF(1=1, 'yes', 'no')"
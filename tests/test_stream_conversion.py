@@ -0,0 +1,121 @@
+"""Tests for live stage streaming in /convert/single/stream."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.api import routes
+from xml_to_sql.web.database.models import Base, Conversion
+from xml_to_sql.web.services.conversion_pool import shutdown_conversion_pool
+from xml_to_sql.web.services.converter import ConversionCancelled, convert_xml_to_sql
+from xml_to_sql.web.services.history_writer import HistoryWriter
+
+_SAMPLE = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+
+
+class _Client:
+    """Stands in for the request; reports the client as gone once ``leave()`` is called."""
+
+    def __init__(self) -> None:
+        self.gone = False
+
+    def leave(self) -> None:
+        self.gone = True
+
+    async def is_disconnected(self) -> bool:
+        return self.gone
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    writer = HistoryWriter(sessions)
+    monkeypatch.setattr(routes, "get_history_writer", lambda: writer)
+    with sessions() as session:
+        yield session
+    writer.close()
+    shutdown_conversion_pool()
+    engine.dispose()
+
+
+@pytest.fixture
+def paused_conversion(monkeypatch):
+    """Conversion that pauses after its first stage until ``resume`` is set."""
+
+    resume, finished = threading.Event(), threading.Event()
+    outcome = {}
+
+    def convert(xml_content, on_stage_update=None, **options):
+        def callback(stage):
+            on_stage_update(stage)
+            if stage.stage_name == "Parse XML":
+                assert resume.wait(10)
+
+        try:
+            outcome["result"] = convert_xml_to_sql(xml_content, on_stage_update=callback, **options)
+            return outcome["result"]
+        except ConversionCancelled as exc:
+            outcome["cancelled"] = exc
+            raise
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(routes, "convert_xml_to_sql", convert)
+    monkeypatch.setattr(routes, "STREAM_DISCONNECT_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(routes, "write_latest_sql_to_file", lambda *args: None)
+    return resume, finished, outcome
+
+
+async def _open_stream(client: _Client, db):
+    upload = UploadFile(BytesIO(_SAMPLE.read_bytes()), filename=_SAMPLE.name)
+    response = await routes.convert_single_stream(client, upload, '{"database_mode": "snowflake"}', db)
+    return response.body_iterator
+
+
+def test_stages_are_sent_while_the_conversion_runs(db, paused_conversion):
+    resume, finished, outcome = paused_conversion
+
+    async def run():
+        events = await _open_stream(_Client(), db)
+        assert (await events.__anext__()).startswith("event: start")
+        first_stage = await events.__anext__()
+        # The conversion is still paused after its first stage
+        assert "Parse XML" in first_stage and not finished.is_set()
+        resume.set()
+        return [chunk async for chunk in events]
+
+    rest = asyncio.run(run())
+    assert [chunk.split("\n", 1)[0] for chunk in rest][-1] == "event: complete"
+    assert sum(chunk.startswith("event: stage_update") for chunk in rest) >= 3
+    assert routes.get_history_writer().flush(10)
+    assert db.query(Conversion).one().scenario_id == outcome["result"].scenario_id
+
+
+def test_disconnect_cancels_the_conversion(db, paused_conversion):
+    resume, finished, outcome = paused_conversion
+    client = _Client()
+
+    async def run():
+        events = await _open_stream(client, db)
+        await events.__anext__()
+        assert "Parse XML" in await events.__anext__()
+        client.leave()
+        rest = [chunk async for chunk in events]
+        resume.set()
+        return rest
+
+    assert asyncio.run(run()) == []
+    assert finished.wait(10)
+    assert "cancelled" in outcome and "result" not in outcome
+    assert routes.get_history_writer().stats().written == 0
+    assert db.query(Conversion).count() == 0
@@ -0,0 +1,113 @@
+"""Tests for the formula translation cache."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion
+from xml_to_sql.sql.function_translator import translate_raw_formula
+from xml_to_sql.sql.translation_cache import TranslationCache, get_formula_cache
+
+
+class _Ctx:
+    def __init__(self, database_mode, hana_version=None, client="PROD", language="EN"):
+        self.database_mode = database_mode
+        self.hana_version = hana_version
+        self.client = client
+        self.language = language
+        self.warnings = []
+
+
+@pytest.fixture(autouse=True)
+def _clear_formula_cache():
+    get_formula_cache().clear()
+    yield
+    get_formula_cache().clear()
+
+
+def test_lru_eviction_order():
+    cache = TranslationCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # "b" is now least recently used
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size == 2
+
+
+def test_stats_hit_ratio_and_delta():
+    cache = TranslationCache()
+    cache.get_or_compute("k", lambda: "v")
+    before = cache.stats()
+    cache.get_or_compute("k", lambda: pytest.fail("should be cached"))
+    cache.get_or_compute("k", lambda: "unused")
+
+    delta = cache.stats().since(before)
+    assert (delta.hits, delta.misses) == (2, 0)
+    assert cache.stats().hit_ratio == pytest.approx(2 / 3)
+    assert delta.to_dict()["hit_ratio"] == 1.0
+
+
+def test_resize_evicts_and_rejects_zero():
+    cache = TranslationCache(max_entries=3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.resize(1)
+    assert len(cache) == 1
+    assert cache.get("c") == "c"
+    with pytest.raises(ValueError):
+        cache.resize(0)
+
+
+def test_concurrent_access_is_consistent():
+    cache = TranslationCache(max_entries=16)
+
+    def worker(offset: int):
+        for i in range(500):
+            key = (i + offset) % 32
+            assert cache.get_or_compute(key, lambda k=key: str(k)) == str(key)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats.lookups == 8 * 500
+    assert stats.size <= 16
+
+
+def test_translate_raw_formula_is_cached():
+    ctx = _Ctx(DatabaseMode.HANA, HanaVersion.HANA_2_0)
+    first = translate_raw_formula("if(\"A\" = 1, 'x', 'y')", ctx)
+    second = translate_raw_formula("if(\"A\" = 1, 'x', 'y')", ctx)
+
+    assert first == second
+    stats = get_formula_cache().stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        _Ctx(DatabaseMode.SNOWFLAKE),
+        _Ctx(DatabaseMode.HANA, HanaVersion.HANA_1_0),
+        _Ctx(DatabaseMode.HANA, HanaVersion.HANA_2_0, client="100"),
+        _Ctx(DatabaseMode.HANA, HanaVersion.HANA_2_0, language="DE"),
+    ],
+)
+def test_cache_key_covers_translation_inputs(other):
+    formula = "\"MANDT\" = '$$client$$' and \"SPRAS\" = '$$language$$' and in(\"X\", 'a', 'b')"
+    translate_raw_formula(formula, _Ctx(DatabaseMode.HANA, HanaVersion.HANA_2_0))
+    translated = translate_raw_formula(formula, other)
+
+    assert get_formula_cache().stats().hits == 0
+    assert translated == translate_raw_formula(formula, other)
@@ -0,0 +1,126 @@
+"""Tests for the content-hash validation result cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from xml_to_sql.domain import (
+    AttributeMapping,
+    DataSource,
+    DataSourceType,
+    Expression,
+    ExpressionType,
+    Node,
+    NodeKind,
+    Scenario,
+    ScenarioMetadata,
+)
+from xml_to_sql.domain.types import DatabaseMode, HanaVersion
+from xml_to_sql.sql import render_scenario
+from xml_to_sql.sql.validation_cache import (
+    ValidationCache,
+    configure_validation_cache,
+    validation_cache_key,
+)
+from xml_to_sql.sql.validator import ValidationResult
+from xml_to_sql.web.services.converter import convert_xml_to_sql
+
+_SAMPLE = Path(__file__).resolve().parents[1] / "Source (XML Files)" / "HANA 2.XX XML Views" / "ECC_ON_HANA" / "Sold_Materials.XML"
+
+
+def _result() -> ValidationResult:
+    result = ValidationResult()
+    result.add_error("Duplicate CTE name: P", "DUPLICATE_CTE", line_number=3)
+    result.add_warning("SELECT * used", "SELECT_STAR")
+    result.add_info("Query uses 2 JOINs", "JOIN_COUNT")
+    return result
+
+
+def _issues(result: ValidationResult) -> list:
+    return [str(issue) for issue in result.errors + result.warnings + result.info]
+
+
+def test_key_covers_sql_mode_version_and_validator_set():
+    base = validation_cache_key("SELECT 1", DatabaseMode.HANA, HanaVersion.HANA_2_0, ["a", "b"])
+    assert base == validation_cache_key("SELECT 1", DatabaseMode.HANA, HanaVersion.HANA_2_0, ["a", "b"])
+    assert len(base) == 64
+    others = {
+        validation_cache_key("SELECT 2", DatabaseMode.HANA, HanaVersion.HANA_2_0, ["a", "b"]),
+        validation_cache_key("SELECT 1", DatabaseMode.SNOWFLAKE, HanaVersion.HANA_2_0, ["a", "b"]),
+        validation_cache_key("SELECT 1", DatabaseMode.HANA, HanaVersion.HANA_1_0, ["a", "b"]),
+        validation_cache_key("SELECT 1", DatabaseMode.HANA, HanaVersion.HANA_2_0, ["a"]),
+    }
+    assert base not in others and len(others) == 4
+
+
+def test_memory_hits_return_independent_copies():
+    cache = ValidationCache(max_entries=1)
+    cache.put("k1", _result(), ["SQL Structure: FAILED (errors=1, warnings=0, info=0)"])
+
+    hit = cache.get("k1")
+    assert hit.layer == "memory" and not hit.result.is_valid
+    assert _issues(hit.result) == _issues(_result())
+    hit.result.errors.clear()
+    assert cache.get("k1").result.has_errors
+
+    cache.put("k2", ValidationResult())
+    assert cache.get("k1") is None  # evicted
+    stats = cache.stats()
+    assert (stats.memory_hits, stats.misses, stats.size) == (2, 1, 1)
+
+
+def test_disk_layer_is_shared_between_caches(tmp_path):
+    writer = ValidationCache(directory=tmp_path)
+    writer.put("ab" + "0" * 62, _result(), ["line"], reports={"dry_run": {"rows": 0}})
+
+    reader = ValidationCache(directory=tmp_path)
+    hit = reader.get("ab" + "0" * 62)
+    assert hit.layer == "disk" and hit.logs == ["line"]
+    assert hit.reports == {"dry_run": {"rows": 0}}
+    assert _issues(hit.result) == _issues(_result())
+    assert reader.get("ab" + "0" * 62).layer == "memory"
+
+    (tmp_path / "cd").mkdir()
+    (tmp_path / "cd" / ("cd" + "0" * 62 + ".json")).write_text("{not json", encoding="utf-8")
+    assert reader.get("cd" + "0" * 62) is None
+
+
+def test_render_validation_is_reused_for_identical_sql():
+    scenario = Scenario(metadata=ScenarioMetadata(scenario_id="cached"))
+    scenario.data_sources["KNA1"] = DataSource(
+        source_id="KNA1", source_type=DataSourceType.TABLE, schema_name="SAPABAP1", object_name="KNA1"
+    )
+    scenario.add_node(
+        Node(
+            node_id="Projection_1",
+            kind=NodeKind.PROJECTION,
+            inputs=["KNA1"],
+            mappings=[AttributeMapping("KUNNR", Expression(ExpressionType.COLUMN, "KUNNR"))],
+        )
+    )
+    cache = configure_validation_cache()
+    try:
+        first = render_scenario(scenario, return_warnings=True)
+        second = render_scenario(scenario, return_warnings=True)
+        assert first == second
+        stats = cache.stats()
+        assert (stats.misses, stats.memory_hits) == (1, 1)
+    finally:
+        configure_validation_cache()
+
+
+def test_conversion_replays_cost_and_dry_run_reports_on_a_hit():
+    def validation_details(result):
+        return next(stage.details for stage in result.stages if stage.stage_name == "Validate SQL")
+
+    configure_validation_cache()
+    try:
+        xml = _SAMPLE.read_bytes()
+        first = validation_details(convert_xml_to_sql(xml, database_mode="snowflake"))
+        second = validation_details(convert_xml_to_sql(xml, database_mode="snowflake"))
+    finally:
+        configure_validation_cache()
+
+    assert not first["cache"]["hit"] and second["cache"]["hit"]
+    assert first["dry_run"] is not None and first["cost_estimate"] is not None
+    assert (second["dry_run"], second["cost_estimate"]) == (first["dry_run"], first["cost_estimate"])
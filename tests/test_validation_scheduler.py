@@ -0,0 +1,93 @@
+"""Tests for dependency- and cost-aware validator scheduling."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from xml_to_sql.sql.validation_scheduler import (
+    ValidationBudget,
+    ValidatorCost,
+    ValidatorSpec,
+    run_validators,
+)
+from xml_to_sql.sql.validator import ValidationResult
+
+
+def _result(*, error: str = "", warning: str = "") -> ValidationResult:
+    result = ValidationResult()
+    if error:
+        result.add_error(error, error.upper())
+    if warning:
+        result.add_warning(warning, warning.upper())
+    return result
+
+
+def test_structural_error_skips_dependent_validators():
+    called = []
+
+    def expensive():
+        called.append("expensive")
+        return _result()
+
+    specs = [
+        ValidatorSpec("SQL Structure", lambda: _result(error="broken")),
+        ValidatorSpec("Snowflake", expensive, ValidatorCost.EXPENSIVE, requires=("SQL Structure",)),
+        ValidatorSpec("Expressions", lambda: _result(warning="odd")),
+    ]
+    report = run_validators(specs)
+
+    assert called == []
+    assert report.skipped == ["Snowflake"]
+    assert report.logs[1] == "Snowflake: SKIPPED (requires SQL Structure)"
+    assert report.logs[0] == "SQL Structure: FAILED (errors=1, warnings=0, info=0)"
+    assert [issue.code for issue in report.result.errors + report.result.warnings] == ["BROKEN", "ODD"]
+
+
+def test_results_merge_in_declaration_order_regardless_of_completion():
+    def slow():
+        time.sleep(0.05)
+        return _result(warning="first")
+
+    def fast():
+        return _result(warning="second")
+
+    specs = [ValidatorSpec("slow", slow, ValidatorCost.EXPENSIVE), ValidatorSpec("fast", fast)]
+    parallel = run_validators(specs)
+    serial = run_validators(list(reversed(specs)), parallel=False)
+
+    assert [w.code for w in parallel.result.warnings] == ["FIRST", "SECOND"]
+    assert [w.code for w in serial.result.warnings] == ["SECOND", "FIRST"]
+    assert [run["name"] for run in parallel.to_dict()["validators"]] == ["slow", "fast"]
+
+
+def test_spent_budget_skips_only_expensive_validators():
+    budget = ValidationBudget(total_ms=1.0)
+
+    def busy():
+        time.sleep(0.005)
+        return _result()
+
+    first = run_validators([ValidatorSpec("heavy", busy, ValidatorCost.EXPENSIVE)], budget=budget)
+    assert first.skipped == [] and budget.exhausted
+
+    second = run_validators(
+        [ValidatorSpec("heavy", busy, ValidatorCost.EXPENSIVE), ValidatorSpec("cheap", busy)],
+        budget=budget,
+    )
+    assert second.skipped == ["heavy"]
+    assert second.runs[0].reason == "validation budget exhausted"
+    assert second.runs[1].status == "ok"
+
+
+def test_invalid_requirements_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        run_validators([ValidatorSpec("a", _result, requires=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        run_validators(
+            [
+                ValidatorSpec("a", _result, requires=("b",)),
+                ValidatorSpec("b", _result, requires=("a",)),
+            ]
+        )
@@ -0,0 +1,66 @@
+"""Tests for the streaming batch ZIP export."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from io import BytesIO
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from xml_to_sql.web.api.routes import download_batch_zip
+from xml_to_sql.web.database.models import Base, BatchConversion, BatchFile, Conversion
+
+_VALIDATION = {"is_valid": True, "errors": [], "warnings": [], "info": []}
+
+
+def test_batch_zip_is_streamed_from_one_query(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    files = 60
+    with sessionmaker(bind=engine)() as db:
+        db.add(BatchConversion(batch_id="b1", total_files=files + 1))
+        for index in range(files):
+            db.add(Conversion(
+                id=index + 1,
+                filename="CV_SALES.xml" if index < 2 else f"CV_{index}.XML",
+                scenario_id=f"CV_{index}",
+                sql_content=f"SELECT {index} FROM DUMMY;\n" * 50,
+                abap_content="REPORT z_stored." if index == 0 else None,
+                validation_result=json.dumps(_VALIDATION),
+                validation_logs=json.dumps([f"log {index}"]),
+            ))
+            db.add(BatchFile(batch_id="b1", conversion_id=index + 1, filename=f"CV_{index}.XML"))
+        db.add(Conversion(id=1000, filename="broken.xml", sql_content="", status="error"))
+        db.add(BatchFile(batch_id="b1", conversion_id=1000, filename="broken.xml"))
+        db.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    async def download():
+        with sessionmaker(bind=engine)() as db:
+            response = await download_batch_zip("b1", include_abap=True, include_validation=True, db=db)
+            return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(download())
+    # Batch lookup, existence check and one streamed query for every file
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 3
+    assert len(chunks) > files
+
+    with ZipFile(BytesIO(b"".join(chunks))) as archive:
+        names = archive.namelist()
+        assert names[:6] == [
+            "CV_SALES.sql", "Z_XDS_CV_SALES.ABAP", "CV_SALES.validation.json",
+            "CV_SALES_2.sql", "Z_XDS_CV_SALES_2.ABAP", "CV_SALES_2.validation.json",
+        ]
+        assert len(names) == files * 3 and "broken.sql" not in names
+        assert archive.read("CV_SALES.sql").decode() == "SELECT 0 FROM DUMMY;\n" * 50
+        assert archive.read("Z_XDS_CV_SALES.ABAP").decode() == "REPORT z_stored."
+        assert "CV_1" in archive.read("Z_XDS_CV_SALES_2.ABAP").decode()
+        assert json.loads(archive.read("CV_5.validation.json")) == {"validation": _VALIDATION, "validation_logs": ["log 5"]}
+        assert all(info.compress_type == ZIP_DEFLATED for info in archive.infolist())
+        assert archive.testzip() is None
+    engine.dispose()